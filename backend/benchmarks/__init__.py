@@ -0,0 +1 @@
+"""재현 가능한 성능 벤치마크 (python -m benchmarks.lifecycle)"""
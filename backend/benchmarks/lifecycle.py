@@ -0,0 +1,347 @@
+"""문의 수명주기 벤치마크
+
+생성 → AI 응답 → 조회 → 이메일별 목록 → 에스컬레이션 → 상태 변경 흐름을 여러 동시 작업자로 반복 실행하고
+단계(엔드포인트)별 p50/p95/p99 지연, 처리량, 요청당 메모리 할당량을 보고한다.
+
+- inprocess: local_server.LocalGateway.dispatch를 직접 호출 (소켓 없음)
+- http: local_server를 같은 프로세스에 띄우거나(--url 미지정) 지정한 서버에 keep-alive HTTP로 요청
+
+저장소는 STORAGE_BACKEND=memory, Bedrock은 BEDROCK_BACKEND=fake로 AWS 접근 없이 실행한다.
+--save-baseline으로 결과를 benchmarks/baselines/에 저장하고, 이후 실행은 기준 대비 허용 오차를 넘으면 종료 코드 1.
+
+    python -m benchmarks.lifecycle --mode inprocess --iterations 1000 --concurrency 8
+    python -m benchmarks.lifecycle --mode http --save-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.model_telemetry import _percentile
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+DEFAULT_TOLERANCE = float(os.environ.get('BENCH_TOLERANCE', '0.25'))
+DEFAULT_MIN_DELTA_MS = float(os.environ.get('BENCH_MIN_DELTA_MS', '2.0'))
+BENCH_ENVIRONMENT = {
+    'STORAGE_BACKEND': 'memory',
+    'BEDROCK_BACKEND': 'fake',
+    'DYNAMODB_TABLE': 'cs-inquiries-bench',
+    'AI_RESPONSE_CACHE_TABLE': 'ai-response-cache-bench',
+    'COMPANY_TABLE': 'cs-companies-bench',
+    'JWT_SECRET': 'bench-secret',
+    # 가짜 Bedrock 호출이 모델별 분당 한도 대기에 묶이지 않도록
+    'BEDROCK_REQUESTS_PER_MINUTE': '1000000',
+    'BEDROCK_TOKENS_PER_MINUTE': '1000000000',
+}
+
+# (단계 이름, 메서드, 경로 템플릿) - 경로는 local_server.ROUTES / INVOKE_HANDLERS 기준
+LIFECYCLE_STEPS = [
+    ('create', 'POST', '/api/inquiries'),
+    ('ai-response', 'POST', '/api/inquiries/{id}/regenerate'),
+    ('get', 'GET', '/api/inquiries/{id}'),
+    ('list-by-email', 'GET', '/api/my-inquiries'),
+    ('escalate', 'POST', '/api/inquiries/{id}/escalate'),
+    ('status-update', 'POST', '/_local/invoke/update-status'),
+]
+
+def build_request(step: str, method: str, path: str, state: Dict[str, Any]) -> Tuple[str, str, str, bytes]:
+    """단계별 (메서드, 경로, 쿼리 문자열, 본문)"""
+    path = path.replace('{id}', state.get('inquiry_id', ''))
+    query = ''
+    body: Dict[str, Any] = {}
+    if step == 'create':
+        body = {
+            'companyId': 'bench-company',
+            'customerEmail': state['email'],
+            'title': '환불 문의',
+            'content': f"주문 {state['sequence']}번 환불은 언제 처리되나요? 결제 취소 후 영업일 기준 며칠이 걸리는지 알려주세요.",
+            'category': 'billing',
+            'urgency': 'medium'
+        }
+    elif step == 'list-by-email':
+        query = urlencode({'email': state['email'], 'limit': 20})
+    elif step == 'escalate':
+        body = {'reason': '상담원 연결 요청'}
+    elif step == 'status-update':
+        # SQS/직접 호출 핸들러라 API Gateway 이벤트를 본문으로 전달
+        body = {'pathParameters': {'id': state['inquiry_id']},
+                'body': json.dumps({'status': 'resolved', 'humanResponse': '처리되었습니다.'})}
+    return method, path, query, json.dumps(body, ensure_ascii=False).encode('utf-8') if body else b''
+
+def _inquiry_id(response_body: bytes) -> Optional[str]:
+    try:
+        return json.loads(response_body)['data']['inquiryId']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+class InProcessTransport:
+    """LocalGateway를 소켓 없이 직접 호출"""
+
+    def __init__(self, gateway):
+        self.gateway = gateway
+
+    async def request(self, method: str, path: str, query: str, body: bytes) -> Tuple[int, bytes]:
+        status_code, _, response_body = await self.gateway.dispatch(
+            method, path, query, {'Content-Type': 'application/json'}, body)
+        return status_code, response_body
+
+    async def close(self) -> None:
+        pass
+
+class HttpTransport:
+    """작업자당 keep-alive 연결 하나를 쓰는 최소 HTTP/1.1 클라이언트"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, query: str, body: bytes) -> Tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        target = f'{path}?{query}' if query else path
+        head = (f'{method} {target} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n')
+        self._writer.write(head.encode('latin-1') + body)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError('Server closed connection')
+        status_code = int(status_line.split()[1])
+        content_length = 0
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                content_length = int(value.strip())
+        return status_code, await self._reader.readexactly(content_length)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+async def run_lifecycle(transport: Any, state: Dict[str, Any],
+                        record: Optional[Callable[[str, int, float], None]] = None,
+                        steps: List[Tuple[str, str, str]] = LIFECYCLE_STEPS) -> None:
+    """수명주기 한 번 실행, 단계마다 record(단계, 상태 코드, 지연 ms)"""
+    for step, method, path in steps:
+        if '{id}' in path or step == 'status-update':
+            if not state.get('inquiry_id'):
+                # 생성 실패 시 이후 단계는 오류로 기록
+                if record:
+                    record(step, 0, 0.0)
+                continue
+        request = build_request(step, method, path, state)
+        started = time.perf_counter()
+        status_code, response_body = await transport.request(*request)
+        latency_ms = (time.perf_counter() - started) * 1000
+        if step == 'create':
+            state['inquiry_id'] = _inquiry_id(response_body) if status_code == 200 else None
+        if record:
+            record(step, status_code, latency_ms)
+
+def summarize(samples: Dict[str, List[float]], errors: Dict[str, int], wall_seconds: float,
+              allocations: Optional[Dict[str, float]] = None) -> Dict[str, Dict[str, Any]]:
+    """단계별 지연 분위수/처리량 (처리량은 전체 실행 시간 기준 초당 요청 수)"""
+    report = {}
+    for step in list(samples) + [step for step in errors if step not in samples]:
+        latencies = sorted(samples.get(step, []))
+        report[step] = {
+            'count': len(latencies),
+            'errors': errors.get(step, 0),
+            'p50Ms': round(_percentile(latencies, 0.50), 2),
+            'p95Ms': round(_percentile(latencies, 0.95), 2),
+            'p99Ms': round(_percentile(latencies, 0.99), 2),
+            'throughputRps': round(len(latencies) / wall_seconds, 1) if wall_seconds else 0.0
+        }
+        if allocations and step in allocations:
+            report[step]['allocKiB'] = allocations[step]
+    return report
+
+async def run_benchmark(transport_factory: Callable[[], Any], iterations: int = 100, concurrency: int = 4,
+                        warmup: int = 5, steps: List[Tuple[str, str, str]] = LIFECYCLE_STEPS
+                        ) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    """concurrency개 작업자가 수명주기를 나눠 iterations번 실행 → (단계별 지연, 오류 수, 실행 시간)"""
+    samples: Dict[str, List[float]] = {step: [] for step, _, _ in steps}
+    errors: Dict[str, int] = {}
+
+    def record(step: str, status_code: int, latency_ms: float) -> None:
+        if 200 <= status_code < 300:
+            samples[step].append(latency_ms)
+        else:
+            errors[step] = errors.get(step, 0) + 1
+
+    async def worker(worker_id: int, count: int, recorder) -> None:
+        transport = transport_factory()
+        try:
+            for sequence in range(count):
+                state = {'email': f'bench-{worker_id}@example.com', 'sequence': sequence}
+                await run_lifecycle(transport, state, recorder, steps)
+        finally:
+            await transport.close()
+
+    # 워밍업: 핸들러 모듈 import, 로컬 테이블/클라이언트 생성 비용 제외
+    await worker(-1, warmup, None)
+
+    started = time.perf_counter()
+    per_worker = [iterations // concurrency + (1 if i < iterations % concurrency else 0) for i in range(concurrency)]
+    await asyncio.gather(*[worker(i, count, record) for i, count in enumerate(per_worker) if count])
+    return samples, errors, time.perf_counter() - started
+
+async def measure_allocations(transport_factory: Callable[[], Any], iterations: int = 20,
+                              steps: List[Tuple[str, str, str]] = LIFECYCLE_STEPS) -> Dict[str, float]:
+    """단계별 요청당 최대 추가 할당량(KiB) 평균 (tracemalloc, 순차 실행)"""
+    totals: Dict[str, List[float]] = {step: [] for step, _, _ in steps}
+    transport = transport_factory()
+    tracemalloc.start()
+    try:
+        for sequence in range(iterations):
+            state = {'email': 'bench-alloc@example.com', 'sequence': sequence}
+            for index in range(len(steps)):
+                baseline, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                await run_lifecycle(transport, state, None, steps[index:index + 1])
+                _, peak = tracemalloc.get_traced_memory()
+                totals[steps[index][0]].append((peak - baseline) / 1024)
+    finally:
+        tracemalloc.stop()
+        await transport.close()
+    return {step: round(sum(values) / len(values), 1) for step, values in totals.items() if values}
+
+def compare_to_baseline(report: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                        tolerance: float = DEFAULT_TOLERANCE,
+                        min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[str]:
+    """기준 대비 p95/p99 지연·할당량 증가, 처리량 감소, 새 오류를 회귀로 보고
+
+    지연은 비율(tolerance)과 절대 증가량(min_delta_ms)을 모두 넘어야 회귀로 본다 (수 ms 수준 지연의 측정 잡음 제외).
+    """
+    regressions = []
+    for step, expected in baseline.items():
+        actual = report.get(step)
+        if actual is None:
+            regressions.append(f"{step}: 결과 없음")
+            continue
+        for metric, min_delta in (('p95Ms', min_delta_ms), ('p99Ms', min_delta_ms), ('allocKiB', 0.0)):
+            if metric in expected and metric in actual and expected[metric] > 0 \
+                    and actual[metric] > expected[metric] * (1 + tolerance) \
+                    and actual[metric] - expected[metric] > min_delta:
+                regressions.append(f"{step}: {metric} {expected[metric]} → {actual[metric]}")
+        if expected.get('throughputRps', 0) > 0 and actual['throughputRps'] < expected['throughputRps'] * (1 - tolerance):
+            regressions.append(f"{step}: throughputRps {expected['throughputRps']} → {actual['throughputRps']}")
+        if actual['errors'] > expected.get('errors', 0):
+            regressions.append(f"{step}: errors {expected.get('errors', 0)} → {actual['errors']}")
+    return regressions
+
+def baseline_path(mode: str) -> str:
+    return os.path.join(BASELINE_DIR, f'lifecycle-{mode}.json')
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def print_report(report: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'step':<15}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'KiB':>9}")
+    for step, row in report.items():
+        print(f"{step:<15}{row['count']:>7}{row['errors']:>8}{row['p50Ms']:>10}{row['p95Ms']:>10}"
+              f"{row['p99Ms']:>10}{row['throughputRps']:>10}{row.get('allocKiB', '-'):>9}")
+
+async def _run(args) -> Dict[str, Any]:
+    for name, value in BENCH_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    from local_server import LocalGateway
+
+    gateway = LocalGateway(max_workers=max(args.concurrency * 2, 4))
+    server = None
+    if args.mode == 'inprocess':
+        transport_factory = lambda: InProcessTransport(gateway)
+    else:
+        if args.url:
+            parsed = urlparse(args.url)
+            host, port = parsed.hostname, parsed.port or 80
+        else:
+            server = await asyncio.start_server(gateway.handle_connection, '127.0.0.1', 0)
+            host, port = server.sockets[0].getsockname()[:2]
+        transport_factory = lambda: HttpTransport(host, port)
+
+    try:
+        samples, errors, wall_seconds = await run_benchmark(
+            transport_factory, args.iterations, args.concurrency, args.warmup)
+        allocations = None
+        if args.mode == 'inprocess' and args.alloc_iterations:
+            allocations = await measure_allocations(transport_factory, args.alloc_iterations)
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+        gateway.executor.shutdown(wait=False)
+
+    return {
+        'runId': str(uuid.uuid4()),
+        'mode': args.mode,
+        'iterations': args.iterations,
+        'concurrency': args.concurrency,
+        'wallSeconds': round(wall_seconds, 3),
+        'steps': summarize(samples, errors, wall_seconds, allocations)
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='문의 수명주기 벤치마크')
+    parser.add_argument('--mode', choices=['inprocess', 'http'], default='inprocess')
+    parser.add_argument('--url', help='http 모드에서 사용할 외부 서버 (미지정 시 내장 local_server)')
+    parser.add_argument('--iterations', type=int, default=1000, help='수명주기 실행 횟수')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--alloc-iterations', type=int, default=20, help='할당량 측정 반복 (0이면 생략)')
+    parser.add_argument('--baseline', help='기준 파일 (기본: benchmarks/baselines/lifecycle-<mode>.json)')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS)
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(_run(args))
+    print_report(result['steps'])
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    path = args.baseline or baseline_path(args.mode)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({key: value for key, value in result.items() if key != 'runId'}, f, ensure_ascii=False, indent=2)
+        print(f"\n기준 저장: {path}")
+        return 0
+
+    baseline = load_baseline(path)
+    if baseline is None:
+        print(f"\n기준 없음: {path} (--save-baseline으로 생성)")
+        return 0
+    regressions = compare_to_baseline(result['steps'], baseline['steps'], args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"\n⚠️ 성능 회귀 (허용 오차 {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print(f"\n✅ 기준 대비 회귀 없음 (허용 오차 {args.tolerance:.0%})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,9 +3,13 @@ AWS Bedrock AI 모델 설정 및 관리
 환경변수를 통한 동적 모델 스위칭 지원
 """
 import os
+import json
 from typing import Dict, Any, Optional
 from enum import Enum
 
+from config.complexity_classifier import get_complexity_classifier
+from config.model_telemetry import ModelTelemetry, model_telemetry
+
 class ModelType(Enum):
     """지원되는 AI 모델 타입"""
     CLAUDE_4_1_OPUS = "claude-4-1-opus"
@@ -17,6 +21,7 @@ class ModelSelectionStrategy(Enum):
     FIXED = "fixed"
     ADAPTIVE = "adaptive"
     COST_OPTIMIZED = "cost_optimized"
+    LATENCY_AWARE = "latency_aware"
 
 # 기본 AI 모델 설정 (inference profile ID)
 AI_MODEL_CONFIG = {
@@ -28,13 +33,42 @@ AI_MODEL_CONFIG = {
     "model_selection_strategy": ModelSelectionStrategy.ADAPTIVE.value
 }
 
+# 응답 생성 예산 ("카테고리:복잡도:우선순위", *는 전체). 일치하는 항목을 덜 구체적인 것부터 차례로 덮어쓴다.
+# max_tokens는 BEDROCK_MAX_TOKENS를 넘지 않는다. 예산에서 잘린 응답은 AIService가 BEDROCK_MAX_TOKENS까지 다시(스트림은 이어서) 생성한다.
+# 예산별 잘림 수와 조정 제안값(suggest_budgets)은 budget_telemetry.emit_metrics()가 EMF로 출력
+DEFAULT_GENERATION_BUDGETS = {
+    "*:simple:*": {"max_tokens": 600, "temperature": 0.3},
+    "*:medium:*": {"max_tokens": 1000, "temperature": 0.5},
+    "*:complex:*": {"max_tokens": 1600, "temperature": 0.6},
+    "billing:*:*": {"temperature": 0.2},
+    "technical:complex:*": {"max_tokens": 2048}
+}
+
+# 모델이 고객 문의 형식을 이어 쓰기 시작하면 중단
+DEFAULT_STOP_SEQUENCES = ["\n\n고객 문의:"]
+
+# latency_aware 전략 기본값 (SLO를 넘거나 오류가 잦은 모델은 배제)
+DEFAULT_ROUTING_POLICY = {
+    "latency_slo_ms": 8000,
+    "max_error_rate": 0.2,
+    "cost_budget_usd": 0.05,
+    "min_samples": 5
+}
+
+# 모델별 호출 한도 기본값 (계정 Bedrock 할당량에 맞게 환경변수로 조정)
+DEFAULT_RATE_LIMITS = {
+    "requests_per_minute": 50,
+    "tokens_per_minute": 200000
+}
+
 DEFAULT_AI_MODEL_CONFIG = AI_MODEL_CONFIG
 
 class AIModelConfig:
     """AI 모델 설정 관리 클래스"""
     
-    def __init__(self):
+    def __init__(self, telemetry: Optional[ModelTelemetry] = None):
         self.config = self._load_config()
+        self.telemetry = telemetry or model_telemetry
     
     def _load_config(self) -> Dict[str, Any]:
         """환경변수에서 모델 설정 로드"""
@@ -44,7 +78,11 @@ class AIModelConfig:
             "fast_model": os.getenv("BEDROCK_FAST_MODEL", DEFAULT_AI_MODEL_CONFIG["fast_model"]),
             "max_tokens": int(os.getenv("BEDROCK_MAX_TOKENS", str(DEFAULT_AI_MODEL_CONFIG["max_tokens"]))),
             "temperature": float(os.getenv("BEDROCK_TEMPERATURE", str(DEFAULT_AI_MODEL_CONFIG["temperature"]))),
-            "model_selection_strategy": os.getenv("BEDROCK_SELECTION_STRATEGY", DEFAULT_AI_MODEL_CONFIG["model_selection_strategy"])
+            "model_selection_strategy": os.getenv("BEDROCK_SELECTION_STRATEGY", DEFAULT_AI_MODEL_CONFIG["model_selection_strategy"]),
+            "latency_slo_ms": float(os.getenv("BEDROCK_LATENCY_SLO_MS", str(DEFAULT_ROUTING_POLICY["latency_slo_ms"]))),
+            "max_error_rate": float(os.getenv("BEDROCK_MAX_ERROR_RATE", str(DEFAULT_ROUTING_POLICY["max_error_rate"]))),
+            "cost_budget_usd": float(os.getenv("BEDROCK_COST_BUDGET_USD", str(DEFAULT_ROUTING_POLICY["cost_budget_usd"]))),
+            "min_samples": int(os.getenv("BEDROCK_TELEMETRY_MIN_SAMPLES", str(DEFAULT_ROUTING_POLICY["min_samples"])))
         }
     
     def get_model_for_request(self, complexity: str = "medium", priority: str = "normal") -> str:
@@ -57,6 +95,8 @@ class AIModelConfig:
             return self._adaptive_model_selection(complexity, priority)
         elif strategy == ModelSelectionStrategy.COST_OPTIMIZED.value:
             return self._cost_optimized_selection(complexity)
+        elif strategy == ModelSelectionStrategy.LATENCY_AWARE.value:
+            return self._latency_aware_selection(complexity, priority)
         
         return self.config["default_model"]
     
@@ -79,6 +119,69 @@ class AIModelConfig:
         else:
             return self.config["default_model"]
     
+    def _latency_aware_selection(self, complexity: str, priority: str) -> str:
+        """최근 지연/오류율/비용 기반 선택
+        
+        선호 순서대로 SLO/오류율/예산을 만족하는 첫 모델을 고른다. 샘플이 적은 모델은 정상으로 본다.
+        모두 만족하지 못하면 오류율이 낮고 p95가 가장 짧은 모델을 고른다.
+        """
+        fast, default, fallback = (self.config[key] for key in ("fast_model", "default_model", "fallback_model"))
+        if priority == "high":
+            preference = [default, fallback, fast]
+        elif complexity == "simple":
+            preference = [fast, default, fallback]
+        else:
+            preference = [default, fallback, fast]
+        candidates = list(dict.fromkeys(preference))
+        # 높은 우선순위는 품질을 위해 비용 예산을 적용하지 않는다
+        budget = None if priority == "high" else self.config["cost_budget_usd"]
+        
+        stats = {model_id: self.telemetry.stats(model_id) for model_id in candidates}
+        for model_id in candidates:
+            if self._is_model_healthy(stats[model_id], budget):
+                return model_id
+        
+        return min(candidates, key=lambda model_id: (
+            stats[model_id]["errorRate"] > self.config["max_error_rate"],
+            stats[model_id]["p95"]
+        ))
+    
+    def _is_model_healthy(self, stats: Dict[str, Any], budget: Optional[float]) -> bool:
+        if stats["count"] < self.config["min_samples"]:
+            return True
+        return (
+            stats["p95"] <= self.config["latency_slo_ms"]
+            and stats["errorRate"] <= self.config["max_error_rate"]
+            and (budget is None or stats["avgCost"] <= budget)
+        )
+    
+    def get_generation_budget(self, category: str = "general", complexity: str = "medium",
+                              priority: str = "normal") -> Dict[str, Any]:
+        """카테고리 × 복잡도 × 우선순위별 maxTokens / temperature / stopSequences
+        
+        BEDROCK_GENERATION_BUDGETS='{"billing:simple:*": {"max_tokens": 400}}'로 항목 추가/덮어쓰기
+        """
+        budgets = {key: dict(value) for key, value in DEFAULT_GENERATION_BUDGETS.items()}
+        for key, value in json.loads(os.getenv("BEDROCK_GENERATION_BUDGETS", "{}")).items():
+            budgets.setdefault(key, {}).update(value)
+        
+        budget = {"max_tokens": self.config["max_tokens"], "temperature": self.config["temperature"]}
+        parts = (category, complexity, priority)
+        matches = []
+        for key, value in budgets.items():
+            pattern = key.split(":")
+            if len(pattern) == 3 and all(p in ("*", part) for p, part in zip(pattern, parts)):
+                matches.append((sum(p != "*" for p in pattern), value))
+        for _, value in sorted(matches, key=lambda match: match[0]):
+            budget.update(value)
+        
+        return {
+            "key": ":".join(parts),
+            "max_tokens": min(int(budget["max_tokens"]), self.config["max_tokens"]),
+            "temperature": float(budget["temperature"]),
+            "stop_sequences": json.loads(os.getenv("BEDROCK_STOP_SEQUENCES", json.dumps(DEFAULT_STOP_SEQUENCES)))
+        }
+    
     def get_model_parameters(self, model_id: Optional[str] = None) -> Dict[str, Any]:
         """모델 파라미터 반환"""
         return {
@@ -95,21 +198,32 @@ class AIModelConfig:
     def get_fallback_model(self) -> str:
         """폴백 모델 반환"""
         return self.config["fallback_model"]
+    
+    def get_model_ids(self) -> list:
+        """설정된 모델 ID 목록 (중복 제거)"""
+        return list(dict.fromkeys(
+            self.config[key] for key in ("default_model", "fallback_model", "fast_model")
+        ))
+    
+    def get_rate_limits(self, model_id: str) -> Dict[str, int]:
+        """모델별 분당 요청/토큰 한도
+        
+        BEDROCK_MODEL_RATE_LIMITS='{"<model_id>": {"requests_per_minute": 20, "tokens_per_minute": 80000}}'로 개별 지정
+        """
+        limits = {
+            "requests_per_minute": int(os.getenv("BEDROCK_REQUESTS_PER_MINUTE", str(DEFAULT_RATE_LIMITS["requests_per_minute"]))),
+            "tokens_per_minute": int(os.getenv("BEDROCK_TOKENS_PER_MINUTE", str(DEFAULT_RATE_LIMITS["tokens_per_minute"])))
+        }
+        overrides = json.loads(os.getenv("BEDROCK_MODEL_RATE_LIMITS", "{}"))
+        limits.update(overrides.get(model_id, {}))
+        return limits
 
 # 전역 설정 인스턴스
 ai_model_config = AIModelConfig()
 
 def analyze_request_complexity(message: str, category: str = "general") -> str:
-    """요청 복잡도 분석"""
-    message_length = len(message)
-    
-    if message_length < 50:
-        return "simple"
-    elif message_length > 200 or any(keyword in message.lower() for keyword in 
-                                   ["복잡한", "상세한", "분석", "설명", "해결방법"]):
-        return "complex"
-    else:
-        return "medium"
+    """요청 복잡도 분석 (COMPLEXITY_MODEL_PATH가 있으면 학습 모델, 없으면 길이/키워드 규칙)"""
+    return get_complexity_classifier().predict(message, category)
 
 def get_request_priority(urgency: str = "normal") -> str:
     """요청 우선순위 결정"""
@@ -0,0 +1,269 @@
+"""
+문의 복잡도 분류기
+analyze_request_complexity가 사용하는 분류기를 교체 가능하게 한다.
+
+- HeuristicComplexityClassifier: 길이/키워드 규칙 (기본값, 모델 파일이 없을 때)
+- NgramLogisticClassifier: 문자 n-gram + 로지스틱 회귀. 과거 문의와 처리 결과
+  (상담사 개입 여부)로 학습해 gzip JSON 파일로 저장하고 프로세스당 한 번만 로드한다.
+
+Lambda 패키지에 NumPy/scikit-learn이 없으므로 학습/추론 모두 표준 라이브러리로 구현했다.
+희소 특성의 가중치 합이라 문의 한 건 분류는 수십 μs 수준이다.
+
+학습:
+    python -m config.complexity_classifier --output complexity_model.json.gz
+"""
+import gzip
+import json
+import math
+import os
+import random
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+logger = logging.getLogger()
+
+COMPLEXITY_LABELS = ("simple", "medium", "complex")
+COMPLEX_KEYWORDS = ["복잡한", "상세한", "분석", "설명", "해결방법"]
+
+# 상담사 개입 확률이 이 값 미만이면 simple, 초과면 complex
+DEFAULT_THRESHOLDS = {"simple": 0.3, "complex": 0.6}
+
+class ComplexityClassifier(ABC):
+    """복잡도 분류기 인터페이스 (predict만 구현하면 predict_batch는 기본 구현 사용)"""
+
+    @abstractmethod
+    def predict(self, message: str, category: str = "general") -> str:
+        """문의 한 건의 복잡도 (COMPLEXITY_LABELS 중 하나)"""
+
+    def predict_batch(self, messages: List[str], categories: Optional[List[str]] = None) -> List[str]:
+        categories = categories or ["general"] * len(messages)
+        return [self.predict(message, category) for message, category in zip(messages, categories)]
+
+class HeuristicComplexityClassifier(ComplexityClassifier):
+    """메시지 길이와 키워드 기반 규칙"""
+
+    def predict(self, message: str, category: str = "general") -> str:
+        message_length = len(message)
+
+        if message_length < 50:
+            return "simple"
+        elif message_length > 200 or any(keyword in message.lower() for keyword in COMPLEX_KEYWORDS):
+            return "complex"
+        else:
+            return "medium"
+
+def extract_features(message: str, category: str = "general",
+                     ngram_range: Tuple[int, int] = (2, 3)) -> List[str]:
+    """문자 n-gram + 카테고리 + 길이 구간 특성"""
+    text = f" {' '.join(message.lower().split())} "
+    features = {f"cat:{category}", f"len:{min(len(message) // 50, 10)}"}
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        features.update(text[i:i + n] for i in range(len(text) - n + 1))
+    return sorted(features)
+
+def _sigmoid(value: float) -> float:
+    if value >= 0:
+        return 1.0 / (1.0 + math.exp(-value))
+    exp_value = math.exp(value)
+    return exp_value / (1.0 + exp_value)
+
+class NgramLogisticClassifier(ComplexityClassifier):
+    """문자 n-gram 로지스틱 회귀 (상담사 개입이 필요할 확률 → 복잡도)"""
+
+    def __init__(self, weights: Dict[str, float], bias: float,
+                 thresholds: Optional[Dict[str, float]] = None,
+                 ngram_range: Tuple[int, int] = (2, 3),
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.weights = weights
+        self.bias = bias
+        self.thresholds = thresholds or dict(DEFAULT_THRESHOLDS)
+        self.ngram_range = tuple(ngram_range)
+        self.metadata = metadata or {}
+
+    def predict_proba(self, message: str, category: str = "general") -> float:
+        features = extract_features(message, category, self.ngram_range)
+        scale = 1.0 / math.sqrt(len(features))
+        score = self.bias + scale * sum(self.weights.get(feature, 0.0) for feature in features)
+        return _sigmoid(score)
+
+    def predict_proba_batch(self, messages: List[str], categories: Optional[List[str]] = None) -> List[float]:
+        categories = categories or ["general"] * len(messages)
+        weights_get = self.weights.get
+        probabilities = []
+        for message, category in zip(messages, categories):
+            features = extract_features(message, category, self.ngram_range)
+            score = sum(weights_get(feature, 0.0) for feature in features) / math.sqrt(len(features))
+            probabilities.append(_sigmoid(self.bias + score))
+        return probabilities
+
+    def _label(self, probability: float) -> str:
+        if probability < self.thresholds["simple"]:
+            return "simple"
+        if probability > self.thresholds["complex"]:
+            return "complex"
+        return "medium"
+
+    def predict(self, message: str, category: str = "general") -> str:
+        return self._label(self.predict_proba(message, category))
+
+    def predict_batch(self, messages: List[str], categories: Optional[List[str]] = None) -> List[str]:
+        return [self._label(probability) for probability in self.predict_proba_batch(messages, categories)]
+
+    def to_bytes(self) -> bytes:
+        return gzip.compress(json.dumps({
+            'version': 1,
+            'type': 'char_ngram_logreg',
+            'ngramRange': list(self.ngram_range),
+            'bias': self.bias,
+            'thresholds': self.thresholds,
+            'weights': self.weights,
+            'metadata': self.metadata
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> 'NgramLogisticClassifier':
+        data = json.loads(gzip.decompress(raw).decode('utf-8'))
+        if data.get('type') != 'char_ngram_logreg':
+            raise ValueError(f"지원하지 않는 분류기 형식: {data.get('type')}")
+        return cls(data['weights'], data['bias'], data.get('thresholds'),
+                   tuple(data.get('ngramRange', (2, 3))), data.get('metadata'))
+
+def train_classifier(samples: List[Tuple[str, str, int]], epochs: int = 15,
+                     learning_rate: float = 0.5, l2: float = 1e-4, min_count: int = 2,
+                     ngram_range: Tuple[int, int] = (2, 3), seed: int = 42) -> NgramLogisticClassifier:
+    """(메시지, 카테고리, 상담사 개입 여부 0/1) 목록으로 학습 (클래스 불균형은 가중치로 보정)"""
+    featurized = [(extract_features(message, category, ngram_range), label) for message, category, label in samples]
+
+    counts: Dict[str, int] = {}
+    for features, _ in featurized:
+        for feature in features:
+            counts[feature] = counts.get(feature, 0) + 1
+    vocabulary = {feature for feature, count in counts.items() if count >= min_count}
+
+    positives = sum(label for _, label in featurized) or 1
+    negatives = (len(featurized) - positives) or 1
+    class_weight = {1: len(featurized) / (2 * positives), 0: len(featurized) / (2 * negatives)}
+
+    weights: Dict[str, float] = {}
+    bias = 0.0
+    rng = random.Random(seed)
+    order = list(range(len(featurized)))
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        rate = learning_rate / (1 + epoch)
+        for index in order:
+            features, label = featurized[index]
+            active = [feature for feature in features if feature in vocabulary]
+            scale = 1.0 / math.sqrt(len(features))
+            prediction = _sigmoid(bias + scale * sum(weights.get(feature, 0.0) for feature in active))
+            gradient = (prediction - label) * class_weight[label]
+            bias -= rate * gradient
+            for feature in active:
+                weight = weights.get(feature, 0.0)
+                weights[feature] = weight - rate * (gradient * scale + l2 * weight)
+
+    # 영향이 거의 없는 특성은 버려 모델 파일을 작게 유지
+    pruned = {feature: round(weight, 4) for feature, weight in weights.items() if abs(weight) >= 1e-3}
+    return NgramLogisticClassifier(pruned, round(bias, 4), ngram_range=ngram_range, metadata={
+        'trainedAt': datetime.utcnow().isoformat(),
+        'samples': len(samples),
+        'positives': sum(label for _, _, label in samples)
+    })
+
+def evaluate_classifier(classifier: ComplexityClassifier,
+                        samples: List[Tuple[str, str, int]]) -> Dict[str, Any]:
+    """복잡도별 비율과 상담사 개입률 (simple로 분류된 문의의 개입률이 낮을수록 좋음)"""
+    labels = classifier.predict_batch([message for message, _, _ in samples],
+                                      [category for _, category, _ in samples])
+    report = {}
+    for complexity in COMPLEXITY_LABELS:
+        outcomes = [outcome for label, (_, _, outcome) in zip(labels, samples) if label == complexity]
+        report[complexity] = {
+            'share': round(len(outcomes) / len(samples), 4) if samples else 0.0,
+            'humanRate': round(sum(outcomes) / len(outcomes), 4) if outcomes else 0.0
+        }
+    return report
+
+def outcome_label(inquiry: Dict[str, Any]) -> Optional[int]:
+    """처리 결과 → 학습 라벨 (상담사 개입 1, AI 응답으로 종료 0, 아직 진행 중이면 None)"""
+    if inquiry.get('status') == 'escalated' or inquiry.get('humanResponse'):
+        return 1
+    if inquiry.get('status') == 'resolved' and inquiry.get('aiResponse'):
+        return 0
+    return None
+
+def load_samples(inquiries: Iterable[Dict[str, Any]]) -> List[Tuple[str, str, int]]:
+    samples = []
+    for inquiry in inquiries:
+        label = outcome_label(inquiry)
+        if label is not None and inquiry.get('content'):
+            samples.append((inquiry['content'], inquiry.get('category', 'general'), label))
+    return samples
+
+def load_classifier(path: str) -> NgramLogisticClassifier:
+    """로컬 파일 또는 s3://bucket/key 에서 모델 로드"""
+    if path.startswith('s3://'):
+        from src.services.aws_clients import get_client
+        bucket, _, key = path[len('s3://'):].partition('/')
+        raw = get_client('s3').get_object(Bucket=bucket, Key=key)['Body'].read()
+    else:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    return NgramLogisticClassifier.from_bytes(raw)
+
+_classifier: Optional[ComplexityClassifier] = None
+
+def get_complexity_classifier() -> ComplexityClassifier:
+    """COMPLEXITY_MODEL_PATH의 학습 모델 (없거나 로드 실패 시 규칙 기반), 프로세스당 한 번 로드"""
+    global _classifier
+    if _classifier is None:
+        path = os.getenv("COMPLEXITY_MODEL_PATH")
+        _classifier = HeuristicComplexityClassifier()
+        if path:
+            try:
+                _classifier = load_classifier(path)
+                logger.info(f"복잡도 분류 모델 로드: {path}, 특성 수: {len(_classifier.weights)}")
+            except Exception as e:
+                logger.error(f"복잡도 분류 모델 로드 실패, 규칙 기반 사용: {str(e)}")
+    return _classifier
+
+def set_complexity_classifier(classifier: Optional[ComplexityClassifier]) -> None:
+    """분류기 교체 (테스트/로컬 서버용, None이면 다음 호출 시 다시 로드)"""
+    global _classifier
+    _classifier = classifier
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """문의 테이블의 종료된 문의로 학습 후 모델 파일 저장"""
+    import argparse
+    from src.services.dynamodb_service import DynamoDBService
+
+    parser = argparse.ArgumentParser(description="문의 복잡도 분류 모델 학습")
+    parser.add_argument('--output', default='complexity_model.json.gz')
+    parser.add_argument('--company-id')
+    parser.add_argument('--holdout', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    db_service = DynamoDBService()
+    inquiries = (
+        inquiry
+        for status in ('resolved', 'escalated')
+        for page in db_service.iter_inquiry_pages(company_id=args.company_id, status=status, page_size=200)
+        for inquiry in page
+    )
+    samples = load_samples(inquiries)
+    random.Random(0).shuffle(samples)
+    split = int(len(samples) * (1 - args.holdout))
+    train, holdout = samples[:split], samples[split:]
+
+    classifier = train_classifier(train)
+    classifier.metadata['holdout'] = evaluate_classifier(classifier, holdout)
+    classifier.metadata['heuristicHoldout'] = evaluate_classifier(HeuristicComplexityClassifier(), holdout)
+
+    with open(args.output, 'wb') as f:
+        f.write(classifier.to_bytes())
+    print(json.dumps(classifier.metadata, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
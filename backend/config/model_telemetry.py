@@ -0,0 +1,235 @@
+"""
+모델별 호출 지연/오류율/비용 집계
+AIService의 Bedrock 호출 결과를 최근 구간(rolling window)만 메모리에 유지하고,
+latency_aware 전략이 이 값으로 SLO를 넘거나 오류가 잦은 모델을 자동으로 배제한다.
+배제된 모델은 구간이 지나 샘플이 사라지면 다시 시도된다.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger()
+
+# 1K 토큰당 USD (입력, 출력). 모델 ID에 포함된 문자열로 매칭
+MODEL_PRICING = {
+    "claude-opus-4": (0.015, 0.075),
+    "claude-sonnet-4": (0.003, 0.015),
+    "claude-3-7-sonnet": (0.003, 0.015),
+    "claude-3-5-haiku": (0.0008, 0.004),
+    "claude-3-haiku": (0.00025, 0.00125)
+}
+
+def load_model_pricing() -> Dict[str, tuple]:
+    """기본 단가 + BEDROCK_MODEL_PRICING='{"<패턴>": [입력, 출력]}' 덮어쓰기 (잘못된 설정은 로그 후 무시)"""
+    pricing = dict(MODEL_PRICING)
+    try:
+        overrides = json.loads(os.getenv("BEDROCK_MODEL_PRICING", "{}"))
+        pricing.update({pattern: (float(prices[0]), float(prices[1])) for pattern, prices in overrides.items()})
+    except (TypeError, ValueError, KeyError, IndexError, AttributeError) as e:
+        logger.error("BEDROCK_MODEL_PRICING 설정 오류, 기본 단가 사용: %s", e)
+    return pricing
+
+# 호출마다 환경변수를 파싱하지 않도록 import 시 한 번만 읽는다
+_model_pricing = load_model_pricing()
+_pricing_patterns = sorted(_model_pricing, key=len, reverse=True)
+
+def get_model_pricing(model_id: str) -> Optional[tuple]:
+    """모델 ID에 포함된 가장 긴 패턴의 단가"""
+    for pattern in _pricing_patterns:
+        if pattern in model_id:
+            return _model_pricing[pattern]
+    return None
+
+# 프롬프트 캐시 토큰 단가 (입력 단가 대비 배율)
+CACHE_READ_PRICE_RATIO = 0.1
+CACHE_WRITE_PRICE_RATIO = 1.25
+
+def estimate_cost(model_id: str, input_tokens: int, output_tokens: int,
+                  cache_read_tokens: int = 0, cache_write_tokens: int = 0) -> float:
+    prices = get_model_pricing(model_id)
+    if prices is None:
+        return 0.0
+    cached_input = (cache_read_tokens * CACHE_READ_PRICE_RATIO + cache_write_tokens * CACHE_WRITE_PRICE_RATIO) * prices[0]
+    return (input_tokens * prices[0] + output_tokens * prices[1] + cached_input) / 1000
+
+def _percentile(sorted_values: list, ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(ratio * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class ModelTelemetry:
+    """모델 ID별 최근 호출 샘플 (timestamp, 지연 ms, 성공 여부, 비용)"""
+
+    def __init__(self, window_seconds: int = 300, max_samples: int = 500,
+                 clock: Callable[[], float] = time.time):
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self.clock = clock
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model_id: str, latency_ms: float, success: bool = True,
+               usage: Optional[Dict[str, Any]] = None) -> None:
+        usage = usage or {}
+        cost = estimate_cost(model_id, usage.get('inputTokens', 0), usage.get('outputTokens', 0))
+        with self._lock:
+            samples = self._samples.setdefault(model_id, deque(maxlen=self.max_samples))
+            samples.append((self.clock(), latency_ms, success, cost))
+
+    def _recent(self, model_id: str) -> list:
+        cutoff = self.clock() - self.window_seconds
+        with self._lock:
+            samples = self._samples.get(model_id, deque())
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+            return list(samples)
+
+    def latency_percentile(self, model_id: str, ratio: float, min_samples: int = 1) -> Optional[float]:
+        """성공 호출 지연의 분위수 (샘플이 min_samples 미만이면 None)"""
+        latencies = sorted(latency for _, latency, success, _ in self._recent(model_id) if success)
+        if len(latencies) < max(1, min_samples):
+            return None
+        return _percentile(latencies, ratio)
+
+    def stats(self, model_id: str) -> Dict[str, Any]:
+        """최근 구간의 호출 수, p50/p95 지연(성공 호출), 오류율, 평균 비용"""
+        recent = self._recent(model_id)
+
+        latencies = sorted(latency for _, latency, success, _ in recent if success)
+        costs = [cost for _, _, success, cost in recent if success]
+        return {
+            'count': len(recent),
+            'p50': round(_percentile(latencies, 0.5), 1),
+            'p95': round(_percentile(latencies, 0.95), 1),
+            'errorRate': round(sum(1 for sample in recent if not sample[2]) / len(recent), 4) if recent else 0.0,
+            'avgCost': round(sum(costs) / len(costs), 6) if costs else 0.0
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            model_ids = list(self._samples)
+        return {model_id: self.stats(model_id) for model_id in model_ids}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+# 프로세스 공유 집계 (warm 호출 간 유지)
+model_telemetry = ModelTelemetry(window_seconds=int(os.getenv("BEDROCK_TELEMETRY_WINDOW", "300")))
+
+# 예산별 지연 히스토그램 버킷 상한 (ms)
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+class BudgetTelemetry:
+    """생성 예산 키("카테고리:복잡도:우선순위")별 지연 히스토그램과 출력 토큰 분포
+
+    히스토그램은 누적 카운트(프로세스 수명 동안)이고, 출력 토큰은 예산 조정용으로 최근 max_samples개만 유지한다.
+    """
+
+    def __init__(self, max_samples: int = 500):
+        self.max_samples = max_samples
+        self._budgets: Dict[str, Dict[str, Any]] = {}
+        self._emitted: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, latency_ms: float, output_tokens: int = 0, truncated: bool = False) -> None:
+        with self._lock:
+            entry = self._budgets.get(key)
+            if entry is None:
+                entry = self._budgets[key] = {
+                    'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    'count': 0,
+                    'truncated': 0,
+                    'outputTokens': deque(maxlen=self.max_samples)
+                }
+            bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if latency_ms <= bound), len(LATENCY_BUCKETS_MS))
+            entry['buckets'][bucket] += 1
+            entry['count'] += 1
+            entry['truncated'] += int(truncated)
+            if output_tokens:
+                entry['outputTokens'].append(output_tokens)
+
+    @staticmethod
+    def _bucket_percentile(buckets: list, count: int, ratio: float) -> Optional[float]:
+        """히스토그램 분위수 (해당 버킷 상한, 마지막 버킷이면 None)"""
+        target = math.ceil(ratio * count)
+        seen = 0
+        for i, bucket_count in enumerate(buckets):
+            seen += bucket_count
+            if seen >= target:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else None
+        return None
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            entries = {key: (list(entry['buckets']), entry['count'], entry['truncated'], sorted(entry['outputTokens']))
+                       for key, entry in self._budgets.items()}
+        report = {}
+        for key, (buckets, count, truncated, output_tokens) in entries.items():
+            labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+            report[key] = {
+                'count': count,
+                'latencyHistogram': dict(zip(labels, buckets)),
+                'p50Ms': self._bucket_percentile(buckets, count, 0.5),
+                'p95Ms': self._bucket_percentile(buckets, count, 0.95),
+                'outputTokensP95': _percentile(output_tokens, 0.95) if output_tokens else None,
+                'truncatedRate': round(truncated / count, 4) if count else 0.0
+            }
+        return report
+
+    def suggest_budgets(self, headroom: float = 1.2, min_samples: int = 20) -> Dict[str, Dict[str, int]]:
+        """관측된 출력 토큰 p95 × headroom (64 단위 올림) → BEDROCK_GENERATION_BUDGETS 형식"""
+        suggestions = {}
+        for key, stats in self.report().items():
+            with self._lock:
+                samples = len(self._budgets[key]['outputTokens'])
+            if samples >= min_samples and stats['outputTokensP95']:
+                suggestions[key] = {'max_tokens': int(math.ceil(stats['outputTokensP95'] * headroom / 64) * 64)}
+        return suggestions
+
+    def emit_metrics(self) -> None:
+        """CloudWatch Embedded Metric Format으로 예산 키별 지표 출력 (직전 출력 이후 증가분)
+
+        출력 토큰 p95와 조정 제안(SuggestedMaxTokens)도 함께 남겨 BEDROCK_GENERATION_BUDGETS 조정에 쓴다.
+        """
+        report = self.report()
+        suggestions = self.suggest_budgets()
+        for key, stats in report.items():
+            with self._lock:
+                entry = self._budgets[key]
+                current = (entry['count'], entry['truncated'])
+                previous = self._emitted.get(key, (0, 0))
+                self._emitted[key] = current
+            if current[0] == previous[0]:
+                continue
+            metrics = {
+                '_aws': {
+                    'Timestamp': int(time.time() * 1000),
+                    'CloudWatchMetrics': [{
+                        'Namespace': 'CSChatbot/AIBudget',
+                        'Dimensions': [['BudgetKey']],
+                        'Metrics': [
+                            {'Name': 'BudgetRequests', 'Unit': 'Count'},
+                            {'Name': 'BudgetTruncated', 'Unit': 'Count'},
+                            {'Name': 'BudgetOutputTokensP95', 'Unit': 'Count'}
+                        ]
+                    }]
+                },
+                'BudgetKey': key,
+                'BudgetRequests': current[0] - previous[0],
+                'BudgetTruncated': current[1] - previous[1],
+                'BudgetOutputTokensP95': stats['outputTokensP95'] or 0,
+                'LatencyP95Ms': stats['p95Ms']
+            }
+            if key in suggestions:
+                metrics['SuggestedMaxTokens'] = suggestions[key]['max_tokens']
+            logger.info(json.dumps(metrics))
+
+# 프로세스 공유 예산별 집계
+budget_telemetry = BudgetTelemetry()
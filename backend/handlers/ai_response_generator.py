@@ -7,14 +7,13 @@ import logging
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.utils.response import success_response, error_response
-from src.services.ai_service import AIService
+from src.services.ai_service import get_ai_service
+from src.utils.logger import with_request_logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# 서비스 인스턴스
-ai_service = AIService()
-
+@with_request_logging
 def lambda_handler(event, context):
     """AI 응답 생성 Lambda 핸들러"""
     try:
@@ -25,7 +24,7 @@ def lambda_handler(event, context):
             return error_response("Title and content are required")
         
         # AI 응답 생성
-        ai_response = ai_service.generate_response(body)
+        ai_response = get_ai_service().generate_response(body)
         
         result = {
             'aiResponse': ai_response,
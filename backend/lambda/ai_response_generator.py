@@ -7,6 +7,10 @@ import logging
 sys.path.append('/opt/python')
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from src.services.aws_clients import get_table
+from src.services.ai_service import get_ai_service
+from src.utils.logger import with_request_logging
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
@@ -56,98 +60,10 @@ def options_response():
     }
 
 def generate_ai_response(inquiry_data):
-    """AI 응답 생성 (Bedrock 직접 연동)"""
-    try:
-        import boto3
-        import json
-        from config.ai_models import ai_model_config, analyze_request_complexity, get_request_priority
-        
-        bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
-        
-        # AI 모델 설정에서 최적 모델 선택
-        complexity = analyze_request_complexity(inquiry_data.get('content', ''), inquiry_data.get('category', 'general'))
-        priority = get_request_priority(inquiry_data.get('urgency', 'normal'))
-        model_id = ai_model_config.get_model_for_request(complexity, priority)
-        
-        logger.info(f"Selected model: {model_id} (complexity: {complexity}, priority: {priority})")
-        
-        max_tokens = ai_model_config.config['max_tokens']
-        temperature = ai_model_config.config['temperature']
-        
-        # 프롬프트 생성
-        prompt = f"""당신은 전문 고객 서비스 담당자입니다.
-
-고객 문의:
-제목: {inquiry_data.get('title', '')}
-내용: {inquiry_data.get('content', '')}
-카테고리: {inquiry_data.get('category', 'general')}
-
-다음 지침을 따라 응답해주세요:
-1. 친절하고 전문적인 톤으로 답변
-2. 구체적이고 실행 가능한 해결책 제시
-3. 한국어로 응답
-4. 200자 이상의 상세한 설명
-
-응답:"""
-        
-        body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        }
-        
-        try:
-            # Primary 모델로 시도
-            response = bedrock.invoke_model(
-                modelId=model_id,
-                body=json.dumps(body)
-            )
-            
-            response_body = json.loads(response['body'].read())
-            ai_response = response_body['content'][0]['text']
-            
-            logger.info(f"AI response generated using {model_id} for inquiry: {inquiry_data.get('title', 'Unknown')}")
-            return ai_response
-            
-        except Exception as primary_error:
-            logger.warning(f"Primary model {model_id} failed: {str(primary_error)}. Trying fallback model.")
-            
-            # Fallback 모델로 재시도
-            fallback_model = ai_model_config.get_fallback_model()
-            try:
-                response = bedrock.invoke_model(
-                    modelId=fallback_model,
-                    body=json.dumps(body)
-                )
-                
-                response_body = json.loads(response['body'].read())
-                ai_response = response_body['content'][0]['text']
-                
-                logger.info(f"AI response generated using fallback model {fallback_model}")
-                return ai_response
-                
-            except Exception as fallback_error:
-                logger.error(f"Fallback model {fallback_model} also failed: {str(fallback_error)}")
-                raise fallback_error
-        
-    except Exception as e:
-        logger.error(f"Error generating AI response: {str(e)}")
-        # 최종 Fallback 응답
-        return f"""안녕하세요, {inquiry_data.get('title', '문의')}에 대해 문의해주셔서 감사합니다.
-
-죄송합니다. 현재 시스템에 일시적인 문제가 발생하여 즉시 답변을 드리기 어려운 상황입니다.
-
-빠른 시일 내에 담당자가 직접 연락드리겠습니다. 
-긴급한 사항이시라면 '사람과 연결' 버튼을 클릭해주세요.
-
-감사합니다."""
+    """AI 응답 생성 (공유 AIService 사용 - 다른 진입점과 같은 프롬프트/예산/캐시/폴백)"""
+    return get_ai_service().generate_response(inquiry_data)
 
+@with_request_logging
 def lambda_handler(event, context):
     """AI 응답 생성 Lambda 핸들러"""
     try:
@@ -166,15 +82,14 @@ def lambda_handler(event, context):
         
         # AI 응답 생성
         ai_response = generate_ai_response(body)
+        get_ai_service().emit_metrics()
         
         # inquiry_id가 있으면 DB에 저장
         if inquiry_id:
             try:
-                import boto3
                 from datetime import datetime
                 
-                dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-                table = dynamodb.Table(os.environ.get('DYNAMODB_TABLE', 'cs-inquiries'))
+                table = get_table()
                 
                 # AI 응답을 DB에 저장
                 table.update_item(
@@ -189,7 +104,7 @@ def lambda_handler(event, context):
                     ExpressionAttributeNames={'#status': 'status'}
                 )
                 
-                logger.info(f"AI 응답 저장 완료: {inquiry_id}")
+                logger.info("AI 응답 저장 완료: %s", inquiry_id)
                 
             except Exception as save_error:
                 logger.error(f"AI 응답 저장 실패: {inquiry_id}, 오류: {str(save_error)}")
@@ -10,9 +10,26 @@ from decimal import Decimal
 sys.path.append('/opt/python')
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from src.services.aws_clients import get_table
+from src.services.dynamodb_service import DynamoDBService
+from src.services.ai_job_queue import get_job_queue, build_job, is_async_enabled
+from src.services.qna_retriever import match_faq
+from src.utils.logger import with_request_logging
+from src.utils.pagination import parse_page_size
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# warm 호출 간 재사용되는 서비스 인스턴스 (첫 사용 시 생성)
+_db_service = None
+
+def get_db_service():
+    """공유 Table 핸들을 사용하는 DynamoDBService"""
+    global _db_service
+    if _db_service is None:
+        _db_service = DynamoDBService(get_table())
+    return _db_service
+
 def decimal_default(obj):
     """Decimal 타입을 JSON 직렬화 가능한 형태로 변환"""
     if isinstance(obj, Decimal):
@@ -78,14 +95,22 @@ def validate_inquiry_data(data):
     
     return errors
 
+def enqueue_ai_job(inquiry_data):
+    """AI 응답 생성 작업 등록 (DI를 위한 래퍼 함수)"""
+    return get_job_queue().send(build_job(inquiry_data))
+
+def save_faq_response(inquiry_id, faq):
+    """FAQ 답변을 AI 응답으로 저장 (저장 오류 시 False를 돌려 기존 경로로 진행)"""
+    try:
+        return get_db_service().update_inquiry_ai_response(inquiry_id, faq['answer'], source='faq') is not None
+    except Exception as e:
+        logger.error("FAQ 답변 저장 오류: %s, 오류: %s", inquiry_id, e)
+        return False
+
 def create_inquiry(data):
-    """문의 생성 (DynamoDB 연동)"""
+    """문의 생성 (DynamoDB 연동) - FAQ와 거의 같으면 바로 답변, 비동기 모드면 AI 응답 생성 작업을 큐에 등록"""
     try:
-        import boto3
-        
-        dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('DYNAMODB_TABLE', 'cs-inquiries')
-        table = dynamodb.Table(table_name)
+        table = get_table()
         
         inquiry_id = str(uuid.uuid4())
         created_at = datetime.utcnow().isoformat()
@@ -106,13 +131,31 @@ def create_inquiry(data):
         
         table.put_item(Item=item)
         
-        return {
+        result = {
             'inquiryId': inquiry_id,
             'status': 'pending',
             'estimatedResponseTime': 15,
             'createdAt': created_at
         }
         
+        # 등록된 Q&A와 거의 같은 문의는 작업을 등록하지 않고 해당 답변으로 바로 응답
+        faq = match_faq(item)
+        if faq and save_faq_response(inquiry_id, faq):
+            logger.info("FAQ 답변 사용: %s, faq: %s, 유사도: %s", inquiry_id, faq.get('id'), faq['score'])
+            result.update({'status': 'ai_responded', 'aiResponse': faq['answer'], 'source': 'faq'})
+            return result
+        
+        # AI 응답은 SQS 워커가 생성해 저장 (등록 실패해도 문의는 접수됨)
+        if is_async_enabled():
+            try:
+                enqueue_ai_job(item)
+                result['message'] = '문의가 접수되었습니다. AI 응답을 생성 중입니다.'
+            except Exception as queue_error:
+                logger.error("AI 작업 등록 실패: %s, 오류: %s", inquiry_id, queue_error)
+                result['message'] = '문의가 접수되었습니다. 상담사가 직접 답변드리겠습니다.'
+        
+        return result
+        
     except Exception as e:
         logger.error(f"Error creating inquiry: {str(e)}")
         raise e
@@ -120,11 +163,7 @@ def create_inquiry(data):
 def get_inquiry(inquiry_id):
     """문의 조회"""
     try:
-        import boto3
-        
-        dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('DYNAMODB_TABLE', 'cs-inquiries')
-        table = dynamodb.Table(table_name)
+        table = get_table()
         
         response = table.get_item(
             Key={'inquiry_id': inquiry_id}
@@ -136,42 +175,22 @@ def get_inquiry(inquiry_id):
         logger.error(f"Error getting inquiry: {str(e)}")
         return None
 
-def get_inquiries_by_email(customer_email):
-    """이메일로 문의 목록 조회"""
-    try:
-        import boto3
-        from boto3.dynamodb.conditions import Attr
-        
-        dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('DYNAMODB_TABLE', 'cs-inquiries')
-        table = dynamodb.Table(table_name)
-        
-        response = table.scan(
-            FilterExpression=Attr('customerEmail').eq(customer_email)
-        )
-        
-        items = response.get('Items', [])
-        
-        # 비밀번호 필드 제거 (보안)
-        for item in items:
-            if 'customerPassword' in item:
-                del item['customerPassword']
-        
-        logger.info(f"Found {len(items)} inquiries for email: {customer_email}")
-        return items
-        
-    except Exception as e:
-        logger.error(f"Error getting inquiries by email: {str(e)}")
-        return []
+def get_inquiries_by_email(customer_email, limit=50, cursor=None):
+    """이메일로 문의 목록 한 페이지 조회 (customer-email-index Query)"""
+    page = get_db_service().query_inquiries_by_email(customer_email, limit, cursor)
+    
+    # 비밀번호 필드 제거 (보안)
+    for item in page['items']:
+        if 'customerPassword' in item:
+            del item['customerPassword']
+    
+    logger.info("Found %s inquiries by customer email", len(page['items']))
+    return page
 
 def escalate_inquiry(inquiry_id, reason=None):
     """문의 에스케이션"""
     try:
-        import boto3
-        
-        dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('DYNAMODB_TABLE', 'cs-inquiries')
-        table = dynamodb.Table(table_name)
+        table = get_table()
         
         # 문의 존재 확인
         inquiry = get_inquiry(inquiry_id)
@@ -192,13 +211,14 @@ def escalate_inquiry(inquiry_id, reason=None):
             }
         )
         
-        logger.info(f"Inquiry {inquiry_id} escalated successfully")
+        logger.info("Inquiry %s escalated successfully", inquiry_id)
         return {'inquiryId': inquiry_id, 'status': 'escalated', 'updatedAt': updated_at}
         
     except Exception as e:
         logger.error(f"Error escalating inquiry: {str(e)}")
         raise e
 
+@with_request_logging
 def lambda_handler(event, context):
     """통합 문의 처리 Lambda 핸들러"""
     try:
@@ -254,11 +274,19 @@ def lambda_handler(event, context):
                 customer_email = query_params.get('email')
                 
                 if customer_email:
-                    # 이메일로 문의 목록 조회
-                    inquiries = get_inquiries_by_email(customer_email)
+                    # 이메일로 문의 목록 조회 (cursor 기반 페이지네이션)
+                    try:
+                        page = get_inquiries_by_email(
+                            customer_email,
+                            parse_page_size(query_params.get('limit')),
+                            query_params.get('cursor')
+                        )
+                    except ValueError:
+                        return error_response("Invalid pagination parameters")
                     return success_response({
-                        'inquiries': inquiries,
-                        'count': len(inquiries)
+                        'inquiries': page['items'],
+                        'count': len(page['items']),
+                        'nextCursor': page['next_cursor']
                     })
                 else:
                     return error_response("Email parameter is required for inquiry list")
@@ -8,6 +8,7 @@ import logging
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.services.dynamodb_service import DynamoDBService
+from src.utils.logger import with_request_logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -15,6 +16,7 @@ logger.setLevel(logging.INFO)
 # 서비스 인스턴스
 db_service = DynamoDBService()
 
+@with_request_logging
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """고객 인증 Lambda 핸들러"""
     
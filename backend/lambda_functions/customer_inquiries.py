@@ -8,6 +8,9 @@ import logging
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.services.dynamodb_service import DynamoDBService
+from src.utils.pagination import parse_page_size
+from src.utils.response import DecimalEncoder
+from src.utils.logger import with_request_logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -15,6 +18,7 @@ logger.setLevel(logging.INFO)
 # 서비스 인스턴스
 db_service = DynamoDBService()
 
+@with_request_logging
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """고객 문의 조회 Lambda 핸들러"""
     
@@ -35,15 +39,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
     
     try:
-        logger.info(f"Customer inquiries request: {json.dumps(event)}")
-        
         # 간단한 이메일 기반 인증
         query_params = event.get('queryStringParameters') or {}
         customer_email = query_params.get('email')
         
-        logger.info(f"Query params: {query_params}")
-        logger.info(f"Customer email: {customer_email}")
-        
         if not customer_email:
             logger.warning("No email parameter provided")
             return {
@@ -55,10 +54,25 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 }, ensure_ascii=False)
             }
         
-        # 고객의 문의 목록 조회
-        logger.info(f"Fetching inquiries for email: {customer_email}")
-        inquiries = db_service.get_inquiries_by_email(customer_email)
-        logger.info(f"Retrieved {len(inquiries)} inquiries")
+        # 고객의 문의 목록 한 페이지 조회
+        logger.debug("Fetching inquiries for email: %s", customer_email)
+        try:
+            page = db_service.query_inquiries_by_email(
+                customer_email,
+                parse_page_size(query_params.get('limit')),
+                query_params.get('cursor')
+            )
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({
+                    'success': False,
+                    'error': {'message': '잘못된 페이지 파라미터입니다'}
+                }, ensure_ascii=False)
+            }
+        inquiries = page['items']
+        logger.debug("Retrieved %s inquiries", len(inquiries))
         
         # 비밀번호 필드 제거 (보안)
         for inquiry in inquiries:
@@ -69,16 +83,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'success': True,
             'data': {
                 'inquiries': inquiries,
-                'count': len(inquiries)
+                'count': len(inquiries),
+                'nextCursor': page['next_cursor']
             }
         }
         
-        logger.info(f"Returning response: {len(inquiries)} inquiries found")
-        
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps(response_data, ensure_ascii=False)
+            'body': json.dumps(response_data, cls=DecimalEncoder, ensure_ascii=False)
         }
         
     except Exception as e:
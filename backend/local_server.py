@@ -1,142 +1,370 @@
 #!/usr/bin/env python3
-"""로컬 테스트용 간단한 HTTP 서버"""
+"""로컬 개발/부하 테스트용 API 게이트웨이 (asyncio)
 
+infra/stacks/api_stack.py의 REST 라우트를 그대로 옮긴 ROUTES 표로 모든 Lambda 핸들러를 라우팅한다.
+- API Gateway 프록시 이벤트(resource, pathParameters, requestContext.requestId 등)를 만들어 핸들러 호출
+- 동기 핸들러는 스레드 풀에서 실행하므로 느린 요청(Bedrock 호출 등)이 다른 요청을 막지 않음
+- 핸들러 모듈은 첫 요청에서 한 번만 import (Lambda warm 컨테이너와 동일)
+- 라우트별 지연(p50/p95/p99)과 상태 코드를 집계해 GET /_local/stats로 제공, 모든 응답에 X-Response-Time-Ms 헤더
+- SQS/WebSocket 등 API 라우트가 없는 핸들러는 POST /_local/invoke/{name}에 이벤트 JSON을 보내 호출
+
+`app`은 ASGI 앱이므로 uvicorn 등으로도 띄울 수 있다 (uvicorn local_server:app).
+"""
+
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import inspect
 import json
-import sys
-import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
 import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote
 
 # 프로젝트 루트를 Python 경로에 추가
-sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Lambda 함수들 import
-from lambda_functions.customer_inquiries import lambda_handler as get_inquiries_handler
-from src.handlers.create_inquiry import lambda_handler as create_inquiry_handler
-from src.handlers.get_inquiry import lambda_handler as get_inquiry_handler
+from config.model_telemetry import _percentile
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class LocalHandler(BaseHTTPRequestHandler):
-    def _set_cors_headers(self):
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-    
-    def do_OPTIONS(self):
-        self.send_response(200)
-        self._set_cors_headers()
-        self.end_headers()
-    
-    def do_GET(self):
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
-        query_params = parse_qs(parsed_path.query)
-        
-        # 쿼리 파라미터를 단일 값으로 변환
-        query_string_params = {k: v[0] if v else None for k, v in query_params.items()}
-        
+# (메서드, 리소스 경로, 핸들러) - api_stack.py와 동일하게 유지
+ROUTES = [
+    ('GET', '/', 'handlers/health_check.lambda_handler'),
+    ('POST', '/api/inquiries', 'lambda/inquiry_handler.lambda_handler'),
+    ('GET', '/api/inquiries', 'lambda/inquiry_handler.lambda_handler'),
+    ('GET', '/api/inquiries/{id}', 'lambda/inquiry_handler.lambda_handler'),
+    ('POST', '/api/inquiries/{id}/regenerate', 'src.handlers.regenerate_ai_response.lambda_handler'),
+    ('POST', '/api/inquiries/{id}/update-ai', 'src.handlers.update_ai_response.lambda_handler'),
+    ('POST', '/api/inquiries/{id}/escalate', 'src.handlers.escalate_inquiry.lambda_handler'),
+    ('POST', '/api/ai-response', 'lambda/ai_response_generator.lambda_handler'),
+    ('POST', '/api/auth/customer/login', 'lambda_functions/customer_auth.lambda_handler'),
+    ('GET', '/api/my-inquiries', 'lambda_functions/customer_inquiries.lambda_handler'),
+    ('GET', '/customer/inquiries', 'lambda_functions/customer_inquiries.lambda_handler'),
+    ('GET', '/api/usage', 'src.handlers.usage_dashboard.lambda_handler'),
+]
+
+# API 라우트가 없는 핸들러 (SQS/WebSocket/직접 호출, 배포되지 않은 핸들러 포함)
+INVOKE_HANDLERS = {
+    'ai-response-worker': 'src.handlers.ai_response_worker.lambda_handler',
+    'bulk-regenerate': 'src.handlers.bulk_regenerate.lambda_handler',
+    'stream-ai-response': 'src.handlers.stream_ai_response.lambda_handler',
+    'create-inquiry': 'src.handlers.create_inquiry.lambda_handler',
+    'get-inquiry': 'src.handlers.get_inquiry.lambda_handler',
+    'list-inquiries': 'src.handlers.list_inquiries.lambda_handler',
+    'update-status': 'src.handlers.update_status.lambda_handler',
+    'admin': 'lambda_functions/admin.lambda_handler',
+    'auth': 'lambda_functions/auth.lambda_handler',
+    'legacy-get-inquiry': 'lambda_functions/get_inquiry.lambda_handler',
+    'legacy-update-status': 'lambda_functions/update_status.lambda_handler',
+}
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Requested-With, Accept, Origin'
+}
+
+LAMBDA_TIMEOUT_MS = 30000
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def load_handler(handler_spec: str) -> Callable:
+    """Lambda handler 문자열('lambda/inquiry_handler.lambda_handler', 'src.handlers.x.lambda_handler') → 함수
+
+    '/' 형식은 Lambda처럼 코드 루트 기준 파일 경로로 불러온다
+    (src를 sys.path에 추가하는 핸들러 때문에 'handlers' 같은 이름이 다른 패키지로 해석되지 않도록).
+    """
+    module_path, function_name = handler_spec.rsplit('.', 1)
+    module_name = module_path.replace('/', '.')
+    if '/' in module_path and module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(BASE_DIR, f'{module_path}.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
         try:
-            if path == '/api/inquiries':
-                # 고객 문의 목록 조회
-                event = {
-                    'httpMethod': 'GET',
-                    'queryStringParameters': query_string_params
-                }
-                response = get_inquiries_handler(event, None)
-                
-            elif path.startswith('/api/inquiries/'):
-                # 문의 상세 조회
-                inquiry_id = path.split('/')[-1]
-                event = {
-                    'httpMethod': 'GET',
-                    'pathParameters': {'id': inquiry_id}
-                }
-                response = get_inquiry_handler(event, None)
-                
-            else:
-                response = {
-                    'statusCode': 404,
-                    'body': json.dumps({'success': False, 'error': {'message': 'Not Found'}})
-                }
-            
-            self._send_response(response)
-            
-        except Exception as e:
-            logger.error(f"GET 요청 처리 오류: {str(e)}")
-            self._send_error_response(str(e))
-    
-    def do_POST(self):
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length)
-        
+            spec.loader.exec_module(module)
+        except Exception:
+            del sys.modules[module_name]
+            raise
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
+    return getattr(module, function_name)
+
+def _compile_path(resource: str) -> re.Pattern:
+    pattern = re.sub(r'\\\{(\w+)\\\}', r'(?P<\1>[^/]+)', re.escape(resource))
+    return re.compile(f'^{pattern}/?$')
+
+class RouteStats:
+    """라우트별 최근 지연 샘플과 상태 코드 집계 (스레드 안전)"""
+
+    def __init__(self, max_samples: int = 5000):
+        self.max_samples = max_samples
+        self._latencies: Dict[str, deque] = {}
+        self._status_counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, status_code: int, latency_ms: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(route, deque(maxlen=self.max_samples)).append(latency_ms)
+            counts = self._status_counts.setdefault(route, {})
+            counts[str(status_code)] = counts.get(str(status_code), 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            routes = {route: sorted(samples) for route, samples in self._latencies.items()}
+            status_counts = {route: dict(counts) for route, counts in self._status_counts.items()}
+        return {
+            route: {
+                'count': sum(status_counts[route].values()),
+                'status': status_counts[route],
+                'p50Ms': round(_percentile(samples, 0.50), 1),
+                'p95Ms': round(_percentile(samples, 0.95), 1),
+                'p99Ms': round(_percentile(samples, 0.99), 1),
+                'maxMs': round(samples[-1], 1) if samples else 0.0
+            }
+            for route, samples in routes.items()
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._status_counts.clear()
+
+class LocalGateway:
+    def __init__(self, routes: List[Tuple[str, str, str]] = ROUTES,
+                 invoke_handlers: Optional[Dict[str, str]] = None,
+                 max_workers: int = int(os.environ.get('LOCAL_SERVER_WORKERS', '32')),
+                 handler_loader: Callable[[str], Callable] = load_handler):
+        self.routes = [(method, resource, _compile_path(resource), spec) for method, resource, spec in routes]
+        self.invoke_handlers = INVOKE_HANDLERS if invoke_handlers is None else invoke_handlers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='lambda')
+        self.handler_loader = handler_loader
+        self.stats = RouteStats()
+        self._handlers: Dict[str, Callable] = {}
+        self._load_lock = threading.Lock()
+
+    def get_handler(self, handler_spec: str) -> Callable:
+        handler = self._handlers.get(handler_spec)
+        if handler is None:
+            with self._load_lock:
+                handler = self._handlers.get(handler_spec)
+                if handler is None:
+                    handler = self.handler_loader(handler_spec)
+                    self._handlers[handler_spec] = handler
+        return handler
+
+    def match(self, method: str, path: str) -> Tuple[Optional[Tuple[str, str]], Dict[str, str], bool]:
+        """((리소스, 핸들러), pathParameters, 경로 존재 여부)"""
+        path_exists = False
+        for route_method, resource, pattern, spec in self.routes:
+            matched = pattern.match(path)
+            if matched:
+                path_exists = True
+                if route_method == method:
+                    return (resource, spec), {k: unquote(v) for k, v in matched.groupdict().items()}, True
+        return None, {}, path_exists
+
+    def build_event(self, method: str, path: str, resource: str, path_parameters: Dict[str, str],
+                    query_string: str, headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+        """API Gateway REST 프록시 통합 이벤트"""
+        query_params = dict(parse_qsl(query_string, keep_blank_values=True)) if query_string else {}
+        return {
+            'resource': resource,
+            'path': path,
+            'httpMethod': method,
+            'headers': headers,
+            'queryStringParameters': query_params or None,
+            'pathParameters': path_parameters or None,
+            'body': body.decode('utf-8') if body else None,
+            'isBase64Encoded': False,
+            'requestContext': {
+                'requestId': str(uuid.uuid4()),
+                'resourcePath': resource,
+                'httpMethod': method,
+                'stage': 'local'
+            }
+        }
+
+    async def invoke(self, handler_spec: str, event: Dict[str, Any]) -> Any:
+        """핸들러 실행 (코루틴이면 직접, 동기 함수면 스레드 풀)"""
+        context = SimpleNamespace(
+            aws_request_id=(event.get('requestContext') or {}).get('requestId') or str(uuid.uuid4()),
+            function_name=handler_spec,
+            get_remaining_time_in_millis=lambda: LAMBDA_TIMEOUT_MS
+        )
+        loop = asyncio.get_running_loop()
+        handler = await loop.run_in_executor(self.executor, self.get_handler, handler_spec)
+        if inspect.iscoroutinefunction(handler):
+            return await handler(event, context)
+        return await loop.run_in_executor(self.executor, handler, event, context)
+
+    async def dispatch(self, method: str, path: str, query_string: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """요청 한 건 처리 → (상태 코드, 헤더, 본문)"""
+        started = time.perf_counter()
+        route_key = f'{method} {path}'
         try:
-            if self.path == '/api/inquiries':
-                # 문의 생성
-                event = {
-                    'httpMethod': 'POST',
-                    'body': post_data.decode('utf-8')
-                }
-                response = create_inquiry_handler(event, None)
-                
-            else:
-                response = {
-                    'statusCode': 404,
-                    'body': json.dumps({'success': False, 'error': {'message': 'Not Found'}})
-                }
-            
-            self._send_response(response)
-            
+            status_code, response_headers, response_body, route_key = await self._dispatch(
+                method, path, query_string, headers, body)
         except Exception as e:
-            logger.error(f"POST 요청 처리 오류: {str(e)}")
-            self._send_error_response(str(e))
-    
-    def _send_response(self, lambda_response):
-        status_code = lambda_response.get('statusCode', 200)
-        body = lambda_response.get('body', '{}')
-        
-        self.send_response(status_code)
-        self.send_header('Content-Type', 'application/json')
-        self._set_cors_headers()
-        self.end_headers()
-        
-        self.wfile.write(body.encode('utf-8'))
-    
-    def _send_error_response(self, error_message):
-        self.send_response(500)
-        self.send_header('Content-Type', 'application/json')
-        self._set_cors_headers()
-        self.end_headers()
-        
-        error_body = json.dumps({
-            'success': False,
-            'error': {'message': f'서버 오류: {error_message}'}
-        }, ensure_ascii=False)
-        
-        self.wfile.write(error_body.encode('utf-8'))
-
-def run_server(port=8000):
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, LocalHandler)
-    
-    print(f"🚀 로컬 서버 시작: http://localhost:{port}")
+            logger.exception("로컬 게이트웨이 처리 오류: %s %s", method, path)
+            status_code, response_headers = 502, {'Content-Type': 'application/json'}
+            response_body = json.dumps({'success': False, 'error': {'message': f'Lambda 실행 오류: {str(e)}'}},
+                                       ensure_ascii=False)
+        latency_ms = (time.perf_counter() - started) * 1000
+        if not route_key.startswith('GET /_local/stats'):
+            self.stats.record(route_key, status_code, latency_ms)
+
+        response_headers = {**CORS_HEADERS, **(response_headers or {})}
+        response_headers['X-Response-Time-Ms'] = f'{latency_ms:.1f}'
+        if isinstance(response_body, str):
+            response_body = response_body.encode('utf-8')
+        return status_code, response_headers, response_body or b''
+
+    async def _dispatch(self, method: str, path: str, query_string: str, headers: Dict[str, str],
+                        body: bytes) -> Tuple[int, Dict[str, str], Any, str]:
+        if path == '/_local/stats':
+            if method == 'DELETE':
+                self.stats.reset()
+            return 200, {'Content-Type': 'application/json'}, json.dumps(self.stats.snapshot()), 'GET /_local/stats'
+
+        if path.startswith('/_local/invoke/') and method == 'POST':
+            name = path[len('/_local/invoke/'):]
+            handler_spec = self.invoke_handlers.get(name)
+            if handler_spec is None:
+                return 404, {}, json.dumps({'success': False, 'error': {'message': f'Unknown handler: {name}'}}), \
+                    f'POST /_local/invoke/{name}'
+            result = await self.invoke(handler_spec, json.loads(body or b'{}'))
+            return 200, {'Content-Type': 'application/json'}, json.dumps(result, ensure_ascii=False, default=str), \
+                f'POST /_local/invoke/{name}'
+
+        route, path_parameters, path_exists = self.match(method, path)
+        if method == 'OPTIONS' and path_exists:
+            # API Gateway CORS preflight (default_cors_preflight_options)
+            return 204, {}, b'', f'OPTIONS {path}'
+        if route is None:
+            status_code, message = (405, 'Method Not Allowed') if path_exists else (404, 'Not Found')
+            return status_code, {'Content-Type': 'application/json'}, \
+                json.dumps({'success': False, 'error': {'message': message}}), f'{method} {path if path_exists else "*"}'
+
+        resource, handler_spec = route
+        event = self.build_event(method, path, resource, path_parameters, query_string, headers, body)
+        result = await self.invoke(handler_spec, event) or {}
+        return int(result.get('statusCode', 200)), result.get('headers') or {}, result.get('body') or '', \
+            f'{method} {resource}'
+
+    # ASGI -----------------------------------------------------------------
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    self.executor.shutdown(wait=False)
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        headers = {key.decode('latin-1').title(): value.decode('latin-1') for key, value in scope['headers']}
+        status_code, response_headers, response_body = await self.dispatch(
+            scope['method'], scope['path'], scope.get('query_string', b'').decode('latin-1'), headers, body)
+        await send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': [(key.encode('latin-1'), value.encode('latin-1')) for key, value in response_headers.items()]
+        })
+        await send({'type': 'http.response.body', 'body': response_body})
+
+    # 내장 HTTP/1.1 서버 (keep-alive) ----------------------------------------
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().title()] = value.strip()
+                body = await reader.readexactly(int(headers.get('Content-Length', '0')))
+                path, _, query_string = target.partition('?')
+
+                status_code, response_headers, response_body = await self.dispatch(
+                    method.upper(), path, query_string, headers, body)
+                keep_alive = headers.get('Connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                response_headers['Content-Length'] = str(len(response_body))
+                response_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+                head = f'HTTP/1.1 {status_code} {_reason(status_code)}\r\n' + ''.join(
+                    f'{key}: {value}\r\n' for key, value in response_headers.items()) + '\r\n'
+                writer.write(head.encode('latin-1') + response_body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8000) -> None:
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+def _reason(status_code: int) -> str:
+    try:
+        return HTTPStatus(status_code).phrase
+    except ValueError:
+        return ''
+
+app = LocalGateway()
+
+def run_server(host: str = '127.0.0.1', port: int = 8000) -> None:
+    print(f"🚀 로컬 서버 시작: http://{host}:{port}")
     print("📋 사용 가능한 엔드포인트:")
-    print("  GET  /api/inquiries?email=test@example.com")
-    print("  POST /api/inquiries")
-    print("  GET  /api/inquiries/{id}")
+    for method, resource, _ in ROUTES:
+        print(f"  {method:<5}{resource}")
+    print("  GET  /_local/stats  (라우트별 지연/상태 코드, DELETE로 초기화)")
+    print(f"  POST /_local/invoke/{{{'|'.join(INVOKE_HANDLERS)}}}")
     print("\n💡 Ctrl+C로 서버 종료")
-    
+
     try:
-        httpd.serve_forever()
+        asyncio.run(app.serve(host, port))
     except KeyboardInterrupt:
         print("\n🛑 서버 종료")
-        httpd.server_close()
 
 if __name__ == '__main__':
-    # 환경변수 설정
+    parser = argparse.ArgumentParser(description='로컬 API 게이트웨이')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--memory', action='store_true', help='DynamoDB 대신 로컬 메모리 테이블 사용')
+    args = parser.parse_args()
+
+    # 환경변수 설정 (핸들러 모듈은 첫 요청에서 import되므로 여기서 설정해도 적용됨)
     os.environ.setdefault('DYNAMODB_TABLE', 'cs-inquiries-local')
     os.environ.setdefault('JWT_SECRET', 'local-test-secret')
-    
-    run_server()
+    if args.memory:
+        os.environ['STORAGE_BACKEND'] = 'memory'
+    logging.basicConfig(level=logging.INFO)
+
+    run_server(args.host, args.port)
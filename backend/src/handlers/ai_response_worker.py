@@ -0,0 +1,100 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
+import logging
+
+from src.services.dynamodb_service import DynamoDBService
+from src.services.ai_job_queue import get_job_queue
+from src.services.ai_service import get_ai_service
+from src.utils.logger import with_request_logging
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 서비스 인스턴스
+db_service = DynamoDBService()
+
+# SQS 배치 내 동시 처리 수 / 최대 수신 횟수 (infra의 DLQ max_receive_count와 동일)
+WORKER_CONCURRENCY = int(os.environ.get('AI_WORKER_CONCURRENCY', '4'))
+MAX_RECEIVE_COUNT = int(os.environ.get('AI_JOB_MAX_RECEIVE_COUNT', '3'))
+
+def generate_ai_response(job: Dict[str, Any], fallback_on_error: bool) -> str:
+    """AI 응답 생성 (DI를 위한 래퍼 함수)"""
+    return get_ai_service().generate_response(job, fallback_on_error=fallback_on_error)
+
+def process_job(job: Dict[str, Any], receive_count: int = 1) -> bool:
+    """작업 하나 처리. 재시도가 필요하면 False
+    
+    응답은 아직 pending인 문의에만 저장하고, 이미 처리된 문의면 저장 없이 완료로 본다.
+    마지막 시도에서는 Bedrock 오류 시에도 폴백 응답을 저장해 고객이 빈 답변을 받지 않게 한다.
+    """
+    inquiry_id = job.get('inquiry_id')
+    if not inquiry_id:
+        logger.error(f"inquiry_id 없는 작업은 폐기: {job}")
+        return True
+    
+    try:
+        ai_response = generate_ai_response(job, fallback_on_error=receive_count >= MAX_RECEIVE_COUNT)
+    except Exception as e:
+        logger.warning("AI 응답 생성 실패 (시도 %s/%s): %s, 오류: %s", receive_count, MAX_RECEIVE_COUNT, inquiry_id, e)
+        return False
+    
+    if not ai_response or ai_response.strip() == "":
+        logger.error(f"AI 응답이 비어있음: {inquiry_id}")
+        return False
+    
+    try:
+        saved = db_service.update_inquiry_ai_response(inquiry_id, ai_response, only_if_pending=True)
+    except Exception as e:
+        logger.error("AI 응답 저장 오류 (재시도): %s, 오류: %s", inquiry_id, e)
+        return False
+    if not saved:
+        # 재전송/지연된 작업: 이미 답변·에스컬레이션·종료된(또는 삭제된) 문의는 덮지 않고 완료 처리
+        logger.info("대기 상태가 아닌 문의라 AI 응답 저장 생략: %s", inquiry_id)
+    
+    return True
+
+def _process_record(record: Dict[str, Any]) -> bool:
+    try:
+        job = json.loads(record['body'])
+    except (KeyError, ValueError):
+        logger.error(f"잘못된 작업 메시지 폐기: {record.get('messageId')}")
+        return True
+    receive_count = int(record.get('attributes', {}).get('ApproximateReceiveCount', '1'))
+    return process_job(job, receive_count)
+
+@with_request_logging
+def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
+    """SQS 배치 처리 핸들러 (실패한 메시지만 재시도되도록 batchItemFailures 반환)"""
+    records = event.get('Records', [])
+    if not records:
+        return {'batchItemFailures': []}
+    
+    with ThreadPoolExecutor(max_workers=min(WORKER_CONCURRENCY, len(records))) as executor:
+        results = list(executor.map(_process_record, records))
+    
+    failures = [
+        {'itemIdentifier': record['messageId']}
+        for record, succeeded in zip(records, results) if not succeeded
+    ]
+    logger.info("AI 작업 배치 처리 완료: %s/%s 성공", len(records) - len(failures), len(records))
+    get_ai_service().emit_metrics()
+    return {'batchItemFailures': failures}
+
+def drain_queue(queue=None, batch_size: int = 10) -> int:
+    """인메모리 큐를 비울 때까지 처리 (로컬 서버/테스트용). 처리한 메시지 수 반환"""
+    queue = queue or get_job_queue()
+    processed = 0
+    while True:
+        records = queue.receive(batch_size)
+        if not records:
+            return processed
+        result = lambda_handler({'Records': records}, None)
+        failed_ids = {failure['itemIdentifier'] for failure in result['batchItemFailures']}
+        for record in records:
+            if record['messageId'] in failed_ids:
+                queue.nack(record['messageId'])
+            else:
+                queue.ack(record['messageId'])
+        processed += len(records)
@@ -0,0 +1,245 @@
+"""
+대량 AI 응답 재생성
+프롬프트/모델 변경 후 status-index로 대상 문의를 페이지 단위로 조회해
+제한된 스레드 풀 + 초당 호출 수 제한으로 Bedrock 응답을 다시 생성한다.
+페이지마다 진행 상황(체크포인트)을 저장하므로 중단된 작업을 이어서 실행할 수 있다.
+체크포인트에는 서명된 페이지 토큰이 아닌 LastEvaluatedKey를 그대로 저장하므로
+CURSOR_SECRET이 없는 로컬 CLI도 다른 프로세스에서 이어서 실행할 수 있다.
+
+    python -m src.handlers.bulk_regenerate --status pending --status ai_responded \\
+        --checkpoint-file /tmp/bulk-regenerate.json
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable, Iterable
+import logging
+
+from src.services.dynamodb_service import DynamoDBService
+from src.services.ai_service import get_ai_service
+from src.utils.rate_limit import TokenBucket
+from src.utils.logger import with_request_logging
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 서비스 인스턴스
+db_service = DynamoDBService()
+
+DEFAULT_STATUSES = ('pending', 'ai_responded')
+BULK_CONCURRENCY = int(os.environ.get('AI_BULK_CONCURRENCY', '8'))
+BULK_RATE_PER_SECOND = float(os.environ.get('AI_BULK_RATE_PER_SECOND', '2'))
+BULK_PAGE_SIZE = int(os.environ.get('AI_BULK_PAGE_SIZE', '50'))
+# Lambda 실행 시간이 이만큼 남으면 체크포인트를 반환하고 중단
+STOP_REMAINING_MS = 60000
+
+def generate_ai_response(inquiry: Dict[str, Any]) -> str:
+    """AI 응답 재생성 (DI를 위한 래퍼 함수) - 폴백 응답으로 덮어쓰지 않도록 오류는 그대로 올린다"""
+    return get_ai_service().generate_response(inquiry, fallback_on_error=False, use_cache=False)
+
+def save_ai_response(inquiry_id: str, ai_response: str) -> bool:
+    """AI 응답 저장 (DI를 위한 래퍼 함수)"""
+    return db_service.update_inquiry_ai_response(inquiry_id, ai_response) is not None
+
+class FileCheckpointStore:
+    """JSON 파일 체크포인트 저장소 (원자적 교체)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, checkpoint: Dict[str, Any]) -> None:
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+def new_checkpoint(statuses: Iterable[str], company_id: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        'statuses': list(statuses),
+        'companyId': company_id,
+        'statusIndex': 0,
+        'lastKey': None,
+        'startedAt': datetime.utcnow().isoformat(),
+        'processed': 0,
+        'succeeded': 0,
+        'skipped': 0,
+        'failed': [],
+        'elapsedSeconds': 0.0
+    }
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def _already_regenerated(inquiry: Dict[str, Any], started_at: str) -> bool:
+    """이번 작업에서 이미 재생성된 문의 (pending → ai_responded로 옮겨간 항목 등)"""
+    return inquiry.get('status') == 'ai_responded' and inquiry.get('ai_responded_at', '') >= started_at
+
+def _regenerate_one(inquiry: Dict[str, Any], limiter: TokenBucket) -> Dict[str, Any]:
+    inquiry_id = inquiry.get('inquiry_id')
+    waited = limiter.acquire()
+    started = time.monotonic()
+    try:
+        ai_response = generate_ai_response(inquiry)
+        if not ai_response or not ai_response.strip():
+            raise ValueError('빈 AI 응답')
+        succeeded = save_ai_response(inquiry_id, ai_response)
+        error = None if succeeded else '저장 실패'
+    except Exception as e:
+        succeeded, error = False, str(e)
+        logger.warning("AI 응답 재생성 실패: %s, 오류: %s", inquiry_id, error)
+    return {
+        'inquiry_id': inquiry_id,
+        'succeeded': succeeded,
+        'error': error,
+        'latency': time.monotonic() - started,
+        'waited': waited
+    }
+
+def run_bulk_regeneration(statuses: Iterable[str] = DEFAULT_STATUSES, company_id: Optional[str] = None,
+                          checkpoint: Optional[Dict[str, Any]] = None,
+                          checkpoint_store: Optional[FileCheckpointStore] = None,
+                          concurrency: int = BULK_CONCURRENCY,
+                          rate_per_second: float = BULK_RATE_PER_SECOND,
+                          page_size: int = BULK_PAGE_SIZE,
+                          max_items: Optional[int] = None,
+                          should_stop: Callable[[], bool] = lambda: False) -> Dict[str, Any]:
+    """대상 문의를 재생성하고 처리량 리포트 반환
+
+    checkpoint(또는 checkpoint_store에 저장된 체크포인트)가 있으면 마지막으로 끝낸 페이지 다음부터 이어서 처리한다.
+    """
+    if checkpoint is None and checkpoint_store is not None:
+        checkpoint = checkpoint_store.load()
+    if checkpoint is None:
+        checkpoint = new_checkpoint(statuses, company_id)
+
+    limiter = TokenBucket(rate_per_second)
+    latencies: List[float] = []
+    rate_limit_wait = 0.0
+    run_started = time.monotonic()
+    elapsed_before = checkpoint['elapsedSeconds']
+    processed_this_run = 0
+    stopped = False
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while checkpoint['statusIndex'] < len(checkpoint['statuses']) and not stopped:
+            status = checkpoint['statuses'][checkpoint['statusIndex']]
+            page = db_service.query_inquiry_page(
+                {'companyId': checkpoint['companyId'], 'status': status},
+                limit=page_size,
+                exclusive_start_key=checkpoint.get('lastKey')
+            )
+
+            targets = [item for item in page['items'] if not _already_regenerated(item, checkpoint['startedAt'])]
+            checkpoint['skipped'] += len(page['items']) - len(targets)
+
+            for result in executor.map(lambda inquiry: _regenerate_one(inquiry, limiter), targets):
+                latencies.append(result['latency'])
+                rate_limit_wait += result['waited']
+                if result['succeeded']:
+                    checkpoint['succeeded'] += 1
+                else:
+                    checkpoint['failed'].append({'inquiry_id': result['inquiry_id'], 'error': result['error']})
+            checkpoint['processed'] += len(targets)
+            processed_this_run += len(targets)
+
+            # 페이지를 모두 처리한 뒤에만 커서를 전진시켜 재시작 시 누락이 없도록 한다.
+            # pending 문의는 처리 후 인덱스에서 빠지지만 DynamoDB는 ExclusiveStartKey 항목이 없어도 위치 기준으로 이어서 조회한다.
+            if page['last_key']:
+                checkpoint['lastKey'] = page['last_key']
+            else:
+                checkpoint['statusIndex'] += 1
+                checkpoint['lastKey'] = None
+            checkpoint['elapsedSeconds'] = elapsed_before + (time.monotonic() - run_started)
+            if checkpoint_store is not None:
+                checkpoint_store.save(checkpoint)
+
+            logger.info("대량 재생성 진행: %s 처리 %s건, 실패 %s건", status, checkpoint['processed'], len(checkpoint['failed']))
+            stopped = should_stop() or (max_items is not None and processed_this_run >= max_items)
+
+    elapsed = time.monotonic() - run_started
+    completed = checkpoint['statusIndex'] >= len(checkpoint['statuses'])
+    if completed and checkpoint_store is not None:
+        # 완료된 작업은 다음 실행이 처음부터 시작하도록 체크포인트 삭제
+        checkpoint_store.clear()
+    report = {
+        'completed': completed,
+        'processed': checkpoint['processed'],
+        'succeeded': checkpoint['succeeded'],
+        'failed': len(checkpoint['failed']),
+        'skipped': checkpoint['skipped'],
+        'elapsedSeconds': round(checkpoint['elapsedSeconds'], 3),
+        'run': {
+            'processed': processed_this_run,
+            'elapsedSeconds': round(elapsed, 3),
+            'itemsPerSecond': round(processed_this_run / elapsed, 3) if elapsed > 0 else 0.0,
+            'latencyP50': round(_percentile(latencies, 50), 3),
+            'latencyP95': round(_percentile(latencies, 95), 3),
+            'rateLimitWaitSeconds': round(rate_limit_wait, 3)
+        },
+        'checkpoint': None if completed else checkpoint
+    }
+    logger.info("대량 재생성 리포트: %s", json.dumps(report['run'], ensure_ascii=False))
+    return report
+
+@with_request_logging
+def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
+    """대량 재생성 Lambda (수동 실행)
+
+    event: {"statuses": [...], "companyId": ..., "maxItems": ..., "checkpoint": {...}}
+    시간이 부족하면 completed=False와 checkpoint를 반환하므로, 그 checkpoint로 다시 호출하면 이어서 처리한다.
+    """
+    def should_stop() -> bool:
+        return context is not None and context.get_remaining_time_in_millis() < STOP_REMAINING_MS
+
+    return run_bulk_regeneration(
+        statuses=event.get('statuses') or DEFAULT_STATUSES,
+        company_id=event.get('companyId'),
+        checkpoint=event.get('checkpoint'),
+        max_items=event.get('maxItems'),
+        should_stop=should_stop
+    )
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='AI 응답 대량 재생성')
+    parser.add_argument('--status', action='append', dest='statuses', help='대상 상태 (반복 지정 가능)')
+    parser.add_argument('--company-id')
+    parser.add_argument('--checkpoint-file', default='bulk-regenerate-checkpoint.json')
+    parser.add_argument('--concurrency', type=int, default=BULK_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=BULK_RATE_PER_SECOND, help='초당 Bedrock 호출 수')
+    parser.add_argument('--max-items', type=int)
+    args = parser.parse_args(argv)
+
+    report = run_bulk_regeneration(
+        statuses=args.statuses or DEFAULT_STATUSES,
+        company_id=args.company_id,
+        checkpoint_store=FileCheckpointStore(args.checkpoint_file),
+        concurrency=args.concurrency,
+        rate_per_second=args.rate,
+        max_items=args.max_items
+    )
+    report.pop('checkpoint', None)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
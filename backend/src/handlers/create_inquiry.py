@@ -1,7 +1,7 @@
 import json
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 import sys
 import os
@@ -12,6 +12,9 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from src.utils.response import success_response, error_response
 from src.utils.validation import validate_inquiry_data
 from src.services.dynamodb_service import DynamoDBService
+from src.services.ai_job_queue import get_job_queue, build_job, is_async_enabled
+from src.services.qna_retriever import match_faq as find_faq_match
+from src.utils.logger import with_request_logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -19,41 +22,32 @@ logger.setLevel(logging.INFO)
 # 서비스 인스턴스
 db_service = DynamoDBService()
 
-def generate_ai_response(inquiry_data):
-    """간단한 AI 응답 생성 (Bedrock 연결 문제 회피)"""
-    try:
-        from src.services.ai_service import AIService
-        ai_service = AIService()
-        return ai_service.generate_response(inquiry_data)
-    except Exception as e:
-        logger.error(f"AI 서비스 오류: {str(e)}")
-        # Fallback 응답
-        return f"""안녕하세요! 문의해주셔서 감사합니다.
-
-제목: {inquiry_data.get('title', '문의')}
-내용: {inquiry_data.get('content', '')}
-
-귀하의 문의를 검토한 결과, 다음과 같이 답변드립니다:
-
-1. 문의 내용을 정확히 파악했습니다.
-2. 관련 정책 및 절차를 확인했습니다.
-3. 최적의 해결 방안을 제시해드립니다.
-
-추가 문의사항이 있으시면 언제든지 연락주세요.
-감사합니다.
-
-※ 이 답변은 AI가 자동으로 생성한 것입니다."""
-
 def create_inquiry(inquiry_data: Dict[str, Any]) -> bool:
     """문의 생성 (DI를 위한 래퍼 함수)"""
     return db_service.create_inquiry(inquiry_data)
 
 def generate_ai_response(inquiry_data: Dict[str, Any]) -> str:
-    """AI 응답 생성"""
-    from src.services.ai_service import AIService
-    ai_service = AIService()
-    return ai_service.generate_response(inquiry_data)
+    """AI 응답 생성 (DI를 위한 래퍼 함수, 비동기 모드에서는 AIService를 만들지 않도록 지연 import)"""
+    from src.services.ai_service import get_ai_service
+    return get_ai_service().generate_response(inquiry_data)
+
+def match_faq(inquiry_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """질문이 거의 같은 등록 Q&A 조회 (DI를 위한 래퍼 함수, QNA_TABLE 미설정 시 None)"""
+    return find_faq_match(inquiry_data)
+
+def save_faq_response(inquiry_id: str, faq: Dict[str, Any]) -> bool:
+    """FAQ 답변을 AI 응답으로 저장 (저장 오류 시 False를 돌려 모델 응답 생성으로 진행)"""
+    try:
+        return db_service.update_inquiry_ai_response(inquiry_id, faq['answer'], source='faq') is not None
+    except Exception as e:
+        logger.error("FAQ 답변 저장 오류: %s, 오류: %s", inquiry_id, e)
+        return False
 
+def enqueue_ai_job(inquiry_data: Dict[str, Any]) -> str:
+    """AI 응답 생성 작업 등록 (DI를 위한 래퍼 함수)"""
+    return get_job_queue().send(build_job(inquiry_data))
+
+@with_request_logging
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     try:
         body = json.loads(event.get('body', '{}'))
@@ -85,20 +79,47 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         if not create_inquiry(inquiry_data):
             return error_response("문의 생성에 실패했습니다", 500)
         
+        # 등록된 Q&A와 거의 같은 문의는 모델 호출 없이 해당 답변으로 바로 응답
+        faq = match_faq(inquiry_data)
+        if faq and save_faq_response(inquiry_id, faq):
+            logger.info("FAQ 답변 사용: %s, faq: %s, 유사도: %s", inquiry_id, faq.get('id'), faq['score'])
+            return success_response({
+                'inquiryId': inquiry_id,
+                'aiResponse': faq['answer'],
+                'estimatedResponseTime': inquiry_data['estimatedResponseTime'],
+                'status': 'ai_responded',
+                'source': 'faq'
+            })
+        
+        # 비동기 모드: 큐에 작업만 등록하고 즉시 반환 (AI 응답은 워커가 저장)
+        if is_async_enabled():
+            try:
+                enqueue_ai_job(inquiry_data)
+                message = '문의가 접수되었습니다. AI 응답을 생성 중입니다.'
+            except Exception as queue_error:
+                logger.error(f"AI 작업 등록 실패: {inquiry_id}, 오류: {str(queue_error)}")
+                message = '문의가 접수되었습니다. 상담사가 직접 답변드리겠습니다.'
+            return success_response({
+                'inquiryId': inquiry_id,
+                'status': 'pending',
+                'estimatedResponseTime': inquiry_data['estimatedResponseTime'],
+                'message': message
+            })
+        
         try:
             # AI 응답 생성
-            logger.info(f"AI 응답 생성 시작: {inquiry_id}")
+            logger.info("AI 응답 생성 시작: %s", inquiry_id)
             ai_response = generate_ai_response(inquiry_data)
             
             if not ai_response or ai_response.strip() == "":
                 logger.error(f"AI 응답이 비어있음: {inquiry_id}")
                 ai_response = "죄송합니다. 현재 AI 서비스에 일시적인 문제가 발생했습니다. 곧 상담사가 직접 답변드리겠습니다."
             
-            logger.info(f"AI 응답 생성 완료: {inquiry_id}, 길이: {len(ai_response)}")
+            logger.info("AI 응답 생성 완료: %s, 길이: %s", inquiry_id, len(ai_response))
             
             # AI 응답을 DB에 저장
-            update_success = db_service.update_inquiry_ai_response(inquiry_id, ai_response)
-            if not update_success:
+            updated_inquiry = db_service.update_inquiry_ai_response(inquiry_id, ai_response)
+            if not updated_inquiry:
                 logger.error(f"AI 응답 저장 실패: {inquiry_id}")
                 # 저장 실패해도 문의는 생성되었으므로 pending 상태로 반환
                 return success_response({
@@ -108,7 +129,7 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
                     'message': '문의가 접수되었습니다. AI 응답 저장 중 오류가 발생하여 상담사가 직접 답변드리겠습니다.'
                 })
             
-            logger.info(f"AI 응답 DB 저장 완료, 상태를 ai_responded로 변경: {inquiry_id}")
+            logger.info("AI 응답 DB 저장 완료, 상태를 ai_responded로 변경: %s", inquiry_id)
             
             result = {
                 'inquiryId': inquiry_id,
@@ -117,7 +138,7 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
                 'status': 'ai_responded'
             }
             
-            logger.info(f"문의 생성 및 AI 응답 완료: {inquiry_id}, status: ai_responded")
+            logger.info("문의 생성 및 AI 응답 완료: %s, status: ai_responded", inquiry_id)
             
             return success_response(result)
             
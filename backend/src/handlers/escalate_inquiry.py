@@ -5,6 +5,7 @@ import logging
 from src.utils.response import success_response, error_response
 from src.services.dynamodb_service import DynamoDBService
 from src.services.email_service import EmailService
+from src.utils.logger import with_request_logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -25,6 +26,7 @@ def send_escalation_email(inquiry: Dict[str, Any], reason: str) -> bool:
     """에스컬레이션 이메일 발송 (DI를 위한 래퍼 함수)"""
     return email_service.send_escalation_email(inquiry, reason)
 
+@with_request_logging
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     try:
         path_params = event.get('pathParameters', {}) or {}
@@ -3,7 +3,9 @@ from typing import Dict, Any
 import logging
 
 from src.utils.response import success_response, error_response
+from src.utils.pagination import parse_page_size
 from src.services.dynamodb_service import DynamoDBService
+from src.utils.logger import with_request_logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -11,43 +13,56 @@ logger.setLevel(logging.INFO)
 # 서비스 인스턴스
 db_service = DynamoDBService()
 
-def list_inquiries(company_id: str, status: str = None, limit: int = 50):
-    """문의 목록 조회 (DI를 위한 래퍼 함수)"""
-    return db_service.list_inquiries(company_id, status, limit)
+def list_inquiries(company_id: str, status: str = None, limit: int = 50,
+                   created_from: str = None, created_to: str = None, cursor: str = None):
+    """문의 목록 한 페이지 조회 (DI를 위한 래퍼 함수)"""
+    return db_service.query_inquiries(
+        company_id=company_id,
+        status=status,
+        created_from=created_from,
+        created_to=created_to,
+        limit=limit,
+        cursor=cursor
+    )
 
-def get_inquiries_by_email(customer_email: str, limit: int = 50):
-    """이메일별 문의 목록 조회 (DI를 위한 래퍼 함수)"""
-    return db_service.get_inquiries_by_email(customer_email, limit)
+def get_inquiries_by_email(customer_email: str, limit: int = 50, cursor: str = None):
+    """이메일별 문의 목록 한 페이지 조회 (DI를 위한 래퍼 함수)"""
+    return db_service.query_inquiries_by_email(customer_email, limit, cursor)
 
+def page_response(page: Dict[str, Any]) -> Dict[str, Any]:
+    """페이지 조회 결과를 목록 응답으로 변환"""
+    return success_response({
+        'inquiries': page['items'],
+        'count': len(page['items']),
+        'nextCursor': page['next_cursor']
+    })
+
+@with_request_logging
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     try:
         query_params = event.get('queryStringParameters', {}) or {}
+        limit = parse_page_size(query_params.get('limit'))
+        cursor = query_params.get('cursor')
         
         # 이메일로 조회하는 경우
         email = query_params.get('email')
         if email:
-            logger.info(f"Querying inquiries by email: {email}")
-            inquiries = get_inquiries_by_email(email)
-            return success_response({
-                'inquiries': inquiries,
-                'count': len(inquiries)
-            })
+            logger.info("Querying inquiries by customer email")
+            return page_response(get_inquiries_by_email(email, limit, cursor))
         
         # 회사 ID로 조회하는 경우 (기존 로직)
         company_id = query_params.get('companyId')
         status = query_params.get('status')
-        limit = int(query_params.get('limit', 50))
+        created_from = query_params.get('createdFrom')
+        created_to = query_params.get('createdTo')
         
         if not company_id:
             return error_response("companyId or email is required", 400)
         
-        inquiries = list_inquiries(company_id, status, limit)
-        
-        return success_response({
-            'inquiries': inquiries,
-            'count': len(inquiries)
-        })
+        return page_response(list_inquiries(company_id, status, limit, created_from, created_to, cursor))
         
+    except ValueError as e:
+        return error_response(f"Invalid query parameter: {str(e)}", 400)
     except Exception as e:
         logger.error(f"Error listing inquiries: {str(e)}")
-        return error_response(str(e), 500)
\ No newline at end of file
+        return error_response(str(e), 500)
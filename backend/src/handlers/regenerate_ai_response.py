@@ -7,7 +7,9 @@ from datetime import datetime
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from services.dynamodb_service import DynamoDBService
+from src.services.dynamodb_service import DynamoDBService
+from src.services.ai_service import get_ai_service
+from src.utils.logger import with_request_logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -15,30 +17,10 @@ logger.setLevel(logging.INFO)
 db_service = DynamoDBService()
 
 def generate_ai_response(inquiry_data):
-    """간단한 AI 응답 생성 (Bedrock 연결 문제 회피)"""
-    try:
-        from services.ai_service import AIService
-        ai_service = AIService()
-        return ai_service.generate_response(inquiry_data)
-    except Exception as e:
-        logger.error(f"AI 서비스 오류: {str(e)}")
-        # Fallback 응답
-        return f"""안녕하세요! 문의해주셔서 감사합니다.
-
-제목: {inquiry_data.get('title', '문의')}
-내용: {inquiry_data.get('content', '')}
-
-귀하의 문의를 검토한 결과, 다음과 같이 답변드립니다:
-
-1. 문의 내용을 정확히 파악했습니다.
-2. 관련 정책 및 절차를 확인했습니다.
-3. 최적의 해결 방안을 제시해드립니다.
-
-추가 문의사항이 있으시면 언제든지 연락주세요.
-감사합니다.
-
-※ 이 답변은 AI가 자동으로 생성한 것입니다."""
+    """AI 응답 재생성 (DI를 위한 래퍼 함수) - 캐시된 응답을 돌려주지 않고 새로 생성한다"""
+    return get_ai_service().generate_response(inquiry_data, use_cache=False)
 
+@with_request_logging
 def lambda_handler(event, context):
     """AI 답변 재생성 핸들러"""
     
@@ -70,7 +52,7 @@ def lambda_handler(event, context):
                 })
             }
         
-        logger.info(f"AI 답변 재생성 요청: {inquiry_id}")
+        logger.info("AI 답변 재생성 요청: %s", inquiry_id)
         
         # 기존 문의 조회
         inquiry = db_service.get_inquiry(inquiry_id)
@@ -86,18 +68,18 @@ def lambda_handler(event, context):
         
         # AI 답변 재생성
         try:
-            logger.info(f"AI 답변 재생성 시작: {inquiry_id}")
+            logger.info("AI 답변 재생성 시작: %s", inquiry_id)
             ai_response = generate_ai_response(inquiry)
             
             if not ai_response or ai_response.strip() == "":
                 ai_response = "죄송합니다. AI 서비스에 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
             
-            logger.info(f"AI 답변 재생성 완료: {inquiry_id}, 길이: {len(ai_response)}")
+            logger.info("AI 답변 재생성 완료: %s, 길이: %s", inquiry_id, len(ai_response))
             
-            # DB에 새로운 AI 답변 저장
-            update_success = db_service.update_inquiry_ai_response(inquiry_id, ai_response)
+            # DB에 새로운 AI 답변 저장 (갱신된 문의를 바로 반환받음)
+            updated_inquiry = db_service.update_inquiry_ai_response(inquiry_id, ai_response)
             
-            if not update_success:
+            if not updated_inquiry:
                 return {
                     'statusCode': 500,
                     'headers': cors_headers,
@@ -114,9 +96,9 @@ def lambda_handler(event, context):
                     'success': True,
                     'data': {
                         'inquiryId': inquiry_id,
-                        'aiResponse': ai_response,
-                        'status': 'ai_responded',
-                        'regeneratedAt': datetime.utcnow().isoformat()
+                        'aiResponse': updated_inquiry.get('aiResponse', ai_response),
+                        'status': updated_inquiry.get('status', 'ai_responded'),
+                        'regeneratedAt': updated_inquiry.get('ai_responded_at', datetime.utcnow().isoformat())
                     }
                 })
             }
@@ -0,0 +1,101 @@
+import json
+import os
+import time
+from typing import Dict, Any, Iterator
+import logging
+
+from src.services.dynamodb_service import DynamoDBService
+from src.services.aws_clients import get_client
+from src.services.ai_service import get_ai_service
+from src.utils.logger import with_request_logging
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 서비스 인스턴스
+db_service = DynamoDBService()
+
+# 중간 저장 주기: 마지막 저장 이후 글자 수 또는 경과 시간 중 먼저 도달한 쪽
+CHECKPOINT_CHARS = int(os.environ.get('AI_STREAM_CHECKPOINT_CHARS', '200'))
+CHECKPOINT_SECONDS = float(os.environ.get('AI_STREAM_CHECKPOINT_SECONDS', '1.0'))
+
+def stream_ai_response(inquiry: Dict[str, Any]) -> Iterator[str]:
+    """AI 응답 조각을 yield하면서 주기적으로 중간 저장, 완료 시 최종 응답 저장
+
+    이미 저장된 AI 응답이 있으면 다시 생성하지 않고 그대로 yield한다 (워커와 중복 호출/비용 방지).
+    중간/최종 저장은 pending인 문의에만 하므로 에스컬레이션·종료된 문의를 다시 열거나 덮지 않는다.
+    """
+    inquiry_id = inquiry['inquiry_id']
+    if inquiry.get('aiResponse'):
+        yield inquiry['aiResponse']
+        return
+    
+    chunks = []
+    length = 0
+    checkpointed_length = 0
+    checkpointed_at = time.monotonic()
+    
+    for chunk in get_ai_service().stream_response(inquiry):
+        chunks.append(chunk)
+        length += len(chunk)
+        yield chunk
+        
+        now = time.monotonic()
+        if length - checkpointed_length >= CHECKPOINT_CHARS or now - checkpointed_at >= CHECKPOINT_SECONDS:
+            db_service.update_inquiry_partial_response(inquiry_id, ''.join(chunks), only_if_pending=True)
+            checkpointed_length = length
+            checkpointed_at = now
+    
+    ai_response = ''.join(chunks)
+    try:
+        saved = db_service.update_inquiry_ai_response(inquiry_id, ai_response, only_if_pending=True)
+    except Exception as e:
+        logger.error("스트리밍 AI 응답 최종 저장 오류: %s, 오류: %s", inquiry_id, e)
+        return
+    if not saved:
+        logger.warning("대기 상태가 아닌 문의라 스트리밍 AI 응답 저장 생략: %s", inquiry_id)
+
+def _post(connection_client, connection_id: str, message: Dict[str, Any]) -> None:
+    connection_client.post_to_connection(
+        ConnectionId=connection_id,
+        Data=json.dumps(message, ensure_ascii=False).encode('utf-8')
+    )
+
+@with_request_logging
+def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
+    """API Gateway WebSocket 핸들러: {"inquiry_id": ...} 메시지를 받아 응답 조각을 push"""
+    request_context = event.get('requestContext', {})
+    if request_context.get('routeKey') in ('$connect', '$disconnect'):
+        return {'statusCode': 200}
+    
+    connection_id = request_context['connectionId']
+    endpoint_url = f"https://{request_context['domainName']}/{request_context['stage']}"
+    connection_client = get_client('apigatewaymanagementapi', endpoint_url=endpoint_url)
+    
+    try:
+        body = json.loads(event.get('body') or '{}')
+        inquiry_id = body.get('inquiry_id')
+        if not inquiry_id:
+            _post(connection_client, connection_id, {'type': 'error', 'error': 'inquiry_id is required'})
+            return {'statusCode': 400}
+        
+        inquiry = db_service.get_inquiry(inquiry_id)
+        if not inquiry:
+            _post(connection_client, connection_id, {'type': 'error', 'error': '문의를 찾을 수 없습니다'})
+            return {'statusCode': 404}
+        
+        for chunk in stream_ai_response(inquiry):
+            _post(connection_client, connection_id, {'type': 'delta', 'text': chunk})
+        
+        # 저장된 응답을 돌려준 경우에는 문의의 현재 상태를 그대로 알림
+        status = inquiry.get('status') if inquiry.get('aiResponse') else 'ai_responded'
+        _post(connection_client, connection_id, {'type': 'done', 'inquiryId': inquiry_id, 'status': status})
+        return {'statusCode': 200}
+        
+    except Exception as e:
+        logger.error(f"AI 응답 스트리밍 오류: {str(e)}")
+        try:
+            _post(connection_client, connection_id, {'type': 'error', 'error': 'AI 응답 생성 중 오류가 발생했습니다'})
+        except Exception:
+            pass
+        return {'statusCode': 500}
@@ -4,6 +4,7 @@ import logging
 
 from src.utils.response import success_response, error_response
 from src.services.dynamodb_service import DynamoDBService
+from src.utils.logger import with_request_logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -11,6 +12,7 @@ logger.setLevel(logging.INFO)
 # 서비스 인스턴스
 db_service = DynamoDBService()
 
+@with_request_logging
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """수동으로 AI 응답 업데이트 (테스트용)"""
     try:
@@ -22,23 +24,13 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         if not inquiry_id:
             return error_response("inquiry_id is required", 400)
         
-        logger.info(f"수동 AI 응답 업데이트 시작: {inquiry_id}")
+        logger.info("수동 AI 응답 업데이트 시작: %s", inquiry_id)
         
-        # 기존 문의 확인
-        existing_inquiry = db_service.get_inquiry(inquiry_id)
-        if not existing_inquiry:
-            return error_response("문의를 찾을 수 없습니다", 404)
-        
-        logger.info(f"기존 문의 상태: {existing_inquiry.get('status')}")
-        
-        # AI 응답 업데이트
-        success = db_service.update_inquiry_ai_response(inquiry_id, ai_response)
+        # AI 응답 업데이트 (존재 확인과 갱신 결과 반환을 한 번의 요청으로 처리)
+        updated_inquiry = db_service.update_inquiry_ai_response(inquiry_id, ai_response)
         
-        if not success:
-            return error_response("AI 응답 업데이트 실패", 500)
-        
-        # 업데이트 후 확인
-        updated_inquiry = db_service.get_inquiry(inquiry_id)
+        if not updated_inquiry:
+            return error_response("문의를 찾을 수 없습니다", 404)
         
         return success_response({
             'inquiry_id': inquiry_id,
@@ -4,6 +4,7 @@ import logging
 
 from src.utils.response import success_response, error_response
 from src.services.dynamodb_service import DynamoDBService
+from src.utils.logger import with_request_logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -15,6 +16,7 @@ def update_inquiry_status(inquiry_id: str, status: str, human_response: str = No
     """문의 상태 업데이트 (DI를 위한 래퍼 함수)"""
     return db_service.update_inquiry_status(inquiry_id, status, human_response)
 
+@with_request_logging
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     try:
         path_params = event.get('pathParameters', {}) or {}
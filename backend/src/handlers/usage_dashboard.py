@@ -0,0 +1,46 @@
+from datetime import date
+from typing import Dict, Any, Optional
+import logging
+
+from src.utils.response import success_response, error_response
+from src.services.usage_ledger import get_usage_ledger, default_usage_period
+from src.utils.logger import with_request_logging
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+MAX_PERIOD_DAYS = 366
+
+def get_company_usage(company_id: str, date_from: str, date_to: str) -> Optional[Dict[str, Any]]:
+    """회사 AI 사용량 집계 조회 (DI를 위한 래퍼 함수, 집계 미사용 시 None)"""
+    ledger = get_usage_ledger()
+    return ledger.get_company_usage(company_id, date_from, date_to) if ledger else None
+
+@with_request_logging
+def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
+    """GET /api/usage?companyId=...&from=YYYY-MM-DD&to=YYYY-MM-DD (기본 최근 30일)"""
+    try:
+        query_params = event.get('queryStringParameters', {}) or {}
+        company_id = query_params.get('companyId')
+        if not company_id:
+            return error_response("companyId is required", 400)
+
+        default_from, default_to = default_usage_period()
+        date_from = query_params.get('from', default_from)
+        date_to = query_params.get('to', default_to)
+        try:
+            period_days = (date.fromisoformat(date_to) - date.fromisoformat(date_from)).days + 1
+        except ValueError:
+            return error_response("from/to must be YYYY-MM-DD", 400)
+        if not 1 <= period_days <= MAX_PERIOD_DAYS:
+            return error_response(f"period must be 1-{MAX_PERIOD_DAYS} days", 400)
+
+        usage = get_company_usage(company_id, date_from, date_to)
+        if usage is None:
+            return error_response("AI usage accounting is not enabled", 404)
+
+        return success_response(usage)
+
+    except Exception as e:
+        logger.error(f"Error getting AI usage: {str(e)}")
+        return error_response(str(e), 500)
@@ -0,0 +1,105 @@
+"""
+AI 응답 생성 작업 큐
+문의 생성 요청과 Bedrock 호출을 분리하기 위한 큐 추상화.
+운영은 SQS, 로컬/테스트는 인메모리 큐를 사용한다.
+"""
+import json
+import os
+import uuid
+import threading
+from collections import deque
+from typing import Dict, Any, List
+
+from src.services.aws_clients import get_client
+
+# 워커에 전달할 문의 필드 (워커가 문의를 다시 읽지 않도록 메시지에 포함)
+JOB_FIELDS = ('inquiry_id', 'companyId', 'title', 'content', 'category', 'urgency')
+
+def build_job(inquiry_data: Dict[str, Any]) -> Dict[str, Any]:
+    """문의 데이터에서 AI 작업 메시지 생성 (비밀번호 등 불필요한 필드 제외)"""
+    return {field: inquiry_data[field] for field in JOB_FIELDS if field in inquiry_data}
+
+class SQSJobQueue:
+    """SQS 기반 작업 큐 (소비는 Lambda SQS 이벤트 소스가 담당)"""
+
+    def __init__(self, queue_url: str):
+        self.queue_url = queue_url
+        self.sqs = get_client('sqs')
+
+    def send(self, job: Dict[str, Any]) -> str:
+        response = self.sqs.send_message(
+            QueueUrl=self.queue_url,
+            MessageBody=json.dumps(job, ensure_ascii=False)
+        )
+        return response['MessageId']
+
+class InMemoryJobQueue:
+    """SQS 동작(가시성, 재시도, DLQ)을 흉내내는 프로세스 내 큐"""
+
+    def __init__(self, max_receive_count: int = 3):
+        self.max_receive_count = max_receive_count
+        self._pending = deque()
+        self._in_flight: Dict[str, Dict[str, Any]] = {}
+        self.dead_letters: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def send(self, job: Dict[str, Any]) -> str:
+        message_id = str(uuid.uuid4())
+        with self._lock:
+            self._pending.append({'messageId': message_id, 'body': json.dumps(job, ensure_ascii=False), 'receiveCount': 0})
+        return message_id
+
+    def receive(self, max_messages: int = 10) -> List[Dict[str, Any]]:
+        """SQS 이벤트 레코드 형식으로 메시지 꺼내기"""
+        records = []
+        with self._lock:
+            while self._pending and len(records) < max_messages:
+                message = self._pending.popleft()
+                message['receiveCount'] += 1
+                self._in_flight[message['messageId']] = message
+                records.append({
+                    'messageId': message['messageId'],
+                    'body': message['body'],
+                    'attributes': {'ApproximateReceiveCount': str(message['receiveCount'])}
+                })
+        return records
+
+    def ack(self, message_id: str) -> None:
+        with self._lock:
+            self._in_flight.pop(message_id, None)
+
+    def nack(self, message_id: str) -> None:
+        """처리 실패: 재시도 횟수를 넘으면 DLQ로 이동"""
+        with self._lock:
+            message = self._in_flight.pop(message_id, None)
+            if message is None:
+                return
+            if message['receiveCount'] >= self.max_receive_count:
+                self.dead_letters.append(message)
+            else:
+                self._pending.append(message)
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._in_flight)
+
+_job_queue = None
+
+def get_job_queue():
+    """환경에 맞는 작업 큐 (AI_JOB_QUEUE_URL이 있으면 SQS, 없으면 인메모리)"""
+    global _job_queue
+    if _job_queue is None:
+        queue_url = os.environ.get('AI_JOB_QUEUE_URL')
+        _job_queue = SQSJobQueue(queue_url) if queue_url else InMemoryJobQueue()
+    return _job_queue
+
+def set_job_queue(queue) -> None:
+    """작업 큐 교체 (테스트/로컬 서버용)"""
+    global _job_queue
+    _job_queue = queue
+
+def is_async_enabled() -> bool:
+    """AI 응답을 큐로 비동기 생성할지 여부"""
+    mode = os.environ.get('AI_RESPONSE_MODE')
+    if mode:
+        return mode == 'async'
+    return bool(os.environ.get('AI_JOB_QUEUE_URL'))
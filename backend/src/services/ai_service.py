@@ -1,6 +1,6 @@
-import boto3
 import json
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Iterator, Optional, Tuple
 import logging
 import sys
 import os
@@ -8,147 +8,397 @@ import os
 # config 모듈 import를 위한 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 from config.ai_models import ai_model_config, analyze_request_complexity, get_request_priority
+from src.services.bedrock_client import get_managed_bedrock_client, is_fallback_eligible
+from src.services.response_cache import get_response_cache
+from src.services.prompt_builder import PromptBuilder, build_system_prompt, build_user_prompt
+from src.services.company_profile_service import get_company_profile_service
+from src.services.qna_retriever import get_qna_retriever
+from src.services.hedging import is_hedging_enabled, get_hedge_delay_seconds, run_hedged, hedge_stats, hedge_budget
+from config.model_telemetry import estimate_cost, budget_telemetry
+from src.services.usage_ledger import get_usage_ledger, build_usage_entry
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 class AIService:
-    def __init__(self):
-        self.bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
+    def __init__(self, bedrock_client=None, response_cache=None, company_profiles=None, qna_retriever=None,
+                 usage_ledger=None):
+        self.bedrock = bedrock_client or get_managed_bedrock_client()
         self.config = ai_model_config
+        self.prompt_builder = PromptBuilder()
+        self.company_profiles = company_profiles if company_profiles is not None else get_company_profile_service()
+        self.qna_retriever = qna_retriever if qna_retriever is not None else get_qna_retriever()
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        self.usage_ledger = usage_ledger if usage_ledger is not None else get_usage_ledger()
     
-    def generate_response(self, inquiry_data: Dict[str, Any], company_context: str = None) -> str:
-        """AI 응답 생성 - converse API 사용"""
+    def generate_response(self, inquiry_data: Dict[str, Any], company_context: str = None,
+                          fallback_on_error: bool = True, use_cache: bool = True) -> str:
+        """AI 응답 생성 - converse API 사용
+        
+        fallback_on_error=False이면 Bedrock 오류를 그대로 올려 호출자(큐 워커)가 재시도하게 한다.
+        use_cache=False이면 캐시를 건너뛰고 새로 생성한 응답으로 캐시를 덮어쓴다 (재생성용).
+        """
         try:
-            logger.info(f"AI 응답 생성 시작: {inquiry_data.get('title', 'Unknown')}")
+            logger.info("AI 응답 생성 시작: %s", inquiry_data.get('title', 'Unknown'))
+            
+            profile_version = self._profile_version(inquiry_data)
+            if self.response_cache and use_cache:
+                cached = self.response_cache.get(inquiry_data, profile_version)
+                if cached is not None:
+                    logger.info("AI 응답 캐시 적중")
+                    return cached
             
-            complexity = analyze_request_complexity(
-                inquiry_data.get('content', ''), 
-                inquiry_data.get('category', 'general')
-            )
-            priority = get_request_priority(inquiry_data.get('urgency', 'normal'))
+            selected_model = self._select_model(inquiry_data)
             
-            selected_model = self.config.get_model_for_request(complexity, priority)
+            response = self._invoke_converse_api(inquiry_data, company_context, selected_model)
             
-            logger.info(f"Selected model: {selected_model} (complexity: {complexity}, priority: {priority})")
+            # 스마트 폴백 응답은 캐시하지 않는다 (실제 모델 응답만 저장)
+            if self.response_cache:
+                self.response_cache.put(inquiry_data, response, profile_version)
             
-            return self._invoke_converse_api(inquiry_data, company_context, selected_model)
+            return response
             
         except Exception as e:
             logger.error(f"Error generating AI response: {str(e)}")
+            if not fallback_on_error:
+                raise
             return self._get_smart_fallback_response(inquiry_data)
     
-    def _call_converse_api_simple(self, inquiry_data: Dict[str, Any], company_context: str, model_id: str) -> str:
-        """간단한 Converse API 호출"""
+    def stream_response(self, inquiry_data: Dict[str, Any], company_context: str = None,
+                        fallback_on_error: bool = True) -> Iterator[str]:
+        """AI 응답 스트리밍 생성 - converse_stream API 사용 (텍스트 조각 단위로 yield)
+        
+        첫 토큰 전 오류는 폴백 모델로 재시도하고, 그래도 실패하면 스마트 폴백 응답을 한 번에 yield한다.
+        생성 예산(maxTokens)에서 잘리면 BEDROCK_MAX_TOKENS까지 이어서 생성한다.
+        """
+        profile_version = self._profile_version(inquiry_data)
+        if self.response_cache:
+            cached = self.response_cache.get(inquiry_data, profile_version)
+            if cached is not None:
+                yield cached
+                return
+        
+        selected_model = self._select_model(inquiry_data)
+        
+        stream = None
+        stream_model = None
+        for model_id in (selected_model, self.config.get_fallback_model()):
+            if model_id != selected_model and not self._is_model_available(model_id):
+                logger.warning("Fallback model %s circuit open, skipping", model_id)
+                break
+            try:
+                stream = self._open_converse_stream(inquiry_data, company_context, model_id,
+                                                    fallback=model_id != selected_model)
+                stream_model = model_id
+                break
+            except Exception as e:
+                logger.warning("Streaming model %s failed: %s", model_id, e)
+                if not is_fallback_eligible(e):
+                    break
+        
+        if stream is None:
+            if not fallback_on_error:
+                raise RuntimeError("All models failed to start streaming")
+            yield self._get_smart_fallback_response(inquiry_data)
+            return
+        
+        chunks = []
+        stop_reason = None
+        for event in stream:
+            if 'messageStop' in event:
+                stop_reason = event['messageStop'].get('stopReason')
+            if 'contentBlockDelta' in event:
+                text = event['contentBlockDelta'].get('delta', {}).get('text')
+                if text:
+                    chunks.append(text)
+                    yield text
+        
+        if stop_reason == 'max_tokens' and chunks:
+            for text in self._continue_stream(inquiry_data, company_context, stream_model, ''.join(chunks)):
+                chunks.append(text)
+                yield text
+        
+        if self.response_cache and chunks:
+            self.response_cache.put(inquiry_data, ''.join(chunks), profile_version)
+    
+    def _profile_version(self, inquiry_data: Dict[str, Any]) -> Optional[int]:
+        """응답 캐시 키에 넣을 회사 프로필 버전 (프로필 서비스/프로필이 없으면 None)"""
+        if not self.company_profiles or not inquiry_data.get('companyId'):
+            return None
+        return self.company_profiles.get_profile_version(inquiry_data['companyId'])
+    
+    def _open_converse_stream(self, inquiry_data: Dict[str, Any], company_context: str, model_id: str,
+                              fallback: bool = False):
+        """converse_stream 호출 후 이벤트 스트림 반환"""
+        request = self._build_request(inquiry_data, company_context, model_id)
+        fingerprint = request.pop('fingerprint')
+        budget_key = request.pop('budgetKey')
+        
+        started = time.perf_counter()
         try:
-            prompt = self._build_prompt(inquiry_data, company_context)
-            logger.info(f"생성된 프롬프트 길이: {len(prompt)}")
-            
-            conversation = [
-                {
-                    "role": "user",
-                    "content": [{"text": prompt}]
-                }
-            ]
-            
-            logger.info(f"Bedrock 호출 시작: {model_id}")
-            
-            response = self.bedrock.converse(
-                modelId=model_id,
-                messages=conversation,
-                inferenceConfig={
-                    "maxTokens": 1000,
-                    "temperature": 0.7,
-                    "topP": 0.9
-                }
-            )
-            
-            logger.info("Bedrock 응답 수신 완료")
-            
-            ai_response = response["output"]["message"]["content"][0]["text"]
-            
-            logger.info(f"AI 응답 생성 완료: 길이 {len(ai_response)}")
-            return ai_response
-            
+            response = self.bedrock.converse_stream(**request)
+        except Exception:
+            self.config.telemetry.record(model_id, (time.perf_counter() - started) * 1000, success=False)
+            raise
+        return self._record_stream_usage(response["stream"], fingerprint, model_id, started, budget_key,
+                                         inquiry_data, fallback)
+    
+    def _continue_stream(self, inquiry_data: Dict[str, Any], company_context: str, model_id: str,
+                         partial: str) -> Iterator[str]:
+        """예산에서 잘린 스트림 응답을 BEDROCK_MAX_TOKENS까지 이어서 생성 (이미 보낸 부분은 assistant 메시지로 전달)"""
+        request = self._build_request(inquiry_data, company_context, model_id)
+        fingerprint = request.pop('fingerprint')
+        budget_key = request.pop('budgetKey')
+        remaining = self.config.config["max_tokens"] - request["inferenceConfig"]["maxTokens"]
+        if remaining <= 0:
+            logger.warning("Streaming response truncated at max tokens ceiling (budget %s)", budget_key)
+            return
+        
+        logger.warning("Streaming response truncated (budget %s), continuing with %s tokens", budget_key, remaining)
+        request["inferenceConfig"]["maxTokens"] = remaining
+        # 마지막 assistant 메시지는 공백으로 끝날 수 없다
+        request["messages"] = request["messages"] + [{"role": "assistant", "content": [{"text": partial.rstrip()}]}]
+        started = time.perf_counter()
+        try:
+            response = self.bedrock.converse_stream(**request)
         except Exception as e:
-            logger.error(f"Converse API 호출 실패: {str(e)}")
-            import traceback
-            logger.error(f"상세 오류: {traceback.format_exc()}")
-            raise e
+            self.config.telemetry.record(model_id, (time.perf_counter() - started) * 1000, success=False)
+            logger.warning("Streaming continuation with %s failed: %s", model_id, e)
+            return
+        # 예산 지표는 첫 요청에서 잘림으로 이미 기록했으므로 이어쓰기는 모델/사용량만 기록
+        for event in self._record_stream_usage(response["stream"], fingerprint, model_id, started, None, inquiry_data):
+            if 'contentBlockDelta' in event:
+                text = event['contentBlockDelta'].get('delta', {}).get('text')
+                if text:
+                    yield text
+    
+    def _record_stream_usage(self, stream, fingerprint: str, model_id: str = None,
+                             started: float = None, budget_key: str = None,
+                             inquiry_data: Dict[str, Any] = None, fallback: bool = False) -> Iterator[Dict[str, Any]]:
+        """스트림 metadata 이벤트의 프롬프트 캐시 사용량과 모델/예산별 지연(전체 응답 완료까지) 기록
+
+        스트림이 도중에 끊기면 모델 지표에 실패로 기록하고 오류를 그대로 올린다.
+        """
+        stop_reason = None
+        try:
+            for event in stream:
+                if 'messageStop' in event:
+                    stop_reason = event['messageStop'].get('stopReason')
+                if 'metadata' in event:
+                    usage = event['metadata'].get('usage')
+                    self.prompt_builder.registry.record_usage(fingerprint, usage)
+                    if model_id and started is not None:
+                        latency_ms = (time.perf_counter() - started) * 1000
+                        self.config.telemetry.record(model_id, latency_ms, usage=usage)
+                        if budget_key:
+                            budget_telemetry.record(budget_key, latency_ms, (usage or {}).get('outputTokens', 0),
+                                                    stop_reason == 'max_tokens')
+                        if inquiry_data is not None:
+                            self._record_usage(inquiry_data, model_id, usage, latency_ms,
+                                               event['metadata'].get('metrics', {}).get('latencyMs'),
+                                               fallback, 'converse_stream')
+                yield event
+        except Exception:
+            if model_id and started is not None:
+                self.config.telemetry.record(model_id, (time.perf_counter() - started) * 1000, success=False)
+            raise
+    
+    def _select_model(self, inquiry_data: Dict[str, Any]) -> str:
+        """문의 복잡도/우선순위에 따른 모델 선택"""
+        complexity = analyze_request_complexity(
+            inquiry_data.get('content', ''), 
+            inquiry_data.get('category', 'general')
+        )
+        priority = get_request_priority(inquiry_data.get('urgency', 'normal'))
+        
+        selected_model = self.config.get_model_for_request(complexity, priority)
+        
+        logger.info("Selected model: %s (complexity: %s, priority: %s)", selected_model, complexity, priority)
+        return selected_model
     
     def _invoke_converse_api(self, inquiry_data: Dict[str, Any], company_context: str, model_id: str) -> str:
         """Converse API를 사용한 모델 호출"""
         try:
+            hedge_model = self._get_hedge_model(inquiry_data, model_id)
+            if hedge_model:
+                return self._call_hedged(inquiry_data, company_context, model_id, hedge_model)
             return self._call_converse_api(inquiry_data, company_context, model_id)
         except Exception as e:
-            logger.warning(f"Primary model {model_id} failed: {str(e)}. Trying fallback model.")
-            
+            # 요청 오류나 열린 서킷은 모델을 바꿔도 해결되지 않으므로 폴백하지 않음
+            if not is_fallback_eligible(e):
+                logger.warning("Primary model %s failed: %s. Not eligible for fallback.", model_id, e)
+                raise
             fallback_model = self.config.get_fallback_model()
+            # 폴백 모델까지 서킷이 열려 있으면 호출하지 않고 바로 실패 (폴백 폭주 방지)
+            if fallback_model == model_id or not self._is_model_available(fallback_model):
+                logger.warning("Primary model %s failed: %s. Fallback model unavailable.", model_id, e)
+                raise
+            
+            logger.warning("Primary model %s failed: %s. Trying fallback model.", model_id, e)
             try:
-                return self._call_converse_api(inquiry_data, company_context, fallback_model)
+                return self._call_converse_api(inquiry_data, company_context, fallback_model, fallback=True)
             except Exception as fallback_error:
                 logger.error(f"Fallback model {fallback_model} also failed: {str(fallback_error)}")
                 raise fallback_error
     
-    def _call_converse_api(self, inquiry_data: Dict[str, Any], company_context: str, model_id: str) -> str:
-        """Converse API 호출"""
-        prompt = self._build_prompt(inquiry_data, company_context)
-        
-        conversation = [
-            {
-                "role": "user",
-                "content": [{"text": prompt}]
-            }
-        ]
+    def emit_metrics(self) -> None:
+        """응답 캐시와 생성 예산 지표를 EMF로 출력 (Lambda 호출 끝에 한 번)"""
+        if self.response_cache:
+            self.response_cache.emit_metrics()
+        budget_telemetry.emit_metrics()
+    
+    def _is_model_available(self, model_id: str) -> bool:
+        """서킷 브레이커가 있는 클라이언트면 모델 사용 가능 여부 확인"""
+        is_available = getattr(self.bedrock, 'is_available', None)
+        return is_available(model_id) if callable(is_available) else True
+    
+    def _is_model_throttled(self, model_id: str) -> bool:
+        """호출 한도가 바닥났거나 최근 스로틀링을 받은 모델인지 (호출 제한 래퍼가 아니면 False)"""
+        is_throttled = getattr(self.bedrock, 'is_throttled', None)
+        return bool(is_throttled(model_id)) if callable(is_throttled) else False
+    
+    def _get_hedge_model(self, inquiry_data: Dict[str, Any], model_id: str) -> Optional[str]:
+        """높은 우선순위 문의의 헤지 대상 모델 (헤지하지 않으면 None)
+
+        주 모델 서킷이 열렸거나 스로틀링 중이면 요청을 늘리지 않도록 헤지하지 않는다.
+        """
+        if not is_hedging_enabled() or get_request_priority(inquiry_data.get('urgency', 'normal')) != 'high':
+            return None
+        if not self._is_model_available(model_id) or self._is_model_throttled(model_id):
+            return None
+        hedge_model = self.config.config["fast_model"]
+        if hedge_model == model_id:
+            hedge_model = self.config.get_fallback_model()
+        if hedge_model == model_id or not self._is_model_available(hedge_model) or self._is_model_throttled(hedge_model):
+            return None
+        return hedge_model
+    
+    def _call_hedged(self, inquiry_data: Dict[str, Any], company_context: str,
+                     model_id: str, hedge_model: str) -> str:
+        """주 모델이 지연 분위수 안에 응답하지 않으면 hedge_model에도 요청하고 먼저 끝난 응답 사용"""
+        def call(target_model: str):
+            return (target_model,) + self._converse(inquiry_data, company_context, target_model)
         
-        model_params = self.config.get_model_parameters(model_id)
+        def on_discarded(result):
+            discarded_model, _, usage = result
+            usage = usage or {}
+            hedge_stats.add_cost(estimate_cost(discarded_model, usage.get('inputTokens', 0), usage.get('outputTokens', 0)))
         
-        response = self.bedrock.converse(
-            modelId=model_id,
-            messages=conversation,
-            inferenceConfig={
-                "maxTokens": model_params["body"]["max_tokens"],
-                "temperature": model_params["body"]["temperature"],
-                "topP": model_params["body"]["top_p"]
-            }
+        delay = get_hedge_delay_seconds(self.config.telemetry, model_id)
+        (winner_model, ai_response, _), hedged, alternate_won = run_hedged(
+            lambda: call(model_id), lambda: call(hedge_model), delay, on_discarded, hedge_budget
         )
+        hedge_stats.record(hedged, alternate_won)
+        if hedged:
+            logger.info("Hedged request: %s → %s after %.2fs, winner: %s", model_id, hedge_model, delay, winner_model)
+            hedge_stats.emit_metrics()
+        return ai_response
+    
+    def _call_converse_api(self, inquiry_data: Dict[str, Any], company_context: str, model_id: str,
+                           fallback: bool = False) -> str:
+        """Converse API 호출"""
+        return self._converse(inquiry_data, company_context, model_id, fallback)[0]
+    
+    def _converse(self, inquiry_data: Dict[str, Any], company_context: str,
+                  model_id: str, fallback: bool = False) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Converse API 호출 후 (응답 텍스트, usage) 반환"""
+        request = self._build_request(inquiry_data, company_context, model_id)
+        fingerprint = request.pop('fingerprint')
+        budget_key = request.pop('budgetKey')
+        
+        response = self._send_converse(request, inquiry_data, model_id, fallback, fingerprint, budget_key)
+        # 좁은 예산에서 잘린 응답은 그대로 쓰지 않고 BEDROCK_MAX_TOKENS 상한으로 한 번 더 생성
+        ceiling = self.config.config["max_tokens"]
+        if response.get("stopReason") == 'max_tokens':
+            if request["inferenceConfig"]["maxTokens"] < ceiling:
+                logger.warning("Response truncated (budget %s, %s tokens), retrying with %s",
+                               budget_key, request["inferenceConfig"]["maxTokens"], ceiling)
+                request = {**request, "inferenceConfig": {**request["inferenceConfig"], "maxTokens": ceiling}}
+                response = self._send_converse(request, inquiry_data, model_id, fallback, fingerprint, budget_key)
+            else:
+                logger.warning("Response truncated at max tokens ceiling (budget %s)", budget_key)
         
         ai_response = response["output"]["message"]["content"][0]["text"]
         
-        logger.info(f"AI response generated using {model_id} for inquiry: {inquiry_data.get('title', 'Unknown')}")
-        return ai_response
+        logger.info("AI response generated using %s for inquiry: %s", model_id, inquiry_data.get('title', 'Unknown'))
+        return ai_response, response.get("usage")
     
-    def _build_prompt(self, inquiry_data: Dict[str, Any], company_context: str = None) -> str:
-        """프롬프트 생성"""
-        context = company_context or "일반적인 고객 서비스"
+    def _send_converse(self, request: Dict[str, Any], inquiry_data: Dict[str, Any], model_id: str,
+                       fallback: bool, fingerprint: str, budget_key: str) -> Dict[str, Any]:
+        """converse 호출 한 번과 지연/예산/프롬프트 캐시/사용량 기록"""
+        started = time.perf_counter()
+        try:
+            response = self.bedrock.converse(**request)
+        except Exception:
+            self.config.telemetry.record(model_id, (time.perf_counter() - started) * 1000, success=False)
+            raise
+        latency_ms = (time.perf_counter() - started) * 1000
+        usage = response.get("usage") or {}
+        self.config.telemetry.record(model_id, latency_ms, usage=usage)
+        budget_telemetry.record(budget_key, latency_ms, usage.get('outputTokens', 0),
+                                response.get("stopReason") == 'max_tokens')
+        self.prompt_builder.registry.record_usage(fingerprint, response.get("usage"))
+        self._record_usage(inquiry_data, model_id, usage, latency_ms,
+                           response.get("metrics", {}).get("latencyMs"), fallback, 'converse')
+        return response
+    
+    def _record_usage(self, inquiry_data: Dict[str, Any], model_id: str, usage: Optional[Dict[str, Any]],
+                      latency_ms: float, server_latency_ms: Optional[float], fallback: bool, operation: str) -> None:
+        """호출 사용량/비용을 문의와 회사 집계에 기록 (AI_USAGE_TABLE 미설정 시 생략)"""
+        if not self.usage_ledger:
+            return
+        try:
+            entry = build_usage_entry(model_id, usage, latency_ms, server_latency_ms, fallback, operation)
+            self.usage_ledger.record(inquiry_data, entry)
+        except Exception as e:
+            logger.error(f"AI 사용량 기록 실패: {str(e)}")
+    
+    def _build_request(self, inquiry_data: Dict[str, Any], company_context: str, model_id: str) -> Dict[str, Any]:
+        """converse / converse_stream 요청 파라미터 (고정 system 블록 + 문의별 user 메시지)"""
+        faq_snippets = None
+        if company_context is None and self.company_profiles and inquiry_data.get('companyId'):
+            # 회사 프로필은 캐시되므로 AI 호출마다 DynamoDB를 읽지 않는다
+            profile_context = self.company_profiles.get_prompt_context(inquiry_data['companyId'])
+            if profile_context:
+                company_context = profile_context['company_context']
+                faq_snippets = profile_context['faq_snippets']
         
-        prompt = f"""당신은 {context}의 전문 고객 서비스 담당자입니다.
-
-고객 문의:
-제목: {inquiry_data.get('title', '')}
-내용: {inquiry_data.get('content', '')}
-카테고리: {inquiry_data.get('category', 'general')}
-
-다음 지침을 따라 응답해주세요:
-1. 친절하고 전문적인 톤으로 답변
-2. 구체적이고 실행 가능한 해결책 제시
-3. 한국어로 응답
-4. 200자 이상의 상세한 설명
-
-응답:"""
+        # 관련 Q&A 상위 k개만 프롬프트에 넣는다 (FAQ 전체를 넣는 것보다 짧고 정확)
+        references = self.qna_retriever.retrieve(inquiry_data) if self.qna_retriever else None
+        
+        prompt = self.prompt_builder.build(inquiry_data, model_id, company_context, faq_snippets, references)
+        model_params = self.config.get_model_parameters(model_id)
+        budget = self._get_generation_budget(inquiry_data)
+        
+        inference_config = {
+            "maxTokens": budget["max_tokens"],
+            "temperature": budget["temperature"],
+            "topP": model_params["body"]["top_p"]
+        }
+        if budget["stop_sequences"]:
+            inference_config["stopSequences"] = budget["stop_sequences"]
         
-        return prompt
+        return {
+            "modelId": model_id,
+            "system": prompt["system"],
+            "messages": prompt["messages"],
+            "inferenceConfig": inference_config,
+            "fingerprint": prompt["fingerprint"],
+            "budgetKey": budget["key"]
+        }
     
-    def _get_fallback_response(self, inquiry_data: Dict[str, Any]) -> str:
-        """기본 응답 (AI 오류 시)"""
-        return f"""안녕하세요, {inquiry_data.get('title', '문의')}에 대해 문의해주셔서 감사합니다.
-
-죄송합니다. 현재 시스템에 일시적인 문제가 발생하여 즉시 답변을 드리기 어려운 상황입니다.
-
-빠른 시일 내에 담당자가 직접 연락드리겠습니다. 
-긴급한 사항이시라면 '사람과 연결' 버튼을 클릭해주세요.
-
-감사합니다."""
+    def _get_generation_budget(self, inquiry_data: Dict[str, Any]) -> Dict[str, Any]:
+        """문의 카테고리 × 복잡도 × 우선순위에 맞는 생성 예산"""
+        category = inquiry_data.get('category', 'general')
+        return self.config.get_generation_budget(
+            category,
+            analyze_request_complexity(inquiry_data.get('content', ''), category),
+            get_request_priority(inquiry_data.get('urgency', 'normal'))
+        )
+    
+    def _build_prompt(self, inquiry_data: Dict[str, Any], company_context: str = None) -> str:
+        """단일 텍스트 프롬프트 생성 (system 블록을 쓰지 않는 호출용)"""
+        return f"{build_system_prompt(company_context)}\n\n{build_user_prompt(inquiry_data)}"
     
     def _get_smart_fallback_response(self, inquiry_data: Dict[str, Any]) -> str:
         """카테고리별 스마트 폴백 응답"""
@@ -186,4 +436,18 @@ class AIService:
 감사합니다."""
         }
         
-        return responses.get(category, responses['general'])
\ No newline at end of file
+        return responses.get(category, responses['general'])
+
+_ai_service = None
+
+def get_ai_service() -> AIService:
+    """모든 AI 응답 생성 진입점이 공유하는 AIService (클라이언트/캐시/지표/서킷 상태를 warm 호출 간 유지)"""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
+
+def set_ai_service(service: Optional[AIService]) -> None:
+    """공유 서비스 교체 (테스트/로컬 서버용, None이면 다음 호출 때 새로 생성)"""
+    global _ai_service
+    _ai_service = service
@@ -0,0 +1,104 @@
+"""
+AWS 클라이언트 레지스트리
+Lambda warm 호출 간 boto3 클라이언트/리소스/Table 핸들을 재사용한다.
+"""
+import os
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+import boto3
+from botocore.config import Config
+
+from src.services.local_table import is_local_storage, get_local_table
+
+AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
+
+# DynamoDB/SES 등 일반 API용 설정 (짧은 타임아웃, 커넥션 풀 유지)
+DEFAULT_CLIENT_CONFIG = Config(
+    region_name=AWS_REGION,
+    max_pool_connections=int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '25')),
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=5,
+    retries={'max_attempts': 3, 'mode': 'standard'}
+)
+
+# Bedrock은 응답 생성에 수 초~수십 초가 걸리므로 read_timeout을 길게 잡는다.
+# 스로틀링 재시도는 ThrottledBedrockClient가 모델별 한도와 함께 처리하므로 botocore 재시도는 끈다.
+BEDROCK_CLIENT_CONFIG = Config(
+    region_name=AWS_REGION,
+    max_pool_connections=int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '25')),
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=int(os.environ.get('BEDROCK_READ_TIMEOUT', '60')),
+    retries={'max_attempts': 1, 'mode': 'standard'}
+)
+
+_lock = threading.Lock()
+_clients: Dict[Hashable, Any] = {}
+_resources: Dict[str, Any] = {}
+_tables: Dict[str, Any] = {}
+
+def get_client(service_name: str, config: Optional[Config] = None,
+               endpoint_url: Optional[str] = None) -> Any:
+    """서비스/엔드포인트/설정별 boto3 클라이언트 (프로세스당 1개)
+
+    설정(Config)이 다르면 타임아웃/재시도가 다른 별도 클라이언트를 만든다.
+    Config는 값이 아닌 객체 기준으로 구분하므로 모듈 상수로 만들어 재사용한다.
+    """
+    config = config or DEFAULT_CLIENT_CONFIG
+    cache_key = (service_name, endpoint_url, config)
+    client = _clients.get(cache_key)
+    if client is None:
+        with _lock:
+            client = _clients.get(cache_key)
+            if client is None:
+                kwargs = {'config': config}
+                if endpoint_url:
+                    kwargs['endpoint_url'] = endpoint_url
+                client = boto3.client(service_name, **kwargs)
+                _clients[cache_key] = client
+    return client
+
+def get_resource(service_name: str = 'dynamodb') -> Any:
+    """서비스별 boto3 리소스 (프로세스당 1개)"""
+    resource = _resources.get(service_name)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service_name)
+            if resource is None:
+                resource = boto3.resource(service_name, config=DEFAULT_CLIENT_CONFIG)
+                _resources[service_name] = resource
+    return resource
+
+def get_table(table_name: Optional[str] = None) -> Any:
+    """DynamoDB Table 핸들 (기본값: DYNAMODB_TABLE 환경변수)
+
+    STORAGE_BACKEND=memory면 같은 인터페이스의 로컬 테이블(local_table.py)을 반환한다.
+    """
+    table_name = table_name or os.environ.get('DYNAMODB_TABLE', 'cs-inquiries')
+    if is_local_storage():
+        return get_local_table(table_name)
+    table = _tables.get(table_name)
+    if table is None:
+        table = get_resource('dynamodb').Table(table_name)
+        _tables[table_name] = table
+    return table
+
+def get_bedrock_client() -> Any:
+    """bedrock-runtime 클라이언트 (BEDROCK_BACKEND=fake면 BEDROCK_FAKE_PROFILE 설정의 가짜 클라이언트)"""
+    if os.environ.get('BEDROCK_BACKEND', 'aws').lower() == 'fake':
+        client = _clients.get('bedrock-runtime@fake')
+        if client is None:
+            from src.services.fake_bedrock import FakeBedrockClient
+            with _lock:
+                client = _clients.setdefault('bedrock-runtime@fake', FakeBedrockClient.from_env())
+        return client
+    return get_client('bedrock-runtime', BEDROCK_CLIENT_CONFIG)
+
+def reset_clients() -> None:
+    """캐시된 클라이언트 초기화 (테스트/로컬 서버용)"""
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _tables.clear()
@@ -0,0 +1,314 @@
+"""
+호출 제한 / 재시도 / 서킷 브레이커가 적용된 Bedrock 클라이언트 래퍼
+모델별로 분당 요청 수 + 분당 토큰 수 토큰 버킷을 두고, ThrottlingException은
+지터가 있는 지수 백오프로 재시도하며, 연속 실패한 모델은 잠시 호출을 차단한다.
+"""
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from typing import Dict, Any, Iterator, Optional, Callable
+
+# config 모듈 import를 위한 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from config.ai_models import ai_model_config
+from src.services.aws_clients import get_bedrock_client
+from src.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger()
+
+# 같은 모델로 재시도해 볼 만한 일시적 오류
+THROTTLING_ERROR_CODES = {
+    'ThrottlingException', 'TooManyRequestsException', 'ServiceQuotaExceededException',
+    'ServiceUnavailableException', 'ModelNotReadyException'
+}
+# 요청 자체가 잘못된 오류 (모델 장애가 아니므로 서킷 브레이커에 반영하지 않음)
+CLIENT_ERROR_CODES = {
+    'ValidationException', 'AccessDeniedException', 'ResourceNotFoundException'
+}
+# 다른 모델(폴백)로 넘겨 볼 만한 용량/장애성 오류 (요청 오류나 열린 서킷은 제외)
+FALLBACK_ERROR_CODES = THROTTLING_ERROR_CODES | {
+    'ModelErrorException', 'ModelTimeoutException', 'ModelStreamErrorException', 'InternalServerException',
+    'ReadTimeoutError', 'ConnectTimeoutError', 'EndpointConnectionError'
+}
+
+THROTTLE_MAX_RETRIES = int(os.environ.get('BEDROCK_THROTTLE_MAX_RETRIES', '3'))
+BACKOFF_BASE_SECONDS = float(os.environ.get('BEDROCK_BACKOFF_BASE_SECONDS', '0.5'))
+BACKOFF_MAX_SECONDS = float(os.environ.get('BEDROCK_BACKOFF_MAX_SECONDS', '8'))
+MAX_QUEUE_SECONDS = float(os.environ.get('BEDROCK_MAX_QUEUE_SECONDS', '10'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('BEDROCK_CIRCUIT_FAILURE_THRESHOLD', '5'))
+CIRCUIT_RESET_SECONDS = float(os.environ.get('BEDROCK_CIRCUIT_RESET_SECONDS', '30'))
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 모델을 호출하지 않음"""
+
+class RateLimitedError(Exception):
+    """대기 한도 안에 호출 한도가 확보되지 않음"""
+
+def error_code(error: Exception) -> str:
+    """botocore ClientError의 오류 코드 (없으면 예외 클래스 이름)"""
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        return response.get('Error', {}).get('Code', type(error).__name__)
+    return type(error).__name__
+
+def is_throttling_error(error: Exception) -> bool:
+    return error_code(error) in THROTTLING_ERROR_CODES
+
+def is_fallback_eligible(error: Exception) -> bool:
+    """폴백 모델로 재시도할 오류인지 (호출 한도 대기 초과 또는 용량/장애성 오류)"""
+    if isinstance(error, RateLimitedError):
+        return True
+    return error_code(error) in FALLBACK_ERROR_CODES
+
+class CircuitBreaker:
+    """closed → (연속 실패) → open → (reset 시간 경과) → half_open → 성공 시 closed"""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds: float = CIRCUIT_RESET_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (half_open에서는 시험 호출 1개만 허용)"""
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """시험 호출이 모델 장애와 무관하게 끝난 경우 (잘못된 요청 등)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+class ModelGuard:
+    """모델 하나의 요청/토큰 버킷과 서킷 브레이커"""
+
+    def __init__(self, model_id: str, requests_per_minute: int, tokens_per_minute: int,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.model_id = model_id
+        self.requests = TokenBucket(requests_per_minute / 60.0, requests_per_minute, clock=clock, sleep=sleep)
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute, clock=clock, sleep=sleep)
+        self.breaker = CircuitBreaker(clock=clock)
+        self.last_throttled_at: Optional[float] = None
+
+def _estimate_text_tokens(text: str) -> int:
+    # 한국어 위주 텍스트의 대략적인 토큰 수 (정확한 값은 응답 usage로 보정)
+    return max(1, len(text) // 2)
+
+def estimate_converse_tokens(kwargs: Dict[str, Any]) -> int:
+    """converse 요청이 차지할 토큰 (입력 추정치 + maxTokens)"""
+    text = ''.join(
+        block.get('text', '')
+        for message in kwargs.get('messages', [])
+        for block in message.get('content', [])
+    )
+    text += ''.join(block.get('text', '') for block in kwargs.get('system', []))
+    return _estimate_text_tokens(text) + kwargs.get('inferenceConfig', {}).get('maxTokens', 0)
+
+def estimate_invoke_tokens(kwargs: Dict[str, Any]) -> int:
+    """invoke_model(Anthropic messages 형식) 요청이 차지할 토큰"""
+    try:
+        body = json.loads(kwargs.get('body') or '{}')
+    except (TypeError, ValueError):
+        return 1
+    text = ''
+    for message in body.get('messages', []):
+        content = message.get('content', '')
+        if isinstance(content, str):
+            text += content
+        else:
+            text += ''.join(block.get('text', '') for block in content)
+    return _estimate_text_tokens(text) + body.get('max_tokens', 0)
+
+class ThrottledBedrockClient:
+    """bedrock-runtime 클라이언트와 같은 인터페이스의 래퍼 (converse / converse_stream / invoke_model)"""
+
+    def __init__(self, client=None, config=None, max_retries: int = THROTTLE_MAX_RETRIES,
+                 max_queue_seconds: float = MAX_QUEUE_SECONDS,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.client = client or get_bedrock_client()
+        self.config = config or ai_model_config
+        self.max_retries = max_retries
+        self.max_queue_seconds = max_queue_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._guards: Dict[str, ModelGuard] = {}
+        self._lock = threading.Lock()
+        for model_id in self.config.get_model_ids():
+            self.guard(model_id)
+
+    def __getattr__(self, name):
+        # exceptions, meta 등 나머지 속성은 원래 클라이언트로 위임
+        return getattr(self.client, name)
+
+    def guard(self, model_id: str) -> ModelGuard:
+        guard = self._guards.get(model_id)
+        if guard is None:
+            with self._lock:
+                guard = self._guards.get(model_id)
+                if guard is None:
+                    limits = self.config.get_rate_limits(model_id)
+                    guard = ModelGuard(model_id, limits['requests_per_minute'], limits['tokens_per_minute'],
+                                       clock=self._clock, sleep=self._sleep)
+                    self._guards[model_id] = guard
+        return guard
+
+    def circuit_state(self, model_id: str) -> str:
+        return self.guard(model_id).breaker.state
+
+    def is_available(self, model_id: str) -> bool:
+        """서킷이 열려 있지 않은지 (호출 전 폴백 여부 판단용, 상태를 바꾸지 않음)"""
+        return self.guard(model_id).breaker.state != 'open'
+
+    def is_throttled(self, model_id: str) -> bool:
+        """요청 한도가 바닥났거나 최근 BACKOFF_MAX_SECONDS 안에 스로틀링을 받았는지 (헤지 등 추가 호출 억제용)"""
+        guard = self.guard(model_id)
+        if guard.last_throttled_at is not None and self._clock() - guard.last_throttled_at < BACKOFF_MAX_SECONDS:
+            return True
+        return guard.requests.available() < 1
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: 0 ~ min(max, base * 2^attempt)
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+    def _wait_for_retry(self, guard: ModelGuard, attempt: int) -> bool:
+        """백오프 후 재시도용 요청 한도 확보 (대기 한도를 넘으면 False)"""
+        self._sleep(self._backoff(attempt))
+        try:
+            guard.requests.acquire(1, timeout=self.max_queue_seconds)
+            return True
+        except TimeoutError:
+            return False
+
+    def _call(self, operation: str, kwargs: Dict[str, Any], reserved_tokens: int) -> Any:
+        model_id = kwargs.get('modelId', '')
+        guard = self.guard(model_id)
+
+        if not guard.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for model {model_id}")
+
+        try:
+            guard.requests.acquire(1, timeout=self.max_queue_seconds)
+        except TimeoutError as e:
+            guard.breaker.release_probe()
+            raise RateLimitedError(f"{model_id}: {str(e)}")
+        try:
+            guard.tokens.acquire(reserved_tokens, timeout=self.max_queue_seconds)
+        except TimeoutError as e:
+            # 호출하지 않았으므로 먼저 확보한 요청 한도는 되돌림
+            guard.requests.refund(1)
+            guard.breaker.release_probe()
+            raise RateLimitedError(f"{model_id}: {str(e)}")
+
+        attempt = 0
+        while True:
+            try:
+                response = getattr(self.client, operation)(**kwargs)
+                guard.breaker.record_success()
+                return response
+            except Exception as e:
+                code = error_code(e)
+                if code in THROTTLING_ERROR_CODES:
+                    guard.last_throttled_at = self._clock()
+                if code in THROTTLING_ERROR_CODES and attempt < self.max_retries and self._wait_for_retry(guard, attempt):
+                    attempt += 1
+                    logger.warning(f"Bedrock {code} ({model_id}), 재시도 {attempt}/{self.max_retries}")
+                    continue
+                if code in CLIENT_ERROR_CODES:
+                    guard.breaker.release_probe()
+                else:
+                    guard.breaker.record_failure()
+                    if guard.breaker.state == 'open':
+                        logger.error(f"Bedrock 서킷 열림: {model_id} ({code})")
+                guard.tokens.refund(reserved_tokens)
+                raise
+
+    def _settle_tokens(self, model_id: str, reserved_tokens: int, usage: Optional[Dict[str, Any]]) -> None:
+        """예약한 토큰과 실제 사용량의 차이를 버킷에 반환"""
+        if usage and 'totalTokens' in usage:
+            unused = reserved_tokens - usage['totalTokens']
+            if unused > 0:
+                self.guard(model_id).tokens.refund(unused)
+
+    def converse(self, **kwargs) -> Dict[str, Any]:
+        reserved = estimate_converse_tokens(kwargs)
+        response = self._call('converse', kwargs, reserved)
+        self._settle_tokens(kwargs.get('modelId', ''), reserved, response.get('usage'))
+        return response
+
+    def converse_stream(self, **kwargs) -> Dict[str, Any]:
+        reserved = estimate_converse_tokens(kwargs)
+        response = self._call('converse_stream', kwargs, reserved)
+        return {**response, 'stream': self._track_stream(kwargs.get('modelId', ''), reserved, response['stream'])}
+
+    def _track_stream(self, model_id: str, reserved: int, stream) -> Iterator[Dict[str, Any]]:
+        """스트림 metadata 이벤트의 usage로 토큰 정산, 스트림 도중 오류는 서킷에 반영"""
+        try:
+            for event in stream:
+                if 'metadata' in event:
+                    self._settle_tokens(model_id, reserved, event['metadata'].get('usage'))
+                yield event
+        except Exception:
+            self.guard(model_id).breaker.record_failure()
+            raise
+
+    def invoke_model(self, **kwargs) -> Dict[str, Any]:
+        return self._call('invoke_model', kwargs, estimate_invoke_tokens(kwargs))
+
+_managed_client = None
+_managed_lock = threading.Lock()
+
+def get_managed_bedrock_client() -> ThrottledBedrockClient:
+    """프로세스 공유 ThrottledBedrockClient (모델별 한도/서킷 상태를 warm 호출 간 유지)"""
+    global _managed_client
+    if _managed_client is None:
+        with _managed_lock:
+            if _managed_client is None:
+                _managed_client = ThrottledBedrockClient()
+    return _managed_client
+
+def reset_managed_bedrock_client() -> None:
+    """공유 클라이언트 초기화 (테스트/로컬 서버용)"""
+    global _managed_client
+    _managed_client = None
@@ -0,0 +1,168 @@
+"""
+회사(테넌트) 프로필 서비스
+cs-companies 테이블의 회사 프로필을 읽어 AI 프롬프트용 컨텍스트를 만든다.
+프로필은 warm 호출 간 공유되는 TTL/LRU 캐시에 두어 AI 호출마다 DynamoDB를 읽지 않는다.
+
+캐시는 컨테이너(프로세스)마다 따로 있다. update_profile/invalidate는 호출한 프로세스의 캐시만 비우므로
+다른 컨테이너는 최대 COMPANY_PROFILE_CACHE_TTL(기본 300초) 동안 이전 프로필을 쓸 수 있다.
+즉시 전체 무효화가 필요하면 COMPANY_PROFILE_CACHE_VERSION을 바꿔 배포한다.
+AI 응답 캐시는 저장된 profileVersion을 키에 넣으므로, 새 프로필을 읽은 컨테이너는 이전 프로필로 만든 응답을 쓰지 않는다.
+"""
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+from botocore.exceptions import ClientError
+
+from src.services.response_cache import InMemoryCacheBackend
+
+logger = logging.getLogger()
+
+PROFILE_CACHE_TTL = int(os.environ.get('COMPANY_PROFILE_CACHE_TTL', '300'))
+# 없는 회사도 잠시 캐시해 매 호출마다 조회하지 않도록 한다
+MISSING_PROFILE_CACHE_TTL = 60
+# 배포 시 값을 바꾸면 모든 컨테이너의 기존 캐시가 무효화된다
+PROFILE_CACHE_VERSION = os.environ.get('COMPANY_PROFILE_CACHE_VERSION', '1')
+MAX_FAQ_SNIPPETS = 20
+
+_MISSING = '__missing__'
+
+def build_company_context(profile: Dict[str, Any]) -> str:
+    """프로필 → 프롬프트의 회사 소개 문구"""
+    name = profile.get('companyName') or profile.get('companyId', '')
+    details = [
+        value for value in (profile.get('industry'), profile.get('businessType'))
+        if value
+    ]
+    context = f"{name}({', '.join(details)})" if details else name
+    if profile.get('description'):
+        context += f"\n회사 소개: {profile['description']}"
+    guidelines = profile.get('guidelines')
+    if guidelines:
+        if isinstance(guidelines, list):
+            guidelines = '\n'.join(f"- {line}" for line in guidelines)
+        context += f"\n회사 응대 정책:\n{guidelines}"
+    return context
+
+def build_faq_snippets(profile: Dict[str, Any]) -> List[str]:
+    """프로필의 FAQ 목록 → system 블록에 넣을 문답 텍스트"""
+    snippets = []
+    for faq in (profile.get('faq') or [])[:MAX_FAQ_SNIPPETS]:
+        if faq.get('question') and faq.get('answer'):
+            snippets.append(f"Q. {faq['question']}\nA. {faq['answer']}")
+    return snippets
+
+class CompanyProfileService:
+    def __init__(self, companies_table=None, ttl_seconds: int = PROFILE_CACHE_TTL,
+                 max_entries: int = 256):
+        if companies_table is None:
+            from src.services.aws_clients import get_table
+            companies_table = get_table(os.environ.get('COMPANY_TABLE', 'cs-companies'))
+        self.companies_table = companies_table
+        self.ttl_seconds = ttl_seconds
+        self.cache = InMemoryCacheBackend(max_entries)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _cache_key(self, company_id: str) -> str:
+        return f"{PROFILE_CACHE_VERSION}:{self._versions.get(company_id, 0)}:{company_id}"
+
+    def get_profile(self, company_id: str) -> Optional[Dict[str, Any]]:
+        """회사 프로필 조회 (캐시 우선, 없거나 오류 시 None)"""
+        if not company_id:
+            return None
+        key = self._cache_key(company_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return None if cached == _MISSING else cached
+
+        try:
+            profile = self.companies_table.get_item(Key={'companyId': company_id}).get('Item')
+        except Exception as e:
+            # 조회 실패는 캐시하지 않는다 (다음 호출에서 다시 시도)
+            logger.error(f"회사 프로필 조회 실패: {company_id}, 오류: {str(e)}")
+            return None
+
+        if profile is None:
+            self.cache.put(key, _MISSING, MISSING_PROFILE_CACHE_TTL)
+        else:
+            self.cache.put(key, profile, self.ttl_seconds)
+        return profile
+
+    def get_profile_version(self, company_id: str) -> Optional[int]:
+        """캐시된 프로필의 profileVersion (프로필이 없으면 None, 수정된 적 없으면 0)"""
+        profile = self.get_profile(company_id)
+        if not profile:
+            return None
+        return int(profile.get('profileVersion', 0))
+
+    def get_prompt_context(self, company_id: str) -> Optional[Dict[str, Any]]:
+        """프롬프트 system 블록용 회사 컨텍스트와 FAQ (프로필이 없으면 None)"""
+        profile = self.get_profile(company_id)
+        if not profile:
+            return None
+        return {
+            'company_context': build_company_context(profile),
+            'faq_snippets': build_faq_snippets(profile)
+        }
+
+    def invalidate(self, company_id: str) -> None:
+        """이 프로세스에서만 회사 캐시 무효화 (다른 컨테이너는 TTL이 지나야 새 프로필을 읽음)
+
+        로컬 버전을 올려 이전 항목은 조회되지 않고 LRU로 밀려나게 한다.
+        """
+        with self._lock:
+            self._versions[company_id] = self._versions.get(company_id, 0) + 1
+
+    def update_profile(self, company_id: str, updates: Dict[str, Any],
+                       expected_version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """프로필 수정 (profileVersion 증가). expected_version이 다르면 None"""
+        try:
+            names = {f'#f{i}': field for i, field in enumerate(updates)}
+            values = {f':v{i}': value for i, value in enumerate(updates.values())}
+            assignments = [f'#f{i} = :v{i}' for i in range(len(updates))]
+            values[':one'] = 1
+            values[':zero'] = 0
+            values[':updated_at'] = datetime.utcnow().isoformat()
+            kwargs = {
+                'Key': {'companyId': company_id},
+                'UpdateExpression': 'SET ' + ', '.join(
+                    assignments + ['profileVersion = if_not_exists(profileVersion, :zero) + :one', 'updatedAt = :updated_at']
+                ),
+                'ExpressionAttributeNames': names,
+                'ExpressionAttributeValues': values,
+                'ReturnValues': 'ALL_NEW'
+            }
+            if expected_version is not None:
+                kwargs['ConditionExpression'] = 'profileVersion = :expected'
+                values[':expected'] = expected_version
+            if not names:
+                del kwargs['ExpressionAttributeNames']
+
+            profile = self.companies_table.update_item(**kwargs)['Attributes']
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.warning(f"회사 프로필 버전 충돌: {company_id}")
+                return None
+            logger.error(f"회사 프로필 수정 실패: {company_id}, 오류: {str(e)}")
+            return None
+        finally:
+            self.invalidate(company_id)
+
+        return profile
+
+_company_profile_service = None
+
+def get_company_profile_service() -> Optional[CompanyProfileService]:
+    """COMPANY_TABLE이 설정된 경우에만 공유 서비스 반환 (warm 호출 간 캐시 유지)"""
+    global _company_profile_service
+    if _company_profile_service is None and os.environ.get('COMPANY_TABLE'):
+        _company_profile_service = CompanyProfileService()
+    return _company_profile_service
+
+def set_company_profile_service(service: Optional[CompanyProfileService]) -> None:
+    """공유 서비스 교체 (테스트/로컬 서버용)"""
+    global _company_profile_service
+    _company_profile_service = service
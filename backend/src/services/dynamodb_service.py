@@ -1,25 +1,63 @@
-import boto3
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterator
 import logging
 from datetime import datetime
-from boto3.dynamodb.conditions import Attr
+from decimal import Decimal
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+from src.utils.pagination import encode_cursor, decode_cursor
+from src.services.aws_clients import get_table
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# GSI 이름 (infra/stacks/data_stack.py 와 동일하게 유지)
+CUSTOMER_EMAIL_INDEX = 'customer-email-index'
+COMPANY_INDEX = 'company-index'
+STATUS_INDEX = 'status-index'
+
+# 쿼리 플래너가 파티션 키로 사용할 수 있는 필터 (선택도가 높은 순)
+# 모든 GSI의 정렬 키는 created_at
+INDEX_BY_FILTER = [
+    ('customerEmail', CUSTOMER_EMAIL_INDEX),
+    ('companyId', COMPANY_INDEX),
+    ('status', STATUS_INDEX),
+]
+
+def end_of_day(created_to: Optional[str]) -> Optional[str]:
+    """날짜만 준 기간 끝(YYYY-MM-DD)은 그날 전체를 포함하도록 마지막 시각으로 (created_at은 isoformat 문자열)"""
+    if created_to and len(created_to) == 10:
+        return f"{created_to}T23:59:59.999999"
+    return created_to
+
+def inquiry_cursor_scope(index_name: str, filters: Dict[str, Any], created_from: Optional[str] = None,
+                         created_to: Optional[str] = None) -> Dict[str, Any]:
+    """페이지 토큰에 서명으로 묶는 조회 조건 (다른 인덱스/필터/기간 조회에 토큰 재사용 방지)"""
+    return {
+        'index': index_name,
+        'filters': {name: value for name, value in filters.items() if value},
+        'from': created_from,
+        'to': created_to
+    }
+
+# 자동 생성 응답은 아직 답변 전(pending)인 문의에만 저장 (재전송/지연 작업이 상담사 답변·종료 상태를 덮지 않게)
+PENDING_CONDITION = '#status = :pending'
+
+# 문의 아이템에 남기는 AI 호출 사용량 항목 수 상한 (이후 호출은 합계만 누적)
+AI_USAGE_MAX_ENTRIES = int(os.environ.get('AI_USAGE_MAX_ENTRIES', '50'))
+
 class DynamoDBService:
-    def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        table_name = os.environ.get('DYNAMODB_TABLE', 'cs-inquiries')
-        self.inquiries_table = self.dynamodb.Table(table_name)
+    def __init__(self, inquiries_table=None):
+        # 기본값: DYNAMODB_TABLE 핸들 (STORAGE_BACKEND=memory면 로컬 테이블, aws_clients에서 재사용)
+        self.inquiries_table = inquiries_table if inquiries_table is not None else get_table()
         # companies_table은 현재 사용하지 않으므로 제거
     
     def create_inquiry(self, inquiry_data: Dict[str, Any]) -> bool:
         """문의 생성"""
         try:
             self.inquiries_table.put_item(Item=inquiry_data)
-            logger.info(f"Inquiry created: {inquiry_data.get('inquiry_id', 'unknown')}")
+            logger.debug("Inquiry created: %s", inquiry_data.get('inquiry_id', 'unknown'))
             return True
         except Exception as e:
             logger.error(f"Error creating inquiry: {str(e)}")
@@ -34,57 +72,150 @@ class DynamoDBService:
             logger.error(f"Error getting inquiry: {str(e)}")
             return None
     
-    def update_inquiry_ai_response(self, inquiry_id: str, ai_response: str) -> bool:
-        """문의에 AI 응답 저장"""
+    def _update_existing_inquiry(self, inquiry_id: str, update_expression: str,
+                                 expression_values: Dict[str, Any],
+                                 expression_names: Dict[str, str],
+                                 return_values: str = 'ALL_NEW',
+                                 extra_condition: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """존재하는 문의만 업데이트하고 갱신된 아이템 반환 (단일 왕복)
+        
+        존재 확인은 ConditionExpression으로 처리하므로 사전 get_item이 필요 없다.
+        문의가 없으면(또는 extra_condition이 거짓이면) None.
+        """
+        condition = 'attribute_exists(inquiry_id)'
+        if extra_condition:
+            condition += f' AND ({extra_condition})'
+        update_kwargs = {
+            'Key': {'inquiry_id': inquiry_id},
+            'UpdateExpression': update_expression,
+            'ConditionExpression': condition,
+            'ExpressionAttributeValues': expression_values,
+            'ReturnValues': return_values
+        }
+        if expression_names:
+            update_kwargs['ExpressionAttributeNames'] = expression_names
+        
         try:
-            logger.info(f"AI 응답 저장 시작: {inquiry_id}, 응답 길이: {len(ai_response) if ai_response else 0}")
-            
-            # 먼저 아이템이 존재하는지 확인
-            existing_item = self.get_inquiry(inquiry_id)
-            if not existing_item:
-                logger.error(f"문의를 찾을 수 없음: {inquiry_id}")
-                return False
-            
-            logger.info(f"기존 문의 상태: {existing_item.get('status', 'unknown')}")
-            
-            self.inquiries_table.update_item(
-                Key={'inquiry_id': inquiry_id},
-                UpdateExpression="SET aiResponse = :ai_response, #status = :status, updatedAt = :updated_at, ai_responded_at = :ai_responded_at",
-                ExpressionAttributeValues={
-                    ':ai_response': ai_response,
-                    ':status': 'ai_responded',
-                    ':updated_at': datetime.utcnow().isoformat(),
-                    ':ai_responded_at': datetime.utcnow().isoformat()
-                },
-                ExpressionAttributeNames={'#status': 'status'}
+            response = self.inquiries_table.update_item(**update_kwargs)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                if extra_condition:
+                    logger.debug("문의 업데이트 조건 불일치: %s", inquiry_id)
+                else:
+                    logger.warning("문의를 찾을 수 없음: %s", inquiry_id)
+                return None
+            raise
+        
+        updated_item = response.get('Attributes', {})
+        # 고객 비밀번호는 업데이트 결과로 노출하지 않음
+        updated_item.pop('customerPassword', None)
+        return updated_item
+    
+    def update_inquiry_ai_response(self, inquiry_id: str, ai_response: str,
+                                   source: Optional[str] = None,
+                                   only_if_pending: bool = False) -> Optional[Dict[str, Any]]:
+        """문의에 AI 응답 저장 후 갱신된 문의 반환 (문의가 없으면 None)
+
+        스로틀링/권한/검증 오류는 그대로 올려 호출자가 '문의 없음'(404)과 구분하게 한다.
+        source: 모델이 아닌 경로로 만든 응답의 출처 (예: 'faq')
+        only_if_pending: 상태가 pending인 문의에만 저장 (아니면 None, 큐 워커/스트리밍용)
+        """
+        now = datetime.utcnow().isoformat()
+        values = {
+            ':ai_response': ai_response,
+            ':status': 'ai_responded',
+            ':updated_at': now,
+            ':ai_responded_at': now
+        }
+        update_expression = "SET aiResponse = :ai_response, #status = :status, updatedAt = :updated_at, ai_responded_at = :ai_responded_at"
+        if source:
+            update_expression += ", aiResponseSource = :source"
+            values[':source'] = source
+        if only_if_pending:
+            values[':pending'] = 'pending'
+        updated_item = self._update_existing_inquiry(
+            inquiry_id,
+            update_expression + " REMOVE aiResponsePartial",
+            values,
+            {'#status': 'status'},
+            extra_condition=PENDING_CONDITION if only_if_pending else None
+        )
+        if updated_item is not None:
+            logger.debug("AI 응답 저장 완료: %s, 응답 길이: %s", inquiry_id, len(ai_response) if ai_response else 0)
+        return updated_item
+
+    def record_ai_usage(self, inquiry_id: str, usage_entry: Dict[str, Any]) -> bool:
+        """AI 호출 사용량 항목을 문의의 aiUsage 목록에 추가하고 토큰/비용 합계 누적
+
+        아이템 크기(400KB)를 넘지 않도록 aiUsage는 AI_USAGE_MAX_ENTRIES개까지만 쌓고,
+        그 뒤 호출은 합계와 생략 건수(aiUsageOmitted)만 누적한다.
+        """
+        try:
+            entry = {
+                key: Decimal(str(value)) if isinstance(value, float) else value
+                for key, value in usage_entry.items()
+            }
+            totals = {
+                ':input_tokens': entry['inputTokens'],
+                ':output_tokens': entry['outputTokens'],
+                ':cost': entry['costUsd']
+            }
+            add_totals = "ADD aiInputTokens :input_tokens, aiOutputTokens :output_tokens, aiCostUsd :cost"
+            appended = self._update_existing_inquiry(
+                inquiry_id,
+                "SET aiUsage = list_append(if_not_exists(aiUsage, :empty), :entry) " + add_totals,
+                {':empty': [], ':entry': [entry], ':max_entries': AI_USAGE_MAX_ENTRIES, **totals},
+                {},
+                return_values='NONE',
+                extra_condition='attribute_not_exists(aiUsage) OR size(aiUsage) < :max_entries'
             )
-            
-            logger.info(f"AI 응답 저장 완료: {inquiry_id}")
-            
-            # 저장 후 확인
-            updated_item = self.get_inquiry(inquiry_id)
-            if updated_item:
-                logger.info(f"저장 후 상태 확인: {updated_item.get('status')}, AI 응답 존재: {bool(updated_item.get('aiResponse'))}")
-            
-            return True
+            if appended is not None:
+                return True
+            # 목록이 가득 찼거나 문의가 없음 - 합계만 누적 (문의가 없으면 다시 None)
+            return self._update_existing_inquiry(
+                inquiry_id,
+                add_totals + ", aiUsageOmitted :one",
+                {':one': 1, **totals},
+                {},
+                return_values='NONE'
+            ) is not None
         except Exception as e:
-            logger.error(f"AI 응답 저장 중 오류: {inquiry_id}, 오류: {str(e)}")
-            import traceback
-            logger.error(f"상세 오류: {traceback.format_exc()}")
+            logger.error(f"AI 사용량 저장 중 오류: {inquiry_id}, 오류: {str(e)}")
+            return False
+    
+    def update_inquiry_partial_response(self, inquiry_id: str, partial_response: str,
+                                        only_if_pending: bool = False) -> bool:
+        """스트리밍 중인 AI 응답 중간 저장 (상태는 바꾸지 않음)"""
+        values = {
+            ':partial': partial_response,
+            ':updated_at': datetime.utcnow().isoformat()
+        }
+        names = {}
+        if only_if_pending:
+            values[':pending'] = 'pending'
+            names['#status'] = 'status'
+        try:
+            return self._update_existing_inquiry(
+                inquiry_id,
+                "SET aiResponsePartial = :partial, updatedAt = :updated_at",
+                values,
+                names,
+                return_values='NONE',
+                extra_condition=PENDING_CONDITION if only_if_pending else None
+            ) is not None
+        except Exception as e:
+            logger.error(f"AI 응답 중간 저장 중 오류: {inquiry_id}, 오류: {str(e)}")
             return False
 
-    def update_inquiry_status(self, inquiry_id: str, status: str, human_response: Optional[str] = None) -> bool:
-        """문의 상태 업데이트"""
+    def update_inquiry_status(self, inquiry_id: str, status: str,
+                              human_response: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """문의 상태 업데이트 후 갱신된 문의 반환 (문의가 없거나 실패 시 None)"""
         try:
-            # 먼저 아이템 존재 여부 확인
-            existing_item = self.get_inquiry(inquiry_id)
-            if not existing_item:
-                return False
-            
+            now = datetime.utcnow().isoformat()
             update_expression = "SET #status = :status, updatedAt = :updated_at"
             expression_values = {
                 ':status': status,
-                ':updated_at': datetime.utcnow().isoformat()
+                ':updated_at': now
             }
             expression_names = {'#status': 'status'}
             
@@ -94,60 +225,153 @@ class DynamoDBService:
             
             if status == 'resolved':
                 update_expression += ", resolvedAt = :resolved_at"
-                expression_values[':resolved_at'] = datetime.utcnow().isoformat()
+                expression_values[':resolved_at'] = now
             
-            response = self.inquiries_table.update_item(
-                Key={'inquiry_id': inquiry_id},
-                UpdateExpression=update_expression,
-                ExpressionAttributeValues=expression_values,
-                ExpressionAttributeNames=expression_names,
-                ReturnValues='ALL_NEW'
+            return self._update_existing_inquiry(
+                inquiry_id, update_expression, expression_values, expression_names
             )
-            
-            return True
         except Exception as e:
             logger.error(f"Error updating inquiry status: {str(e)}")
-            return False
+            return None
+    
+    def plan_inquiry_query(self, filters: Dict[str, Any], created_from: Optional[str] = None,
+                           created_to: Optional[str] = None, limit: int = 50,
+                           cursor: Optional[str] = None) -> Dict[str, Any]:
+        """필터에 맞는 GSI를 골라 Query 파라미터 생성
+        
+        가장 선택도가 높은 필터를 파티션 키로, created_at 범위를 정렬 키 조건으로 쓰고
+        나머지 필터는 FilterExpression으로 적용한다. 결과는 최신순.
+        """
+        active_filters = {name: value for name, value in filters.items() if value}
+        
+        index_name = None
+        key_condition = None
+        for attribute, candidate in INDEX_BY_FILTER:
+            if attribute in active_filters:
+                index_name = candidate
+                key_condition = Key(attribute).eq(active_filters.pop(attribute))
+                break
+        
+        if not index_name:
+            raise ValueError(f"No index for filters: {', '.join(filters) or 'none'}")
+        
+        range_end = end_of_day(created_to)
+        if created_from and range_end:
+            key_condition = key_condition & Key('created_at').between(created_from, range_end)
+        elif created_from:
+            key_condition = key_condition & Key('created_at').gte(created_from)
+        elif range_end:
+            key_condition = key_condition & Key('created_at').lte(range_end)
+        
+        query_kwargs = {
+            'IndexName': index_name,
+            'KeyConditionExpression': key_condition,
+            'ScanIndexForward': False,
+            'Limit': limit
+        }
+        
+        filter_expression = None
+        for attribute, value in active_filters.items():
+            condition = Attr(attribute).eq(value)
+            filter_expression = condition if filter_expression is None else filter_expression & condition
+        if filter_expression is not None:
+            query_kwargs['FilterExpression'] = filter_expression
+        
+        exclusive_start_key = decode_cursor(
+            cursor, inquiry_cursor_scope(index_name, filters, created_from, created_to)
+        )
+        if exclusive_start_key:
+            query_kwargs['ExclusiveStartKey'] = exclusive_start_key
+        
+        return query_kwargs
+    
+    def query_inquiries(self, company_id: Optional[str] = None, status: Optional[str] = None,
+                        customer_email: Optional[str] = None, created_from: Optional[str] = None,
+                        created_to: Optional[str] = None, limit: int = 50,
+                        cursor: Optional[str] = None) -> Dict[str, Any]:
+        """GSI Query로 문의 한 페이지 조회"""
+        filters = {'customerEmail': customer_email, 'companyId': company_id, 'status': status}
+        query_kwargs = self.plan_inquiry_query(filters, created_from, created_to, limit, cursor)
+        
+        response = self.inquiries_table.query(**query_kwargs)
+        
+        scope = inquiry_cursor_scope(query_kwargs['IndexName'], filters, created_from, created_to)
+        return {
+            'items': response.get('Items', []),
+            'next_cursor': encode_cursor(response.get('LastEvaluatedKey'), scope)
+        }
+    
+    def query_inquiry_page(self, filters: Dict[str, Any], limit: int = 50,
+                           exclusive_start_key: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GSI Query로 문의 한 페이지 조회 (서명 토큰 대신 DynamoDB 키를 그대로 주고받음)
+
+        대량 재생성 체크포인트처럼 프로세스를 넘어 이어서 조회해야 하는 내부 작업용.
+        """
+        query_kwargs = self.plan_inquiry_query(filters, limit=limit)
+        if exclusive_start_key:
+            query_kwargs['ExclusiveStartKey'] = exclusive_start_key
+        response = self.inquiries_table.query(**query_kwargs)
+        return {
+            'items': response.get('Items', []),
+            'last_key': response.get('LastEvaluatedKey')
+        }
     
-    def list_inquiries(self, company_id: str, status: str = None, limit: int = 50) -> list:
-        """회사별 문의 목록 조회"""
+    def iter_inquiry_pages(self, company_id: Optional[str] = None, status: Optional[str] = None,
+                           customer_email: Optional[str] = None, created_from: Optional[str] = None,
+                           created_to: Optional[str] = None, page_size: int = 50,
+                           cursor: Optional[str] = None) -> Iterator[list]:
+        """LastEvaluatedKey를 따라가며 문의를 페이지 단위로 yield
+        
+        한 번에 한 페이지만 메모리에 올리므로 대량 조회에도 메모리 사용량이 일정하다.
+        """
+        while True:
+            page = self.query_inquiries(
+                company_id=company_id,
+                status=status,
+                customer_email=customer_email,
+                created_from=created_from,
+                created_to=created_to,
+                limit=page_size,
+                cursor=cursor
+            )
+            if page['items']:
+                yield page['items']
+            cursor = page['next_cursor']
+            if not cursor:
+                return
+    
+    def list_inquiries(self, company_id: str, status: str = None, limit: int = 50,
+                       created_from: Optional[str] = None, created_to: Optional[str] = None) -> list:
+        """회사별 문의 목록 조회 (company-index)"""
         try:
-            # Condition 객체 사용
-            filter_expression = Attr('companyId').eq(company_id)
-            
-            if status:
-                filter_expression = filter_expression & Attr('status').eq(status)
-            
-            response = self.inquiries_table.scan(
-                FilterExpression=filter_expression,
-                Limit=limit
+            page = self.query_inquiries(
+                company_id=company_id,
+                status=status,
+                created_from=created_from,
+                created_to=created_to,
+                limit=limit
             )
-            
-            return response.get('Items', [])
+            return page['items']
             
         except Exception as e:
             logger.error(f"Error listing inquiries: {str(e)}")
             return []
     
+    def query_inquiries_by_email(self, customer_email: str, limit: int = 50,
+                                 cursor: Optional[str] = None) -> Dict[str, Any]:
+        """고객 이메일별 문의 한 페이지 조회 (customer-email-index, 최신순)"""
+        return self.query_inquiries(customer_email=customer_email, limit=limit, cursor=cursor)
+    
     def get_inquiries_by_email(self, customer_email: str, limit: int = 50) -> list:
         """고객 이메일별 문의 목록 조회"""
         try:
-            logger.info(f"Searching inquiries for email: {customer_email}")
-            
-            filter_expression = Attr('customerEmail').eq(customer_email)
-            
-            response = self.inquiries_table.scan(
-                FilterExpression=filter_expression,
-                Limit=limit
-            )
-            
-            items = response.get('Items', [])
-            logger.info(f"Found {len(items)} inquiries for email: {customer_email}")
+            # 첫 페이지만 쓰므로 페이지 토큰은 만들지 않음 (로그인 검증 등 CURSOR_SECRET이 없는 함수에서도 사용)
+            query_kwargs = self.plan_inquiry_query({'customerEmail': customer_email}, limit=limit)
+            items = self.inquiries_table.query(**query_kwargs).get('Items', [])
+            logger.info("Found %s inquiries by customer email", len(items))
             
             return items
             
         except Exception as e:
-            logger.error(f"Error getting inquiries by email {customer_email}: {str(e)}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return []
\ No newline at end of file
+            logger.error(f"Error getting inquiries by customer email: {str(e)}")
+            return []
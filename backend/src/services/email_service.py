@@ -1,13 +1,14 @@
-import boto3
 from typing import Dict, Any
 import logging
 
+from src.services.aws_clients import get_client
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 class EmailService:
     def __init__(self):
-        self.ses = boto3.client('ses', region_name='us-east-1')
+        self.ses = get_client('ses')
         self.sender_email = 'noreply@cs-chatbot.com'
     
     def send_escalation_email(self, inquiry: Dict[str, Any], reason: str) -> bool:
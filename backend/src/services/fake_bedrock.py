@@ -0,0 +1,271 @@
+"""
+오프라인 테스트용 가짜 bedrock-runtime 클라이언트
+실제 Bedrock converse / converse_stream / invoke_model 응답 형식을 그대로 흉내낸다.
+
+성능 테스트용으로 모델별 동작(FakeModelProfile)을 줄 수 있다.
+- 지연 분포: fixed / uniform / normal / lognormal (첫 토큰까지의 시간)
+- 토큰 속도: tokens_per_second로 출력 토큰 생성 시간을 더하고, 스트림은 청크 사이에 나눠 기다린다
+- 오류 주입: throttle_rate 확률 또는 throttle_every 번째 호출마다 ThrottlingException,
+  error_rate 확률로 ModelErrorException
+seed가 같으면 모델별 지연/오류 순서가 같다 (모델마다 별도 난수열).
+요청의 maxTokens보다 긴 응답은 잘라서 stopReason 'max_tokens'로 돌려주고,
+마지막 메시지가 assistant(이어쓰기)면 그 뒤부터 응답한다.
+
+BEDROCK_BACKEND=fake일 때 BEDROCK_FAKE_PROFILE(JSON 문자열 또는 JSON 파일 경로)로 설정한다.
+    {"seed": 7, "default": {"latency": {"distribution": "lognormal", "median_ms": 400, "sigma": 0.5}},
+     "models": {"us.anthropic.claude-sonnet-4-20250514-v1:0": {"tokens_per_second": 60, "throttle_rate": 0.1}}}
+"""
+import io
+import json
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+DEFAULT_FAKE_RESPONSE = (
+    "안녕하세요, 문의해주셔서 감사합니다. "
+    "말씀하신 내용을 확인했으며 아래 순서대로 진행해보시기 바랍니다. "
+    "문제가 계속되면 '사람과 연결' 버튼을 눌러주세요."
+)
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal')
+
+@dataclass
+class FakeModelProfile:
+    """모델 하나의 가짜 동작 설정 (None인 항목은 클라이언트 기본값 사용)"""
+    response_text: Optional[str] = None
+    # {'distribution': 'fixed', 'ms': 0} / {'distribution': 'uniform', 'min_ms', 'max_ms'}
+    # {'distribution': 'normal', 'mean_ms', 'stddev_ms'} / {'distribution': 'lognormal', 'median_ms', 'sigma'}
+    latency: Dict[str, Any] = field(default_factory=lambda: {'distribution': 'fixed', 'ms': 0})
+    tokens_per_second: float = 0.0
+    throttle_rate: float = 0.0
+    throttle_every: int = 0
+    error_rate: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FakeModelProfile':
+        known = {item.name for item in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"알 수 없는 가짜 모델 설정: {sorted(unknown)}")
+        profile = cls(**data)
+        distribution = profile.latency.get('distribution', 'fixed')
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"지원하지 않는 지연 분포: {distribution}")
+        return profile
+
+def sample_latency_ms(latency: Dict[str, Any], rng: random.Random) -> float:
+    """지연 분포에서 한 번 뽑기 (음수는 0으로)"""
+    distribution = latency.get('distribution', 'fixed')
+    if distribution == 'uniform':
+        value = rng.uniform(latency.get('min_ms', 0), latency.get('max_ms', 0))
+    elif distribution == 'normal':
+        value = rng.gauss(latency.get('mean_ms', 0), latency.get('stddev_ms', 0))
+    elif distribution == 'lognormal':
+        value = rng.lognormvariate(math.log(max(latency.get('median_ms', 1), 1e-6)), latency.get('sigma', 0.5))
+    else:
+        value = latency.get('ms', 0)
+    return max(0.0, float(value))
+
+def _fake_error(code: str, operation: str, model_id: str) -> ClientError:
+    return ClientError(
+        {'Error': {'Code': code, 'Message': f'Fake {code} for {model_id}'},
+         'ResponseMetadata': {'HTTPStatusCode': 429 if code == 'ThrottlingException' else 424}},
+        operation
+    )
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get('content', [])
+    if isinstance(content, str):
+        return content
+    return ''.join(block.get('text', '') for block in content)
+
+class _FakeStreamingBody:
+    """botocore StreamingBody처럼 read()만 지원"""
+
+    def __init__(self, payload: bytes):
+        self._stream = io.BytesIO(payload)
+
+    def read(self, amount: Optional[int] = None) -> bytes:
+        return self._stream.read(amount)
+
+class FakeBedrockClient:
+    """converse / converse_stream / invoke_model을 지원하는 가짜 클라이언트"""
+
+    def __init__(self, response_text: str = DEFAULT_FAKE_RESPONSE, chunk_size: int = 8,
+                 chunk_delay: float = 0.0, default: Optional[FakeModelProfile] = None,
+                 models: Optional[Dict[str, FakeModelProfile]] = None, seed: int = 0,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.response_text = response_text
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.default = default or FakeModelProfile()
+        self.models = dict(models or {})
+        self.seed = seed
+        self.calls: List[Dict[str, Any]] = []
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._rngs: Dict[str, random.Random] = {}
+        self._call_counts: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **kwargs) -> 'FakeBedrockClient':
+        """{'seed', 'response_text', 'chunk_size', 'default': {...}, 'models': {model_id: {...}}} 설정으로 생성"""
+        options = {key: config[key] for key in ('seed', 'response_text', 'chunk_size') if key in config}
+        return cls(
+            default=FakeModelProfile.from_dict(config.get('default', {})),
+            models={model_id: FakeModelProfile.from_dict(profile)
+                    for model_id, profile in config.get('models', {}).items()},
+            **options, **kwargs
+        )
+
+    @classmethod
+    def from_env(cls) -> 'FakeBedrockClient':
+        """BEDROCK_FAKE_PROFILE 환경 변수 설정으로 생성 (없으면 지연/오류 없는 기본 클라이언트)"""
+        raw = os.environ.get('BEDROCK_FAKE_PROFILE', '').strip()
+        if not raw:
+            return cls()
+        if not raw.startswith('{'):
+            with open(raw, encoding='utf-8') as profile_file:
+                raw = profile_file.read()
+        return cls.from_config(json.loads(raw))
+
+    def profile(self, model_id: str) -> FakeModelProfile:
+        return self.models.get(model_id, self.default)
+
+    def _response_text(self, model_id: str) -> str:
+        text = self.profile(model_id).response_text
+        return self.response_text if text is None else text
+
+    def _completion(self, request: Dict[str, Any], model_id: str,
+                    max_tokens: Optional[int]) -> Tuple[str, str]:
+        """(응답 텍스트, stopReason) - 이어쓰기 요청이면 나머지 부분만, maxTokens를 넘으면 잘라냄"""
+        text = self._response_text(model_id)
+        messages = request.get('messages', [])
+        if messages and messages[-1].get('role') == 'assistant':
+            prefill = _message_text(messages[-1])
+            if text.startswith(prefill):
+                text = text[len(prefill):]
+        # 토큰 수는 _usage와 같은 글자 수 기반 근사치
+        if max_tokens and len(text) // 2 > max_tokens:
+            return text[:max_tokens * 2], 'max_tokens'
+        return text, 'end_turn'
+
+    def _draw(self, operation: str, model_id: str) -> float:
+        """호출 기록 후 지연(ms) 결정, 주입할 오류가 있으면 예외 발생"""
+        profile = self.profile(model_id)
+        with self._lock:
+            rng = self._rngs.get(model_id)
+            if rng is None:
+                rng = self._rngs[model_id] = random.Random(f'{self.seed}:{model_id}')
+            count = self._call_counts[model_id] = self._call_counts.get(model_id, 0) + 1
+            latency_ms = sample_latency_ms(profile.latency, rng)
+            throttled = (
+                (profile.throttle_every and count % profile.throttle_every == 0)
+                or rng.random() < profile.throttle_rate
+            )
+            failed = not throttled and rng.random() < profile.error_rate
+        if throttled:
+            raise _fake_error('ThrottlingException', operation, model_id)
+        if failed:
+            self._pause(latency_ms)
+            raise _fake_error('ModelErrorException', operation, model_id)
+        return latency_ms
+
+    def _pause(self, milliseconds: float) -> None:
+        if milliseconds > 0:
+            self._sleep(milliseconds / 1000)
+
+    def _generation_ms(self, model_id: str, output_tokens: int) -> float:
+        tokens_per_second = self.profile(model_id).tokens_per_second
+        return output_tokens / tokens_per_second * 1000 if tokens_per_second > 0 else 0.0
+
+    def _usage(self, request: Dict[str, Any], response_text: str) -> Dict[str, int]:
+        # 실제 토크나이저 대신 글자 수 기반 근사치
+        input_text = ''.join(block.get('text', '') for block in request.get('system', []))
+        for message in request.get('messages', []):
+            input_text += _message_text(message)
+        input_tokens = len(input_text) // 2
+        output_tokens = max(1, len(response_text) // 2)
+        return {
+            'inputTokens': input_tokens,
+            'outputTokens': output_tokens,
+            'totalTokens': input_tokens + output_tokens
+        }
+
+    def converse(self, **kwargs) -> Dict[str, Any]:
+        self.calls.append({'operation': 'converse', **kwargs})
+        model_id = kwargs.get('modelId', '')
+        latency_ms = self._draw('Converse', model_id)
+        text, stop_reason = self._completion(kwargs, model_id, kwargs.get('inferenceConfig', {}).get('maxTokens'))
+        usage = self._usage(kwargs, text)
+        latency_ms += self._generation_ms(model_id, usage['outputTokens'])
+        self._pause(latency_ms)
+        return {
+            'output': {'message': {'role': 'assistant', 'content': [{'text': text}]}},
+            'stopReason': stop_reason,
+            'usage': usage,
+            'metrics': {'latencyMs': int(latency_ms)}
+        }
+
+    def converse_stream(self, **kwargs) -> Dict[str, Any]:
+        self.calls.append({'operation': 'converse_stream', **kwargs})
+        model_id = kwargs.get('modelId', '')
+        first_token_ms = self._draw('ConverseStream', model_id)
+        return {'stream': self._stream_events(kwargs, model_id, first_token_ms)}
+
+    def _stream_events(self, request: Dict[str, Any], model_id: str,
+                       first_token_ms: float = 0.0) -> Iterator[Dict[str, Any]]:
+        started = time.monotonic()
+        text, stop_reason = self._completion(request, model_id, request.get('inferenceConfig', {}).get('maxTokens'))
+        usage = self._usage(request, text)
+        chunks = [text[start:start + self.chunk_size] for start in range(0, len(text), self.chunk_size)]
+        chunk_ms = self._generation_ms(model_id, usage['outputTokens']) / max(1, len(chunks))
+
+        self._pause(first_token_ms)
+        yield {'messageStart': {'role': 'assistant'}}
+        for index, chunk in enumerate(chunks):
+            if index:
+                self._pause(chunk_ms)
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield {'contentBlockDelta': {'contentBlockIndex': 0, 'delta': {'text': chunk}}}
+        yield {'contentBlockStop': {'contentBlockIndex': 0}}
+        yield {'messageStop': {'stopReason': stop_reason}}
+        yield {
+            'metadata': {
+                'usage': usage,
+                'metrics': {'latencyMs': int((time.monotonic() - started) * 1000)}
+            }
+        }
+
+    def invoke_model(self, **kwargs) -> Dict[str, Any]:
+        """Anthropic messages 형식 body를 받아 같은 형식의 응답 body 반환"""
+        body = kwargs.get('body') or '{}'
+        request = json.loads(body.decode('utf-8') if isinstance(body, bytes) else body)
+        self.calls.append({'operation': 'invoke_model', **kwargs, 'request': request})
+        model_id = kwargs.get('modelId', '')
+        latency_ms = self._draw('InvokeModel', model_id)
+        text, stop_reason = self._completion(request, model_id, request.get('max_tokens'))
+        usage = self._usage(request, text)
+        latency_ms += self._generation_ms(model_id, usage['outputTokens'])
+        self._pause(latency_ms)
+        payload = {
+            'id': f'msg_fake_{len(self.calls)}',
+            'type': 'message',
+            'role': 'assistant',
+            'model': model_id,
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': stop_reason,
+            'usage': {'input_tokens': usage['inputTokens'], 'output_tokens': usage['outputTokens']}
+        }
+        return {
+            'body': _FakeStreamingBody(json.dumps(payload, ensure_ascii=False).encode('utf-8')),
+            'contentType': 'application/json',
+            'ResponseMetadata': {'HTTPStatusCode': 200}
+        }
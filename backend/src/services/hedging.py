@@ -0,0 +1,196 @@
+"""
+헤지 요청 (hedged request)
+주 모델이 최근 지연 분위수(p95 등) 안에 응답하지 않으면 대체 모델에 같은 요청을 동시에 보내
+먼저 끝난 응답을 사용한다. 진행 중인 Bedrock 호출은 중단할 수 없으므로 늦게 끝난 쪽 결과는 버리고
+그 비용만 추가 비용으로 집계한다.
+
+헤지는 부하를 더하므로 예산(HedgeBudget, 헤지 대상 호출의 BEDROCK_HEDGE_MAX_RATE 비율)을 넘거나
+스레드 풀에 남는 작업자가 없으면 헤지하지 않고 주 모델 결과를 기다린다.
+"""
+import json
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger()
+
+HEDGE_MIN_SAMPLES = 5
+
+def is_hedging_enabled() -> bool:
+    return os.environ.get('BEDROCK_HEDGING', 'off') == 'on'
+
+def get_hedge_delay_seconds(telemetry, model_id: str) -> float:
+    """주 모델 최근 성공 호출의 BEDROCK_HEDGE_PERCENTILE 분위 지연 (샘플이 부족하면 BEDROCK_HEDGE_DELAY_MS)"""
+    percentile = float(os.environ.get('BEDROCK_HEDGE_PERCENTILE', '95'))
+    latency_ms = telemetry.latency_percentile(model_id, percentile / 100, HEDGE_MIN_SAMPLES)
+    if latency_ms is None:
+        latency_ms = float(os.environ.get('BEDROCK_HEDGE_DELAY_MS', '3000'))
+    return latency_ms / 1000
+
+class HedgeStats:
+    """헤지 대상 요청 수, 헤지 발생 수, 대체 모델 승리 수, 버려진 응답 비용"""
+
+    def __init__(self):
+        self.eligible = 0
+        self.hedged = 0
+        self.alternate_wins = 0
+        self.added_cost = 0.0
+        self._emitted = {'eligible': 0, 'hedged': 0, 'alternateWins': 0, 'addedCostUsd': 0.0}
+        self._lock = threading.Lock()
+
+    def record(self, hedged: bool, alternate_won: bool) -> None:
+        with self._lock:
+            self.eligible += 1
+            self.hedged += int(hedged)
+            self.alternate_wins += int(alternate_won)
+
+    def add_cost(self, cost: float) -> None:
+        with self._lock:
+            self.added_cost += cost
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, Any]:
+        return {
+            'eligible': self.eligible,
+            'hedged': self.hedged,
+            'alternateWins': self.alternate_wins,
+            'addedCostUsd': round(self.added_cost, 6),
+            'hedgeRate': round(self.hedged / self.eligible, 4) if self.eligible else 0.0,
+            'winRate': round(self.alternate_wins / self.hedged, 4) if self.hedged else 0.0
+        }
+
+    def emit_metrics(self) -> None:
+        """CloudWatch Embedded Metric Format으로 헤지 지표 출력 (직전 출력 이후 증가분)"""
+        with self._lock:
+            stats = self._stats()
+            delta = {name: stats[name] - self._emitted[name] for name in self._emitted}
+            self._emitted = {name: stats[name] for name in self._emitted}
+        logger.info(json.dumps({
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': 'CSChatbot/AIHedging',
+                    'Dimensions': [[]],
+                    'Metrics': [
+                        {'Name': 'HedgeEligible', 'Unit': 'Count'},
+                        {'Name': 'Hedged', 'Unit': 'Count'},
+                        {'Name': 'HedgeAlternateWins', 'Unit': 'Count'},
+                        {'Name': 'HedgeAddedCostUsd', 'Unit': 'None'}
+                    ]
+                }]
+            },
+            'HedgeEligible': delta['eligible'],
+            'Hedged': delta['hedged'],
+            'HedgeAlternateWins': delta['alternateWins'],
+            'HedgeAddedCostUsd': round(delta['addedCostUsd'], 6)
+        }))
+
+class HedgeBudget:
+    """헤지 대상 호출마다 max_rate만큼 적립하고 헤지 1회에 1을 쓰는 예산 (최대 burst까지 적립)
+
+    장기적으로 헤지 비율이 max_rate를 넘지 않아, 주 모델이 전반적으로 느려져도 요청이 두 배로 늘지 않는다.
+    """
+
+    def __init__(self, max_rate: float = 0.1, burst: float = 3.0):
+        self.max_rate = max_rate
+        self.burst = burst
+        self._balance = burst
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self.burst, self._balance + self.max_rate)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._balance >= 1:
+                self._balance -= 1
+                return True
+            self.denied += 1
+            return False
+
+# 프로세스 공유 지표/예산
+hedge_stats = HedgeStats()
+hedge_budget = HedgeBudget(max_rate=float(os.environ.get('BEDROCK_HEDGE_MAX_RATE', '0.1')),
+                           burst=float(os.environ.get('BEDROCK_HEDGE_BURST', '3')))
+
+# 헤지 호출용 공유 스레드 풀 (늦게 끝난 호출을 기다리지 않고 반환하기 위해 with 블록을 쓰지 않음)
+HEDGE_WORKERS = int(os.environ.get('BEDROCK_HEDGE_WORKERS', '8'))
+_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='bedrock-hedge')
+_busy_workers = 0
+_busy_lock = threading.Lock()
+
+def _submit(call: Callable[[], Any], started: Optional[threading.Event] = None):
+    """풀에 작업 제출 (실행 중인 작업 수를 세고, 실제로 시작되면 started를 알림)"""
+    def run():
+        global _busy_workers
+        with _busy_lock:
+            _busy_workers += 1
+        if started is not None:
+            started.set()
+        try:
+            return call()
+        finally:
+            with _busy_lock:
+                _busy_workers -= 1
+    return _executor.submit(run)
+
+def _has_idle_worker() -> bool:
+    with _busy_lock:
+        return _busy_workers < HEDGE_WORKERS
+
+def run_hedged(primary: Callable[[], Any], alternate: Callable[[], Any], delay_seconds: float,
+               on_discarded: Optional[Callable[[Any], None]] = None,
+               budget: Optional[HedgeBudget] = None) -> Tuple[Any, bool, bool]:
+    """(결과, 헤지 여부, 대체 모델 결과 여부) 반환
+
+    delay_seconds 안에 primary가 끝나면(성공/실패 모두) 그 결과를 그대로 돌려준다.
+    대기 시간은 primary가 풀에서 실제로 시작된 뒤부터 잰다 (풀 대기열에서 기다린 시간으로 헤지하지 않도록).
+    그렇지 않으면 alternate를 함께 실행해 먼저 성공한 결과를 쓰고, 버려진 쪽이 성공하면 on_discarded를 호출한다.
+    budget이 바닥났거나 남는 작업자가 없으면 헤지하지 않고 primary를 기다린다.
+    둘 다 실패하면 마지막 오류를 올린다.
+    """
+    if budget is not None:
+        budget.deposit()
+    started = threading.Event()
+    primary_future = _submit(primary, started)
+    started.wait()
+    done, _ = wait([primary_future], timeout=delay_seconds)
+    if done:
+        return primary_future.result(), False, False
+
+    if not _has_idle_worker() or (budget is not None and not budget.try_spend()):
+        logger.info("헤지 생략 (예산 소진 또는 작업자 부족), 주 모델 응답 대기")
+        return primary_future.result(), False, False
+
+    alternate_future = _submit(alternate)
+    pending = {primary_future, alternate_future}
+    last_error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        succeeded = [future for future in done if future.exception() is None]
+        for future in done:
+            if future.exception() is not None:
+                last_error = future.exception()
+        if not succeeded:
+            continue
+
+        # 동시에 끝났으면 주 모델 결과 우선
+        winner = primary_future if primary_future in succeeded else succeeded[0]
+        for future in (primary_future, alternate_future):
+            if future is not winner:
+                future.cancel()
+                if on_discarded:
+                    future.add_done_callback(
+                        lambda f: f.cancelled() or f.exception() is not None or on_discarded(f.result())
+                    )
+        return winner.result(), True, winner is alternate_future
+
+    raise last_error
@@ -0,0 +1,621 @@
+"""
+로컬 DynamoDB 테이블 엔진 (STORAGE_BACKEND=memory)
+서비스 코드가 쓰는 boto3 Table 인터페이스(put_item / get_item / update_item / delete_item / query / scan)를
+프로세스 메모리에서 구현한다. 부하 테스트, 벤치마크, local_server.py를 AWS 접근 없이 돌리기 위한 용도다.
+
+- GSI: data_stack.py와 같은 키 스키마로 파티션별 정렬 목록을 유지해 Query가 전체 스캔 없이 범위 탐색으로 끝난다
+- 표현식: boto3 conditions(Key/Attr) 객체와 문자열 Condition/UpdateExpression(SET/ADD/REMOVE,
+  if_not_exists, list_append, attribute_exists 등)을 해석한다
+- 조건 실패는 DynamoDB와 같은 ClientError(ConditionalCheckFailedException)로 알린다
+- 숫자는 Decimal로 저장/반환하고 float는 boto3처럼 거부한다
+"""
+import os
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase
+from botocore.exceptions import ClientError
+
+# 테이블 이름(접두사) → 키 스키마. infra/stacks/data_stack.py와 동일하게 유지
+TABLE_SCHEMAS = {
+    'cs-inquiries': {
+        'key': ('inquiry_id', None),
+        'indexes': {
+            'company-index': ('companyId', 'created_at'),
+            'status-index': ('status', 'created_at'),
+            'customer-email-index': ('customerEmail', 'created_at'),
+        }
+    },
+    'admin-inquiries': {
+        'key': ('id', None),
+        'indexes': {
+            'status-created-index': ('status', 'createdAt'),
+            'urgency-created-index': ('urgency', 'createdAt'),
+        }
+    },
+    'admin-users': {'key': ('username', None), 'indexes': {}},
+    'qna-data': {
+        'key': ('id', None),
+        'indexes': {'category-created-index': ('category', 'createdAt')}
+    },
+    'cs-companies': {
+        'key': ('companyId', None),
+        'indexes': {
+            'industry-index': ('industry', 'createdAt'),
+            'businessType-index': ('businessType', 'companySize'),
+        }
+    },
+    'ai-response-cache': {'key': ('cacheKey', None), 'indexes': {}},
+    'ai-usage': {'key': ('companyId', 'period'), 'indexes': {}},
+}
+
+class _Max:
+    """어떤 값보다도 큰 센티널 (정렬 목록 상한 탐색용)"""
+
+    def __eq__(self, other):
+        return other is self
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return other is not self
+
+    __hash__ = object.__hash__
+
+_MAX = _Max()
+_TOKEN_PATTERN = re.compile(r'\s*(<>|<=|>=|[=<>(),.+\-\[\]]|#\w+|:\w+|\w+)')
+_UPDATE_CLAUSES = ('SET', 'REMOVE', 'ADD', 'DELETE')
+
+def _client_error(code: str, message: str, operation: str) -> ClientError:
+    return ClientError({'Error': {'Code': code, 'Message': message}}, operation)
+
+def _to_storage(value: Any) -> Any:
+    """boto3 직렬화 규칙: int → Decimal, float 거부, 컨테이너는 재귀 변환"""
+    if isinstance(value, bool) or value is None or isinstance(value, (str, bytes, Decimal)):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    if isinstance(value, dict):
+        return {key: _to_storage(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_storage(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return {_to_storage(item) for item in value}
+    raise TypeError(f"Unsupported type {type(value)} for value {value!r}")
+
+def _copy(value: Any) -> Any:
+    """호출자가 결과를 수정해도 저장본이 바뀌지 않도록 복사 (deepcopy보다 빠름)"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+def _get_path(item: Dict[str, Any], path: List[str]) -> Tuple[bool, Any]:
+    current: Any = item
+    for part in path:
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        elif isinstance(current, list) and isinstance(part, int) and part < len(current):
+            current = current[part]
+        else:
+            return False, None
+    return True, current
+
+def _set_path(item: Dict[str, Any], path: List[str], value: Any) -> None:
+    current = item
+    for part in path[:-1]:
+        current = current[part]
+    current[path[-1]] = value
+
+def _remove_path(item: Dict[str, Any], path: List[str]) -> None:
+    found, parent = _get_path(item, path[:-1])
+    if found and isinstance(parent, dict):
+        parent.pop(path[-1], None)
+    elif found and isinstance(parent, list) and path[-1] < len(parent):
+        del parent[path[-1]]
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    try:
+        if operator == '=':
+            return left == right
+        if operator == '<>':
+            return left != right
+        if operator == '<':
+            return left < right
+        if operator == '<=':
+            return left <= right
+        if operator == '>':
+            return left > right
+        if operator == '>=':
+            return left >= right
+    except TypeError:
+        # DynamoDB는 타입이 다른 값 비교를 거짓으로 취급
+        return False
+    raise ValueError(f"Unsupported operator: {operator}")
+
+class _Expression:
+    """문자열 Condition/UpdateExpression 파서 (#name, :value 치환 포함)"""
+
+    def __init__(self, text: str, names: Optional[Dict[str, str]], values: Optional[Dict[str, Any]]):
+        self.tokens = [token for token in _TOKEN_PATTERN.findall(text)]
+        if ''.join(self.tokens) != re.sub(r'\s+', '', text):
+            raise ValueError(f"Invalid expression: {text}")
+        self.position = 0
+        self.names = names or {}
+        self.values = {key: _to_storage(value) for key, value in (values or {}).items()}
+
+    def peek(self, offset: int = 0) -> Optional[str]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def take(self, expected: Optional[str] = None) -> str:
+        token = self.peek()
+        if token is None or (expected is not None and token.upper() != expected):
+            raise ValueError(f"Expected {expected or 'token'}, got {token}")
+        self.position += 1
+        return token
+
+    def at_end(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    # 피연산자 -------------------------------------------------------------
+    def path(self) -> List[Any]:
+        parts: List[Any] = [self._name(self.take())]
+        while self.peek() in ('.', '['):
+            if self.take() == '.':
+                parts.append(self._name(self.take()))
+            else:
+                parts.append(int(self.take()))
+                self.take(']')
+        return parts
+
+    def _name(self, token: str) -> str:
+        if token.startswith('#'):
+            if token not in self.names:
+                raise ValueError(f"Unknown attribute name placeholder: {token}")
+            return self.names[token]
+        return token
+
+    def value_token(self) -> Any:
+        token = self.take()
+        if token not in self.values:
+            raise ValueError(f"Unknown attribute value placeholder: {token}")
+        return self.values[token]
+
+    def operand(self, item: Dict[str, Any]) -> Tuple[bool, Any]:
+        """(존재 여부, 값)"""
+        token = self.peek()
+        if token.startswith(':'):
+            return True, self.value_token()
+        lowered = token.lower()
+        if lowered in ('if_not_exists', 'list_append') and self.peek(1) == '(':
+            self.take()
+            self.take('(')
+            first = self.operand(item)
+            self.take(',')
+            second = self.operand(item)
+            self.take(')')
+            if lowered == 'if_not_exists':
+                return True, first[1] if first[0] else second[1]
+            return True, list(first[1] or []) + list(second[1] or [])
+        if lowered == 'size' and self.peek(1) == '(':
+            self.take()
+            self.take('(')
+            found, value = self.operand(item)
+            self.take(')')
+            return found, Decimal(len(value)) if found else None
+        return _get_path(item, self.path())
+
+    # 조건식 ---------------------------------------------------------------
+    def condition(self, item: Dict[str, Any]) -> bool:
+        result = self._and_condition(item)
+        while self.peek() and self.peek().upper() == 'OR':
+            self.take()
+            right = self._and_condition(item)
+            result = result or right
+        return result
+
+    def _and_condition(self, item: Dict[str, Any]) -> bool:
+        result = self._unary_condition(item)
+        while self.peek() and self.peek().upper() == 'AND':
+            self.take()
+            right = self._unary_condition(item)
+            result = result and right
+        return result
+
+    def _unary_condition(self, item: Dict[str, Any]) -> bool:
+        token = self.peek()
+        if token.upper() == 'NOT':
+            self.take()
+            return not self._unary_condition(item)
+        if token == '(':
+            self.take()
+            result = self.condition(item)
+            self.take(')')
+            return result
+        lowered = token.lower()
+        if lowered in ('attribute_exists', 'attribute_not_exists') and self.peek(1) == '(':
+            self.take()
+            self.take('(')
+            found, _ = _get_path(item, self.path())
+            self.take(')')
+            return found if lowered == 'attribute_exists' else not found
+        if lowered in ('begins_with', 'contains') and self.peek(1) == '(':
+            self.take()
+            self.take('(')
+            found, value = self.operand(item)
+            self.take(',')
+            _, expected = self.operand(item)
+            self.take(')')
+            if not found:
+                return False
+            if lowered == 'begins_with':
+                return isinstance(value, str) and value.startswith(expected)
+            return expected in value
+
+        found, left = self.operand(item)
+        operator = self.take()
+        if operator.upper() == 'BETWEEN':
+            _, low = self.operand(item)
+            self.take('AND')
+            _, high = self.operand(item)
+            return found and _compare('>=', left, low) and _compare('<=', left, high)
+        if operator.upper() == 'IN':
+            self.take('(')
+            candidates = [self.operand(item)[1]]
+            while self.peek() == ',':
+                self.take()
+                candidates.append(self.operand(item)[1])
+            self.take(')')
+            return found and left in candidates
+        right_found, right = self.operand(item)
+        return found and right_found and _compare(operator, left, right)
+
+    # 업데이트식 -----------------------------------------------------------
+    def apply_update(self, item: Dict[str, Any]) -> None:
+        """SET/REMOVE/ADD/DELETE 절을 순서대로 적용 (모든 피연산자는 수정 전 값 기준)"""
+        original = _copy(item)
+        while not self.at_end():
+            clause = self.take().upper()
+            if clause not in _UPDATE_CLAUSES:
+                raise ValueError(f"Unknown update clause: {clause}")
+            while True:
+                self._apply_action(clause, item, original)
+                if self.peek() != ',':
+                    break
+                self.take()
+
+    def _apply_action(self, clause: str, item: Dict[str, Any], original: Dict[str, Any]) -> None:
+        path = self.path()
+        if clause == 'REMOVE':
+            _remove_path(item, path)
+            return
+        if clause == 'SET':
+            self.take('=')
+            _, value = self.operand(original)
+            if self.peek() in ('+', '-'):
+                operator = self.take()
+                _, right = self.operand(original)
+                value = value + right if operator == '+' else value - right
+            _set_path(item, path, _copy(value))
+            return
+
+        value = self.value_token()
+        found, current = _get_path(item, path)
+        if clause == 'ADD':
+            if isinstance(value, set):
+                _set_path(item, path, (current if found else set()) | value)
+            else:
+                _set_path(item, path, (current if found else Decimal(0)) + value)
+        elif found:
+            _set_path(item, path, current - value)
+
+def _evaluate_condition(condition: Any, item: Dict[str, Any], names: Optional[Dict[str, str]] = None,
+                        values: Optional[Dict[str, Any]] = None) -> bool:
+    """boto3 conditions 객체 또는 문자열 조건식 평가"""
+    if isinstance(condition, str):
+        expression = _Expression(condition, names, values)
+        result = expression.condition(item)
+        if not expression.at_end():
+            raise ValueError(f"Invalid condition: {condition}")
+        return result
+
+    expression = condition.get_expression()
+    operator = expression['operator']
+    operands = expression['values']
+    if operator == 'AND':
+        return all(_evaluate_condition(operand, item) for operand in operands)
+    if operator == 'OR':
+        return any(_evaluate_condition(operand, item) for operand in operands)
+    if operator == 'NOT':
+        return not _evaluate_condition(operands[0], item)
+
+    found, value = _get_path(item, operands[0].name.split('.'))
+    arguments = [_to_storage(operand) for operand in operands[1:]]
+    if operator == 'attribute_exists':
+        return found
+    if operator == 'attribute_not_exists':
+        return not found
+    if not found:
+        return False
+    if operator == 'BETWEEN':
+        return _compare('>=', value, arguments[0]) and _compare('<=', value, arguments[1])
+    if operator == 'begins_with':
+        return isinstance(value, str) and value.startswith(arguments[0])
+    if operator == 'contains':
+        return arguments[0] in value
+    if operator == 'IN':
+        return value in arguments[0]
+    return _compare(operator, value, arguments[0])
+
+def _key_conditions(condition: ConditionBase) -> List[Tuple[str, str, list]]:
+    """KeyConditionExpression → [(속성, 연산자, 값들)] (AND만 허용)"""
+    expression = condition.get_expression()
+    if expression['operator'] == 'AND':
+        return [part for operand in expression['values'] for part in _key_conditions(operand)]
+    attribute = expression['values'][0]
+    if not isinstance(attribute, AttributeBase):
+        raise ValueError("Invalid KeyConditionExpression")
+    return [(attribute.name, expression['operator'], [_to_storage(value) for value in expression['values'][1:]])]
+
+class _Index:
+    """파티션 값 → (정렬 키, 기본 키) 정렬 목록"""
+
+    def __init__(self, partition_key: str, sort_key: Optional[str]):
+        self.partition_key = partition_key
+        self.sort_key = sort_key
+        self.partitions: Dict[Any, list] = {}
+
+    def entry(self, item: Dict[str, Any], primary: tuple) -> Optional[tuple]:
+        if self.partition_key not in item:
+            return None
+        if self.sort_key is None:
+            return item[self.partition_key], ('', primary)
+        if self.sort_key not in item:
+            # 키 속성이 없는 아이템은 GSI에 들어가지 않음 (sparse index)
+            return None
+        return item[self.partition_key], (item[self.sort_key], primary)
+
+    def add(self, item: Dict[str, Any], primary: tuple) -> None:
+        entry = self.entry(item, primary)
+        if entry:
+            insort(self.partitions.setdefault(entry[0], []), entry[1])
+
+    def remove(self, item: Dict[str, Any], primary: tuple) -> None:
+        entry = self.entry(item, primary)
+        if entry:
+            entries = self.partitions.get(entry[0], [])
+            position = bisect_left(entries, entry[1])
+            if position < len(entries) and entries[position] == entry[1]:
+                del entries[position]
+            if not entries:
+                self.partitions.pop(entry[0], None)
+
+class LocalTable:
+    def __init__(self, table_name: str, key_schema: Tuple[str, Optional[str]],
+                 indexes: Optional[Dict[str, Tuple[str, Optional[str]]]] = None):
+        self.table_name = self.name = table_name
+        self.hash_key, self.range_key = key_schema
+        self._items: Dict[tuple, Dict[str, Any]] = {}
+        self._primary = _Index(self.hash_key, self.range_key)
+        self._indexes = {name: _Index(*schema) for name, schema in (indexes or {}).items()}
+        self._lock = threading.RLock()
+
+    # 키 -------------------------------------------------------------------
+    def _primary_key(self, key: Dict[str, Any], operation: str) -> tuple:
+        expected = [self.hash_key] + ([self.range_key] if self.range_key else [])
+        if set(key) != set(expected) or any(key[name] is None for name in expected):
+            raise _client_error('ValidationException',
+                                'The provided key element does not match the schema', operation)
+        return tuple(_to_storage(key[name]) for name in expected)
+
+    def _key_of(self, primary: tuple) -> Dict[str, Any]:
+        key = {self.hash_key: primary[0]}
+        if self.range_key:
+            key[self.range_key] = primary[1]
+        return key
+
+    def _store(self, primary: tuple, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        for index in [self._primary, *self._indexes.values()]:
+            if old is not None:
+                index.remove(old, primary)
+            if new is not None:
+                index.add(new, primary)
+        if new is None:
+            self._items.pop(primary, None)
+        else:
+            self._items[primary] = new
+
+    def _check_condition(self, kwargs: Dict[str, Any], item: Dict[str, Any], operation: str) -> None:
+        condition = kwargs.get('ConditionExpression')
+        if condition is not None and not _evaluate_condition(
+                condition, item, kwargs.get('ExpressionAttributeNames'), kwargs.get('ExpressionAttributeValues')):
+            raise _client_error('ConditionalCheckFailedException', 'The conditional request failed', operation)
+
+    @staticmethod
+    def _return_values(kwargs: Dict[str, Any], old: Optional[Dict[str, Any]],
+                       new: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return_values = kwargs.get('ReturnValues', 'NONE')
+        if return_values == 'ALL_OLD' and old is not None:
+            return {'Attributes': _copy(old)}
+        if return_values in ('ALL_NEW', 'UPDATED_NEW') and new is not None:
+            return {'Attributes': _copy(new)}
+        return {}
+
+    # 단건 연산 ------------------------------------------------------------
+    def put_item(self, **kwargs) -> Dict[str, Any]:
+        item = _to_storage(kwargs['Item'])
+        primary = self._primary_key({name: item.get(name) for name in (self.hash_key, self.range_key) if name}, 'PutItem')
+        with self._lock:
+            old = self._items.get(primary)
+            self._check_condition(kwargs, old or {}, 'PutItem')
+            self._store(primary, old, item)
+        return self._return_values(kwargs, old, None)
+
+    def get_item(self, **kwargs) -> Dict[str, Any]:
+        primary = self._primary_key(kwargs['Key'], 'GetItem')
+        item = self._items.get(primary)
+        return {'Item': _copy(item)} if item is not None else {}
+
+    def delete_item(self, **kwargs) -> Dict[str, Any]:
+        primary = self._primary_key(kwargs['Key'], 'DeleteItem')
+        with self._lock:
+            old = self._items.get(primary)
+            self._check_condition(kwargs, old or {}, 'DeleteItem')
+            if old is not None:
+                self._store(primary, old, None)
+        return self._return_values(kwargs, old, None)
+
+    def update_item(self, **kwargs) -> Dict[str, Any]:
+        key = kwargs['Key']
+        primary = self._primary_key(key, 'UpdateItem')
+        with self._lock:
+            old = self._items.get(primary)
+            self._check_condition(kwargs, old or {}, 'UpdateItem')
+            new = _copy(old) if old is not None else _to_storage(dict(key))
+            try:
+                expression = _Expression(kwargs.get('UpdateExpression', ''), kwargs.get('ExpressionAttributeNames'),
+                                         kwargs.get('ExpressionAttributeValues'))
+                expression.apply_update(new)
+            except (ValueError, TypeError, KeyError) as e:
+                raise _client_error('ValidationException', str(e), 'UpdateItem')
+            if any(new.get(name) != value for name, value in self._key_of(primary).items()):
+                raise _client_error('ValidationException', 'Cannot update attribute: part of the key', 'UpdateItem')
+            self._store(primary, old, new)
+        return self._return_values(kwargs, old, new)
+
+    # 조회 -----------------------------------------------------------------
+    def query(self, **kwargs) -> Dict[str, Any]:
+        index_name = kwargs.get('IndexName')
+        index = self._primary if index_name is None else self._indexes.get(index_name)
+        if index is None:
+            raise _client_error('ValidationException', f'The table does not have the specified index: {index_name}', 'Query')
+
+        partition_value = None
+        sort_conditions = []
+        for attribute, operator, values in _key_conditions(kwargs['KeyConditionExpression']):
+            if attribute == index.partition_key and operator == '=':
+                partition_value = values[0]
+            elif attribute == index.sort_key:
+                sort_conditions.append((operator, values))
+            else:
+                raise _client_error('ValidationException', f'Query key condition not supported: {attribute}', 'Query')
+        if partition_value is None:
+            raise _client_error('ValidationException', 'Query condition missed key schema element', 'Query')
+
+        with self._lock:
+            entries = self._sort_range(index, partition_value, sort_conditions)
+            forward = kwargs.get('ScanIndexForward', True)
+            start_key = kwargs.get('ExclusiveStartKey')
+            if start_key:
+                marker = (_to_storage(start_key[index.sort_key]) if index.sort_key else '',
+                          self._primary_key({name: start_key[name] for name in self._key_of_names()}, 'Query'))
+                entries = entries[bisect_right(entries, marker):] if forward else entries[:bisect_left(entries, marker)]
+            if not forward:
+                entries = entries[::-1]
+            return self._collect(entries, kwargs, index)
+
+    def _sort_range(self, index: _Index, partition_value: Any, sort_conditions: list) -> list:
+        """파티션에서 정렬 키 조건 범위만 잘라냄 (이진 탐색)"""
+        entries = index.partitions.get(partition_value, [])
+        low, high = 0, len(entries)
+        for operator, values in sort_conditions:
+            if operator in ('>=', 'BETWEEN'):
+                low = max(low, bisect_left(entries, (values[0],)))
+            if operator == '>':
+                low = max(low, bisect_left(entries, (values[0], _MAX)))
+            if operator == '<=' or operator == 'BETWEEN':
+                high = min(high, bisect_left(entries, (values[-1], _MAX)))
+            if operator == '<':
+                high = min(high, bisect_left(entries, (values[0],)))
+            if operator == '=':
+                low = max(low, bisect_left(entries, (values[0],)))
+                high = min(high, bisect_left(entries, (values[0], _MAX)))
+            if operator == 'begins_with':
+                low = max(low, bisect_left(entries, (values[0],)))
+                high = min(high, bisect_left(entries, (values[0] + chr(0x10FFFF),)))
+        return entries[low:high] if low < high else []
+
+    def _key_of_names(self) -> List[str]:
+        return [self.hash_key] + ([self.range_key] if self.range_key else [])
+
+    def _collect(self, entries: list, kwargs: Dict[str, Any], index: Optional[_Index]) -> Dict[str, Any]:
+        """Limit(평가 건수 기준)까지 읽고 FilterExpression 적용, 남으면 LastEvaluatedKey 반환"""
+        limit = kwargs.get('Limit')
+        filter_expression = kwargs.get('FilterExpression')
+        items = []
+        scanned = 0
+        last_primary = None
+        for _, primary in entries:
+            if limit is not None and scanned >= limit:
+                break
+            item = self._items[primary]
+            scanned += 1
+            last_primary = primary
+            if filter_expression is None or _evaluate_condition(
+                    filter_expression, item, kwargs.get('ExpressionAttributeNames'),
+                    kwargs.get('ExpressionAttributeValues')):
+                items.append(_copy(item))
+
+        response: Dict[str, Any] = {'Items': items, 'Count': len(items), 'ScannedCount': scanned}
+        if limit is not None and scanned >= limit and scanned < len(entries):
+            last_key = self._key_of(last_primary)
+            if index is not None:
+                for name in (index.partition_key, index.sort_key):
+                    if name:
+                        last_key[name] = self._items[last_primary][name]
+            response['LastEvaluatedKey'] = last_key
+        return response
+
+    def scan(self, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            entries = [('', primary) for primary in self._items]
+            start_key = kwargs.get('ExclusiveStartKey')
+            if start_key:
+                marker = self._primary_key({name: start_key[name] for name in self._key_of_names()}, 'Scan')
+                positions = [primary for _, primary in entries]
+                entries = entries[positions.index(marker) + 1:] if marker in positions else []
+            return self._collect(entries, kwargs, None)
+
+    def item_count(self) -> int:
+        return len(self._items)
+
+_local_tables: Dict[str, LocalTable] = {}
+_registry_lock = threading.Lock()
+
+def is_local_storage() -> bool:
+    """STORAGE_BACKEND=memory면 DynamoDB 대신 로컬 엔진 사용"""
+    return os.environ.get('STORAGE_BACKEND', 'dynamodb').lower() == 'memory'
+
+def get_schema(table_name: str) -> Dict[str, Any]:
+    """테이블 이름(cs-inquiries-local 등 접미사 포함)에 맞는 스키마"""
+    for base_name in sorted(TABLE_SCHEMAS, key=len, reverse=True):
+        if table_name == base_name or table_name.startswith(base_name + '-'):
+            return TABLE_SCHEMAS[base_name]
+    raise ValueError(f"Unknown table schema: {table_name}")
+
+def get_local_table(table_name: str) -> LocalTable:
+    """이름별 로컬 테이블 (프로세스당 1개)"""
+    table = _local_tables.get(table_name)
+    if table is None:
+        with _registry_lock:
+            table = _local_tables.get(table_name)
+            if table is None:
+                schema = get_schema(table_name)
+                table = LocalTable(table_name, schema['key'], schema['indexes'])
+                _local_tables[table_name] = table
+    return table
+
+def reset_local_tables() -> None:
+    """로컬 테이블 전체 삭제 (테스트/벤치마크 반복용)"""
+    with _registry_lock:
+        _local_tables.clear()
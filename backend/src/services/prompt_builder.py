@@ -0,0 +1,134 @@
+"""
+프롬프트 캐시를 고려한 프롬프트 구성
+회사 컨텍스트/응답 지침/FAQ처럼 문의마다 바뀌지 않는 내용은 system 블록에,
+고객 문의는 user 메시지에 넣어 Bedrock 프롬프트 캐시가 system 블록을 재사용하게 한다.
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+DEFAULT_COMPANY_CONTEXT = "일반적인 고객 서비스"
+
+RESPONSE_GUIDELINES = """다음 지침을 따라 응답해주세요:
+1. 친절하고 전문적인 톤으로 답변
+2. 구체적이고 실행 가능한 해결책 제시
+3. 한국어로 응답
+4. 200자 이상의 상세한 설명"""
+
+# Bedrock 프롬프트 캐시(cachePoint)를 지원하는 모델 ID 패턴
+PROMPT_CACHE_MODEL_PATTERNS = (
+    'claude-sonnet-4', 'claude-opus-4', 'claude-3-7-sonnet', 'claude-3-5-haiku'
+)
+# 캐시 체크포인트 최소 길이 (Claude 모델은 1024 토큰 미만 접두사는 캐시하지 않음)
+PROMPT_CACHE_MIN_TOKENS = int(os.environ.get('BEDROCK_PROMPT_CACHE_MIN_TOKENS', '1024'))
+PROMPT_CACHE_ENABLED = os.environ.get('BEDROCK_PROMPT_CACHE', 'on') != 'off'
+
+def estimate_tokens(text: str) -> int:
+    # 한국어 위주 텍스트의 대략적인 토큰 수
+    return max(1, len(text) // 2)
+
+def supports_prompt_cache(model_id: str) -> bool:
+    return PROMPT_CACHE_ENABLED and any(pattern in model_id for pattern in PROMPT_CACHE_MODEL_PATTERNS)
+
+def build_system_prompt(company_context: Optional[str] = None, faq_snippets: Optional[List[str]] = None) -> str:
+    """문의와 무관하게 고정되는 system 프롬프트 (같은 회사면 항상 같은 문자열)"""
+    sections = [
+        f"당신은 {company_context or DEFAULT_COMPANY_CONTEXT}의 전문 고객 서비스 담당자입니다.",
+        RESPONSE_GUIDELINES
+    ]
+    if faq_snippets:
+        sections.append("참고 FAQ:\n" + "\n\n".join(faq_snippets))
+    return "\n\n".join(sections)
+
+def build_user_prompt(inquiry_data: Dict[str, Any], references: Optional[List[Dict[str, Any]]] = None) -> str:
+    """문의마다 바뀌는 user 메시지 (검색된 참고 Q&A는 캐시 접두사를 깨지 않도록 여기에 넣는다)"""
+    reference_text = ""
+    if references:
+        reference_text = "참고 Q&A (관련 있는 경우에만 활용):\n" + "\n\n".join(
+            f"Q. {reference['question']}\nA. {reference['answer']}" for reference in references
+        ) + "\n\n"
+    return f"""{reference_text}고객 문의:
+제목: {inquiry_data.get('title', '')}
+내용: {inquiry_data.get('content', '')}
+카테고리: {inquiry_data.get('category', 'general')}
+
+응답:"""
+
+class PromptFingerprintRegistry:
+    """system 프롬프트(캐시 가능한 접두사)별 사용 횟수와 실제 캐시 적중 토큰 집계"""
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, fingerprint: str, prefix_tokens: int, cacheable: bool) -> None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    oldest = min(self._entries, key=lambda key: self._entries[key]['lastSeen'])
+                    del self._entries[oldest]
+                entry = self._entries[fingerprint] = {
+                    'fingerprint': fingerprint,
+                    'prefixTokens': prefix_tokens,
+                    'cacheable': cacheable,
+                    'uses': 0,
+                    'cacheReadTokens': 0,
+                    'cacheWriteTokens': 0,
+                    'firstSeen': now
+                }
+            entry['uses'] += 1
+            entry['lastSeen'] = now
+
+    def record_usage(self, fingerprint: str, usage: Optional[Dict[str, Any]]) -> None:
+        """Bedrock 응답 usage의 캐시 읽기/쓰기 토큰 반영"""
+        if not usage:
+            return
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                entry['cacheReadTokens'] += usage.get('cacheReadInputTokens', 0)
+                entry['cacheWriteTokens'] += usage.get('cacheWriteInputTokens', 0)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """접두사별 통계 (재사용 가능한 토큰이 많은 순)"""
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        for entry in entries:
+            entry['reusableTokens'] = entry['prefixTokens'] * max(0, entry['uses'] - 1)
+        return sorted(entries, key=lambda entry: entry['reusableTokens'], reverse=True)
+
+# 프로세스 공유 레지스트리
+fingerprint_registry = PromptFingerprintRegistry()
+
+class PromptBuilder:
+    """converse 요청의 system / messages 구성"""
+
+    def __init__(self, registry: Optional[PromptFingerprintRegistry] = None,
+                 min_cache_tokens: int = PROMPT_CACHE_MIN_TOKENS):
+        self.registry = registry or fingerprint_registry
+        self.min_cache_tokens = min_cache_tokens
+
+    def build(self, inquiry_data: Dict[str, Any], model_id: str, company_context: Optional[str] = None,
+              faq_snippets: Optional[List[str]] = None,
+              references: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """converse(**request) 에 그대로 넘길 system/messages와 접두사 fingerprint 반환"""
+        system_text = build_system_prompt(company_context, faq_snippets)
+        prefix_tokens = estimate_tokens(system_text)
+        fingerprint = hashlib.sha256(system_text.encode('utf-8')).hexdigest()[:16]
+        cacheable = supports_prompt_cache(model_id) and prefix_tokens >= self.min_cache_tokens
+
+        system = [{"text": system_text}]
+        if cacheable:
+            system.append({"cachePoint": {"type": "default"}})
+        self.registry.record(fingerprint, prefix_tokens, cacheable)
+
+        return {
+            'system': system,
+            'messages': [{"role": "user", "content": [{"text": build_user_prompt(inquiry_data, references)}]}],
+            'fingerprint': fingerprint
+        }
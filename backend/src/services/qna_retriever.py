@@ -0,0 +1,303 @@
+"""
+qna-data 테이블 기반 검색 (RAG)
+회사/카테고리별 Q&A를 TF-IDF 역색인으로 만들어 문의와 가장 관련 있는 항목 k개를 찾는다.
+색인은 디스크(/tmp)와 선택적으로 S3에 저장해 cold start 시 DynamoDB를 다시 읽지 않고 불러온다.
+
+Lambda 배포 패키지에 NumPy가 없으므로 벡터 연산은 표준 라이브러리만으로 구현했다.
+문자 bigram 기반 희소 벡터 + 역색인이라 수천 건 규모에서 검색은 수 ms 이내다.
+"""
+import gzip
+import hashlib
+import heapq
+import json
+import math
+import os
+import threading
+import time
+import logging
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Attr, Key
+
+from src.services.response_cache import normalize_text
+
+logger = logging.getLogger()
+
+QNA_CATEGORY_INDEX = 'category-created-index'
+QNA_TOP_K = int(os.environ.get('QNA_TOP_K', '3'))
+QNA_MIN_SCORE = float(os.environ.get('QNA_MIN_SCORE', '0.15'))
+QNA_INDEX_TTL = int(os.environ.get('QNA_INDEX_TTL', '3600'))
+QNA_INDEX_DIR = os.environ.get('QNA_INDEX_DIR', '/tmp/qna-index')
+# 메모리에 유지할 (회사, 카테고리) 색인 수 (LRU) / 색인 생성 잠금 분할 수
+QNA_INDEX_MAX_ENTRIES = int(os.environ.get('QNA_INDEX_MAX_ENTRIES', '128'))
+QNA_BUILD_LOCK_STRIPES = 16
+# 이 유사도 이상으로 질문이 일치하면 모델 호출 없이 Q&A 답변을 그대로 사용
+FAQ_MATCH_THRESHOLD = float(os.environ.get('FAQ_MATCH_THRESHOLD', '0.8'))
+
+def tokenize(text: str) -> List[str]:
+    """단어 + 단어 내부 문자 bigram (조사/어미가 붙는 한국어에서 부분 일치를 잡기 위함)"""
+    tokens = []
+    for word in normalize_text(text).split():
+        tokens.append(f"w:{word}")
+        if len(word) >= 2:
+            tokens.extend(f"c:{word[i:i + 2]}" for i in range(len(word) - 1))
+    return tokens
+
+class QnAIndex:
+    """L2 정규화된 TF-IDF 희소 벡터의 역색인"""
+
+    def __init__(self, entries: List[Dict[str, Any]], idf: Dict[str, float],
+                 postings: Dict[str, List[Tuple[int, float]]], built_at: float,
+                 question_postings: Optional[Dict[str, List[Tuple[int, float]]]] = None):
+        self.entries = entries
+        self.idf = idf
+        self.postings = postings
+        self.question_postings = question_postings or {}
+        self.built_at = built_at
+
+    @classmethod
+    def build(cls, entries: List[Dict[str, Any]]) -> 'QnAIndex':
+        docs = [Counter(tokenize(f"{entry['question']} {entry['question']} {entry['answer']}")) for entry in entries]
+        questions = [Counter(tokenize(entry['question'])) for entry in entries]
+        doc_freq = Counter(term for doc in docs for term in doc)
+        total = len(docs)
+        idf = {term: math.log((1 + total) / (1 + df)) + 1.0 for term, df in doc_freq.items()}
+        return cls(entries, idf, cls._build_postings(docs, idf), time.time(),
+                   question_postings=cls._build_postings(questions, idf))
+
+    @staticmethod
+    def _build_postings(docs: List[Counter], idf: Dict[str, float]) -> Dict[str, List[Tuple[int, float]]]:
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for doc_id, doc in enumerate(docs):
+            weights = {term: (1 + math.log(tf)) * idf[term] for term, tf in doc.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                postings.setdefault(term, []).append((doc_id, weight / norm))
+        return postings
+
+    def search(self, query: str, k: int = QNA_TOP_K, min_score: float = QNA_MIN_SCORE,
+               questions_only: bool = False) -> List[Dict[str, Any]]:
+        """코사인 유사도 상위 k개 (score 포함). questions_only면 질문 문장과만 비교"""
+        postings = self.question_postings if questions_only else self.postings
+        terms = Counter(tokenize(query))
+        if not terms:
+            return []
+        # 색인에 없는 단어도 노름에 포함해야 질문과 상관없는 내용이 섞인 문의의 점수가 낮아진다
+        unseen_idf = math.log(1 + len(self.entries)) + 1.0
+        weights = {term: (1 + math.log(tf)) * self.idf.get(term, unseen_idf) for term, tf in terms.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+
+        scores: Dict[int, float] = {}
+        for term, weight in weights.items():
+            for doc_id, doc_weight in postings.get(term, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * doc_weight
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [
+            {**self.entries[doc_id], 'score': round(score / norm, 4)}
+            for doc_id, score in top if score / norm >= min_score
+        ]
+
+    def to_bytes(self) -> bytes:
+        return gzip.compress(json.dumps({
+            'entries': self.entries,
+            'idf': self.idf,
+            'postings': self.postings,
+            'questionPostings': self.question_postings,
+            'builtAt': self.built_at
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> 'QnAIndex':
+        data = json.loads(gzip.decompress(raw).decode('utf-8'))
+        postings, question_postings = (
+            {term: [tuple(posting) for posting in items] for term, items in data.get(field, {}).items()}
+            for field in ('postings', 'questionPostings')
+        )
+        return cls(data['entries'], data['idf'], postings, data['builtAt'], question_postings)
+
+def _company_exists(company_id: str) -> bool:
+    """cs-companies에 등록된 회사인지 (COMPANY_TABLE 미설정 시 확인하지 않음)"""
+    from src.services.company_profile_service import get_company_profile_service
+    service = get_company_profile_service()
+    return service is None or service.get_profile(company_id) is not None
+
+class QnARetriever:
+    """회사/카테고리별 색인 관리 (메모리 → 디스크 → S3 → DynamoDB 순으로 조회)
+
+    companyId/category는 요청 본문 값이므로 파일/S3 이름은 해시로만 만들고,
+    등록되지 않은 회사는 색인을 만들지 않는다. 메모리 색인은 LRU로 제한하고,
+    색인 생성은 키별(분할) 잠금으로 직렬화해 한 회사의 생성이 다른 회사의 검색을 막지 않게 한다.
+    """
+
+    def __init__(self, qna_table=None, index_dir: str = QNA_INDEX_DIR,
+                 s3_bucket: Optional[str] = None, ttl_seconds: int = QNA_INDEX_TTL,
+                 max_entries: int = QNA_INDEX_MAX_ENTRIES,
+                 company_exists: Optional[Callable[[str], bool]] = None):
+        if qna_table is None:
+            from src.services.aws_clients import get_table
+            qna_table = get_table(os.environ.get('QNA_TABLE', 'qna-data'))
+        self.qna_table = qna_table
+        self.index_dir = index_dir
+        self.s3_bucket = s3_bucket if s3_bucket is not None else os.environ.get('QNA_INDEX_BUCKET')
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.company_exists = company_exists or _company_exists
+        self._indexes: 'OrderedDict[Tuple[str, str], QnAIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks = [threading.Lock() for _ in range(QNA_BUILD_LOCK_STRIPES)]
+
+    def _object_name(self, company_id: str, category: str) -> str:
+        digest = hashlib.sha256(json.dumps([company_id, category]).encode('utf-8')).hexdigest()
+        return f"{digest[:40]}.json.gz"
+
+    def _is_fresh(self, index: Optional[QnAIndex]) -> bool:
+        return index is not None and time.time() - index.built_at < self.ttl_seconds
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[QnAIndex]:
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+            return index
+
+    def _store(self, key: Tuple[str, str], index: QnAIndex) -> None:
+        with self._lock:
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_entries:
+                self._indexes.popitem(last=False)
+
+    def get_index(self, company_id: str, category: str) -> QnAIndex:
+        key = (company_id, category)
+        index = self._cached(key)
+        if self._is_fresh(index):
+            return index
+
+        with self._build_locks[hash(key) % len(self._build_locks)]:
+            index = self._cached(key)
+            if self._is_fresh(index):
+                return index
+            if company_id and not self.company_exists(company_id):
+                # 없는 회사는 저장/S3 쓰기 없이 빈 색인 (공용 Q&A 조회도 하지 않음)
+                logger.info("QnA 색인 생략 (등록되지 않은 회사): %s", company_id)
+                return QnAIndex.build([])
+            index = self._load_persisted(company_id, category)
+            if not self._is_fresh(index):
+                index = QnAIndex.build(self._load_entries(company_id, category))
+                self._persist(company_id, category, index)
+                logger.info("QnA 색인 생성: %s/%s, %s건", company_id, category, len(index.entries))
+            self._store(key, index)
+        return index
+
+    def _load_entries(self, company_id: str, category: str) -> List[Dict[str, Any]]:
+        """category GSI로 해당 회사(또는 공용) Q&A 로드"""
+        query_kwargs = {
+            'IndexName': QNA_CATEGORY_INDEX,
+            'KeyConditionExpression': Key('category').eq(category),
+            'FilterExpression': Attr('companyId').eq(company_id) | Attr('companyId').not_exists()
+        }
+        entries = []
+        while True:
+            response = self.qna_table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                if item.get('question') and item.get('answer'):
+                    entries.append({'id': item.get('id'), 'question': item['question'], 'answer': item['answer']})
+            if 'LastEvaluatedKey' not in response:
+                return entries
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def _load_persisted(self, company_id: str, category: str) -> Optional[QnAIndex]:
+        name = self._object_name(company_id, category)
+        path = os.path.join(self.index_dir, name)
+        try:
+            with open(path, 'rb') as f:
+                index = QnAIndex.from_bytes(f.read())
+            if self._is_fresh(index):
+                return index
+        except (OSError, ValueError):
+            pass
+
+        if self.s3_bucket:
+            try:
+                from src.services.aws_clients import get_client
+                raw = get_client('s3').get_object(Bucket=self.s3_bucket, Key=f"qna-index/{name}")['Body'].read()
+                index = QnAIndex.from_bytes(raw)
+                self._write_local(path, raw)
+                return index
+            except Exception as e:
+                logger.info("S3 QnA 색인 없음: %s (%s)", name, e)
+        return None
+
+    def _write_local(self, path: str, raw: bytes) -> None:
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("QnA 색인 디스크 저장 실패: %s", e)
+
+    def _persist(self, company_id: str, category: str, index: QnAIndex) -> None:
+        name = self._object_name(company_id, category)
+        raw = index.to_bytes()
+        self._write_local(os.path.join(self.index_dir, name), raw)
+        if self.s3_bucket:
+            try:
+                from src.services.aws_clients import get_client
+                get_client('s3').put_object(Bucket=self.s3_bucket, Key=f"qna-index/{name}", Body=raw)
+            except Exception as e:
+                logger.warning("QnA 색인 S3 저장 실패: %s", e)
+
+    def invalidate(self, company_id: str, category: str) -> None:
+        """Q&A 변경 후 색인 재생성이 필요할 때 호출"""
+        with self._lock:
+            self._indexes.pop((company_id, category), None)
+        try:
+            os.remove(os.path.join(self.index_dir, self._object_name(company_id, category)))
+        except OSError:
+            pass
+
+    def retrieve(self, inquiry_data: Dict[str, Any], k: int = QNA_TOP_K) -> List[Dict[str, Any]]:
+        """문의와 관련된 Q&A 상위 k개 (오류 시 빈 목록)"""
+        try:
+            index = self.get_index(inquiry_data.get('companyId', ''), inquiry_data.get('category', 'general'))
+            return index.search(f"{inquiry_data.get('title', '')} {inquiry_data.get('content', '')}", k)
+        except Exception as e:
+            logger.error(f"QnA 검색 실패: {str(e)}")
+            return []
+
+    def match(self, inquiry_data: Dict[str, Any],
+              threshold: float = FAQ_MATCH_THRESHOLD) -> Optional[Dict[str, Any]]:
+        """질문이 거의 같은 Q&A 1건 (없거나 오류 시 None)"""
+        try:
+            index = self.get_index(inquiry_data.get('companyId', ''), inquiry_data.get('category', 'general'))
+            results = index.search(f"{inquiry_data.get('title', '')} {inquiry_data.get('content', '')}",
+                                   k=1, min_score=threshold, questions_only=True)
+            return results[0] if results else None
+        except Exception as e:
+            logger.error(f"FAQ 매칭 실패: {str(e)}")
+            return None
+
+_qna_retriever = None
+
+def get_qna_retriever() -> Optional[QnARetriever]:
+    """QNA_TABLE이 설정된 경우에만 공유 검색기 반환 (warm 호출 간 색인 유지)"""
+    global _qna_retriever
+    if _qna_retriever is None and os.environ.get('QNA_TABLE'):
+        _qna_retriever = QnARetriever()
+    return _qna_retriever
+
+def match_faq(inquiry_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """문의 생성 시 FAQ 즉시 응답용 매칭 (FAQ_SHORT_CIRCUIT=off거나 QNA_TABLE 미설정 시 None)"""
+    if os.environ.get('FAQ_SHORT_CIRCUIT', 'on') == 'off':
+        return None
+    retriever = get_qna_retriever()
+    return retriever.match(inquiry_data) if retriever else None
+
+def set_qna_retriever(retriever: Optional[QnARetriever]) -> None:
+    """공유 검색기 교체 (테스트/로컬 서버용)"""
+    global _qna_retriever
+    _qna_retriever = retriever
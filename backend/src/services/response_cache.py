@@ -0,0 +1,302 @@
+"""
+AI 응답 캐시
+정규화한 문의 내용(회사/카테고리/제목/본문) 해시로 AI 응답을 캐시한다.
+저장소는 인메모리(LRU) / 로컬 디스크 / DynamoDB 중 선택하며,
+선택적으로 문자 n-gram 유사도로 거의 같은 문의도 캐시에서 응답한다.
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+logger = logging.getLogger()
+
+CACHE_KEY_FIELDS = ('companyId', 'category')
+
+def normalize_text(text: str) -> str:
+    """대소문자/전각/공백/문장부호 차이를 없앤 비교용 문자열"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return ' '.join(text.split())
+
+def make_cache_key(inquiry_data: Dict[str, Any], profile_version: Optional[int] = None) -> str:
+    """회사/카테고리/정규화된 제목+본문 기반 캐시 키
+
+    profile_version(회사 프로필의 profileVersion)을 주면 키에 포함해, 프로필이 바뀌면 이전 응답을 쓰지 않는다.
+    """
+    parts = [
+        inquiry_data.get('companyId', ''),
+        inquiry_data.get('category', 'general'),
+        normalize_text(inquiry_data.get('title', '')),
+        normalize_text(inquiry_data.get('content', ''))
+    ]
+    if profile_version is not None:
+        parts.append(f"profile:{profile_version}")
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+def ngram_vector(text: str, n: int = 3) -> Counter:
+    """문자 n-gram 빈도 벡터 (한국어처럼 띄어쓰기가 불규칙한 텍스트에 적합)"""
+    compact = normalize_text(text).replace(' ', '')
+    if len(compact) < n:
+        return Counter([compact]) if compact else Counter()
+    return Counter(compact[i:i + n] for i in range(len(compact) - n + 1))
+
+def cosine_similarity(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b.get(gram, 0) for gram, count in a.items())
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+class InMemoryCacheBackend:
+    """TTL + LRU 크기 제한이 있는 프로세스 내 캐시"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class DiskCacheBackend:
+    """로컬 디스크 캐시 (키당 JSON 파일, 로컬 서버/벤치마크용)"""
+
+    def __init__(self, directory: str, max_entries: int = 10000):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry['expiresAt'] < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        os.utime(path)  # LRU 순서를 mtime으로 관리
+        return entry['value']
+
+    def put(self, key: str, value: str, ttl_seconds: int) -> None:
+        tmp_path = self._path(key) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'expiresAt': time.time() + ttl_seconds, 'value': value}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        files = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        overflow = len(files) - self.max_entries
+        if overflow <= 0:
+            return
+        paths = sorted((os.path.join(self.directory, name) for name in files), key=os.path.getmtime)
+        for path in paths[:overflow]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+class DynamoDBCacheBackend:
+    """DynamoDB 캐시 테이블 (cacheKey 파티션 키, expiresAt TTL 속성)"""
+
+    def __init__(self, table=None, table_name: Optional[str] = None):
+        if table is None:
+            from src.services.aws_clients import get_table
+            table = get_table(table_name or os.environ.get('AI_RESPONSE_CACHE_TABLE', 'ai-response-cache'))
+        self.table = table
+
+    def get(self, key: str) -> Optional[str]:
+        item = self.table.get_item(Key={'cacheKey': key}).get('Item')
+        # DynamoDB TTL 삭제는 지연될 수 있으므로 만료 시각을 직접 확인
+        if not item or int(item.get('expiresAt', 0)) < time.time():
+            return None
+        return item.get('value')
+
+    def put(self, key: str, value: str, ttl_seconds: int) -> None:
+        self.table.put_item(Item={
+            'cacheKey': key,
+            'value': value,
+            'expiresAt': int(time.time() + ttl_seconds)
+        })
+
+class ResponseCache:
+    """AIService 앞단의 응답 캐시 (정확 일치 + 선택적 유사도 조회)"""
+
+    def __init__(self, backend, ttl_seconds: int = 86400,
+                 similarity_threshold: Optional[float] = None,
+                 embed_fn: Callable[[str], Counter] = ngram_vector,
+                 max_similarity_entries: int = 500):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embed_fn = embed_fn
+        self.max_similarity_entries = max_similarity_entries
+        # (companyId, category, 프로필 버전) 별 최근 문의 벡터 → 캐시 키
+        self._similarity_index: Dict[tuple, "OrderedDict[str, Counter]"] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._emitted = {'hits': 0, 'similarHits': 0, 'misses': 0}
+
+    def _bucket(self, inquiry_data: Dict[str, Any], profile_version: Optional[int] = None) -> tuple:
+        return tuple(inquiry_data.get(field, '') for field in CACHE_KEY_FIELDS) + (profile_version,)
+
+    def _text(self, inquiry_data: Dict[str, Any]) -> str:
+        return f"{inquiry_data.get('title', '')} {inquiry_data.get('content', '')}"
+
+    def get(self, inquiry_data: Dict[str, Any], profile_version: Optional[int] = None) -> Optional[str]:
+        try:
+            value = self.backend.get(make_cache_key(inquiry_data, profile_version))
+            if value is not None:
+                self._count('hits')
+                return value
+
+            if self.similarity_threshold is not None:
+                similar_key = self._find_similar(inquiry_data, profile_version)
+                if similar_key:
+                    value = self.backend.get(similar_key)
+                    if value is not None:
+                        self._count('similar_hits')
+                        return value
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"AI 응답 캐시 조회 실패: {str(e)}")
+
+        self._count('misses')
+        return None
+
+    def _count(self, name: str) -> None:
+        # 스트리밍/헤지 스레드에서 동시에 조회하므로 카운터는 락 안에서 증가
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def put(self, inquiry_data: Dict[str, Any], response: str, profile_version: Optional[int] = None) -> None:
+        key = make_cache_key(inquiry_data, profile_version)
+        try:
+            self.backend.put(key, response, self.ttl_seconds)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"AI 응답 캐시 저장 실패: {str(e)}")
+            return
+
+        if self.similarity_threshold is not None:
+            with self._lock:
+                bucket = self._similarity_index.setdefault(self._bucket(inquiry_data, profile_version), OrderedDict())
+                bucket[key] = self.embed_fn(self._text(inquiry_data))
+                while len(bucket) > self.max_similarity_entries:
+                    bucket.popitem(last=False)
+
+    def _find_similar(self, inquiry_data: Dict[str, Any], profile_version: Optional[int] = None) -> Optional[str]:
+        vector = self.embed_fn(self._text(inquiry_data))
+        with self._lock:
+            candidates: List[Tuple[str, Counter]] = list(
+                self._similarity_index.get(self._bucket(inquiry_data, profile_version), {}).items()
+            )
+        best_key, best_score = None, self.similarity_threshold
+        for key, candidate in candidates:
+            score = cosine_similarity(vector, candidate)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.similar_hits + self.misses
+        return {
+            'hits': self.hits,
+            'similarHits': self.similar_hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hitRate': round((self.hits + self.similar_hits) / lookups, 4) if lookups else 0.0
+        }
+
+    def emit_metrics(self) -> None:
+        """CloudWatch Embedded Metric Format으로 히트/미스 지표 출력 (직전 출력 이후 증가분)"""
+        with self._lock:
+            stats = self._stats()
+            delta = {name: stats[name] - self._emitted[name] for name in self._emitted}
+            self._emitted = {name: stats[name] for name in self._emitted}
+        logger.info(json.dumps({
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': 'CSChatbot/AIResponseCache',
+                    'Dimensions': [[]],
+                    'Metrics': [
+                        {'Name': 'CacheHits', 'Unit': 'Count'},
+                        {'Name': 'CacheSimilarHits', 'Unit': 'Count'},
+                        {'Name': 'CacheMisses', 'Unit': 'Count'}
+                    ]
+                }]
+            },
+            'CacheHits': delta['hits'],
+            'CacheSimilarHits': delta['similarHits'],
+            'CacheMisses': delta['misses']
+        }))
+
+_response_cache = None
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """AI_RESPONSE_CACHE 환경변수(memory/disk/dynamodb/off)에 따른 공유 캐시"""
+    global _response_cache
+    if _response_cache is None:
+        mode = os.environ.get('AI_RESPONSE_CACHE', 'off')
+        if mode == 'off':
+            return None
+        if mode == 'memory':
+            backend = InMemoryCacheBackend(int(os.environ.get('AI_RESPONSE_CACHE_MAX_ENTRIES', '1000')))
+        elif mode == 'disk':
+            backend = DiskCacheBackend(os.environ.get('AI_RESPONSE_CACHE_DIR', '/tmp/ai-response-cache'))
+        elif mode == 'dynamodb':
+            backend = DynamoDBCacheBackend()
+        else:
+            raise ValueError(f"Unknown AI_RESPONSE_CACHE mode: {mode}")
+        threshold = os.environ.get('AI_RESPONSE_CACHE_SIMILARITY')
+        _response_cache = ResponseCache(
+            backend,
+            ttl_seconds=int(os.environ.get('AI_RESPONSE_CACHE_TTL', '86400')),
+            similarity_threshold=float(threshold) if threshold else None
+        )
+    return _response_cache
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """공유 캐시 교체 (테스트/로컬 서버용)"""
+    global _response_cache
+    _response_cache = cache
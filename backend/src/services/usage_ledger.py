@@ -0,0 +1,162 @@
+"""
+Bedrock 사용량/비용 기록
+AI 호출마다 모델, 입력/출력/캐시 토큰, 지연, 폴백 여부, 추정 비용을 문의 아이템(aiUsage)에 남기고
+회사별 일 단위 집계 아이템(ai-usage 테이블)에 누적한다.
+집계 아이템은 ADD 연산으로만 갱신하므로 동시 호출에도 읽기 없이 한 번의 쓰기로 끝나고,
+대시보드는 기간 내 일자 아이템만 Query하면 된다.
+"""
+import os
+import time
+import logging
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Any, Optional
+from urllib.parse import unquote
+
+from boto3.dynamodb.conditions import Key
+
+from config.model_telemetry import estimate_cost
+from src.utils.validation import normalize_category
+
+logger = logging.getLogger()
+
+USAGE_RETENTION_DAYS = int(os.environ.get('AI_USAGE_RETENTION_DAYS', '400'))
+# 일자 아이템에 누적하는 합계 필드
+TOTAL_FIELDS = ('calls', 'inputTokens', 'outputTokens', 'cacheReadTokens', 'cacheWriteTokens',
+                'costUsd', 'latencyMsTotal', 'fallbacks')
+BREAKDOWN_FIELDS = ('calls', 'costUsd')
+
+def _decimal(value: float) -> Decimal:
+    return Decimal(str(round(value, 6)))
+
+def _breakdown_attribute(dimension: str, value: str, field: str) -> str:
+    """분해 집계 속성 이름 "<차원>#<값>#<필드>" (값의 '#'와 '%'는 퍼센트 인코딩)"""
+    return f"{dimension}#{value.replace('%', '%25').replace('#', '%23')}#{field}"
+
+def build_usage_entry(model_id: str, usage: Optional[Dict[str, Any]], latency_ms: float,
+                      server_latency_ms: Optional[float] = None, fallback: bool = False,
+                      operation: str = 'converse') -> Dict[str, Any]:
+    """Bedrock 응답 usage/metrics → 문의에 저장할 사용량 항목"""
+    usage = usage or {}
+    input_tokens = int(usage.get('inputTokens', 0))
+    output_tokens = int(usage.get('outputTokens', 0))
+    cache_read = int(usage.get('cacheReadInputTokens', 0))
+    cache_write = int(usage.get('cacheWriteInputTokens', 0))
+    return {
+        'modelId': model_id,
+        'operation': operation,
+        'inputTokens': input_tokens,
+        'outputTokens': output_tokens,
+        'cacheReadTokens': cache_read,
+        'cacheWriteTokens': cache_write,
+        'latencyMs': int(latency_ms),
+        'serverLatencyMs': int(server_latency_ms) if server_latency_ms is not None else None,
+        'fallback': fallback,
+        'costUsd': round(estimate_cost(model_id, input_tokens, output_tokens, cache_read, cache_write), 6),
+        'at': datetime.utcnow().isoformat()
+    }
+
+class UsageLedger:
+    def __init__(self, usage_table=None, db_service=None, retention_days: int = USAGE_RETENTION_DAYS):
+        if usage_table is None:
+            from src.services.aws_clients import get_table
+            usage_table = get_table(os.environ.get('AI_USAGE_TABLE', 'ai-usage'))
+        if db_service is None:
+            from src.services.dynamodb_service import DynamoDBService
+            db_service = DynamoDBService()
+        self.usage_table = usage_table
+        self.db_service = db_service
+        self.retention_days = retention_days
+
+    def record(self, inquiry_data: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """문의 아이템과 회사 집계에 사용량 반영 (실패해도 AI 응답 흐름은 계속)"""
+        inquiry_id = inquiry_data.get('inquiry_id')
+        if inquiry_id:
+            self.db_service.record_ai_usage(inquiry_id, entry)
+        company_id = inquiry_data.get('companyId')
+        if company_id:
+            self._add_to_daily(company_id, normalize_category(inquiry_data.get('category', 'general')), entry)
+
+    def _add_to_daily(self, company_id: str, category: str, entry: Dict[str, Any]) -> None:
+        increments = {
+            'calls': 1,
+            'inputTokens': entry['inputTokens'],
+            'outputTokens': entry['outputTokens'],
+            'cacheReadTokens': entry['cacheReadTokens'],
+            'cacheWriteTokens': entry['cacheWriteTokens'],
+            'costUsd': _decimal(entry['costUsd']),
+            'latencyMsTotal': entry['latencyMs'],
+            'fallbacks': int(entry['fallback'])
+        }
+        for dimension, value in (('category', category), ('model', entry['modelId'])):
+            increments[_breakdown_attribute(dimension, value, 'calls')] = 1
+            increments[_breakdown_attribute(dimension, value, 'costUsd')] = _decimal(entry['costUsd'])
+
+        names = {f'#a{i}': field for i, field in enumerate(increments)}
+        values = {f':a{i}': value for i, value in enumerate(increments.values())}
+        values[':expires_at'] = int(time.time()) + self.retention_days * 86400
+        try:
+            self.usage_table.update_item(
+                Key={'companyId': company_id, 'period': entry['at'][:10]},
+                UpdateExpression='ADD ' + ', '.join(f'#a{i} :a{i}' for i in range(len(increments)))
+                                 + ' SET expiresAt = :expires_at',
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values
+            )
+        except Exception as e:
+            logger.error(f"AI 사용량 집계 실패: {company_id}, 오류: {str(e)}")
+
+    def get_company_usage(self, company_id: str, date_from: str, date_to: str) -> Dict[str, Any]:
+        """기간(YYYY-MM-DD, 양 끝 포함)의 회사 사용량 합계, 일자별/카테고리별/모델별 분해"""
+        query_kwargs = {
+            'KeyConditionExpression': Key('companyId').eq(company_id) & Key('period').between(date_from, date_to)
+        }
+        totals = {field: 0 for field in TOTAL_FIELDS}
+        breakdowns: Dict[str, Dict[str, Dict[str, Any]]] = {'category': {}, 'model': {}}
+        by_day = []
+        while True:
+            response = self.usage_table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                day = {field: item.get(field, 0) for field in TOTAL_FIELDS}
+                by_day.append({'period': item['period'], **day})
+                for field in TOTAL_FIELDS:
+                    totals[field] += day[field]
+                for attribute, value in item.items():
+                    parts = attribute.split('#')
+                    if len(parts) == 3 and parts[0] in breakdowns and parts[2] in BREAKDOWN_FIELDS:
+                        bucket = breakdowns[parts[0]].setdefault(unquote(parts[1]),
+                                                                  {field: 0 for field in BREAKDOWN_FIELDS})
+                        bucket[parts[2]] += value
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        calls = totals['calls']
+        totals['avgLatencyMs'] = round(float(totals['latencyMsTotal']) / float(calls), 1) if calls else 0.0
+        return {
+            'companyId': company_id,
+            'from': date_from,
+            'to': date_to,
+            'totals': totals,
+            'byDay': by_day,
+            'byCategory': breakdowns['category'],
+            'byModel': breakdowns['model']
+        }
+
+def default_usage_period(days: int = 30) -> tuple:
+    today = datetime.utcnow().date()
+    return (today - timedelta(days=days - 1)).isoformat(), today.isoformat()
+
+_usage_ledger = None
+
+def get_usage_ledger() -> Optional[UsageLedger]:
+    """AI_USAGE_TABLE이 설정된 경우에만 공유 기록기 반환"""
+    global _usage_ledger
+    if _usage_ledger is None and os.environ.get('AI_USAGE_TABLE'):
+        _usage_ledger = UsageLedger()
+    return _usage_ledger
+
+def set_usage_ledger(ledger: Optional[UsageLedger]) -> None:
+    """공유 기록기 교체 (테스트/로컬 서버용)"""
+    global _usage_ledger
+    _usage_ledger = ledger
@@ -0,0 +1,143 @@
+"""
+구조화(JSON) 로깅
+- 지연 포맷팅: logger.info("... %s", value) 형태로 호출하면 출력되는 로그만 문자열로 만든다
+- 요청 ID 연결: with_request_logging 데코레이터가 Lambda/API Gateway 요청 ID를 모든 로그에 붙인다
+- 샘플링: INFO 이하 로그는 요청 단위로 LOG_SAMPLE_RATE_<LEVEL> 비율만 남긴다 (WARNING 이상은 항상 출력)
+- 개인정보 마스킹: 이메일, 비밀번호/토큰 필드는 출력 전에 가린다
+
+Lambda(AWS_LAMBDA_FUNCTION_NAME)에서는 자동으로 JSON 형식을 쓰고, 로컬은 LOG_FORMAT=json일 때만 적용한다.
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+EMAIL_PATTERN = re.compile(r'([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*(@[A-Za-z0-9.-]+\.[A-Za-z]{2,})')
+# 값 전체를 가리는 필드 (소문자 비교)
+SECRET_KEYS = {'customerpassword', 'password', 'authorization', 'token', 'jwt', 'secret'}
+SECRET_IN_TEXT_PATTERN = re.compile(
+    r'''(["']?(?:customerPassword|password|authorization|token)["']?\s*[:=]\s*["']?)([^"',\s}]+)''',
+    re.IGNORECASE
+)
+# LogRecord 기본 속성 (extra 필드와 구분하기 위함)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_request_context: contextvars.ContextVar = contextvars.ContextVar('request_context', default={})
+
+def redact_text(text: str) -> str:
+    """문자열 내 이메일(첫 글자만 남김)과 비밀번호/토큰 값 마스킹"""
+    text = EMAIL_PATTERN.sub(r'\1***\2', text)
+    return SECRET_IN_TEXT_PATTERN.sub(r'\1***', text)
+
+def redact(value: Any) -> Any:
+    """dict/list를 재귀적으로 마스킹"""
+    if isinstance(value, dict):
+        return {
+            key: '***' if str(key).lower() in SECRET_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, str):
+        return redact_text(value)
+    return value
+
+def _sample_rate(level: int) -> float:
+    name = logging.getLevelName(level)
+    return float(os.environ.get(f'LOG_SAMPLE_RATE_{name}', '1.0'))
+
+class RequestContextFilter(logging.Filter):
+    """요청 ID를 레코드에 붙이고, INFO 이하 로그는 요청 단위 샘플링"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _request_context.get()
+        record.requestId = context.get('requestId')
+        if record.levelno >= logging.WARNING:
+            return True
+        return context.get('sampleDraw', 0.0) < _sample_rate(record.levelno)
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (CloudWatch Logs Insights에서 필드로 조회 가능)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': redact_text(record.getMessage())
+        }
+        request_id = getattr(record, 'requestId', None)
+        if request_id:
+            entry['requestId'] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and key != 'requestId':
+                entry[key] = '***' if key.lower() in SECRET_KEYS else redact(value)
+        if record.exc_info:
+            entry['exception'] = redact_text(self.formatException(record.exc_info))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+_configured = False
+
+def configure_logging(handlers: Optional[list] = None, force: bool = False) -> bool:
+    """루트 로거 핸들러에 JSON 포맷/요청 필터 설치 (한 번만). 적용했으면 True"""
+    global _configured
+    if _configured and not force:
+        return True
+    log_format = os.environ.get('LOG_FORMAT')
+    if not force and (log_format == 'text' or (log_format != 'json' and not os.environ.get('AWS_LAMBDA_FUNCTION_NAME'))):
+        return False
+
+    root = logging.getLogger()
+    if handlers is None:
+        if not root.handlers:
+            root.addHandler(logging.StreamHandler())
+        handlers = root.handlers
+    for handler in handlers:
+        handler.setFormatter(JsonFormatter())
+        if not any(isinstance(existing, RequestContextFilter) for existing in handler.filters):
+            handler.addFilter(RequestContextFilter())
+    root.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+    _configured = True
+    return True
+
+def bind_request(event: Optional[Dict[str, Any]] = None, context: Any = None) -> Dict[str, Any]:
+    """현재 요청의 로그 컨텍스트 설정 (요청 ID, 샘플링 값)"""
+    event = event if isinstance(event, dict) else {}
+    request_id = (
+        getattr(context, 'aws_request_id', None)
+        or (event.get('requestContext') or {}).get('requestId')
+    )
+    request_context = {'requestId': request_id, 'sampleDraw': random.random()}
+    _request_context.set(request_context)
+    return request_context
+
+def with_request_logging(handler: Callable) -> Callable:
+    """Lambda 핸들러 데코레이터: 요청 컨텍스트 설정 후 요청당 한 줄 요약 로그 출력"""
+    handler_logger = logging.getLogger(handler.__module__)
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        configure_logging()
+        bind_request(event, context)
+        started = time.perf_counter()
+        status_code = None
+        try:
+            result = handler(event, context)
+            if isinstance(result, dict):
+                status_code = result.get('statusCode')
+            return result
+        finally:
+            event_dict = event if isinstance(event, dict) else {}
+            handler_logger.info('request handled', extra={
+                'method': event_dict.get('httpMethod'),
+                'path': event_dict.get('resource') or event_dict.get('path'),
+                'statusCode': status_code,
+                'durationMs': round((time.perf_counter() - started) * 1000, 1)
+            })
+    return wrapper
@@ -0,0 +1,83 @@
+import os
+import json
+import hmac
+import base64
+import hashlib
+import secrets
+import threading
+from typing import Dict, Any, Optional
+
+from src.services.aws_clients import get_client
+
+# 운영(Lambda)에서는 infra가 만든 Secrets Manager 비밀(CURSOR_SECRET_ARN)을 컨테이너당 한 번 읽어 쓰고,
+# 비밀이 없으면 토큰을 만들거나 검증하지 않는다. CURSOR_SECRET을 직접 주면 그 값을 쓴다.
+# 로컬 실행/테스트에서만 프로세스별 임의 값을 쓴다 (재시작하면 이전 토큰은 무효).
+CURSOR_SECRET = os.environ.get('CURSOR_SECRET')
+CURSOR_SECRET_ARN = os.environ.get('CURSOR_SECRET_ARN')
+_LOCAL_CURSOR_SECRET = secrets.token_hex(32)
+_secret_lock = threading.Lock()
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode((value + '=' * (-len(value) % 4)).encode('ascii'))
+
+def _load_cursor_secret() -> Optional[str]:
+    """CURSOR_SECRET_ARN의 비밀 값을 한 번만 읽어 CURSOR_SECRET에 보관"""
+    global CURSOR_SECRET
+    if CURSOR_SECRET or not CURSOR_SECRET_ARN:
+        return CURSOR_SECRET
+    with _secret_lock:
+        if not CURSOR_SECRET:
+            CURSOR_SECRET = get_client('secretsmanager').get_secret_value(SecretId=CURSOR_SECRET_ARN)['SecretString']
+    return CURSOR_SECRET
+
+def _cursor_secret() -> str:
+    secret = _load_cursor_secret()
+    if secret:
+        return secret
+    if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+        raise RuntimeError('CURSOR_SECRET is not configured')
+    return _LOCAL_CURSOR_SECRET
+
+def _sign(payload: str, scope: Optional[Dict[str, Any]] = None) -> str:
+    # 토큰을 만든 조회 조건(인덱스/필터)도 서명에 포함해 다른 조회에 재사용하지 못하게 한다
+    message = payload
+    if scope:
+        message += '.' + json.dumps(scope, separators=(',', ':'), sort_keys=True, default=str)
+    digest = hmac.new(_cursor_secret().encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
+    return _b64encode(digest[:16])
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]],
+                  scope: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """LastEvaluatedKey를 서명된 불투명 페이지 토큰으로 변환 (scope: 토큰을 쓸 수 있는 조회 조건)"""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(',', ':'), sort_keys=True, default=str)
+    payload = _b64encode(raw.encode('utf-8'))
+    return f"{payload}.{_sign(payload, scope)}"
+
+def decode_cursor(cursor: Optional[str], scope: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """페이지 토큰 서명 검증 후 ExclusiveStartKey로 복원 (만들 때와 scope가 다르면 ValueError)"""
+    if not cursor:
+        return None
+    payload, _, signature = cursor.partition('.')
+    if not signature or not hmac.compare_digest(signature, _sign(payload, scope)):
+        raise ValueError('Invalid cursor')
+    try:
+        key = json.loads(_b64decode(payload).decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(key, dict):
+        raise ValueError('Invalid cursor')
+    return key
+
+def parse_page_size(value: Optional[str]) -> int:
+    """limit 쿼리 파라미터를 1..MAX_PAGE_SIZE 범위로 제한"""
+    if not value:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(value), MAX_PAGE_SIZE))
@@ -0,0 +1,66 @@
+import threading
+import time
+from typing import Callable, Optional
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (초당 rate개 보충, 최대 capacity개 누적)"""
+
+    def __init__(self, rate: float, capacity: float = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """토큰이 있으면 즉시 차감하고 True, 없으면 False"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def available(self) -> float:
+        """지금 쓸 수 있는 토큰 수 (차감하지 않음)"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """토큰이 생길 때까지 대기 후 차감. 대기한 시간(초) 반환
+
+        timeout 안에 토큰이 생기지 않을 것이 확실하면 기다리지 않고 TimeoutError를 낸다.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                # capacity보다 큰 요청은 버킷이 가득 찰 때까지만 기다린다
+                if tokens > self.capacity and self._tokens >= self.capacity:
+                    self._tokens -= tokens
+                    return waited
+                needed = min(tokens, self.capacity) - self._tokens
+                wait = max(needed / self.rate, 0.001)
+            if timeout is not None and waited + wait > timeout:
+                raise TimeoutError(f"rate limit: {wait:.2f}s 대기 필요")
+            self._sleep(wait)
+            waited += wait
+
+    def refund(self, tokens: float) -> None:
+        """미리 차감했지만 쓰지 않은 토큰 반환"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + tokens)
@@ -1,6 +1,13 @@
 import re
 from typing import Dict, Any, List
 
+# 문의 카테고리 (frontend 문의 양식의 선택지와 동일)
+INQUIRY_CATEGORIES = ('technical', 'billing', 'general', 'other')
+
+def normalize_category(category: Any) -> str:
+    """알려진 카테고리가 아니면 'other' (집계 키처럼 자유 입력을 그대로 쓰면 안 되는 곳에 사용)"""
+    return category if category in INQUIRY_CATEGORIES else 'other'
+
 def validate_email(email: str) -> bool:
     """이메일 주소 유효성 검증"""
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -76,32 +76,29 @@ def test_dynamodb_update_method():
     mock_table = Mock()
     mock_table.update_item.return_value = {}
     
-    with patch('boto3.resource') as mock_resource:
-        mock_resource.return_value.Table.return_value = mock_table
-        
-        # DynamoDB 서비스 인스턴스 생성
-        db_service = DynamoDBService()
-        
-        # AI 응답 저장 테스트
-        result = db_service.update_inquiry_ai_response("test-123", "테스트 AI 응답")
-        
-        print(f"저장 결과: {result}")
+    # DynamoDB 서비스 인스턴스 생성 (Table 핸들은 aws_clients에서 캐시되므로 boto3 패치 대신 주입)
+    db_service = DynamoDBService(inquiries_table=mock_table)
+    
+    # AI 응답 저장 테스트
+    result = db_service.update_inquiry_ai_response("test-123", "테스트 AI 응답")
+    
+    print(f"저장 결과: {result}")
+    
+    if mock_table.update_item.called:
+        print("✅ update_item 메서드 호출됨")
+        call_args = mock_table.update_item.call_args
+        print(f"   - Key: {call_args[1]['Key']}")
+        print(f"   - UpdateExpression: {call_args[1]['UpdateExpression']}")
+        print(f"   - ExpressionAttributeValues: {call_args[1]['ExpressionAttributeValues']}")
         
-        if mock_table.update_item.called:
-            print("✅ update_item 메서드 호출됨")
-            call_args = mock_table.update_item.call_args
-            print(f"   - Key: {call_args[1]['Key']}")
-            print(f"   - UpdateExpression: {call_args[1]['UpdateExpression']}")
-            print(f"   - ExpressionAttributeValues: {call_args[1]['ExpressionAttributeValues']}")
-            
-            # 상태가 ai_responded로 설정되었는지 확인
-            values = call_args[1]['ExpressionAttributeValues']
-            if values.get(':status') == 'ai_responded':
-                print("✅ 상태가 'ai_responded'로 설정됨")
-            else:
-                print(f"❌ 상태가 잘못됨: {values.get(':status')}")
+        # 상태가 ai_responded로 설정되었는지 확인
+        values = call_args[1]['ExpressionAttributeValues']
+        if values.get(':status') == 'ai_responded':
+            print("✅ 상태가 'ai_responded'로 설정됨")
         else:
-            print("❌ update_item 메서드 호출되지 않음")
+            print(f"❌ 상태가 잘못됨: {values.get(':status')}")
+    else:
+        print("❌ update_item 메서드 호출되지 않음")
 
 if __name__ == '__main__':
     # 환경변수 설정
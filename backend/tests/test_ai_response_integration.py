@@ -3,6 +3,15 @@ from unittest.mock import patch, Mock
 from src.services.dynamodb_service import DynamoDBService
 import json
 
+from src.services.aws_clients import reset_clients
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """boto3.resource 패치가 적용되도록 테스트마다 캐시된 Table 핸들 초기화"""
+    reset_clients()
+    yield
+    reset_clients()
+
 @pytest.fixture
 def dynamodb_service():
     return DynamoDBService()
@@ -23,18 +32,72 @@ def test_AI_응답_저장_및_조회_통합_테스트():
         db_service = DynamoDBService()
         
         # When - AI 응답 저장
-        mock_table.update_item.return_value = {}
+        mock_table.update_item.return_value = {
+            'Attributes': {
+                'inquiry_id': inquiry_id,
+                'aiResponse': ai_response,
+                'status': 'ai_responded',
+                'customerPassword': 'secret'
+            }
+        }
         result = db_service.update_inquiry_ai_response(inquiry_id, ai_response)
         
-        # Then - 저장 성공 확인
-        assert result is True
+        # Then - 단일 조건부 업데이트로 저장하고 갱신된 문의 반환
+        assert result['status'] == 'ai_responded'
+        assert result['aiResponse'] == ai_response
+        assert 'customerPassword' not in result
         mock_table.update_item.assert_called_once()
+        mock_table.get_item.assert_not_called()
         
         # 호출된 파라미터 확인
         call_args = mock_table.update_item.call_args
         assert call_args[1]['Key']['inquiry_id'] == inquiry_id
         assert ai_response in str(call_args[1]['ExpressionAttributeValues'])
         assert 'ai_responded' in str(call_args[1]['ExpressionAttributeValues'])
+        assert call_args[1]['ConditionExpression'] == 'attribute_exists(inquiry_id)'
+        assert call_args[1]['ReturnValues'] == 'ALL_NEW'
+
+def test_존재하지_않는_문의_AI_응답_저장():
+    """문의가 없으면 조건부 업데이트 실패로 None 반환"""
+    from botocore.exceptions import ClientError
+    
+    mock_table = Mock()
+    mock_table.update_item.side_effect = ClientError(
+        {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+        'UpdateItem'
+    )
+    
+    with patch('boto3.resource') as mock_resource:
+        mock_resource.return_value.Table.return_value = mock_table
+        db_service = DynamoDBService()
+        
+        result = db_service.update_inquiry_ai_response('missing-inquiry', '응답')
+        
+        assert result is None
+        mock_table.get_item.assert_not_called()
+
+def test_AI_응답_저장_오류는_404가_아닌_500():
+    """스로틀링 등 조건 실패가 아닌 오류는 올려서 수동 업데이트 핸들러가 500으로 응답"""
+    from botocore.exceptions import ClientError
+    from src.handlers import update_ai_response
+
+    mock_table = Mock()
+    mock_table.update_item.side_effect = ClientError(
+        {'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'Rate exceeded'}},
+        'UpdateItem'
+    )
+
+    db_service = DynamoDBService(inquiries_table=mock_table)
+
+    with pytest.raises(ClientError):
+        db_service.update_inquiry_ai_response('inquiry-1', '응답')
+
+    with patch.object(update_ai_response, 'db_service', db_service):
+        response = update_ai_response.lambda_handler(
+            {'body': json.dumps({'inquiry_id': 'inquiry-1', 'ai_response': '응답'})}, None
+        )
+
+    assert response['statusCode'] == 500
 
 def test_문의_조회시_AI_응답_포함_확인():
     """문의 조회 시 AI 응답이 포함되는지 확인"""
@@ -10,6 +10,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../src/services'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '../config'))
 
 from ai_response_generator import generate_ai_response, lambda_handler
+from src.services.ai_service import AIService
+from src.services.fake_bedrock import FakeBedrockClient, FakeModelProfile
 
 class TestAIServiceIntegration:
     """AI 서비스 연동 테스트"""
@@ -26,11 +28,11 @@ class TestAIServiceIntegration:
         
         expected_response = "안녕하세요, 로그인 문제에 대해 도움을 드리겠습니다..."
         
-        # Mock AI 서비스
-        with patch('ai_service.AIService') as mock_ai_service:
+        # Mock 공유 AI 서비스
+        with patch('ai_response_generator.get_ai_service') as mock_get_ai_service:
             mock_instance = Mock()
             mock_instance.generate_response.return_value = expected_response
-            mock_ai_service.return_value = mock_instance
+            mock_get_ai_service.return_value = mock_instance
             
             # When
             result = generate_ai_response(inquiry_data)
@@ -48,16 +50,42 @@ class TestAIServiceIntegration:
             'category': 'general'
         }
         
-        # Mock AI 서비스가 예외 발생
-        with patch('ai_service.AIService') as mock_ai_service:
-            mock_ai_service.side_effect = Exception("Bedrock 연결 실패")
+        # 모든 모델 호출이 실패하는 가짜 Bedrock 클라이언트
+        failing_client = FakeBedrockClient(default=FakeModelProfile(error_rate=1.0))
+        ai_service = AIService(bedrock_client=failing_client, response_cache=None)
+        with patch('ai_response_generator.get_ai_service', return_value=ai_service):
             
             # When
             result = generate_ai_response(inquiry_data)
             
-            # Then
+            # Then - 다른 진입점과 같은 카테고리별 폴백 응답
             assert "안녕하세요, 테스트 문의에 대해 문의해주셔서 감사합니다" in result
-            assert "일시적인 문제가 발생하여" in result
+            assert "담당자가 직접 검토 후 답변드리겠습니다" in result
+            assert len(failing_client.calls) == 2
+    
+    def test_모든_진입점이_공유_AI_서비스_사용(self):
+        """Lambda, 문의 생성, 재생성, 큐 워커가 같은 AIService(같은 클라이언트/프롬프트/폴백)를 사용"""
+        from src.handlers import ai_response_worker, create_inquiry, regenerate_ai_response
+        from src.services.ai_service import get_ai_service, set_ai_service
+        
+        fake_client = FakeBedrockClient(response_text='공통 엔진 응답')
+        set_ai_service(AIService(bedrock_client=fake_client, response_cache=None))
+        try:
+            inquiry_data = {'title': '환불 문의', 'content': '환불은 언제 되나요?', 'category': 'billing'}
+            results = [
+                generate_ai_response(inquiry_data),
+                create_inquiry.generate_ai_response(inquiry_data),
+                regenerate_ai_response.generate_ai_response(inquiry_data),
+                ai_response_worker.generate_ai_response(inquiry_data, fallback_on_error=True)
+            ]
+            
+            assert results == ['공통 엔진 응답'] * 4
+            assert [call['operation'] for call in fake_client.calls] == ['converse'] * 4
+            # 같은 문의면 진입점과 관계없이 같은 요청
+            assert len({json.dumps(call, sort_keys=True, ensure_ascii=False) for call in fake_client.calls}) == 1
+            assert get_ai_service().bedrock is fake_client
+        finally:
+            set_ai_service(None)
     
     def test_Lambda_핸들러_AI_응답_생성_성공(self):
         """Lambda 핸들러가 AI 응답을 성공적으로 생성하는지 테스트"""
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+from unittest.mock import Mock, patch
+from botocore.exceptions import ClientError
+
+from src.services.ai_service import AIService
+from src.services.fake_bedrock import FakeBedrockClient
+
+
+def test_스트리밍_응답_조각_순서대로_생성():
+    """converse_stream 응답이 조각 단위로 순서대로 yield되는지 테스트"""
+    # Given: 가짜 Bedrock 스트림
+    fake_client = FakeBedrockClient(response_text="안녕하세요, 비밀번호 재설정 방법을 안내드립니다.", chunk_size=5)
+    ai_service = AIService(bedrock_client=fake_client)
+    
+    # When: 스트리밍 생성
+    chunks = list(ai_service.stream_response({'title': '비밀번호 재설정', 'content': '비밀번호를 잊어버렸어요'}))
+    
+    # Then: 여러 조각으로 나뉘어 전체 응답을 구성
+    assert len(chunks) > 1
+    assert ''.join(chunks) == fake_client.response_text
+    assert fake_client.calls[0]['operation'] == 'converse_stream'
+
+def test_스트리밍_시작_실패시_폴백():
+    """모든 모델에서 스트림 시작이 실패하면 폴백 응답을 한 번에 yield"""
+    failing_client = Mock()
+    failing_client.converse_stream.side_effect = ClientError(
+        {'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, 'ConverseStream')
+    ai_service = AIService(bedrock_client=failing_client)
+    
+    chunks = list(ai_service.stream_response({'title': '결제 문의', 'category': 'billing'}))
+    
+    assert len(chunks) == 1
+    assert '결제 관련 문의' in chunks[0]
+    assert failing_client.converse_stream.call_count == 2  # primary + fallback
+    
+    with pytest.raises(RuntimeError):
+        list(ai_service.stream_response({'title': '결제 문의'}, fallback_on_error=False))
+
+def test_스트리밍_중간_저장_및_최종_저장():
+    """스트리밍 중 주기적으로 중간 저장하고 완료 시 최종 응답 저장"""
+    from src.handlers import stream_ai_response as handler
+    
+    fake_client = FakeBedrockClient(response_text="가" * 50, chunk_size=10)
+    mock_db = Mock()
+    
+    with patch.object(handler, 'get_ai_service', return_value=AIService(bedrock_client=fake_client)), \
+         patch.object(handler, 'db_service', mock_db), \
+         patch.object(handler, 'CHECKPOINT_CHARS', 20), \
+         patch.object(handler, 'CHECKPOINT_SECONDS', 60.0):
+        
+        chunks = list(handler.stream_ai_response({'inquiry_id': 'inquiry-1', 'title': '테스트'}))
+    
+    assert ''.join(chunks) == "가" * 50
+    partial_calls = mock_db.update_inquiry_partial_response.call_args_list
+    assert [len(call.args[1]) for call in partial_calls] == [20, 40]
+    assert all(call.kwargs['only_if_pending'] for call in partial_calls)
+    mock_db.update_inquiry_ai_response.assert_called_once_with('inquiry-1', "가" * 50, only_if_pending=True)
+
+def test_저장된_AI_응답은_다시_생성하지_않음():
+    """이미 AI 응답이 있는 문의는 Bedrock 호출/저장 없이 저장된 응답을 그대로 스트리밍"""
+    from src.handlers import stream_ai_response as handler
+    
+    fake_client = FakeBedrockClient(response_text="새 응답")
+    mock_db = Mock()
+    mock_db.get_inquiry.return_value = {'inquiry_id': 'inquiry-1', 'status': 'escalated', 'aiResponse': '기존 응답'}
+    connection_client = Mock()
+    event = {
+        'requestContext': {'routeKey': 'stream', 'connectionId': 'conn-1', 'domainName': 'example.com', 'stage': 'prod'},
+        'body': json.dumps({'inquiry_id': 'inquiry-1'})
+    }
+    
+    with patch.object(handler, 'get_ai_service', return_value=AIService(bedrock_client=fake_client)), \
+         patch.object(handler, 'db_service', mock_db), \
+         patch.object(handler, 'get_client', return_value=connection_client):
+        response = handler.lambda_handler(event, None)
+    
+    assert response['statusCode'] == 200
+    messages = [json.loads(call.kwargs['Data']) for call in connection_client.post_to_connection.call_args_list]
+    assert messages == [
+        {'type': 'delta', 'text': '기존 응답'},
+        {'type': 'done', 'inquiryId': 'inquiry-1', 'status': 'escalated'}
+    ]
+    assert fake_client.calls == []
+    mock_db.update_inquiry_ai_response.assert_not_called()
+
+def test_대기_상태가_아닌_문의는_스트리밍_결과로_덮지_않음():
+    """AI 응답 없이 에스컬레이션된 문의는 생성 결과를 저장하지 않음 (중간 저장 포함)"""
+    from src.handlers import stream_ai_response as handler
+    from src.services.dynamodb_service import DynamoDBService
+    from src.services.local_table import get_local_table, reset_local_tables
+    
+    reset_local_tables()
+    try:
+        table = get_local_table('cs-inquiries-stream-test')
+        table.put_item(Item={'inquiry_id': 'inquiry-1', 'status': 'escalated'})
+        
+        with patch.object(handler, 'get_ai_service',
+                          return_value=AIService(bedrock_client=FakeBedrockClient(response_text="가" * 50, chunk_size=10))), \
+             patch.object(handler, 'db_service', DynamoDBService(inquiries_table=table)), \
+             patch.object(handler, 'CHECKPOINT_CHARS', 20):
+            list(handler.stream_ai_response({'inquiry_id': 'inquiry-1', 'title': '테스트'}))
+        
+        item = table.get_item(Key={'inquiry_id': 'inquiry-1'})['Item']
+        assert item['status'] == 'escalated'
+        assert 'aiResponse' not in item and 'aiResponsePartial' not in item
+    finally:
+        reset_local_tables()
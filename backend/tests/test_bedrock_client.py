@@ -0,0 +1,175 @@
+import pytest
+from unittest.mock import Mock
+from botocore.exceptions import ClientError
+
+from config.ai_models import AIModelConfig
+from src.services.ai_service import AIService
+from src.services.bedrock_client import ThrottledBedrockClient, CircuitOpenError, RateLimitedError
+from src.services.fake_bedrock import FakeBedrockClient
+
+MODEL = 'us.anthropic.claude-sonnet-4-20250514-v1:0'
+FALLBACK = 'us.anthropic.claude-opus-4-20250514-v1:0'
+
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'Converse')
+
+def converse_kwargs(model_id=MODEL):
+    return {
+        'modelId': model_id,
+        'messages': [{'role': 'user', 'content': [{'text': '비밀번호를 잊어버렸어요'}]}],
+        'inferenceConfig': {'maxTokens': 100}
+    }
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def make_client(inner, clock, **kwargs):
+    return ThrottledBedrockClient(inner, config=AIModelConfig(), clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_스로틀링은_백오프_후_재시도(clock):
+    """ThrottlingException은 같은 모델로 지터 백오프 재시도"""
+    inner = FakeBedrockClient(response_text='답변')
+    real_converse = inner.converse
+    inner.converse = Mock(side_effect=[client_error('ThrottlingException'), client_error('ThrottlingException'), real_converse(**converse_kwargs())])
+    client = make_client(inner, clock)
+
+    response = client.converse(**converse_kwargs())
+
+    assert response['output']['message']['content'][0]['text'] == '답변'
+    assert inner.converse.call_count == 3
+    assert len(clock.sleeps) == 2
+    assert client.circuit_state(MODEL) == 'closed'
+
+def test_잘못된_요청은_재시도하지_않음(clock):
+    """ValidationException은 즉시 실패하고 서킷에도 반영되지 않음"""
+    inner = Mock()
+    inner.converse.side_effect = client_error('ValidationException')
+    client = make_client(inner, clock)
+
+    for _ in range(10):
+        with pytest.raises(ClientError):
+            client.converse(**converse_kwargs())
+
+    assert inner.converse.call_count == 10
+    assert client.circuit_state(MODEL) == 'closed'
+
+def test_연속_실패시_서킷_열림_후_복구(clock):
+    """연속 실패가 임계값을 넘으면 호출 차단, reset 시간 후 시험 호출 성공 시 복구"""
+    inner = Mock()
+    inner.converse.side_effect = client_error('InternalServerException')
+    client = make_client(inner, clock)
+
+    for _ in range(5):
+        with pytest.raises(ClientError):
+            client.converse(**converse_kwargs())
+
+    assert client.circuit_state(MODEL) == 'open'
+    with pytest.raises(CircuitOpenError):
+        client.converse(**converse_kwargs())
+    assert inner.converse.call_count == 5
+
+    clock.now += 31
+    inner.converse.side_effect = None
+    inner.converse.return_value = {'output': {'message': {'content': [{'text': '복구'}]}}}
+
+    client.converse(**converse_kwargs())
+    assert client.circuit_state(MODEL) == 'closed'
+
+def test_분당_요청_한도(clock, monkeypatch):
+    """분당 요청 한도를 넘는 호출은 대기 한도 안에 토큰이 없으면 RateLimitedError"""
+    monkeypatch.setenv('BEDROCK_REQUESTS_PER_MINUTE', '2')
+    client = make_client(FakeBedrockClient(), clock, max_queue_seconds=0)
+
+    client.converse(**converse_kwargs())
+    client.converse(**converse_kwargs())
+    with pytest.raises(RateLimitedError):
+        client.converse(**converse_kwargs())
+
+    # 30초 뒤에는 한 건이 보충됨
+    clock.now += 30
+    client.converse(**converse_kwargs())
+
+def test_분당_토큰_한도는_실제_사용량으로_정산(clock, monkeypatch):
+    """maxTokens만큼 예약했다가 실제 usage만 차감"""
+    monkeypatch.setenv('BEDROCK_TOKENS_PER_MINUTE', '300')
+    client = make_client(FakeBedrockClient(response_text='짧음'), clock, max_queue_seconds=0)
+
+    # 예약 ~105토큰, 실제 사용 ~7토큰이므로 300 토큰 버킷으로 여러 번 호출 가능
+    for _ in range(5):
+        client.converse(**converse_kwargs())
+
+def test_폴백_모델_서킷이_열리면_폴백하지_않음(clock):
+    """기본 모델 실패 시 폴백 모델 서킷이 열려 있으면 Opus를 호출하지 않고 스마트 폴백 응답"""
+    inner = Mock()
+    inner.converse.side_effect = client_error('InternalServerException')
+    client = make_client(inner, clock)
+    for _ in range(5):
+        with pytest.raises(ClientError):
+            client.converse(**converse_kwargs(FALLBACK))
+    inner.converse.reset_mock()
+
+    ai_service = AIService(bedrock_client=client)
+    response = ai_service.generate_response({'title': '결제 문의', 'category': 'billing', 'content': '결제'})
+
+    assert '결제 관련 문의' in response
+    called_models = [call.kwargs['modelId'] for call in inner.converse.call_args_list]
+    assert FALLBACK not in called_models
+
+def test_토큰_한도_대기_초과시_요청_한도_반환(clock, monkeypatch):
+    """토큰 한도를 확보하지 못하면 먼저 확보한 요청 한도를 되돌려 다음 호출이 막히지 않음"""
+    monkeypatch.setenv('BEDROCK_REQUESTS_PER_MINUTE', '1')
+    monkeypatch.setenv('BEDROCK_TOKENS_PER_MINUTE', '300')
+    client = make_client(FakeBedrockClient(response_text='짧음'), clock, max_queue_seconds=0)
+    guard = client.guard(MODEL)
+    guard.tokens.acquire(300)
+
+    with pytest.raises(RateLimitedError):
+        client.converse(**converse_kwargs())
+    assert guard.requests.available() == 1
+
+    # 토큰만 보충되면 요청 한도는 그대로 남아 있어 바로 호출 가능
+    guard.tokens.refund(300)
+    client.converse(**converse_kwargs())
+
+def test_요청_오류는_폴백하지_않음(clock):
+    """ValidationException은 모델을 바꿔도 해결되지 않으므로 Opus를 호출하지 않음"""
+    inner = Mock()
+    inner.converse.side_effect = client_error('ValidationException')
+    ai_service = AIService(bedrock_client=make_client(inner, clock))
+
+    response = ai_service.generate_response({'title': '결제 문의', 'category': 'billing', 'content': '결제'})
+
+    assert '결제 관련 문의' in response
+    called_models = [call.kwargs['modelId'] for call in inner.converse.call_args_list]
+    assert called_models == [MODEL]
+
+def test_기본_모델_서킷이_열려도_폴백하지_않음(clock):
+    """기본 모델 서킷이 열려 CircuitOpenError가 나면 Opus로 넘기지 않음"""
+    inner = Mock()
+    inner.converse.side_effect = client_error('InternalServerException')
+    client = make_client(inner, clock)
+    for _ in range(5):
+        with pytest.raises(ClientError):
+            client.converse(**converse_kwargs(MODEL))
+    inner.converse.reset_mock()
+
+    ai_service = AIService(bedrock_client=client)
+    response = ai_service.generate_response({'title': '결제 문의', 'category': 'billing', 'content': '결제'})
+
+    assert '결제 관련 문의' in response
+    assert inner.converse.call_count == 0
@@ -0,0 +1,110 @@
+import boto3
+from unittest.mock import Mock
+from moto import mock_dynamodb
+
+from src.services.ai_service import AIService
+from src.services.company_profile_service import CompanyProfileService, build_company_context
+from src.services.fake_bedrock import FakeBedrockClient
+from src.services.response_cache import ResponseCache, InMemoryCacheBackend
+
+PROFILE = {
+    'companyId': 'company-1',
+    'companyName': '테스트쇼핑',
+    'industry': '이커머스',
+    'businessType': 'B2C',
+    'guidelines': ['환불은 구매 후 7일 이내 가능', '배송은 영업일 기준 2일 소요'],
+    'faq': [{'question': '배송 조회는 어떻게 하나요?', 'answer': '마이페이지 > 주문내역에서 확인하세요.'}]
+}
+
+
+def test_회사_컨텍스트_생성():
+    """프로필의 회사명/업종/응대 정책이 컨텍스트에 포함됨"""
+    context = build_company_context(PROFILE)
+
+    assert context.startswith('테스트쇼핑(이커머스, B2C)')
+    assert '- 환불은 구매 후 7일 이내 가능' in context
+
+def test_프로필은_캐시되어_한번만_조회():
+    """같은 회사는 TTL 동안 DynamoDB를 다시 읽지 않고, 무효화하면 다시 읽음"""
+    table = Mock()
+    table.get_item.return_value = {'Item': PROFILE}
+    service = CompanyProfileService(companies_table=table)
+
+    for _ in range(3):
+        assert service.get_prompt_context('company-1')['faq_snippets'] == [
+            'Q. 배송 조회는 어떻게 하나요?\nA. 마이페이지 > 주문내역에서 확인하세요.'
+        ]
+    assert table.get_item.call_count == 1
+
+    service.invalidate('company-1')
+    service.get_profile('company-1')
+    assert table.get_item.call_count == 2
+
+def test_없는_회사와_조회_오류():
+    """없는 회사는 잠시 캐시하고, 조회 오류는 캐시하지 않음"""
+    table = Mock()
+    table.get_item.return_value = {}
+    service = CompanyProfileService(companies_table=table)
+
+    assert service.get_prompt_context('unknown') is None
+    assert service.get_prompt_context('unknown') is None
+    assert table.get_item.call_count == 1
+
+    table.get_item.side_effect = Exception('timeout')
+    assert service.get_profile('company-2') is None
+    assert service.get_profile('company-2') is None
+    assert table.get_item.call_count == 3
+
+@mock_dynamodb
+def test_프로필_수정은_버전_확인_후_캐시_무효화():
+    """profileVersion이 다르면 수정을 거부하고, 수정되면 새 프로필을 읽음"""
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.create_table(
+        TableName='cs-companies',
+        KeySchema=[{'AttributeName': 'companyId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'companyId', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    table.put_item(Item={**PROFILE, 'profileVersion': 1})
+    service = CompanyProfileService(companies_table=table)
+    assert service.get_profile('company-1')['companyName'] == '테스트쇼핑'
+
+    assert service.update_profile('company-1', {'companyName': '새이름'}, expected_version=5) is None
+    updated = service.update_profile('company-1', {'companyName': '새이름'}, expected_version=1)
+
+    assert updated['profileVersion'] == 2
+    assert service.get_profile('company-1')['companyName'] == '새이름'
+
+def test_AI_프롬프트에_회사_컨텍스트_사용():
+    """company_context 없이 호출해도 companyId의 프로필로 system 블록 구성"""
+    table = Mock()
+    table.get_item.return_value = {'Item': PROFILE}
+    fake_client = FakeBedrockClient(response_text='답변')
+    ai_service = AIService(bedrock_client=fake_client, response_cache=None,
+                           company_profiles=CompanyProfileService(companies_table=table))
+
+    ai_service.generate_response({'companyId': 'company-1', 'title': '배송 문의', 'content': '언제 오나요?'})
+
+    system_text = fake_client.calls[0]['system'][0]['text']
+    assert '테스트쇼핑(이커머스, B2C)' in system_text
+    assert '배송 조회는 어떻게 하나요?' in system_text
+
+def test_프로필_버전이_바뀌면_이전_캐시_응답을_쓰지_않음():
+    """응답 캐시 키에 저장된 profileVersion이 들어가 프로필 수정 후에는 새로 생성"""
+    table = Mock()
+    table.get_item.return_value = {'Item': {**PROFILE, 'profileVersion': 1}}
+    profiles = CompanyProfileService(companies_table=table)
+    fake_client = FakeBedrockClient(response_text='답변')
+    ai_service = AIService(bedrock_client=fake_client, response_cache=ResponseCache(InMemoryCacheBackend()),
+                           company_profiles=profiles)
+    inquiry = {'companyId': 'company-1', 'title': '배송 문의', 'content': '언제 오나요?'}
+
+    ai_service.generate_response(inquiry)
+    ai_service.generate_response(inquiry)
+    assert len(fake_client.calls) == 1
+
+    # 다른 컨테이너에서 수정된 프로필을 TTL 만료 후 다시 읽은 경우
+    table.get_item.return_value = {'Item': {**PROFILE, 'profileVersion': 2}}
+    profiles.invalidate('company-1')
+    ai_service.generate_response(inquiry)
+    assert len(fake_client.calls) == 2
@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+import pytest
+
+from config.ai_models import analyze_request_complexity
+from config.complexity_classifier import (
+    ComplexityClassifier,
+    HeuristicComplexityClassifier,
+    NgramLogisticClassifier,
+    get_complexity_classifier,
+    load_samples,
+    set_complexity_classifier,
+    train_classifier
+)
+
+SIMPLE = ['배송 조회는 어디서 하나요', '영업시간이 언제인가요', '비밀번호를 잊어버렸어요', '주소 변경 방법 알려주세요']
+COMPLEX = ['결제가 두 번 되었는데 한 건은 취소가 안 되고 포인트도 차감되었습니다',
+           '계약 해지 후 위약금 산정 내역이 약관과 다릅니다 법적 검토를 요청합니다',
+           '정산 금액이 세금계산서와 맞지 않습니다 월별 내역 대조가 필요합니다',
+           '환불 승인 후 카드사에는 취소가 안 되어 있고 이중 결제가 확인됩니다']
+
+
+def _samples():
+    return [(text, 'general', 0) for text in SIMPLE] * 5 + [(text, 'general', 1) for text in COMPLEX] * 5
+
+def test_규칙_기반이_기본값():
+    """모델 경로가 없으면 기존 길이/키워드 규칙 사용"""
+    set_complexity_classifier(None)
+    with patch.dict('os.environ', {}, clear=False) as env:
+        env.pop('COMPLEXITY_MODEL_PATH', None)
+        assert isinstance(get_complexity_classifier(), HeuristicComplexityClassifier)
+        assert analyze_request_complexity('안녕하세요') == 'simple'
+    set_complexity_classifier(None)
+
+def test_학습_모델이_처리_결과를_구분():
+    """상담사 개입이 필요했던 유형은 complex, 단순 문의는 simple"""
+    classifier = train_classifier(_samples())
+
+    assert classifier.predict('배송 조회 어디서 하나요?') == 'simple'
+    assert classifier.predict('이중 결제가 되었는데 카드사 취소가 안 되어 있습니다') == 'complex'
+    assert classifier.predict_batch(SIMPLE + COMPLEX) == [classifier.predict(text) for text in SIMPLE + COMPLEX]
+
+def test_모델_파일_로드(tmp_path):
+    """저장한 모델을 COMPLEXITY_MODEL_PATH로 한 번 로드해 analyze_request_complexity에서 사용"""
+    classifier = train_classifier(_samples())
+    path = tmp_path / 'complexity_model.json.gz'
+    path.write_bytes(classifier.to_bytes())
+
+    set_complexity_classifier(None)
+    with patch.dict('os.environ', {'COMPLEXITY_MODEL_PATH': str(path)}):
+        loaded = get_complexity_classifier()
+        assert isinstance(loaded, NgramLogisticClassifier)
+        assert loaded.weights == classifier.weights
+        assert analyze_request_complexity('영업시간이 언제인가요') == 'simple'
+
+    set_complexity_classifier(None)
+    with patch.dict('os.environ', {'COMPLEXITY_MODEL_PATH': str(tmp_path / 'missing.json.gz')}):
+        assert isinstance(get_complexity_classifier(), HeuristicComplexityClassifier)
+    set_complexity_classifier(None)
+
+def test_처리_결과로_학습_라벨_생성():
+    """에스컬레이션/상담사 답변은 1, AI 답변으로 해결은 0, 진행 중은 제외"""
+    samples = load_samples([
+        {'content': 'a', 'status': 'escalated'},
+        {'content': 'b', 'status': 'resolved', 'aiResponse': '답변', 'humanResponse': '상담사 답변'},
+        {'content': 'c', 'status': 'resolved', 'aiResponse': '답변'},
+        {'content': 'd', 'status': 'pending'}
+    ])
+
+    assert [label for _, _, label in samples] == [1, 1, 0]
+
+def test_분류기_인터페이스는_predict_구현_필요():
+    """predict를 구현하지 않은 분류기는 만들 수 없고, 구현하면 predict_batch 기본 구현 사용"""
+    class Incomplete(ComplexityClassifier):
+        pass
+
+    class AlwaysSimple(ComplexityClassifier):
+        def predict(self, message, category="general"):
+            return "simple"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    assert AlwaysSimple().predict_batch(["a", "b"]) == ["simple", "simple"]
@@ -106,7 +106,7 @@ def test_고객_문의_목록_조회_성공():
     ]
     
     with patch('lambda_functions.customer_inquiries.db_service') as mock_db:
-        mock_db.get_inquiries_by_email.return_value = mock_inquiries
+        mock_db.query_inquiries_by_email.return_value = {'items': mock_inquiries, 'next_cursor': None}
         
         # When: 문의 목록 조회 API 호출
         from lambda_functions.customer_inquiries import lambda_handler
@@ -7,6 +7,15 @@ import os
 # 테스트 환경 설정
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from src.services.aws_clients import reset_clients
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """boto3.resource 패치가 적용되도록 테스트마다 캐시된 Table 핸들 초기화"""
+    reset_clients()
+    yield
+    reset_clients()
+
 def test_고객_문의_조회_성공_빈_목록():
     """고객 문의 조회 성공 - 빈 목록 테스트"""
     # Given: 문의가 없는 고객 이메일
@@ -18,7 +27,7 @@ def test_고객_문의_조회_성공_빈_목록():
     }
     
     with patch('lambda_functions.customer_inquiries.db_service') as mock_db:
-        mock_db.get_inquiries_by_email.return_value = []
+        mock_db.query_inquiries_by_email.return_value = {'items': [], 'next_cursor': None}
         
         # When: 문의 목록 조회 API 호출
         from lambda_functions.customer_inquiries import lambda_handler
@@ -72,7 +81,7 @@ def test_고객_문의_조회_비밀번호_필드_제거():
     ]
     
     with patch('lambda_functions.customer_inquiries.db_service') as mock_db:
-        mock_db.get_inquiries_by_email.return_value = mock_inquiries
+        mock_db.query_inquiries_by_email.return_value = {'items': mock_inquiries, 'next_cursor': None}
         
         # When: 문의 목록 조회 API 호출
         from lambda_functions.customer_inquiries import lambda_handler
@@ -96,7 +105,7 @@ def test_고객_문의_조회_CORS_헤더():
     }
     
     with patch('lambda_functions.customer_inquiries.db_service') as mock_db:
-        mock_db.get_inquiries_by_email.return_value = []
+        mock_db.query_inquiries_by_email.return_value = {'items': [], 'next_cursor': None}
         
         # When: 문의 목록 조회 API 호출
         from lambda_functions.customer_inquiries import lambda_handler
@@ -144,7 +153,7 @@ def test_DynamoDB_서비스_이메일별_조회_로깅():
          patch('src.services.dynamodb_service.logger') as mock_logger:
         
         mock_table = Mock()
-        mock_table.scan.return_value = mock_response
+        mock_table.query.return_value = mock_response
         mock_boto3.return_value.Table.return_value = mock_table
         
         # When: 이메일별 문의 조회
@@ -164,7 +173,7 @@ def test_DynamoDB_서비스_예외_처리():
          patch('src.services.dynamodb_service.logger') as mock_logger:
         
         mock_table = Mock()
-        mock_table.scan.side_effect = Exception("DynamoDB 연결 실패")
+        mock_table.query.side_effect = Exception("DynamoDB 연결 실패")
         mock_boto3.return_value.Table.return_value = mock_table
         
         # When: 이메일별 문의 조회 (예외 발생)
@@ -175,5 +184,22 @@ def test_DynamoDB_서비스_예외_처리():
         assert result == []
         mock_logger.error.assert_called()
 
+def test_이메일별_조회_로그에_고객_이메일_미포함(caplog):
+    """JSON 포매터가 없는 환경(로컬/basicConfig)에서도 고객 이메일이 로그에 남지 않음"""
+    import logging
+    from src.services.dynamodb_service import DynamoDBService
+    
+    mock_table = Mock()
+    mock_table.query.return_value = {'Items': [{'inquiry_id': '123', 'customerEmail': 'kim@example.com'}]}
+    failing_table = Mock()
+    failing_table.query.side_effect = Exception("DynamoDB 연결 실패")
+    
+    with caplog.at_level(logging.DEBUG):
+        DynamoDBService(inquiries_table=mock_table).get_inquiries_by_email('kim@example.com')
+        DynamoDBService(inquiries_table=failing_table).get_inquiries_by_email('kim@example.com')
+    
+    assert caplog.records
+    assert 'kim@example.com' not in caplog.text
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
@@ -1,11 +1,23 @@
 import pytest
 from unittest.mock import Mock, patch
+import boto3
+from moto import mock_dynamodb
+from boto3.dynamodb.conditions import Key
 import sys
 import os
 
 # 테스트 환경 설정
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from src.services.aws_clients import reset_clients
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """boto3.resource 패치가 적용되도록 테스트마다 캐시된 Table 핸들 초기화"""
+    reset_clients()
+    yield
+    reset_clients()
+
 def test_이메일별_문의_조회_성공():
     """이메일별 문의 조회 성공 테스트"""
     # Given: DynamoDB 서비스와 Mock 응답
@@ -30,7 +42,7 @@ def test_이메일별_문의_조회_성공():
     
     with patch('boto3.resource') as mock_boto3:
         mock_table = Mock()
-        mock_table.scan.return_value = mock_response
+        mock_table.query.return_value = mock_response
         mock_boto3.return_value.Table.return_value = mock_table
         
         # When: 이메일별 문의 조회
@@ -97,5 +109,195 @@ def test_문의_조회_성공():
         assert result['inquiry_id'] == '123'
         assert result['customerEmail'] == 'test@example.com'
 
+def test_이메일별_문의_조회_GSI_페이지_토큰():
+    """이메일별 문의 조회가 GSI Query를 사용하고 페이지 토큰을 반환하는지 테스트"""
+    # Given: 다음 페이지가 있는 Query 응답
+    from src.services.dynamodb_service import DynamoDBService, decode_cursor
+    
+    last_key = {
+        'inquiry_id': '456',
+        'customerEmail': 'test@example.com',
+        'created_at': '2025-09-05T10:00:00'
+    }
+    mock_response = {
+        'Items': [{'inquiry_id': '456', 'customerEmail': 'test@example.com'}],
+        'LastEvaluatedKey': last_key
+    }
+    
+    with patch('boto3.resource') as mock_boto3:
+        mock_table = Mock()
+        mock_table.query.return_value = mock_response
+        mock_boto3.return_value.Table.return_value = mock_table
+        
+        # When: 첫 페이지 조회 후 토큰으로 다음 페이지 조회
+        db_service = DynamoDBService()
+        page = db_service.query_inquiries_by_email('test@example.com', limit=1)
+        db_service.query_inquiries_by_email('test@example.com', limit=1, cursor=page['next_cursor'])
+        
+        # Then: 인덱스 Query, 최신순, 토큰 왕복 확인
+        first_call = mock_table.query.call_args_list[0].kwargs
+        assert first_call['IndexName'] == 'customer-email-index'
+        assert first_call['ScanIndexForward'] is False
+        assert first_call['Limit'] == 1
+        assert 'ExclusiveStartKey' not in first_call
+        assert mock_table.query.call_args_list[1].kwargs['ExclusiveStartKey'] == last_key
+        # 토큰은 만든 조회 조건에서만 유효
+        with pytest.raises(ValueError):
+            decode_cursor(page['next_cursor'])
+        with pytest.raises(ValueError):
+            db_service.query_inquiries_by_email('other@example.com', limit=1, cursor=page['next_cursor'])
+        mock_table.scan.assert_not_called()
+
+def test_잘못된_페이지_토큰():
+    """변조된 페이지 토큰은 ValueError"""
+    from src.services.dynamodb_service import decode_cursor
+    
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-valid-cursor!!')
+
+def test_쿼리_플래너_인덱스_선택():
+    """필터에 따라 올바른 GSI와 조건을 선택하는지 테스트"""
+    from src.services.dynamodb_service import DynamoDBService
+    
+    with patch('boto3.resource'):
+        db_service = DynamoDBService()
+        
+        # 회사 + 상태 + 기간: company-index, 상태는 FilterExpression
+        plan = db_service.plan_inquiry_query(
+            {'companyId': 'company-a', 'status': 'pending'},
+            created_from='2025-09-01', created_to='2025-09-30', limit=20
+        )
+        assert plan['IndexName'] == 'company-index'
+        assert plan['Limit'] == 20
+        assert plan['ScanIndexForward'] is False
+        assert 'FilterExpression' in plan
+        # 날짜만 준 기간 끝은 그날 전체 포함
+        assert plan['KeyConditionExpression'] == (
+            Key('companyId').eq('company-a') & Key('created_at').between('2025-09-01', '2025-09-30T23:59:59.999999')
+        )
+        
+        # 상태만: status-index, 추가 필터 없음
+        plan = db_service.plan_inquiry_query({'status': 'escalated'})
+        assert plan['IndexName'] == 'status-index'
+        assert 'FilterExpression' not in plan
+        
+        # 사용 가능한 인덱스가 없으면 오류
+        with pytest.raises(ValueError):
+            db_service.plan_inquiry_query({'companyId': None})
+
+@mock_dynamodb
+def test_회사별_문의_목록_GSI_조회():
+    """company-index로 자기 회사 문의만 최신순 조회되는지 테스트"""
+    # Given: 두 회사의 문의가 섞인 테이블
+    from src.services.dynamodb_service import DynamoDBService
+    
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.create_table(
+        TableName='cs-inquiries',
+        KeySchema=[{'AttributeName': 'inquiry_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'inquiry_id', 'AttributeType': 'S'},
+            {'AttributeName': 'companyId', 'AttributeType': 'S'},
+            {'AttributeName': 'created_at', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'company-index',
+            'KeySchema': [
+                {'AttributeName': 'companyId', 'KeyType': 'HASH'},
+                {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    for i in range(1, 6):
+        table.put_item(Item={
+            'inquiry_id': f'a-{i}', 'companyId': 'company-a',
+            'status': 'pending' if i % 2 else 'resolved',
+            'created_at': f'2025-09-0{i}T10:00:00'
+        })
+        table.put_item(Item={
+            'inquiry_id': f'b-{i}', 'companyId': 'company-b',
+            'status': 'pending', 'created_at': f'2025-09-0{i}T10:00:00'
+        })
+    
+    # When: 회사 A의 문의를 기간/상태 조건으로 조회
+    db_service = DynamoDBService()
+    everything = db_service.list_inquiries('company-a')
+    pending = db_service.list_inquiries('company-a', status='pending')
+    ranged = db_service.list_inquiries('company-a', created_from='2025-09-02', created_to='2025-09-04')
+    
+    # Then: 다른 회사 문의는 제외되고 최신순 정렬
+    assert [item['inquiry_id'] for item in everything] == ['a-5', 'a-4', 'a-3', 'a-2', 'a-1']
+    assert [item['inquiry_id'] for item in pending] == ['a-5', 'a-3', 'a-1']
+    assert [item['inquiry_id'] for item in ranged] == ['a-4', 'a-3', 'a-2']
+    
+    # 페이지 단위 순회: LastEvaluatedKey를 따라 모든 페이지를 방문
+    pages = list(db_service.iter_inquiry_pages(company_id='company-a', page_size=2))
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sorted(item['inquiry_id'] for page in pages for item in page) == ['a-1', 'a-2', 'a-3', 'a-4', 'a-5']
+
+def test_페이지_토큰_서명_검증():
+    """페이지 토큰이 변조되면 거부되는지 테스트"""
+    from src.utils.pagination import encode_cursor, decode_cursor
+    
+    key = {'inquiry_id': 'a-1', 'companyId': 'company-a', 'created_at': '2025-09-01T10:00:00'}
+    cursor = encode_cursor(key)
+    assert decode_cursor(cursor) == key
+    
+    payload, signature = cursor.split('.')
+    forged_payload = encode_cursor({**key, 'companyId': 'company-b'}).split('.')[0]
+    with pytest.raises(ValueError):
+        decode_cursor(f"{forged_payload}.{signature}")
+
+def test_페이지_토큰_조회_조건_바인딩과_비밀값_필수():
+    """다른 조건의 조회에 쓴 토큰은 거부, Lambda에서 CURSOR_SECRET이 없으면 토큰을 만들지 않음"""
+    from src.utils import pagination
+    
+    key = {'inquiry_id': 'a-1', 'companyId': 'company-a', 'created_at': '2025-09-01T10:00:00'}
+    scope = {'index': 'company-index', 'filters': {'companyId': 'company-a'}, 'from': None, 'to': None}
+    cursor = pagination.encode_cursor(key, scope)
+    assert pagination.decode_cursor(cursor, scope) == key
+    with pytest.raises(ValueError):
+        pagination.decode_cursor(cursor, {**scope, 'filters': {'companyId': 'company-b'}})
+    
+    with patch.object(pagination, 'CURSOR_SECRET', None), \
+            patch.dict('os.environ', {'AWS_LAMBDA_FUNCTION_NAME': 'InquiryHandler'}):
+        with pytest.raises(RuntimeError):
+            pagination.encode_cursor(key, scope)
+
+def test_페이지_토큰_비밀값은_Secrets_Manager에서_한_번만_조회():
+    """CURSOR_SECRET_ARN만 있으면 첫 사용 시 비밀 값을 읽어 이후 호출에 재사용"""
+    from src.utils import pagination
+    
+    secrets_client = Mock()
+    secrets_client.get_secret_value.return_value = {'SecretString': 'arn-secret'}
+    key = {'inquiry_id': 'a-1'}
+    with patch.object(pagination, 'CURSOR_SECRET', None), \
+            patch.object(pagination, 'CURSOR_SECRET_ARN', 'arn:aws:secretsmanager:us-east-1:123:secret:cursor'), \
+            patch.object(pagination, 'get_client', return_value=secrets_client), \
+            patch.dict('os.environ', {'AWS_LAMBDA_FUNCTION_NAME': 'InquiryHandler'}):
+        cursor = pagination.encode_cursor(key)
+        assert pagination.decode_cursor(cursor) == key
+    
+    secrets_client.get_secret_value.assert_called_once_with(SecretId='arn:aws:secretsmanager:us-east-1:123:secret:cursor')
+
+def test_이메일별_문의_목록은_페이지_토큰_없이_조회():
+    """로그인 검증용 목록 조회는 다음 페이지가 있어도 토큰을 만들지 않아 CURSOR_SECRET 없이 동작"""
+    from src.services.dynamodb_service import DynamoDBService
+    from src.utils import pagination
+    
+    mock_table = Mock()
+    mock_table.query.return_value = {
+        'Items': [{'inquiry_id': 'a-1', 'customerEmail': 'kim@example.com'}],
+        'LastEvaluatedKey': {'inquiry_id': 'a-1'}
+    }
+    with patch.object(pagination, 'CURSOR_SECRET', None), \
+            patch.object(pagination, 'CURSOR_SECRET_ARN', None), \
+            patch.dict('os.environ', {'AWS_LAMBDA_FUNCTION_NAME': 'CustomerAuth'}):
+        items = DynamoDBService(inquiries_table=mock_table).get_inquiries_by_email('kim@example.com', limit=1)
+    
+    assert [item['inquiry_id'] for item in items] == ['a-1']
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
@@ -0,0 +1,112 @@
+import importlib.util
+import json
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from config.ai_models import AIModelConfig, ai_model_config
+from src.services.ai_service import get_ai_service, set_ai_service
+from src.services.aws_clients import get_bedrock_client, reset_clients
+from src.services.bedrock_client import ThrottledBedrockClient, reset_managed_bedrock_client
+from src.services.fake_bedrock import FakeBedrockClient, FakeModelProfile, sample_latency_ms
+
+MODEL = 'us.anthropic.claude-sonnet-4-20250514-v1:0'
+MESSAGES = [{'role': 'user', 'content': [{'text': '비밀번호를 잊어버렸어요'}]}]
+
+
+def recording_client(**kwargs):
+    sleeps = []
+    return FakeBedrockClient(sleep=sleeps.append, **kwargs), sleeps
+
+def load_ai_response_generator():
+    path = os.path.join(os.path.dirname(__file__), '..', 'lambda', 'ai_response_generator.py')
+    spec = importlib.util.spec_from_file_location('fake_bedrock_ai_response_generator', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_같은_시드는_같은_지연_순서():
+    profile = FakeModelProfile(latency={'distribution': 'lognormal', 'median_ms': 400, 'sigma': 0.5})
+    first, first_sleeps = recording_client(default=profile, seed=7)
+    second, second_sleeps = recording_client(default=profile, seed=7)
+
+    for client in (first, second):
+        for _ in range(5):
+            client.converse(modelId=MODEL, messages=MESSAGES)
+            client.converse(modelId='other-model', messages=MESSAGES)
+
+    assert first_sleeps == second_sleeps
+    assert len(set(first_sleeps)) == 10
+    assert sample_latency_ms({'distribution': 'normal', 'mean_ms': -50, 'stddev_ms': 0}, random.Random(0)) == 0
+
+def test_토큰_속도와_스트림_청크_지연():
+    """출력 토큰 수 / tokens_per_second 만큼 생성 시간이 더해지고, 스트림은 청크 사이에 나눠 기다림"""
+    profile = FakeModelProfile(latency={'distribution': 'fixed', 'ms': 100}, tokens_per_second=50)
+    client, sleeps = recording_client(response_text='가' * 40, chunk_size=10, default=profile)
+
+    response = client.converse(modelId=MODEL, messages=MESSAGES)
+    assert response['usage']['outputTokens'] == 20
+    assert response['metrics']['latencyMs'] == 500
+    assert sleeps == [0.5]
+
+    sleeps.clear()
+    events = list(client.converse_stream(modelId=MODEL, messages=MESSAGES)['stream'])
+    assert ''.join(event['contentBlockDelta']['delta']['text'] for event in events if 'contentBlockDelta' in event) == '가' * 40
+    assert sleeps == [0.1, 0.1, 0.1, 0.1]
+
+def test_스로틀링_주입과_재시도():
+    """throttle_every 번째 호출은 ThrottlingException, 래퍼는 같은 모델로 재시도"""
+    client, _ = recording_client(models={MODEL: FakeModelProfile(throttle_every=2)})
+
+    client.converse(modelId=MODEL, messages=MESSAGES)
+    with pytest.raises(ClientError) as error:
+        client.converse(modelId=MODEL, messages=MESSAGES)
+    assert error.value.response['Error']['Code'] == 'ThrottlingException'
+    # 다른 모델은 영향 없음
+    client.converse(modelId='other-model', messages=MESSAGES)
+
+    # 3번째 호출은 성공, 4번째는 스로틀링 후 5번째로 재시도
+    throttled = ThrottledBedrockClient(client=client, config=AIModelConfig(), sleep=lambda seconds: None)
+    for _ in range(2):
+        assert throttled.converse(modelId=MODEL, messages=MESSAGES)['stopReason'] == 'end_turn'
+    assert [call['modelId'] for call in client.calls].count(MODEL) == 5
+
+def test_invoke_model_응답_형식():
+    client, _ = recording_client(response_text='답변')
+    body = {'anthropic_version': 'bedrock-2023-05-31', 'max_tokens': 100,
+            'messages': [{'role': 'user', 'content': '로그인이 안돼요'}]}
+
+    response = client.invoke_model(modelId=MODEL, body=json.dumps(body))
+    payload = json.loads(response['body'].read())
+
+    assert payload['content'][0]['text'] == '답변'
+    assert payload['usage'] == {'input_tokens': 4, 'output_tokens': 1}
+    assert client.calls[0]['request']['max_tokens'] == 100
+
+@patch.dict('os.environ', {'BEDROCK_BACKEND': 'fake', 'BEDROCK_FAKE_PROFILE': json.dumps({
+    'seed': 3,
+    'default': {'error_rate': 1.0},
+    'models': {ai_model_config.get_fallback_model(): {'response_text': '폴백 모델 답변'}}
+})})
+def test_환경변수_설정으로_공유_AIService에_연결():
+    """BEDROCK_FAKE_PROFILE 설정이 공유 AIService의 클라이언트에 적용되어 Lambda 진입점도 폴백 모델을 사용"""
+    reset_clients()
+    reset_managed_bedrock_client()
+    set_ai_service(None)
+    try:
+        fake_client = get_bedrock_client()
+        assert isinstance(fake_client, FakeBedrockClient)
+        assert fake_client.profile('unknown-model').error_rate == 1.0
+
+        inquiry = {'title': '배송 문의', 'content': '언제 도착하나요?', 'category': 'delivery', 'urgency': 'low'}
+        assert load_ai_response_generator().generate_ai_response(inquiry) == '폴백 모델 답변'
+        assert [call['modelId'] for call in fake_client.calls][-1] == ai_model_config.get_fallback_model()
+        assert get_ai_service().bedrock.client is fake_client
+    finally:
+        reset_clients()
+        reset_managed_bedrock_client()
+        set_ai_service(None)
@@ -0,0 +1,99 @@
+import json
+import logging
+from unittest.mock import patch
+
+from config.ai_models import AIModelConfig
+from config.model_telemetry import BudgetTelemetry
+from src.services.ai_service import AIService
+from src.services.fake_bedrock import FakeBedrockClient
+
+
+def test_구체적인_예산이_우선():
+    """카테고리/복잡도/우선순위가 일치하는 항목을 덜 구체적인 것부터 덮어씀"""
+    config = AIModelConfig()
+
+    assert config.get_generation_budget('general', 'simple', 'normal')['max_tokens'] == 600
+    billing = config.get_generation_budget('billing', 'simple', 'normal')
+    assert (billing['max_tokens'], billing['temperature']) == (600, 0.2)
+    assert config.get_generation_budget('technical', 'complex', 'high')['max_tokens'] == 2048
+    assert billing['key'] == 'billing:simple:normal'
+
+@patch.dict('os.environ', {
+    'BEDROCK_MAX_TOKENS': '1200',
+    'BEDROCK_GENERATION_BUDGETS': '{"*:*:high": {"temperature": 0.1}, "general:complex:*": {"max_tokens": 4000}}',
+    'BEDROCK_STOP_SEQUENCES': '[]'
+})
+def test_환경변수로_예산_조정():
+    """환경변수 항목이 추가되고, max_tokens는 BEDROCK_MAX_TOKENS를 넘지 않음"""
+    config = AIModelConfig()
+
+    budget = config.get_generation_budget('general', 'complex', 'high')
+    assert budget['max_tokens'] == 1200
+    assert budget['temperature'] == 0.1
+    assert budget['stop_sequences'] == []
+
+def test_예산별_지연_히스토그램과_조정_제안():
+    telemetry = BudgetTelemetry()
+    for i in range(20):
+        telemetry.record('general:simple:normal', 300 + i * 10, output_tokens=200 + i, truncated=(i == 0))
+    telemetry.record('general:simple:normal', 5000, output_tokens=230)
+
+    report = telemetry.report()['general:simple:normal']
+    assert report['count'] == 21
+    assert report['latencyHistogram']['<=500'] == 20
+    assert report['latencyHistogram']['<=8000'] == 1
+    assert (report['p50Ms'], report['p95Ms']) == (500, 500)
+    assert report['truncatedRate'] == round(1 / 21, 4)
+    # p95 219~230 토큰 × 1.2 → 64 단위 올림
+    assert telemetry.suggest_budgets()['general:simple:normal'] == {'max_tokens': 320}
+
+def test_AI_호출에_예산_적용():
+    """converse 요청의 maxTokens/temperature/stopSequences가 예산을 따름"""
+    fake_client = FakeBedrockClient(response_text='답변')
+    ai_service = AIService(bedrock_client=fake_client, response_cache=None)
+
+    ai_service.generate_response({'title': '환불', 'content': '환불 언제 되나요?', 'category': 'billing'})
+
+    inference_config = fake_client.calls[0]['inferenceConfig']
+    assert inference_config['maxTokens'] == 600
+    assert inference_config['temperature'] == 0.2
+    assert inference_config['stopSequences'] == ['\n\n고객 문의:']
+
+def test_예산에서_잘린_응답은_상한으로_재생성():
+    """stopReason이 max_tokens면 BEDROCK_MAX_TOKENS로 한 번 더 호출하고 잘리지 않은 응답 사용"""
+    fake_client = FakeBedrockClient(response_text='가' * 1400)
+    ai_service = AIService(bedrock_client=fake_client, response_cache=None)
+
+    response = ai_service.generate_response({'title': '환불', 'content': '환불 언제 되나요?', 'category': 'billing'})
+
+    assert response == '가' * 1400
+    assert [call['inferenceConfig']['maxTokens'] for call in fake_client.calls] == [600, 4096]
+
+def test_예산에서_잘린_스트림은_이어서_생성():
+    """이미 보낸 부분을 assistant 메시지로 넘겨 남은 토큰만큼 이어서 스트리밍"""
+    fake_client = FakeBedrockClient(response_text='가' * 1400, chunk_size=200)
+    ai_service = AIService(bedrock_client=fake_client, response_cache=None)
+
+    chunks = list(ai_service.stream_response({'title': '환불', 'content': '환불 언제 되나요?', 'category': 'billing'}))
+
+    assert ''.join(chunks) == '가' * 1400
+    continuation = fake_client.calls[1]
+    assert continuation['inferenceConfig']['maxTokens'] == 4096 - 600
+    assert continuation['messages'][-1] == {'role': 'assistant', 'content': [{'text': '가' * 1200}]}
+
+def test_예산_지표_EMF_출력(caplog):
+    telemetry = BudgetTelemetry()
+    for i in range(20):
+        telemetry.record('general:simple:normal', 400, output_tokens=200, truncated=(i < 2))
+
+    with caplog.at_level(logging.INFO):
+        telemetry.emit_metrics()
+        telemetry.emit_metrics()
+
+    emitted = [json.loads(record.getMessage()) for record in caplog.records]
+    # 증가분이 없으면 다시 출력하지 않음
+    assert len(emitted) == 1
+    assert emitted[0]['BudgetKey'] == 'general:simple:normal'
+    assert (emitted[0]['BudgetRequests'], emitted[0]['BudgetTruncated']) == (20, 2)
+    assert emitted[0]['SuggestedMaxTokens'] == 256
+    assert emitted[0]['_aws']['CloudWatchMetrics'][0]['Namespace'] == 'CSChatbot/AIBudget'
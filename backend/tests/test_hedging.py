@@ -0,0 +1,119 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from config.ai_models import AIModelConfig
+from config.model_telemetry import ModelTelemetry
+from src.services.ai_service import AIService
+from src.services.fake_bedrock import FakeBedrockClient, FakeModelProfile
+from concurrent.futures import ThreadPoolExecutor
+
+from src.services import hedging
+from src.services.bedrock_client import ThrottledBedrockClient
+from src.services.hedging import HedgeBudget, HedgeStats, run_hedged
+
+ENV = {
+    'BEDROCK_HEDGING': 'on',
+    'BEDROCK_HEDGE_DELAY_MS': '50',
+    'BEDROCK_SELECTION_STRATEGY': 'fixed',
+    'BEDROCK_DEFAULT_MODEL': 'us.anthropic.claude-sonnet-4-20250514-v1:0',
+    'BEDROCK_FAST_MODEL': 'us.anthropic.claude-3-5-haiku-20241022-v1:0'
+}
+
+
+def slow_model_client(delays):
+    """모델별로 응답 지연과 응답 텍스트(모델 ID)가 다른 가짜 클라이언트"""
+    return FakeBedrockClient(models={
+        model_id: FakeModelProfile(response_text=model_id, latency={'distribution': 'fixed', 'ms': delays.get(model_id, 0)})
+        for model_id in (ENV['BEDROCK_DEFAULT_MODEL'], ENV['BEDROCK_FAST_MODEL'])
+    })
+
+
+def slow(value, seconds, error=None):
+    def call():
+        time.sleep(seconds)
+        if error:
+            raise error
+        return value
+    return call
+
+def test_지연_안에_끝나면_헤지하지_않음():
+    assert run_hedged(slow('primary', 0), slow('alternate', 0), 0.5) == ('primary', False, False)
+
+def test_주_모델이_느리면_대체_모델_결과_사용():
+    """헤지 후 먼저 끝난 결과를 쓰고, 늦게 끝난 결과는 on_discarded로 전달"""
+    discarded = []
+    finished = threading.Event()
+
+    def on_discarded(result):
+        discarded.append(result)
+        finished.set()
+
+    result = run_hedged(slow('primary', 0.3), slow('alternate', 0.01), 0.05, on_discarded)
+
+    assert result == ('alternate', True, True)
+    assert finished.wait(1)
+    assert discarded == ['primary']
+
+def test_헤지한_대체_모델이_실패하면_주_모델_결과_대기():
+    result = run_hedged(slow('primary', 0.15), slow('alternate', 0, RuntimeError('throttled')), 0.05)
+    assert result == ('primary', True, False)
+
+    with pytest.raises(ValueError):
+        run_hedged(slow('primary', 0, ValueError('bad request')), slow('alternate', 0), 0.5)
+
+def test_헤지_지표():
+    stats = HedgeStats()
+    stats.record(hedged=False, alternate_won=False)
+    stats.record(hedged=True, alternate_won=True)
+    stats.add_cost(0.002)
+
+    assert stats.stats() == {
+        'eligible': 2, 'hedged': 1, 'alternateWins': 1, 'addedCostUsd': 0.002,
+        'hedgeRate': 0.5, 'winRate': 1.0
+    }
+
+@patch.dict('os.environ', ENV)
+def test_높은_우선순위만_헤지():
+    """urgency high 문의는 느린 기본 모델 대신 fast 모델 응답을 받고, 일반 문의는 헤지하지 않음"""
+    client = slow_model_client({ENV['BEDROCK_DEFAULT_MODEL']: 300})
+    ai_service = AIService(bedrock_client=client, response_cache=None)
+    ai_service.config = AIModelConfig(telemetry=ModelTelemetry())
+
+    response = ai_service.generate_response({'title': '결제 오류', 'content': '긴급', 'urgency': 'high'})
+    assert response == ENV['BEDROCK_FAST_MODEL']
+
+    response = ai_service.generate_response({'title': '결제 오류', 'content': '일반', 'urgency': 'low'})
+    assert response == ENV['BEDROCK_DEFAULT_MODEL']
+
+def test_헤지_예산을_넘으면_헤지하지_않음():
+    """헤지 대상 호출마다 max_rate씩 적립, 잔액이 1 미만이면 주 모델 결과를 기다림"""
+    budget = HedgeBudget(max_rate=0.5, burst=1)
+
+    assert run_hedged(slow('primary', 0.1), slow('alternate', 0), 0.01, budget=budget)[1] is True
+    assert run_hedged(slow('primary', 0.1), slow('alternate', 0), 0.01, budget=budget) == ('primary', False, False)
+    assert run_hedged(slow('primary', 0.1), slow('alternate', 0), 0.01, budget=budget)[1] is True
+    assert budget.denied == 1
+
+def test_풀_대기_시간은_헤지_지연에_포함하지_않음():
+    """작업자가 모두 바쁠 때 대기열에서 기다린 시간으로 헤지하지 않음"""
+    with patch.object(hedging, '_executor', ThreadPoolExecutor(max_workers=1)), \
+            patch.object(hedging, 'HEDGE_WORKERS', 1):
+        busy = hedging._submit(slow('busy', 0.2))
+        assert run_hedged(slow('primary', 0), slow('alternate', 0), 0.05) == ('primary', False, False)
+        busy.result()
+
+@patch.dict('os.environ', ENV)
+def test_주_모델_스로틀링_중에는_헤지하지_않음():
+    client = ThrottledBedrockClient(client=slow_model_client({ENV['BEDROCK_DEFAULT_MODEL']: 100}))
+    ai_service = AIService(bedrock_client=client, response_cache=None)
+    ai_service.config = AIModelConfig(telemetry=ModelTelemetry())
+    client.guard(ENV['BEDROCK_DEFAULT_MODEL']).last_throttled_at = time.monotonic()
+
+    response = ai_service.generate_response({'title': '결제 오류', 'content': '긴급', 'urgency': 'high'})
+
+    assert response == ENV['BEDROCK_DEFAULT_MODEL']
+    assert client.is_throttled(ENV['BEDROCK_DEFAULT_MODEL'])
+    assert not client.is_throttled(ENV['BEDROCK_FAST_MODEL'])
@@ -0,0 +1,73 @@
+import importlib.util
+import json
+import os
+from unittest.mock import Mock, patch
+
+from src.services.ai_job_queue import InMemoryJobQueue, set_job_queue
+from src.services.local_table import get_local_table, reset_local_tables
+from src.services.qna_retriever import set_qna_retriever
+
+
+def load_inquiry_handler():
+    path = os.path.join(os.path.dirname(__file__), '..', 'lambda', 'inquiry_handler.py')
+    spec = importlib.util.spec_from_file_location('queued_inquiry_handler', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@patch.dict('os.environ', {'STORAGE_BACKEND': 'memory', 'DYNAMODB_TABLE': 'cs-inquiries-queue-test',
+                           'AI_RESPONSE_MODE': 'async'})
+def test_문의_생성시_AI_작업_등록():
+    """배포된 POST /api/inquiries 경로도 비동기 모드면 워커용 작업을 큐에 등록"""
+    reset_local_tables()
+    queue = InMemoryJobQueue()
+    set_job_queue(queue)
+    try:
+        handler = load_inquiry_handler()
+        event = {'httpMethod': 'POST', 'resource': '/api/inquiries', 'body': json.dumps({
+            'companyId': 'company-1', 'customerEmail': 'kim@example.com', 'customerPassword': 'secret',
+            'title': '환불 문의', 'content': '환불은 언제 되나요?'
+        })}
+
+        response = handler.lambda_handler(event, None)
+
+        data = json.loads(response['body'])['data']
+        assert response['statusCode'] == 200 and data['status'] == 'pending'
+        job = json.loads(queue.receive()[0]['body'])
+        assert job['inquiry_id'] == data['inquiryId']
+        assert (job['category'], job['urgency']) == ('general', 'medium')
+        assert 'customerPassword' not in job and 'customerEmail' not in job
+    finally:
+        set_job_queue(None)
+        reset_local_tables()
+
+@patch.dict('os.environ', {'STORAGE_BACKEND': 'memory', 'DYNAMODB_TABLE': 'cs-inquiries-queue-test',
+                           'AI_RESPONSE_MODE': 'async'})
+def test_FAQ와_같은_문의는_작업_없이_바로_답변():
+    """배포된 POST /api/inquiries 경로도 FAQ와 거의 같은 문의는 큐에 등록하지 않고 FAQ 답변 저장"""
+    reset_local_tables()
+    queue = InMemoryJobQueue()
+    set_job_queue(queue)
+    retriever = Mock()
+    retriever.match.return_value = {'id': 'faq-1', 'answer': '환불은 3영업일 내 처리됩니다.', 'score': 0.93}
+    set_qna_retriever(retriever)
+    try:
+        handler = load_inquiry_handler()
+        event = {'httpMethod': 'POST', 'resource': '/api/inquiries', 'body': json.dumps({
+            'companyId': 'company-1', 'customerEmail': 'kim@example.com',
+            'title': '환불 문의', 'content': '환불은 언제 되나요?'
+        })}
+
+        response = handler.lambda_handler(event, None)
+
+        data = json.loads(response['body'])['data']
+        assert (data['status'], data['source']) == ('ai_responded', 'faq')
+        assert data['aiResponse'] == '환불은 3영업일 내 처리됩니다.'
+        assert queue.receive() == []
+        item = get_local_table('cs-inquiries-queue-test').get_item(Key={'inquiry_id': data['inquiryId']})['Item']
+        assert (item['status'], item['aiResponseSource']) == ('ai_responded', 'faq')
+    finally:
+        set_qna_retriever(None)
+        set_job_queue(None)
+        reset_local_tables()
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+from benchmarks.lifecycle import LIFECYCLE_STEPS, compare_to_baseline, run_benchmark, summarize
+
+
+class FakeTransport:
+    """생성 요청에 문의 ID를 돌려주고 모든 요청을 기록"""
+
+    def __init__(self, requests, fail_step=None):
+        self.requests = requests
+        self.fail_step = fail_step
+
+    async def request(self, method, path, query, body):
+        self.requests.append((method, path, query, json.loads(body) if body else None))
+        if self.fail_step and path.endswith(self.fail_step):
+            return 500, b'{}'
+        if path == '/api/inquiries':
+            return 200, json.dumps({'data': {'inquiryId': f'q-{len(self.requests)}'}}).encode()
+        return 200, b'{}'
+
+    async def close(self):
+        pass
+
+def test_수명주기_단계와_집계():
+    """작업자들이 수명주기를 나눠 실행하고 단계별 지연/처리량이 집계됨"""
+    requests = []
+    samples, errors, wall_seconds = asyncio.run(
+        run_benchmark(lambda: FakeTransport(requests), iterations=10, concurrency=3, warmup=1))
+
+    assert len(requests) == 11 * len(LIFECYCLE_STEPS)
+    assert requests[1][1] == '/api/inquiries/q-1/regenerate'
+    assert requests[3][2] == 'email=bench--1%40example.com&limit=20'
+    assert requests[5][3]['pathParameters'] == {'id': 'q-1'}
+
+    report = summarize(samples, errors, wall_seconds, {'create': 3.5})
+    assert report['create']['count'] == 10 and report['create']['errors'] == 0
+    assert report['create']['allocKiB'] == 3.5
+    assert report['get']['p50Ms'] <= report['get']['p99Ms']
+    assert report['escalate']['throughputRps'] > 0
+
+def test_오류는_지연_집계에서_제외():
+    requests = []
+    samples, errors, _ = asyncio.run(
+        run_benchmark(lambda: FakeTransport(requests, fail_step='escalate'), iterations=4, concurrency=2, warmup=0))
+
+    assert errors == {'escalate': 4}
+    assert samples['escalate'] == []
+
+def test_기준_대비_회귀_감지():
+    baseline = {
+        'get': {'p95Ms': 2.0, 'p99Ms': 3.0, 'throughputRps': 500.0, 'allocKiB': 10.0, 'errors': 0},
+        'create': {'p95Ms': 2.0, 'p99Ms': 3.0, 'throughputRps': 500.0, 'errors': 0}
+    }
+    report = {
+        'get': {'p95Ms': 2.4, 'p99Ms': 4.0, 'throughputRps': 300.0, 'allocKiB': 10.5, 'errors': 1},
+        'create': {'p95Ms': 2.4, 'p99Ms': 3.5, 'throughputRps': 450.0, 'errors': 0}
+    }
+
+    assert compare_to_baseline(report, baseline, tolerance=0.25, min_delta_ms=0.5) == [
+        'get: p99Ms 3.0 → 4.0',
+        'get: throughputRps 500.0 → 300.0',
+        'get: errors 0 → 1'
+    ]
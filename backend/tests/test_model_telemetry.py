@@ -0,0 +1,114 @@
+from unittest.mock import patch
+
+import pytest
+
+from config.ai_models import AIModelConfig
+from config.model_telemetry import ModelTelemetry, estimate_cost, load_model_pricing
+from src.services.ai_service import AIService
+from src.services.fake_bedrock import FakeBedrockClient
+
+ENV = {
+    'BEDROCK_SELECTION_STRATEGY': 'latency_aware',
+    'BEDROCK_DEFAULT_MODEL': 'us.anthropic.claude-sonnet-4-20250514-v1:0',
+    'BEDROCK_FALLBACK_MODEL': 'us.anthropic.claude-opus-4-20250514-v1:0',
+    'BEDROCK_FAST_MODEL': 'us.anthropic.claude-3-5-haiku-20241022-v1:0',
+    'BEDROCK_LATENCY_SLO_MS': '5000',
+    'BEDROCK_TELEMETRY_MIN_SAMPLES': '3'
+}
+DEFAULT = ENV['BEDROCK_DEFAULT_MODEL']
+FALLBACK = ENV['BEDROCK_FALLBACK_MODEL']
+FAST = ENV['BEDROCK_FAST_MODEL']
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_구간_통계():
+    """p50/p95, 오류율, 비용을 최근 구간 샘플로만 계산"""
+    clock = FakeClock()
+    telemetry = ModelTelemetry(window_seconds=60, clock=clock)
+    for latency in range(100, 1100, 100):
+        telemetry.record(DEFAULT, latency, usage={'inputTokens': 1000, 'outputTokens': 1000})
+    telemetry.record(DEFAULT, 30000, success=False)
+
+    stats = telemetry.stats(DEFAULT)
+    assert stats['count'] == 11
+    assert stats['p50'] == 500
+    assert stats['p95'] == 1000
+    assert stats['errorRate'] == round(1 / 11, 4)
+    assert stats['avgCost'] == estimate_cost(DEFAULT, 1000, 1000) == 0.018
+
+    clock.now += 61
+    assert telemetry.stats(DEFAULT)['count'] == 0
+
+@patch.dict('os.environ', ENV)
+def test_느린_모델은_배제되고_구간이_지나면_복귀():
+    """SLO를 넘는 모델은 다음 후보로, 샘플이 만료되면 다시 선호 모델로"""
+    clock = FakeClock()
+    config = AIModelConfig(telemetry=ModelTelemetry(window_seconds=60, clock=clock))
+    assert config.get_model_for_request('medium', 'normal') == DEFAULT
+
+    for _ in range(5):
+        config.telemetry.record(DEFAULT, 9000)
+    assert config.get_model_for_request('medium', 'normal') == FALLBACK
+
+    clock.now += 61
+    assert config.get_model_for_request('medium', 'normal') == DEFAULT
+
+@patch.dict('os.environ', {**ENV, 'BEDROCK_COST_BUDGET_USD': '0.01'})
+def test_오류율과_예산():
+    """오류가 잦은 모델은 배제, 예산 초과 모델은 높은 우선순위에서만 사용"""
+    config = AIModelConfig(telemetry=ModelTelemetry())
+    for _ in range(5):
+        config.telemetry.record(FAST, 800, success=False)
+        config.telemetry.record(DEFAULT, 2000, usage={'inputTokens': 2000, 'outputTokens': 1000})
+
+    # FAST는 오류율, DEFAULT는 예산(0.021 > 0.01) 초과 → 샘플 없는 FALLBACK
+    assert config.get_model_for_request('simple', 'normal') == FALLBACK
+    assert config.get_model_for_request('simple', 'high') == DEFAULT
+
+    for _ in range(5):
+        config.telemetry.record(FALLBACK, 12000)
+    # 모두 조건 미달이면 오류율이 낮고 p95가 짧은 모델
+    assert config.get_model_for_request('medium', 'normal') == DEFAULT
+
+def test_AI_호출_결과_기록():
+    """AIService의 Bedrock 호출 지연과 오류가 모델별로 기록됨"""
+    fake_client = FakeBedrockClient(response_text='답변')
+    ai_service = AIService(bedrock_client=fake_client, response_cache=None)
+    ai_service.config = AIModelConfig(telemetry=ModelTelemetry())
+
+    ai_service.generate_response({'title': '문의', 'content': '내용'})
+    model_id = fake_client.calls[0]['modelId']
+
+    assert ai_service.config.telemetry.stats(model_id)['count'] == 1
+    assert ai_service.config.telemetry.stats(model_id)['errorRate'] == 0.0
+
+def test_단가_설정_덮어쓰기와_오류_무시():
+    with patch.dict('os.environ', {'BEDROCK_MODEL_PRICING': '{"claude-sonnet-4": [0.001, 0.002]}'}):
+        assert load_model_pricing()['claude-sonnet-4'] == (0.001, 0.002)
+    with patch.dict('os.environ', {'BEDROCK_MODEL_PRICING': '{"claude-sonnet-4": 3}'}):
+        assert load_model_pricing()['claude-sonnet-4'] == (0.003, 0.015)
+    with patch.dict('os.environ', {'BEDROCK_MODEL_PRICING': 'not-json'}):
+        assert load_model_pricing()['claude-opus-4'] == (0.015, 0.075)
+
+def test_스트림_도중_끊기면_실패로_기록():
+    class BrokenStreamClient(FakeBedrockClient):
+        def _stream_events(self, request, model_id, first_token_ms=0.0):
+            yield {'messageStart': {'role': 'assistant'}}
+            raise ConnectionError('stream reset')
+
+    fake_client = BrokenStreamClient()
+    ai_service = AIService(bedrock_client=fake_client, response_cache=None)
+    ai_service.config = AIModelConfig(telemetry=ModelTelemetry())
+
+    with pytest.raises(ConnectionError):
+        list(ai_service.stream_response({'title': '문의', 'content': '내용'}))
+
+    stats = ai_service.config.telemetry.stats(fake_client.calls[0]['modelId'])
+    assert (stats['count'], stats['errorRate']) == (1, 1.0)
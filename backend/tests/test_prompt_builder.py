@@ -0,0 +1,55 @@
+from src.services.ai_service import AIService
+from src.services.fake_bedrock import FakeBedrockClient
+from src.services.prompt_builder import PromptBuilder, PromptFingerprintRegistry
+
+SONNET = 'us.anthropic.claude-sonnet-4-20250514-v1:0'
+FAQ = ["Q. 비밀번호를 잊어버렸어요\nA. 로그인 화면의 '비밀번호 찾기'를 눌러 이메일 인증 후 재설정하세요." * 50]
+
+
+def test_system_블록은_문의와_무관하게_고정():
+    """같은 회사 컨텍스트면 system 블록과 fingerprint가 같고 user 메시지만 달라짐"""
+    builder = PromptBuilder(registry=PromptFingerprintRegistry())
+
+    first = builder.build({'title': '로그인 오류', 'content': '로그인이 안 돼요'}, SONNET, '테스트 회사')
+    second = builder.build({'title': '환불 요청', 'content': '환불해주세요'}, SONNET, '테스트 회사')
+
+    assert first['system'] == second['system']
+    assert first['fingerprint'] == second['fingerprint']
+    assert '테스트 회사' in first['system'][0]['text']
+    assert '로그인이 안 돼요' in first['messages'][0]['content'][0]['text']
+    assert '로그인이 안 돼요' not in first['system'][0]['text']
+
+def test_캐시_체크포인트는_지원_모델과_긴_접두사에만():
+    """짧은 접두사나 미지원 모델에는 cachePoint를 넣지 않음"""
+    builder = PromptBuilder(registry=PromptFingerprintRegistry(), min_cache_tokens=1024)
+    inquiry = {'title': '비밀번호', 'content': '비밀번호를 잊어버렸어요'}
+
+    short = builder.build(inquiry, SONNET)
+    long_prefix = builder.build(inquiry, SONNET, faq_snippets=FAQ)
+    unsupported = builder.build(inquiry, 'amazon.titan-text-express-v1', faq_snippets=FAQ)
+
+    assert short['system'] == [short['system'][0]]
+    assert long_prefix['system'][-1] == {'cachePoint': {'type': 'default'}}
+    assert all('cachePoint' not in block for block in unsupported['system'])
+
+def test_fingerprint_레지스트리_리포트():
+    """접두사별 사용 횟수, 재사용 가능한 토큰, 실제 캐시 적중 토큰 집계"""
+    registry = PromptFingerprintRegistry()
+    builder = PromptBuilder(registry=registry, min_cache_tokens=1)
+    fake_client = FakeBedrockClient(response_text='답변')
+    ai_service = AIService(bedrock_client=fake_client, response_cache=None)
+    ai_service.prompt_builder = builder
+
+    for title in ('로그인 오류', '결제 오류', '배송 문의'):
+        ai_service.generate_response({'title': title, 'content': f'{title} 관련 문의입니다'}, company_context='테스트 회사')
+
+    call = fake_client.calls[0]
+    assert call['system'][0]['text'].startswith('당신은 테스트 회사의')
+    assert call['system'][-1] == {'cachePoint': {'type': 'default'}}
+
+    [entry] = registry.report()
+    assert entry['uses'] == 3 and entry['cacheable'] is True
+    assert entry['reusableTokens'] == entry['prefixTokens'] * 2
+
+    registry.record_usage(entry['fingerprint'], {'cacheReadInputTokens': 500, 'cacheWriteInputTokens': 600})
+    assert registry.report()[0]['cacheReadTokens'] == 500
@@ -0,0 +1,130 @@
+import time
+
+import boto3
+import pytest
+from unittest.mock import Mock
+from moto import mock_dynamodb
+
+from src.services.ai_service import AIService
+from src.services.fake_bedrock import FakeBedrockClient
+from src.services.qna_retriever import QnAIndex, QnARetriever
+
+ENTRIES = [
+    {'id': '1', 'question': '비밀번호를 잊어버렸어요', 'answer': "로그인 화면의 '비밀번호 찾기'에서 이메일 인증 후 재설정하세요."},
+    {'id': '2', 'question': '결제가 계속 실패합니다', 'answer': '카드 한도와 해외결제 차단 여부를 확인한 뒤 다시 시도해주세요.'},
+    {'id': '3', 'question': '배송 조회는 어디서 하나요?', 'answer': '마이페이지 > 주문내역에서 송장번호를 확인할 수 있습니다.'},
+]
+
+
+@pytest.fixture
+def qna_table():
+    with mock_dynamodb():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='qna-data',
+            KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[
+                {'AttributeName': 'id', 'AttributeType': 'S'},
+                {'AttributeName': 'category', 'AttributeType': 'S'},
+                {'AttributeName': 'createdAt', 'AttributeType': 'S'}
+            ],
+            GlobalSecondaryIndexes=[{
+                'IndexName': 'category-created-index',
+                'KeySchema': [
+                    {'AttributeName': 'category', 'KeyType': 'HASH'},
+                    {'AttributeName': 'createdAt', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            }],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        for entry in ENTRIES:
+            table.put_item(Item={**entry, 'category': 'general', 'companyId': 'company-1', 'createdAt': '2025-09-01'})
+        table.put_item(Item={'id': '4', 'question': '다른 회사 비밀번호 문의', 'answer': '다른 회사 답변',
+                             'category': 'general', 'companyId': 'company-2', 'createdAt': '2025-09-01'})
+        table.put_item(Item={'id': '5', 'question': '비밀번호 변경 주기는?', 'answer': '90일마다 변경을 권장합니다.',
+                             'category': 'general', 'createdAt': '2025-09-01'})
+        yield table
+
+
+def test_관련_QnA_검색():
+    """조사/어미가 달라도 가장 관련 있는 Q&A가 먼저 나옴"""
+    index = QnAIndex.build(ENTRIES)
+
+    results = index.search('비밀번호를 잊어버렸는데 어떻게 하나요', k=2)
+
+    assert results[0]['id'] == '1'
+    assert index.search('전혀 상관없는 날씨 이야기') == []
+
+def test_회사별_색인과_디스크_재사용(qna_table, tmp_path):
+    """다른 회사 Q&A는 제외하고 공용 Q&A는 포함, 새 검색기는 디스크 색인을 재사용"""
+    retriever = QnARetriever(qna_table=qna_table, index_dir=str(tmp_path), s3_bucket='')
+    inquiry = {'companyId': 'company-1', 'category': 'general', 'title': '비밀번호', 'content': '비밀번호 재설정 방법'}
+
+    ids = {result['id'] for result in retriever.retrieve(inquiry, k=5)}
+    assert '1' in ids and '5' in ids and '4' not in ids
+
+    table = Mock()
+    cold_start = QnARetriever(qna_table=table, index_dir=str(tmp_path), s3_bucket='')
+    assert cold_start.retrieve(inquiry)[0]['id'] == retriever.retrieve(inquiry)[0]['id']
+    table.query.assert_not_called()
+
+def test_요청_값으로_경로를_벗어나지_않고_색인_수_제한(qna_table, tmp_path):
+    """companyId/category는 해시 이름으로만 저장, 없는 회사는 조회하지 않고, 메모리 색인은 LRU로 제한"""
+    index_dir = tmp_path / 'index'
+    known = {'company-1', '../../etc'}
+    retriever = QnARetriever(qna_table=qna_table, index_dir=str(index_dir), s3_bucket='', max_entries=2,
+                             company_exists=lambda company_id: company_id in known)
+
+    retriever.get_index('../../etc', '/passwd')
+    retriever.get_index('company-1', 'general')
+    assert [path.parent for path in tmp_path.rglob('*.json.gz')] == [index_dir] * 2
+
+    table = Mock()
+    unknown = QnARetriever(qna_table=table, index_dir=str(index_dir), s3_bucket='',
+                           company_exists=lambda company_id: False)
+    assert unknown.retrieve({'companyId': 'random-1', 'category': 'general', 'title': '비밀번호'}) == []
+    table.query.assert_not_called()
+
+    retriever.get_index('company-1', 'billing')
+    assert list(retriever._indexes) == [('company-1', 'general'), ('company-1', 'billing')]
+
+def test_FAQ_매칭은_질문이_거의_같을_때만():
+    """질문과 거의 같은 문의만 매칭되고, 다른 요청이 섞이면 매칭되지 않음"""
+    retriever = QnARetriever(qna_table=Mock(), index_dir='', s3_bucket='')
+    retriever._indexes[('company-1', 'general')] = QnAIndex.build(ENTRIES)
+
+    matched = retriever.match({'companyId': 'company-1', 'category': 'general',
+                               'title': '비밀번호 분실', 'content': '비밀번호를 잊어버렸어요'})
+    assert matched['id'] == '1'
+    assert retriever.match({'companyId': 'company-1', 'category': 'general', 'title': '비밀번호',
+                            'content': '비밀번호를 잊어버렸는데 어제 주문한 상품 환불도 같이 요청드립니다'}) is None
+
+def test_검색_지연은_수_ms_이내():
+    """2000건 색인에서 검색이 10ms 이내"""
+    entries = [
+        {'id': str(i), 'question': f'{i}번 상품 {"배송" if i % 2 else "환불"} 문의', 'answer': f'{i}번 상품 안내입니다.'}
+        for i in range(2000)
+    ]
+    index = QnAIndex.build(entries)
+    index = QnAIndex.from_bytes(index.to_bytes())
+
+    started = time.perf_counter()
+    for _ in range(20):
+        index.search('환불 요청합니다 상품이 파손되었어요')
+    elapsed_ms = (time.perf_counter() - started) / 20 * 1000
+
+    assert elapsed_ms < 10
+
+def test_AI_프롬프트에_검색_결과_주입():
+    """검색된 Q&A는 system이 아닌 user 메시지에 들어감"""
+    retriever = Mock()
+    retriever.retrieve.return_value = [{**ENTRIES[0], 'score': 0.8}]
+    fake_client = FakeBedrockClient(response_text='답변')
+    ai_service = AIService(bedrock_client=fake_client, response_cache=None, qna_retriever=retriever)
+
+    ai_service.generate_response({'title': '비밀번호', 'content': '비밀번호를 잊어버렸어요'})
+
+    call = fake_client.calls[0]
+    assert "비밀번호 찾기" in call['messages'][0]['content'][0]['text']
+    assert "비밀번호 찾기" not in call['system'][0]['text']
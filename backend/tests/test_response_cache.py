@@ -0,0 +1,127 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import boto3
+from moto import mock_dynamodb
+
+from src.services.ai_service import AIService
+from src.services.fake_bedrock import FakeBedrockClient
+from src.services.response_cache import (
+    ResponseCache, InMemoryCacheBackend, DiskCacheBackend, DynamoDBCacheBackend, make_cache_key
+)
+
+INQUIRY = {'companyId': 'company-1', 'category': 'billing', 'title': '결제가 안 돼요', 'content': '카드 결제가 계속 실패합니다.'}
+
+
+def test_캐시_키_정규화():
+    """공백/대소문자/문장부호 차이는 같은 키, 회사가 다르면 다른 키"""
+    variant = {**INQUIRY, 'title': '  결제가   안 돼요!! ', 'content': '카드 결제가 계속 실패합니다'}
+
+    assert make_cache_key(INQUIRY) == make_cache_key(variant)
+    assert make_cache_key(INQUIRY) != make_cache_key({**INQUIRY, 'companyId': 'company-2'})
+    assert make_cache_key(INQUIRY, profile_version=1) != make_cache_key(INQUIRY, profile_version=2)
+
+def test_반복_문의는_캐시에서_응답():
+    """같은 문의는 Bedrock을 한 번만 호출하고 히트/미스가 집계됨"""
+    fake_client = FakeBedrockClient(response_text="결제 수단을 다시 등록해주세요.")
+    cache = ResponseCache(InMemoryCacheBackend())
+    ai_service = AIService(bedrock_client=fake_client, response_cache=cache)
+
+    first = ai_service.generate_response(INQUIRY)
+    second = ai_service.generate_response({**INQUIRY, 'title': '결제가 안 돼요?'})
+
+    assert first == second == "결제 수단을 다시 등록해주세요."
+    assert len(fake_client.calls) == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+def test_폴백_응답은_캐시하지_않음():
+    """Bedrock 실패 시 스마트 폴백 응답은 캐시에 저장되지 않음"""
+    failing_client = Mock()
+    failing_client.converse.side_effect = Exception("ThrottlingException")
+    cache = ResponseCache(InMemoryCacheBackend())
+    ai_service = AIService(bedrock_client=failing_client, response_cache=cache)
+
+    ai_service.generate_response(INQUIRY)
+
+    assert cache.get(INQUIRY) is None
+
+def test_동시_조회_카운터와_지표_증가분():
+    """여러 스레드가 동시에 조회해도 히트/미스가 빠짐없이 집계되고 지표는 증가분만 출력"""
+    cache = ResponseCache(InMemoryCacheBackend())
+    cache.put(INQUIRY, "캐시된 응답")
+    missing = {**INQUIRY, 'title': '배송 문의'}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: cache.get(INQUIRY if i % 2 else missing), range(400)))
+
+    assert cache.stats()['hits'] == 200 and cache.stats()['misses'] == 200
+    cache.emit_metrics()
+    assert cache._emitted == {'hits': 200, 'similarHits': 0, 'misses': 200}
+
+def test_재생성은_캐시_무시():
+    """use_cache=False면 새로 생성하고 캐시를 덮어씀"""
+    fake_client = FakeBedrockClient(response_text="첫 번째 응답")
+    cache = ResponseCache(InMemoryCacheBackend())
+    ai_service = AIService(bedrock_client=fake_client, response_cache=cache)
+    ai_service.generate_response(INQUIRY)
+
+    fake_client.response_text = "두 번째 응답"
+
+    assert ai_service.generate_response(INQUIRY, use_cache=False) == "두 번째 응답"
+    assert ai_service.generate_response(INQUIRY) == "두 번째 응답"
+
+def test_메모리_캐시_TTL_및_LRU():
+    """만료된 항목은 조회되지 않고, 최대 크기를 넘으면 가장 오래 안 쓴 항목부터 제거"""
+    backend = InMemoryCacheBackend(max_entries=2)
+    backend.put('a', 'A', ttl_seconds=60)
+    backend.put('b', 'B', ttl_seconds=60)
+    backend.get('a')
+    backend.put('c', 'C', ttl_seconds=60)
+
+    assert backend.get('b') is None
+    assert backend.get('a') == 'A'
+
+    backend.put('expired', 'X', ttl_seconds=-1)
+    assert backend.get('expired') is None
+
+def test_유사도_조회():
+    """임계값 이상으로 비슷한 문의는 유사 히트로 응답"""
+    cache = ResponseCache(InMemoryCacheBackend(), similarity_threshold=0.7)
+    cache.put(INQUIRY, '결제 안내')
+
+    similar = {**INQUIRY, 'content': '카드 결제가 계속 실패해요.'}
+    unrelated = {**INQUIRY, 'title': '배송 조회', 'content': '택배가 아직 안 왔어요.'}
+
+    assert cache.get(similar) == '결제 안내'
+    assert cache.get(unrelated) is None
+    assert cache.stats()['similarHits'] == 1
+
+def test_디스크_캐시(tmp_path):
+    """디스크 캐시 저장/조회 및 최대 항목 수 유지"""
+    backend = DiskCacheBackend(str(tmp_path), max_entries=1)
+    backend.put('old', '이전', ttl_seconds=60)
+    time.sleep(0.01)
+    backend.put('new', '최신', ttl_seconds=60)
+
+    assert backend.get('new') == '최신'
+    assert backend.get('old') is None
+
+@mock_dynamodb
+def test_DynamoDB_캐시():
+    """DynamoDB 캐시 저장/조회 및 만료 항목 무시"""
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.create_table(
+        TableName='ai-response-cache',
+        KeySchema=[{'AttributeName': 'cacheKey', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'cacheKey', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    backend = DynamoDBCacheBackend(table=table)
+
+    backend.put('key-1', '응답', ttl_seconds=60)
+    backend.put('key-2', '만료', ttl_seconds=-10)
+
+    assert backend.get('key-1') == '응답'
+    assert backend.get('key-2') is None
+    assert backend.get('missing') is None
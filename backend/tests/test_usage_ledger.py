@@ -0,0 +1,129 @@
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_dynamodb
+
+from config.model_telemetry import estimate_cost
+from src.handlers import usage_dashboard
+from src.services.ai_service import AIService
+from src.services.dynamodb_service import DynamoDBService
+from src.services.fake_bedrock import FakeBedrockClient
+from src.services.usage_ledger import UsageLedger, build_usage_entry
+
+MODEL_ID = 'us.anthropic.claude-sonnet-4-20250514-v1:0'
+
+
+@pytest.fixture
+def tables():
+    with mock_dynamodb():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        inquiries = dynamodb.create_table(
+            TableName='cs-inquiries',
+            KeySchema=[{'AttributeName': 'inquiry_id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'inquiry_id', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        usage = dynamodb.create_table(
+            TableName='ai-usage',
+            KeySchema=[
+                {'AttributeName': 'companyId', 'KeyType': 'HASH'},
+                {'AttributeName': 'period', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'companyId', 'AttributeType': 'S'},
+                {'AttributeName': 'period', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        yield inquiries, usage
+
+
+def test_사용량_항목과_캐시_토큰_비용():
+    entry = build_usage_entry(MODEL_ID, {
+        'inputTokens': 1000, 'outputTokens': 500, 'cacheReadInputTokens': 2000
+    }, latency_ms=1234.5, server_latency_ms=1100, fallback=True)
+
+    assert entry['modelId'] == MODEL_ID
+    assert (entry['latencyMs'], entry['serverLatencyMs'], entry['fallback']) == (1234, 1100, True)
+    # 입력 0.003 + 출력 0.0075 + 캐시 읽기 2000 × 0.1 × 0.003/1K
+    assert entry['costUsd'] == round(estimate_cost(MODEL_ID, 1000, 500, 2000), 6) == 0.0111
+
+def test_AI_호출_사용량이_문의와_회사_집계에_기록(tables):
+    """converse 호출마다 문의 aiUsage에 추가되고 회사 일 집계에 누적됨"""
+    inquiries, usage = tables
+    db_service = DynamoDBService(inquiries_table=inquiries)
+    inquiries.put_item(Item={'inquiry_id': 'q-1', 'companyId': 'company-1', 'category': 'billing'})
+    ledger = UsageLedger(usage_table=usage, db_service=db_service)
+    ai_service = AIService(bedrock_client=FakeBedrockClient(response_text='답변'), response_cache=None,
+                           usage_ledger=ledger)
+
+    inquiry = {'inquiry_id': 'q-1', 'companyId': 'company-1', 'category': 'billing',
+               'title': '환불', 'content': '환불 문의'}
+    ai_service.generate_response(inquiry)
+    ai_service.generate_response(inquiry)
+
+    item = inquiries.get_item(Key={'inquiry_id': 'q-1'})['Item']
+    assert len(item['aiUsage']) == 2
+    assert item['aiUsage'][0]['fallback'] is False
+    assert item['aiOutputTokens'] == 2 * item['aiUsage'][0]['outputTokens']
+
+    today = datetime.utcnow().date().isoformat()
+    report = ledger.get_company_usage('company-1', today, today)
+    assert report['totals']['calls'] == 2
+    assert report['totals']['costUsd'] == item['aiCostUsd']
+    assert report['byCategory']['billing']['calls'] == 2
+    assert report['byModel'][item['aiUsage'][0]['modelId']]['calls'] == 2
+    assert report['byDay'][0]['period'] == today
+
+def test_대시보드_조회():
+    """기간 검증 후 회사 집계 반환, 집계 미사용이면 404"""
+    report = {'companyId': 'company-1', 'totals': {'calls': 3}}
+    with patch('src.handlers.usage_dashboard.get_company_usage', return_value=report) as mock_usage:
+        result = usage_dashboard.lambda_handler({'queryStringParameters': {
+            'companyId': 'company-1', 'from': '2026-10-01', 'to': '2026-10-18'
+        }}, None)
+
+        assert json.loads(result['body'])['data'] == report
+        mock_usage.assert_called_once_with('company-1', '2026-10-01', '2026-10-18')
+
+        bad = usage_dashboard.lambda_handler({'queryStringParameters': {
+            'companyId': 'company-1', 'from': '2026-10-18', 'to': '2026-10-01'
+        }}, None)
+        assert bad['statusCode'] == 400
+
+    with patch('src.handlers.usage_dashboard.get_company_usage', return_value=None):
+        result = usage_dashboard.lambda_handler({'queryStringParameters': {'companyId': 'company-1'}}, None)
+        assert result['statusCode'] == 404
+
+def test_카테고리_정규화와_모델_ID_구분자_인코딩(tables):
+    """알 수 없는 카테고리는 other로, '#'가 든 값도 분해 집계가 깨지지 않음"""
+    _, usage = tables
+    ledger = UsageLedger(usage_table=usage, db_service=DynamoDBService(inquiries_table=tables[0]))
+    entry = build_usage_entry('custom#model%1', {'inputTokens': 10, 'outputTokens': 5}, latency_ms=100)
+
+    ledger.record({'companyId': 'company-1', 'category': 'x#calls'}, entry)
+    ledger.record({'companyId': 'company-1', 'category': 'billing'}, entry)
+
+    today = datetime.utcnow().date().isoformat()
+    report = ledger.get_company_usage('company-1', today, today)
+    assert set(report['byCategory']) == {'other', 'billing'}
+    assert report['byModel']['custom#model%1']['calls'] == 2
+
+def test_문의_사용량_목록_상한(tables):
+    """aiUsage는 상한까지만 쌓고 이후 호출은 합계와 생략 건수만 누적"""
+    inquiries, _ = tables
+    db_service = DynamoDBService(inquiries_table=inquiries)
+    inquiries.put_item(Item={'inquiry_id': 'q-1'})
+    entry = build_usage_entry(MODEL_ID, {'inputTokens': 10, 'outputTokens': 5}, latency_ms=100)
+
+    with patch('src.services.dynamodb_service.AI_USAGE_MAX_ENTRIES', 2):
+        results = [db_service.record_ai_usage('q-1', entry) for _ in range(3)]
+
+    item = inquiries.get_item(Key={'inquiry_id': 'q-1'})['Item']
+    assert results == [True, True, True]
+    assert len(item['aiUsage']) == 2
+    assert (item['aiInputTokens'], item['aiUsageOmitted']) == (30, 1)
+    assert db_service.record_ai_usage('missing', entry) is False
@@ -0,0 +1,99 @@
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+from src.handlers import ai_response_worker
+from src.handlers.ai_response_worker import lambda_handler, drain_queue
+from src.services.ai_job_queue import InMemoryJobQueue
+from src.services.dynamodb_service import DynamoDBService
+from src.services.local_table import get_local_table, reset_local_tables
+
+
+class TestAIResponseWorker:
+    
+    def _record(self, message_id, job, receive_count=1):
+        return {
+            'messageId': message_id,
+            'body': json.dumps(job),
+            'attributes': {'ApproximateReceiveCount': str(receive_count)}
+        }
+    
+    def test_batch_partial_failure(self):
+        """실패한 메시지만 batchItemFailures로 반환"""
+        event = {'Records': [
+            self._record('msg-1', {'inquiry_id': 'inquiry-1', 'title': '로그인 문제'}),
+            self._record('msg-2', {'inquiry_id': 'inquiry-2', 'title': '결제 문제'})
+        ]}
+        
+        def fake_update(inquiry_id, ai_response, only_if_pending):
+            if inquiry_id == 'inquiry-2':
+                raise Exception("ProvisionedThroughputExceededException")
+            return {'inquiry_id': inquiry_id}
+        
+        with patch('src.handlers.ai_response_worker.generate_ai_response', return_value='AI 응답입니다.'), \
+             patch('src.handlers.ai_response_worker.db_service') as mock_db:
+            mock_db.update_inquiry_ai_response.side_effect = fake_update
+            
+            result = lambda_handler(event, None)
+        
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'msg-2'}]}
+        assert mock_db.update_inquiry_ai_response.call_count == 2
+    
+    def test_fallback_only_on_last_attempt(self):
+        """마지막 시도에서만 폴백 응답 허용"""
+        event = {'Records': [
+            self._record('msg-1', {'inquiry_id': 'inquiry-1'}, receive_count=1),
+            self._record('msg-2', {'inquiry_id': 'inquiry-2'}, receive_count=ai_response_worker.MAX_RECEIVE_COUNT)
+        ]}
+        
+        with patch('src.handlers.ai_response_worker.generate_ai_response', return_value='응답') as mock_generate, \
+             patch('src.handlers.ai_response_worker.db_service'):
+            lambda_handler(event, None)
+        
+        fallback_flags = {call.args[0]['inquiry_id']: call.kwargs['fallback_on_error'] for call in mock_generate.call_args_list}
+        assert fallback_flags == {'inquiry-1': False, 'inquiry-2': True}
+    
+    def test_drain_queue_retries_then_dead_letters(self):
+        """인메모리 큐: 계속 실패하는 작업은 재시도 후 DLQ로 이동"""
+        queue = InMemoryJobQueue(max_receive_count=3)
+        queue.send({'inquiry_id': 'inquiry-ok'})
+        queue.send({'inquiry_id': 'inquiry-broken'})
+        
+        def fake_generate(job, fallback_on_error):
+            if job['inquiry_id'] == 'inquiry-broken':
+                raise Exception("ThrottlingException")
+            return 'AI 응답입니다.'
+        
+        with patch('src.handlers.ai_response_worker.generate_ai_response', side_effect=fake_generate), \
+             patch('src.handlers.ai_response_worker.db_service') as mock_db, \
+             patch('src.handlers.ai_response_worker.MAX_RECEIVE_COUNT', 5):
+            mock_db.update_inquiry_ai_response.return_value = {'status': 'ai_responded'}
+            
+            processed = drain_queue(queue)
+        
+        assert processed == 4  # 성공 1회 + 실패 작업 3회 수신
+        assert len(queue) == 0
+        assert [json.loads(m['body'])['inquiry_id'] for m in queue.dead_letters] == ['inquiry-broken']
+        mock_db.update_inquiry_ai_response.assert_called_once_with('inquiry-ok', 'AI 응답입니다.', only_if_pending=True)
+    
+    def test_already_handled_inquiry_not_overwritten(self):
+        """재전송/지연된 작업은 pending이 아닌 문의를 덮지 않고 완료로 처리 (재시도/DLQ 없음)"""
+        reset_local_tables()
+        try:
+            table = get_local_table('cs-inquiries-worker-test')
+            table.put_item(Item={'inquiry_id': 'inquiry-1', 'status': 'escalated', 'humanResponse': '상담사 답변'})
+            table.put_item(Item={'inquiry_id': 'inquiry-2', 'status': 'pending'})
+            event = {'Records': [
+                self._record('msg-1', {'inquiry_id': 'inquiry-1'}, receive_count=2),
+                self._record('msg-2', {'inquiry_id': 'inquiry-2'})
+            ]}
+            
+            with patch('src.handlers.ai_response_worker.generate_ai_response', return_value='AI 응답입니다.'), \
+                 patch.object(ai_response_worker, 'db_service', DynamoDBService(inquiries_table=table)):
+                result = lambda_handler(event, None)
+            
+            assert result == {'batchItemFailures': []}
+            escalated = table.get_item(Key={'inquiry_id': 'inquiry-1'})['Item']
+            assert escalated['status'] == 'escalated' and 'aiResponse' not in escalated
+            assert table.get_item(Key={'inquiry_id': 'inquiry-2'})['Item']['status'] == 'ai_responded'
+        finally:
+            reset_local_tables()
@@ -0,0 +1,147 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import boto3
+import pytest
+from unittest.mock import patch
+from moto import mock_dynamodb
+
+from src.handlers import bulk_regenerate
+from src.handlers.bulk_regenerate import run_bulk_regeneration, FileCheckpointStore
+from src.services.dynamodb_service import DynamoDBService
+from src.utils.rate_limit import TokenBucket
+
+
+@pytest.fixture
+def inquiries_table():
+    with mock_dynamodb():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='cs-inquiries',
+            KeySchema=[{'AttributeName': 'inquiry_id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[
+                {'AttributeName': 'inquiry_id', 'AttributeType': 'S'},
+                {'AttributeName': 'status', 'AttributeType': 'S'},
+                {'AttributeName': 'created_at', 'AttributeType': 'S'}
+            ],
+            GlobalSecondaryIndexes=[{
+                'IndexName': 'status-index',
+                'KeySchema': [
+                    {'AttributeName': 'status', 'KeyType': 'HASH'},
+                    {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            }],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        for i in range(1, 3):
+            table.put_item(Item={
+                'inquiry_id': f'p-{i}', 'status': 'pending', 'title': f'문의 {i}',
+                'created_at': f'2025-09-0{i}T10:00:00'
+            })
+        for i in range(1, 5):
+            table.put_item(Item={
+                'inquiry_id': f'r-{i}', 'status': 'ai_responded', 'aiResponse': '이전 응답',
+                'ai_responded_at': f'2025-08-0{i}T11:00:00', 'created_at': f'2025-08-0{i}T10:00:00'
+            })
+        with patch.object(bulk_regenerate, 'db_service', DynamoDBService(inquiries_table=table)):
+            yield table
+
+
+class TestBulkRegenerate:
+
+    def test_regenerates_all_statuses_once(self, inquiries_table):
+        """pending → ai_responded로 옮겨간 문의는 같은 작업에서 다시 생성하지 않음"""
+        with patch('src.handlers.bulk_regenerate.generate_ai_response', return_value='새 응답') as mock_generate:
+            report = run_bulk_regeneration(page_size=2, rate_per_second=1000, concurrency=3)
+
+        assert report['completed'] is True
+        assert report['checkpoint'] is None
+        assert report['processed'] == 6 and report['succeeded'] == 6 and report['failed'] == 0
+        assert report['skipped'] == 2
+        assert mock_generate.call_count == 6
+        assert inquiries_table.get_item(Key={'inquiry_id': 'r-1'})['Item']['aiResponse'] == '새 응답'
+
+    def test_resume_from_checkpoint(self, inquiries_table, tmp_path):
+        """중단 후 체크포인트 파일로 이어서 실행하면 남은 문의만 처리"""
+        store = FileCheckpointStore(str(tmp_path / 'checkpoint.json'))
+
+        with patch('src.handlers.bulk_regenerate.generate_ai_response', return_value='새 응답') as mock_generate:
+            first = run_bulk_regeneration(statuses=['ai_responded'], checkpoint_store=store,
+                                          page_size=2, rate_per_second=1000, max_items=2)
+            assert first['completed'] is False
+            assert store.load()['processed'] == 2
+
+            second = run_bulk_regeneration(statuses=['ai_responded'], checkpoint_store=store,
+                                           page_size=2, rate_per_second=1000)
+
+        assert second['completed'] is True
+        assert second['processed'] == 4 and second['run']['processed'] == 2
+        assert store.load() is None
+        regenerated = sorted(call.args[0]['inquiry_id'] for call in mock_generate.call_args_list)
+        assert regenerated == ['r-1', 'r-2', 'r-3', 'r-4']
+
+    def test_failures_are_reported(self, inquiries_table):
+        """Bedrock 오류는 기존 응답을 덮어쓰지 않고 실패 목록에 기록"""
+        def fake_generate(inquiry):
+            if inquiry['inquiry_id'] == 'p-2':
+                raise Exception('ThrottlingException')
+            return '새 응답'
+
+        with patch('src.handlers.bulk_regenerate.generate_ai_response', side_effect=fake_generate):
+            report = run_bulk_regeneration(statuses=['pending'], rate_per_second=1000)
+
+        assert report['failed'] == 1 and report['succeeded'] == 1
+        assert inquiries_table.get_item(Key={'inquiry_id': 'p-2'})['Item']['status'] == 'pending'
+        assert report['run']['latencyP95'] >= report['run']['latencyP50']
+
+    def test_resume_from_checkpoint_in_new_process(self, tmp_path):
+        """CURSOR_SECRET 없는 CLI를 다시 실행해도(새 프로세스) 체크포인트에서 이어서 처리"""
+        script = textwrap.dedent('''
+            import json, sys
+            from src.services.aws_clients import get_table
+            table = get_table()
+            for i in range(1, 5):
+                table.put_item(Item={'inquiry_id': f'r-{i}', 'status': 'ai_responded', 'aiResponse': '이전 응답',
+                                     'ai_responded_at': f'2025-08-0{i}T11:00:00', 'created_at': f'2025-08-0{i}T10:00:00'})
+            from src.handlers import bulk_regenerate
+            bulk_regenerate.generate_ai_response = lambda inquiry: '새 응답'
+            bulk_regenerate.main(['--status', 'ai_responded', '--checkpoint-file', sys.argv[1], '--rate', '1000'] + sys.argv[2:])
+        ''')
+        backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..')
+        env = {**os.environ, 'STORAGE_BACKEND': 'memory', 'DYNAMODB_TABLE': 'cs-inquiries-bulk-test',
+               'AI_BULK_PAGE_SIZE': '2'}
+        for name in ('CURSOR_SECRET', 'CURSOR_SECRET_ARN', 'AWS_LAMBDA_FUNCTION_NAME'):
+            env.pop(name, None)
+        checkpoint_file = str(tmp_path / 'checkpoint.json')
+
+        def run(*args):
+            result = subprocess.run([sys.executable, '-c', script, checkpoint_file, *args], cwd=backend_dir,
+                                    env=env, capture_output=True, text=True, timeout=60)
+            assert result.returncode == 0, result.stderr
+            return json.loads(result.stdout)
+
+        first = run('--max-items', '2')
+        assert first['completed'] is False and os.path.exists(checkpoint_file)
+
+        second = run()
+        assert second['completed'] is True
+        assert second['processed'] == 4 and second['run']['processed'] == 2
+        assert not os.path.exists(checkpoint_file)
+
+
+def test_token_bucket_waits_for_refill():
+    """토큰이 없으면 보충 속도에 맞춰 대기"""
+    now = [0.0]
+
+    def fake_sleep(seconds):
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2, capacity=1, clock=lambda: now[0], sleep=fake_sleep)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.try_acquire() is False
+    assert bucket.acquire() == pytest.approx(0.5)
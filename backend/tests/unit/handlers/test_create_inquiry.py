@@ -33,6 +33,70 @@ class TestCreateInquiry:
             assert 'inquiryId' in body['data']
             assert body['data']['aiResponse'] == "AI 응답입니다."
     
+    def test_create_inquiry_async_mode(self):
+        """비동기 모드에서는 작업만 큐에 넣고 pending으로 즉시 반환"""
+        event = {
+            'body': json.dumps({
+                'companyId': 'test-company',
+                'customerEmail': 'test@example.com',
+                'customerPassword': 'secret123',
+                'title': '테스트 문의',
+                'content': '테스트 내용',
+                'urgency': 'medium'
+            })
+        }
+        context = {}
+        
+        with patch.dict('os.environ', {'AI_RESPONSE_MODE': 'async'}), \
+             patch('src.handlers.create_inquiry.create_inquiry') as mock_create, \
+             patch('src.handlers.create_inquiry.generate_ai_response') as mock_ai, \
+             patch('src.handlers.create_inquiry.get_job_queue') as mock_queue:
+            
+            mock_create.return_value = True
+            
+            result = lambda_handler(event, context)
+            
+            assert result['statusCode'] == 200
+            body = json.loads(result['body'])
+            assert body['data']['status'] == 'pending'
+            assert 'aiResponse' not in body['data']
+            mock_ai.assert_not_called()
+            
+            job = mock_queue.return_value.send.call_args.args[0]
+            assert job['inquiry_id'] == body['data']['inquiryId']
+            assert 'customerPassword' not in job
+    
+    def test_create_inquiry_faq_match(self):
+        """등록된 Q&A와 일치하면 AI 호출 없이 FAQ 답변으로 ai_responded 반환"""
+        event = {
+            'body': json.dumps({
+                'companyId': 'test-company',
+                'customerEmail': 'test@example.com',
+                'title': '비밀번호 분실',
+                'content': '비밀번호를 잊어버렸어요'
+            })
+        }
+        context = {}
+        
+        with patch('src.handlers.create_inquiry.create_inquiry') as mock_create, \
+             patch('src.handlers.create_inquiry.match_faq') as mock_match, \
+             patch('src.handlers.create_inquiry.db_service') as mock_db, \
+             patch('src.handlers.create_inquiry.generate_ai_response') as mock_ai:
+            
+            mock_create.return_value = True
+            mock_match.return_value = {'id': 'faq-1', 'question': '비밀번호를 잊어버렸어요',
+                                       'answer': "'비밀번호 찾기'를 이용해주세요.", 'score': 0.93}
+            mock_db.update_inquiry_ai_response.return_value = {'status': 'ai_responded'}
+            
+            result = lambda_handler(event, context)
+            
+            body = json.loads(result['body'])
+            assert body['data']['status'] == 'ai_responded'
+            assert body['data']['source'] == 'faq'
+            assert body['data']['aiResponse'] == "'비밀번호 찾기'를 이용해주세요."
+            mock_ai.assert_not_called()
+            assert mock_db.update_inquiry_ai_response.call_args.kwargs['source'] == 'faq'
+    
     def test_create_inquiry_validation_error(self):
         """입력 검증 실패 테스트"""
         event = {
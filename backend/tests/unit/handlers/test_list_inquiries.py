@@ -22,7 +22,7 @@ class TestListInquiries:
         ]
         
         with patch('src.handlers.list_inquiries.list_inquiries') as mock_list:
-            mock_list.return_value = mock_inquiries
+            mock_list.return_value = {'items': mock_inquiries, 'next_cursor': None}
             
             result = lambda_handler(event, context)
             
@@ -48,7 +48,7 @@ class TestListInquiries:
         ]
         
         with patch('src.handlers.list_inquiries.list_inquiries') as mock_list:
-            mock_list.return_value = mock_inquiries
+            mock_list.return_value = {'items': mock_inquiries, 'next_cursor': None}
             
             result = lambda_handler(event, context)
             
@@ -57,6 +57,44 @@ class TestListInquiries:
             assert body['success'] is True
             assert len(body['data']['inquiries']) == 1
     
+    def test_list_inquiries_cursor_pagination(self):
+        """cursor 파라미터 전달 및 nextCursor 반환 테스트"""
+        event = {
+            'queryStringParameters': {
+                'companyId': 'test-company',
+                'limit': '1000',
+                'cursor': 'page-2-token'
+            }
+        }
+        context = {}
+        
+        mock_inquiries = [{'id': 'inquiry-3', 'title': '세 번째 문의', 'status': 'pending'}]
+        
+        with patch('src.handlers.list_inquiries.list_inquiries') as mock_list:
+            mock_list.return_value = {'items': mock_inquiries, 'next_cursor': 'page-3-token'}
+            
+            result = lambda_handler(event, context)
+            
+            assert result['statusCode'] == 200
+            body = json.loads(result['body'])
+            assert body['data']['nextCursor'] == 'page-3-token'
+            # limit은 최대 페이지 크기로 제한
+            mock_list.assert_called_once_with('test-company', None, 100, None, None, 'page-2-token')
+    
+    def test_list_inquiries_invalid_cursor(self):
+        """서명이 맞지 않는 cursor는 400 반환"""
+        event = {
+            'queryStringParameters': {
+                'companyId': 'test-company',
+                'cursor': 'tampered.cursor'
+            }
+        }
+        context = {}
+        
+        result = lambda_handler(event, context)
+        
+        assert result['statusCode'] == 400
+    
     def test_list_inquiries_missing_company_id(self):
         """회사 ID 누락 테스트"""
         event = {
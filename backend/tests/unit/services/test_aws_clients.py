@@ -0,0 +1,56 @@
+from unittest.mock import patch
+from src.services import aws_clients
+
+
+class TestAWSClients:
+    
+    def setup_method(self, method):
+        """각 테스트 전에 캐시 초기화"""
+        aws_clients.reset_clients()
+    
+    def teardown_method(self, method):
+        aws_clients.reset_clients()
+    
+    def test_client_reused_across_calls(self):
+        """같은 서비스 클라이언트는 한 번만 생성"""
+        with patch('src.services.aws_clients.boto3.client') as mock_client:
+            first = aws_clients.get_bedrock_client()
+            second = aws_clients.get_bedrock_client()
+            
+            assert first is second
+            mock_client.assert_called_once_with(
+                'bedrock-runtime', config=aws_clients.BEDROCK_CLIENT_CONFIG
+            )
+    
+    def test_table_handle_cached_per_name(self):
+        """Table 핸들은 테이블 이름별로 캐시"""
+        with patch('src.services.aws_clients.boto3.resource') as mock_resource:
+            mock_resource.return_value.Table.side_effect = lambda name: f"table:{name}"
+            
+            assert aws_clients.get_table('cs-inquiries') == 'table:cs-inquiries'
+            assert aws_clients.get_table('cs-inquiries') == 'table:cs-inquiries'
+            assert aws_clients.get_table('cs-companies') == 'table:cs-companies'
+            
+            mock_resource.assert_called_once()
+            assert mock_resource.return_value.Table.call_count == 2
+    
+    def test_reset_clients(self):
+        """reset_clients 후에는 새 클라이언트 생성"""
+        with patch('src.services.aws_clients.boto3.client') as mock_client:
+            aws_clients.get_client('ses')
+            aws_clients.reset_clients()
+            aws_clients.get_client('ses')
+            
+            assert mock_client.call_count == 2
+    
+    def test_client_cached_per_config(self):
+        """같은 서비스라도 설정이 다르면 별도 클라이언트"""
+        with patch('src.services.aws_clients.boto3.client') as mock_client:
+            mock_client.side_effect = lambda name, **kwargs: (name, kwargs['config'])
+            
+            default = aws_clients.get_client('s3')
+            assert aws_clients.get_client('s3', aws_clients.DEFAULT_CLIENT_CONFIG) is default
+            bedrock_config = aws_clients.get_client('s3', aws_clients.BEDROCK_CLIENT_CONFIG)
+            
+            assert bedrock_config == ('s3', aws_clients.BEDROCK_CLIENT_CONFIG)
+            assert mock_client.call_count == 2
@@ -0,0 +1,124 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+from src.services.aws_clients import get_table
+from src.services.dynamodb_service import DynamoDBService
+from src.services.local_table import LocalTable, TABLE_SCHEMAS, get_local_table, reset_local_tables
+
+
+def _local_inquiries_table():
+    schema = TABLE_SCHEMAS['cs-inquiries']
+    return LocalTable('cs-inquiries', schema['key'], schema['indexes'])
+
+def _seed(db_service):
+    inquiries = []
+    for i in range(12):
+        inquiries.append({
+            'inquiry_id': f'q-{i:02d}',
+            'companyId': 'company-1' if i % 3 else 'company-2',
+            'status': 'pending' if i % 2 else 'ai_responded',
+            'customerEmail': 'kim@example.com',
+            'created_at': f'2026-10-{i + 1:02d}T00:00:00',
+            'title': f'문의 {i}'
+        })
+        db_service.create_inquiry(inquiries[-1])
+    return inquiries
+
+def _all_pages(db_service, **filters):
+    return [[item['inquiry_id'] for item in page] for page in db_service.iter_inquiry_pages(page_size=3, **filters)]
+
+
+class TestLocalTable:
+
+    def test_GSI_쿼리와_페이지(self):
+        """GSI 파티션/정렬 키 범위, 나머지 필터, 최신순 커서 페이지가 DynamoDB 의미와 같음"""
+        db_service = DynamoDBService(inquiries_table=_local_inquiries_table())
+        inquiries = _seed(db_service)
+
+        for filters, matches in [
+            ({'company_id': 'company-1'}, lambda q: q['companyId'] == 'company-1'),
+            ({'company_id': 'company-1', 'status': 'pending'},
+             lambda q: q['companyId'] == 'company-1' and q['status'] == 'pending'),
+            ({'status': 'ai_responded', 'created_from': '2026-10-03', 'created_to': '2026-10-09'},
+             lambda q: q['status'] == 'ai_responded' and '2026-10-03' <= q['created_at'][:10] <= '2026-10-09'),
+        ]:
+            expected = sorted((q['inquiry_id'] for q in inquiries if matches(q)), reverse=True)
+            pages = _all_pages(db_service, **filters)
+            assert [inquiry_id for page in pages for inquiry_id in page] == expected, filters
+            # Limit은 필터 전 평가 건수 기준
+            assert all(len(page) <= 3 for page in pages)
+
+        page = db_service.query_inquiries(customer_email='kim@example.com', limit=5)
+        assert len(page['items']) == 5 and page['next_cursor']
+
+    def test_조건부_업데이트와_업데이트식(self):
+        db_service = DynamoDBService(inquiries_table=_local_inquiries_table())
+        _seed(db_service)
+
+        assert db_service.update_inquiry_status('missing', 'resolved') is None
+        updated = db_service.update_inquiry_status('q-01', 'resolved', '처리했습니다')
+        assert (updated['status'], updated['humanResponse']) == ('resolved', '처리했습니다')
+        assert 'resolvedAt' in updated
+
+        assert db_service.record_ai_usage('q-01', {'inputTokens': 10, 'outputTokens': 5, 'costUsd': 0.25})
+        assert db_service.record_ai_usage('q-01', {'inputTokens': 10, 'outputTokens': 5, 'costUsd': 0.25})
+        item = db_service.get_inquiry('q-01')
+        assert len(item['aiUsage']) == 2
+        assert (item['aiInputTokens'], item['aiCostUsd']) == (Decimal(20), Decimal('0.50'))
+
+        # 상태 변경 시 GSI도 갱신됨
+        resolved = db_service.query_inquiries(status='resolved')['items']
+        assert [inquiry['inquiry_id'] for inquiry in resolved] == ['q-01']
+
+    def test_문자열_조건식과_boto3_규칙(self):
+        table = LocalTable('cs-companies', ('companyId', None))
+        table.put_item(Item={'companyId': 'c-1', 'profileVersion': 1})
+
+        with pytest.raises(ClientError) as error:
+            table.update_item(Key={'companyId': 'c-1'}, UpdateExpression='SET profileVersion = :v',
+                              ConditionExpression='profileVersion = :expected',
+                              ExpressionAttributeValues={':v': 3, ':expected': 2})
+        assert error.value.response['Error']['Code'] == 'ConditionalCheckFailedException'
+
+        result = table.update_item(
+            Key={'companyId': 'c-1'},
+            UpdateExpression='SET profileVersion = if_not_exists(profileVersion, :zero) + :one, #n = :name '
+                             'REMOVE legacy',
+            ExpressionAttributeNames={'#n': 'name'},
+            ExpressionAttributeValues={':zero': 0, ':one': 1, ':name': '가게'},
+            ReturnValues='ALL_NEW'
+        )
+        assert result['Attributes'] == {'companyId': 'c-1', 'profileVersion': Decimal(2), 'name': '가게'}
+
+        with pytest.raises(TypeError):
+            table.put_item(Item={'companyId': 'c-2', 'score': 0.5})
+
+        # 반환값을 수정해도 저장본은 그대로
+        table.get_item(Key={'companyId': 'c-1'})['Item']['name'] = '변경'
+        assert table.get_item(Key={'companyId': 'c-1'})['Item']['name'] == '가게'
+
+    def test_복합_키_테이블_쿼리(self):
+        table = LocalTable('ai-usage', ('companyId', 'period'))
+        for day in ('2026-10-01', '2026-10-02', '2026-10-03'):
+            table.update_item(Key={'companyId': 'c-1', 'period': day},
+                              UpdateExpression='ADD calls :one', ExpressionAttributeValues={':one': 1})
+
+        response = table.query(KeyConditionExpression=Key('companyId').eq('c-1')
+                               & Key('period').between('2026-10-02', '2026-10-03'),
+                               FilterExpression=Attr('calls').gte(1))
+        assert [item['period'] for item in response['Items']] == ['2026-10-02', '2026-10-03']
+
+    @patch.dict('os.environ', {'STORAGE_BACKEND': 'memory', 'DYNAMODB_TABLE': 'cs-inquiries-local'})
+    def test_환경변수로_로컬_엔진_선택(self):
+        reset_local_tables()
+        try:
+            db_service = DynamoDBService()
+            assert db_service.inquiries_table is get_local_table('cs-inquiries-local')
+            assert get_table() is db_service.inquiries_table
+            assert isinstance(get_table('ai-usage-local'), LocalTable)
+        finally:
+            reset_local_tables()
@@ -0,0 +1,73 @@
+import io
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.utils.logger import JsonFormatter, RequestContextFilter, bind_request, redact, with_request_logging
+
+
+def _capture():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(RequestContextFilter())
+    test_logger = logging.getLogger('test_logger')
+    test_logger.handlers = [handler]
+    test_logger.propagate = False
+    test_logger.setLevel(logging.DEBUG)
+    return test_logger, stream
+
+def _lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestLogger:
+
+    def test_개인정보_마스킹(self):
+        """이메일은 첫 글자만, 비밀번호/토큰 필드는 전체를 가림"""
+        masked = redact({'email': 'customer@example.com', 'customerPassword': '1234',
+                         'items': [{'Authorization': 'Bearer abc'}]})
+
+        assert masked == {'email': 'c***@example.com', 'customerPassword': '***',
+                          'items': [{'Authorization': '***'}]}
+
+    def test_JSON_로그에_요청_ID와_extra_필드(self):
+        test_logger, stream = _capture()
+        bind_request({}, SimpleNamespace(aws_request_id='req-1'))
+
+        test_logger.info("문의 조회: %s, password=%s", 'kim@example.com', 'secret', extra={'inquiryId': 'q-1'})
+
+        entry = _lines(stream)[0]
+        assert entry['requestId'] == 'req-1'
+        assert entry['level'] == 'INFO'
+        assert entry['message'] == '문의 조회: k***@example.com, password=***'
+        assert entry['inquiryId'] == 'q-1'
+
+    @patch.dict('os.environ', {'LOG_SAMPLE_RATE_INFO': '0.5'})
+    def test_요청_단위_샘플링(self):
+        """샘플링에서 빠진 요청은 INFO를 남기지 않지만 WARNING 이상은 항상 남김"""
+        test_logger, stream = _capture()
+        with patch('src.utils.logger.random.random', return_value=0.9):
+            bind_request({'requestContext': {'requestId': 'req-2'}})
+
+        test_logger.info("생략됨")
+        test_logger.warning("남김")
+
+        assert [entry['message'] for entry in _lines(stream)] == ['남김']
+
+    def test_핸들러_요약_로그(self):
+        """데코레이터가 요청 ID를 설정하고 상태 코드/처리 시간을 한 줄로 남김"""
+        @with_request_logging
+        def handler(event, context):
+            return {'statusCode': 201}
+
+        with patch('src.utils.logger.configure_logging'), \
+             patch('logging.Logger.info') as mock_info:
+            result = handler({'httpMethod': 'POST', 'resource': '/api/inquiries',
+                              'requestContext': {'requestId': 'req-3'}}, None)
+
+        assert result == {'statusCode': 201}
+        extra = mock_info.call_args.kwargs['extra']
+        assert (extra['method'], extra['path'], extra['statusCode']) == ('POST', '/api/inquiries', 201)
+        assert extra['durationMs'] >= 0
@@ -1,5 +1,5 @@
 import pytest
-from src.utils.validation import validate_email, validate_inquiry_data
+from src.utils.validation import validate_email, validate_inquiry_data, normalize_category
 
 
 class TestValidationUtils:
@@ -79,4 +79,10 @@ class TestValidationUtils:
         
         errors = validate_inquiry_data(invalid_data)
         assert len(errors) == 1
-        assert 'urgency must be low, medium, or high' in errors
\ No newline at end of file
+        assert 'urgency must be low, medium, or high' in errors
+    
+    def test_normalize_category(self):
+        """알 수 없는 카테고리는 other로 정규화"""
+        assert normalize_category('billing') == 'billing'
+        assert normalize_category('billing#calls') == 'other'
+        assert normalize_category(None) == 'other'
@@ -29,6 +29,10 @@ data_stack = DataStack(app, f"{stack_prefix}-data",
                       env=env)
 api_stack = ApiStack(app, f"{stack_prefix}-api", 
                     dynamodb_table=data_stack.table,
+                    response_cache_table=data_stack.response_cache_table,
+                    company_table=data_stack.company_table,
+                    qna_table=data_stack.qna_table,
+                    usage_table=data_stack.usage_table,
                     developer=developer,
                     env=env)
 frontend_stack = FrontendStack(app, f"{stack_prefix}-frontend", 
@@ -4,7 +4,14 @@ from aws_cdk import (
     aws_apigateway as apigateway,
     aws_dynamodb as dynamodb,
     aws_iam as iam,
+    aws_sqs as sqs,
+    aws_s3 as s3,
+    aws_secretsmanager as secretsmanager,
+    aws_lambda_event_sources as lambda_event_sources,
+    aws_apigatewayv2 as apigwv2,
+    aws_apigatewayv2_integrations as apigwv2_integrations,
     Duration,
+    RemovalPolicy,
     CfnOutput
 )
 from constructs import Construct
@@ -12,6 +19,10 @@ from constructs import Construct
 class ApiStack(Stack):
     def __init__(self, scope: Construct, construct_id: str, 
                  dynamodb_table: dynamodb.Table, 
+                 response_cache_table: dynamodb.Table = None,
+                 company_table: dynamodb.Table = None,
+                 qna_table: dynamodb.Table = None,
+                 usage_table: dynamodb.Table = None,
                  developer: str = "", **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
         
@@ -27,11 +38,50 @@ class ApiStack(Stack):
         # Grant DynamoDB permissions
         dynamodb_table.grant_read_write_data(lambda_role)
         
+        # AI 응답 캐시 (캐시 테이블이 없으면 Lambda 컨테이너 내 메모리 캐시)
+        if response_cache_table is not None:
+            response_cache_table.grant_read_write_data(lambda_role)
+            ai_environment = {
+                "AI_RESPONSE_CACHE": "dynamodb",
+                "AI_RESPONSE_CACHE_TABLE": response_cache_table.table_name,
+                "AI_RESPONSE_CACHE_TTL": "86400"
+            }
+        else:
+            ai_environment = {
+                "AI_RESPONSE_CACHE": "memory",
+                "AI_RESPONSE_CACHE_TTL": "86400"
+            }
+        
+        # 회사 프로필 (AI 프롬프트의 회사 컨텍스트)
+        if company_table is not None:
+            company_table.grant_read_data(lambda_role)
+            ai_environment["COMPANY_TABLE"] = company_table.table_name
+            ai_environment["COMPANY_PROFILE_CACHE_TTL"] = "300"
+        
+        # Q&A 검색 (RAG) - 색인은 S3에 저장해 cold start 시 재사용
+        if qna_table is not None:
+            qna_table.grant_read_data(lambda_role)
+            qna_index_bucket = s3.Bucket(
+                self, "QnAIndexBucket",
+                removal_policy=RemovalPolicy.DESTROY,
+                auto_delete_objects=True,
+                lifecycle_rules=[s3.LifecycleRule(expiration=Duration.days(7))]
+            )
+            qna_index_bucket.grant_read_write(lambda_role)
+            ai_environment["QNA_TABLE"] = qna_table.table_name
+            ai_environment["QNA_INDEX_BUCKET"] = qna_index_bucket.bucket_name
+        
+        # AI 사용량/비용 기록 (문의 아이템 + 회사별 일 집계)
+        if usage_table is not None:
+            usage_table.grant_read_write_data(lambda_role)
+            ai_environment["AI_USAGE_TABLE"] = usage_table.table_name
+        
         # Bedrock permissions
         lambda_role.add_to_policy(
             iam.PolicyStatement(
                 actions=[
                     "bedrock:InvokeModel",
+                    "bedrock:InvokeModelWithResponseStream",
                     "bedrock:GetModel",
                     "bedrock:ListModels"
                 ],
@@ -39,6 +89,18 @@ class ApiStack(Stack):
             )
         )
         
+        # 페이지 토큰 서명 키 (값은 환경변수/템플릿에 넣지 않고 ARN만 전달, Lambda가 cold start 후 한 번 읽음)
+        cursor_secret = secretsmanager.Secret(
+            self, "CursorSecret",
+            description="HMAC key for inquiry list page tokens",
+            generate_secret_string=secretsmanager.SecretStringGenerator(
+                exclude_punctuation=True,
+                password_length=64
+            )
+        )
+        cursor_secret.grant_read(lambda_role)
+        cursor_environment = {"CURSOR_SECRET_ARN": cursor_secret.secret_arn}
+        
         # Lambda functions
         health_check = _lambda.Function(
             self, "HealthCheck",
@@ -67,7 +129,9 @@ class ApiStack(Stack):
                 "BEDROCK_FAST_MODEL": "us.anthropic.claude-sonnet-4-20250514-v1:0",
                 "BEDROCK_MAX_TOKENS": "4096",
                 "BEDROCK_TEMPERATURE": "0.7",
-                "BEDROCK_SELECTION_STRATEGY": "adaptive"
+                "BEDROCK_SELECTION_STRATEGY": "adaptive",
+                **ai_environment,
+                **cursor_environment
             }
         )
         
@@ -86,7 +150,8 @@ class ApiStack(Stack):
                 "BEDROCK_FAST_MODEL": "us.anthropic.claude-sonnet-4-20250514-v1:0",
                 "BEDROCK_MAX_TOKENS": "4096",
                 "BEDROCK_TEMPERATURE": "0.7",
-                "BEDROCK_SELECTION_STRATEGY": "adaptive"
+                "BEDROCK_SELECTION_STRATEGY": "adaptive",
+                **ai_environment
             }
         )
         
@@ -105,9 +170,119 @@ class ApiStack(Stack):
                 "BEDROCK_FAST_MODEL": "us.anthropic.claude-sonnet-4-20250514-v1:0",
                 "BEDROCK_MAX_TOKENS": "4096",
                 "BEDROCK_TEMPERATURE": "0.7",
-                "BEDROCK_SELECTION_STRATEGY": "adaptive"
+                "BEDROCK_SELECTION_STRATEGY": "adaptive",
+                **ai_environment
+            }
+        )
+        
+        # AI 응답 생성 작업 큐 (문의 생성과 Bedrock 호출 분리)
+        ai_job_dlq = sqs.Queue(
+            self, "AIResponseJobDLQ",
+            retention_period=Duration.days(14)
+        )
+        
+        ai_job_queue = sqs.Queue(
+            self, "AIResponseJobQueue",
+            visibility_timeout=Duration.seconds(720),  # 워커 timeout의 6배
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=3,
+                queue=ai_job_dlq
+            )
+        )
+        ai_job_queue.grant_send_messages(lambda_role)
+        # 문의 생성 route(POST /api/inquiries)는 작업만 등록하고 AI 응답은 워커가 생성
+        inquiry_handler.add_environment("AI_JOB_QUEUE_URL", ai_job_queue.queue_url)
+        
+        ai_response_worker = _lambda.Function(
+            self, "AIResponseWorker",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="src.handlers.ai_response_worker.lambda_handler",
+            code=_lambda.Code.from_asset("../backend"),
+            timeout=Duration.seconds(120),
+            memory_size=512,
+            role=lambda_role,
+            environment={
+                "DYNAMODB_TABLE": dynamodb_table.table_name,
+                "AI_WORKER_CONCURRENCY": "4",
+                "AI_JOB_MAX_RECEIVE_COUNT": "3",
+                "BEDROCK_DEFAULT_MODEL": "us.anthropic.claude-sonnet-4-20250514-v1:0",
+                "BEDROCK_FALLBACK_MODEL": "us.anthropic.claude-opus-4-20250514-v1:0",
+                "BEDROCK_FAST_MODEL": "us.anthropic.claude-sonnet-4-20250514-v1:0",
+                "BEDROCK_MAX_TOKENS": "4096",
+                "BEDROCK_TEMPERATURE": "0.7",
+                "BEDROCK_SELECTION_STRATEGY": "adaptive",
+                **ai_environment
             }
         )
+        ai_response_worker.add_event_source(
+            lambda_event_sources.SqsEventSource(
+                ai_job_queue,
+                batch_size=10,
+                max_batching_window=Duration.seconds(1),
+                report_batch_item_failures=True
+            )
+        )
+        
+        # AI 응답 대량 재생성 (수동 실행, 시간이 부족하면 checkpoint를 반환하므로 그대로 다시 호출)
+        _lambda.Function(
+            self, "AIBulkRegenerate",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="src.handlers.bulk_regenerate.lambda_handler",
+            code=_lambda.Code.from_asset("../backend"),
+            timeout=Duration.minutes(15),
+            memory_size=1024,
+            role=lambda_role,
+            environment={
+                "DYNAMODB_TABLE": dynamodb_table.table_name,
+                "AI_BULK_CONCURRENCY": "8",
+                "AI_BULK_RATE_PER_SECOND": "2",
+                "BEDROCK_DEFAULT_MODEL": "us.anthropic.claude-sonnet-4-20250514-v1:0",
+                "BEDROCK_FALLBACK_MODEL": "us.anthropic.claude-opus-4-20250514-v1:0",
+                "BEDROCK_FAST_MODEL": "us.anthropic.claude-sonnet-4-20250514-v1:0",
+                "BEDROCK_MAX_TOKENS": "4096",
+                "BEDROCK_TEMPERATURE": "0.7",
+                "BEDROCK_SELECTION_STRATEGY": "adaptive",
+                **ai_environment
+            }
+        )
+        
+        # AI 응답 스트리밍 (WebSocket: {"action": "stream", "inquiry_id": ...})
+        ai_stream_handler = _lambda.Function(
+            self, "AIResponseStream",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="src.handlers.stream_ai_response.lambda_handler",
+            code=_lambda.Code.from_asset("../backend"),
+            timeout=Duration.seconds(120),
+            memory_size=512,
+            role=lambda_role,
+            environment={
+                "DYNAMODB_TABLE": dynamodb_table.table_name,
+                "AI_STREAM_CHECKPOINT_CHARS": "200",
+                "AI_STREAM_CHECKPOINT_SECONDS": "1.0",
+                "BEDROCK_DEFAULT_MODEL": "us.anthropic.claude-sonnet-4-20250514-v1:0",
+                "BEDROCK_FALLBACK_MODEL": "us.anthropic.claude-opus-4-20250514-v1:0",
+                "BEDROCK_FAST_MODEL": "us.anthropic.claude-sonnet-4-20250514-v1:0",
+                "BEDROCK_MAX_TOKENS": "4096",
+                "BEDROCK_TEMPERATURE": "0.7",
+                "BEDROCK_SELECTION_STRATEGY": "adaptive",
+                **ai_environment
+            }
+        )
+        
+        ai_stream_api = apigwv2.WebSocketApi(self, "AIStreamAPI")
+        ai_stream_api.add_route(
+            "stream",
+            integration=apigwv2_integrations.WebSocketLambdaIntegration(
+                "AIStreamIntegration", ai_stream_handler
+            )
+        )
+        ai_stream_stage = apigwv2.WebSocketStage(
+            self, "AIStreamStage",
+            web_socket_api=ai_stream_api,
+            stage_name="prod",
+            auto_deploy=True
+        )
+        ai_stream_api.grant_manage_connections(ai_stream_handler)
         
         # dev 환경일 때만 개발자 이름 추가
         if developer:
@@ -203,7 +378,8 @@ class ApiStack(Stack):
             memory_size=256,
             role=lambda_role,
             environment={
-                "DYNAMODB_TABLE": dynamodb_table.table_name
+                "DYNAMODB_TABLE": dynamodb_table.table_name,
+                **cursor_environment
             }
         )
         
@@ -217,7 +393,8 @@ class ApiStack(Stack):
             memory_size=256,
             role=lambda_role,
             environment={
-                "DYNAMODB_TABLE": dynamodb_table.table_name
+                "DYNAMODB_TABLE": dynamodb_table.table_name,
+                **cursor_environment
             }
         )
         
@@ -236,10 +413,37 @@ class ApiStack(Stack):
         customer_inquiries_endpoint = customer_root.add_resource("inquiries")
         customer_inquiries_endpoint.add_method("GET", apigateway.LambdaIntegration(customer_inquiries))
         
+        # AI 사용량/비용 대시보드 endpoint
+        if usage_table is not None:
+            usage_dashboard = _lambda.Function(
+                self, "AIUsageDashboard",
+                runtime=_lambda.Runtime.PYTHON_3_11,
+                handler="src.handlers.usage_dashboard.lambda_handler",
+                code=_lambda.Code.from_asset("../backend"),
+                timeout=Duration.seconds(30),
+                memory_size=256,
+                role=lambda_role,
+                environment={
+                    "DYNAMODB_TABLE": dynamodb_table.table_name,
+                    "AI_USAGE_TABLE": usage_table.table_name
+                }
+            )
+            usage = api_v1.add_resource("usage")
+            usage.add_method("GET", apigateway.LambdaIntegration(usage_dashboard))
+        
         self.api_url = api.url
         self.api = api
+        self.ai_job_queue = ai_job_queue
         
         # Output API URL
         CfnOutput(self, "ApiUrl", 
                  value=api.url,
-                 description="CS Chatbot API Gateway URL")
\ No newline at end of file
+                 description="CS Chatbot API Gateway URL")
+        
+        CfnOutput(self, "AIStreamUrl",
+                 value=ai_stream_stage.url,
+                 description="AI Response Streaming WebSocket URL")
+        
+        CfnOutput(self, "AIJobQueueUrl",
+                 value=ai_job_queue.queue_url,
+                 description="AI Response Job Queue URL")
\ No newline at end of file
@@ -18,12 +18,16 @@ class DataStack(Stack):
             admin_users_table_name = f"admin-users-dev-{developer}"
             qna_table_name = f"qna-data-dev-{developer}"
             company_table_name = f"cs-companies-dev-{developer}"
+            response_cache_table_name = f"ai-response-cache-dev-{developer}"
+            usage_table_name = f"ai-usage-dev-{developer}"
         else:
             inquiry_table_name = "cs-inquiries"  # 기존 prod 환경
             admin_inquiries_table_name = "admin-inquiries"
             admin_users_table_name = "admin-users"
             qna_table_name = "qna-data"
             company_table_name = "cs-companies"
+            response_cache_table_name = "ai-response-cache"
+            usage_table_name = "ai-usage"
         
         # DynamoDB Table for CS inquiries
         self.inquiry_table = dynamodb.Table(
@@ -64,6 +68,19 @@ class DataStack(Stack):
             )
         )
         
+        # GSI for customer email queries (고객별 문의 목록, 최신순)
+        self.inquiry_table.add_global_secondary_index(
+            index_name="customer-email-index",
+            partition_key=dynamodb.Attribute(
+                name="customerEmail",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="created_at",
+                type=dynamodb.AttributeType.STRING
+            )
+        )
+
         # DynamoDB Table for Admin Inquiries (별도)
         self.admin_inquiries_table = dynamodb.Table(
             self, "AdminInquiriesTable",
@@ -181,6 +198,36 @@ class DataStack(Stack):
             )
         )
         
+        # DynamoDB Table for AI response cache (만료 항목은 TTL로 자동 삭제)
+        self.response_cache_table = dynamodb.Table(
+            self, "AIResponseCacheTable",
+            table_name=response_cache_table_name,
+            partition_key=dynamodb.Attribute(
+                name="cacheKey",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+            time_to_live_attribute="expiresAt"
+        )
+        
+        # AI 사용량/비용 회사별 일 집계 (companyId + period=YYYY-MM-DD)
+        self.usage_table = dynamodb.Table(
+            self, "AIUsageTable",
+            table_name=usage_table_name,
+            partition_key=dynamodb.Attribute(
+                name="companyId",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="period",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+            time_to_live_attribute="expiresAt"
+        )
+        
         # Outputs
         CfnOutput(self, "InquiryTableName",
                  value=self.inquiry_table.table_name,
@@ -202,6 +249,14 @@ class DataStack(Stack):
                  value=self.company_table.table_name,
                  description="Company DynamoDB Table Name")
         
+        CfnOutput(self, "ResponseCacheTableName",
+                 value=self.response_cache_table.table_name,
+                 description="AI Response Cache DynamoDB Table Name")
+        
+        CfnOutput(self, "AIUsageTableName",
+                 value=self.usage_table.table_name,
+                 description="AI Usage DynamoDB Table Name")
+        
         # 기존 호환성을 위한 출력
         CfnOutput(self, "TableName",
                  value=self.inquiry_table.table_name,